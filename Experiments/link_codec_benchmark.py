@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measure the per-link cost of the Cod Sync link codec.
+
+A fetch decodes one link per chain step and a publication encodes a link
+twice (once for the signed canonical bytes, once for the wire bytes), so the
+codec sits on every sync path. This compares, per link:
+
+  1. PyYAML's pure-Python loader and dumper (the codec before the fast path)
+  2. PyYAML's libyaml loader, when this PyYAML was built with it
+  3. cod_sync.format.decode_link / encode_link / canonical_link_bytes
+  4. cod_sync.format.decode_archived_link on a warm cache
+
+Links are signed by a configurable number of teammates, since signatures are
+most of a link's bytes in a real team.
+"""
+
+import argparse
+import secrets
+import timeit
+
+import yaml
+
+from cod_sync.format import (
+    Link,
+    Predecessor,
+    canonical_link_bytes,
+    decode_archived_link,
+    decode_link,
+    encode_link,
+    new_uid,
+)
+
+
+def make_link(n_signatures):
+    signatures = {
+        secrets.token_hex(16): {
+            "device_public_key": secrets.token_hex(32),
+            "signature": secrets.token_urlsafe(64).replace("-", "+").replace("_", "/"),
+        }
+        for _ in range(n_signatures)
+    }
+    return Link(
+        link_id=new_uid(),
+        head=secrets.token_hex(20),
+        bundle_id=new_uid(),
+        previous=Predecessor(link_id=new_uid(), head=secrets.token_hex(20)),
+        extensions={"signatures": signatures} if signatures else {},
+    )
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(n_links, n_signatures, number):
+    links = [make_link(n_signatures) for _ in range(n_links)]
+    blobs = [encode_link(link) for link in links]
+    texts = [blob.decode("utf-8") for blob in blobs]
+    mappings = [yaml.safe_load(text) for text in texts]
+
+    def each(fn, items):
+        return lambda: [fn(item) for item in items]
+
+    rows = [
+        ("decode: yaml.safe_load (pure Python)", each(yaml.safe_load, texts)),
+        ("decode: cod_sync decode_link", each(decode_link, blobs)),
+        ("decode: cod_sync decode_archived_link (warm)", each(decode_archived_link, blobs)),
+        (
+            "encode: yaml.dump",
+            each(
+                lambda m: yaml.dump(m, default_flow_style=False, sort_keys=True),
+                mappings,
+            ),
+        ),
+        ("encode: cod_sync encode_link", each(encode_link, links)),
+        ("encode: cod_sync canonical_link_bytes", each(canonical_link_bytes, links)),
+    ]
+    if hasattr(yaml, "CSafeLoader"):
+        rows.insert(
+            1,
+            (
+                "decode: yaml CSafeLoader (libyaml)",
+                each(lambda t: yaml.load(t, Loader=yaml.CSafeLoader), texts),
+            ),
+        )
+
+    print(f"{n_links} links, {n_signatures} signatures each, "
+          f"{len(blobs[0])} bytes per link")
+    for label, fn in rows:
+        fn()  # warm caches, including decode_archived_link's
+        print(f"  {label:<48} {per_call_us(fn, number) / n_links:9.1f} us/link")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--links", type=int, default=50)
+    parser.add_argument("--signatures", type=int, default=3)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    run(args.links, args.signatures, args.number)
+
+
+if __name__ == "__main__":
+    main()
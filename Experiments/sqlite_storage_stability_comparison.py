@@ -14,6 +14,13 @@ For each experimental condition, we:
   4. Iterate N rounds of random inserts, updates, and deletes, committing to
      git after each round
   5. Report: total repo size, number of git objects, and average diff size
+
+With --policy, it instead runs the workload Small Sea's Core DBs actually see
+(a few row changes per commit, with an occasional purge) against stock SQLite
+settings and against small_sea_sqlite.sqlite_policy's tracked layout, and
+reports the size of the incremental git bundle each commit would ship. This
+is the regression benchmark for the tracked-layout constants; see
+tests/test_sqlite_storage_stability_experiment.py.
 """
 
 import argparse
@@ -26,6 +33,8 @@ import subprocess
 import string
 import sys
 
+from small_sea_sqlite import sqlite_policy
+
 
 # ---------------------------------------------------------------------------
 # Schema and random data helpers
@@ -208,6 +217,34 @@ def do_round(conn, rng):
     conn.commit()
 
 
+def do_small_round(conn, rng):
+    """A Core-sized edit: a couple of inserts and a couple of updates."""
+    cur = conn.cursor()
+    project_ids = [r[0] for r in cur.execute("SELECT id FROM project").fetchall()]
+    for _ in range(rng.randint(1, 3)):
+        cur.execute(
+            "INSERT INTO todo (project_id, title, body, priority) VALUES (?, ?, ?, ?)",
+            (rng.choice(project_ids), random_title(), random_body(), rng.randint(0, 3)),
+        )
+    todo_ids = [r[0] for r in cur.execute("SELECT id FROM todo").fetchall()]
+    for tid in rng.sample(todo_ids, min(2, len(todo_ids))):
+        cur.execute(
+            "UPDATE todo SET priority = ?, updated_at = '2026-01-01' WHERE id = ?",
+            (rng.randint(0, 3), tid),
+        )
+    conn.commit()
+
+
+def do_purge_round(conn, rng):
+    """Drop most rows at once, as removing a teammate or old history does."""
+    cur = conn.cursor()
+    todo_ids = [r[0] for r in cur.execute("SELECT id FROM todo").fetchall()]
+    doomed = rng.sample(todo_ids, len(todo_ids) * 3 // 4)
+    cur.executemany("DELETE FROM todo_tag WHERE todo_id = ?", [(d,) for d in doomed])
+    cur.executemany("DELETE FROM todo WHERE id = ?", [(d,) for d in doomed])
+    conn.commit()
+
+
 # ---------------------------------------------------------------------------
 # Git helpers
 # ---------------------------------------------------------------------------
@@ -235,6 +272,20 @@ def git_commit(repo_dir, message):
     git(repo_dir, "commit", "-m", message)
 
 
+def git_head(repo_dir):
+    return git(repo_dir, "rev-parse", "HEAD").stdout.strip()
+
+
+def bundle_bytes(repo_dir, since, until="HEAD"):
+    """Size of the git bundle carrying since..until, as Cod Sync would ship it."""
+    bundle = pathlib.Path(repo_dir) / ".git" / "measure.bundle"
+    git(repo_dir, "bundle", "create", str(bundle), f"{since}..{until}")
+    try:
+        return bundle.stat().st_size
+    finally:
+        bundle.unlink(missing_ok=True)
+
+
 def git_repo_stats(repo_dir):
     """Gather stats about the git repo."""
     # Total size of .git directory
@@ -305,6 +356,89 @@ def condition_name(journal_mode, auto_vacuum, page_size):
     return f"jrnl-{journal_mode}_vacuum-{auto_vacuum}_page-{page_size}"
 
 
+# SQLite's compiled-in defaults (secure_delete off), the same with
+# secure_delete on, and the tracked layout from small_sea_sqlite.sqlite_policy.
+POLICY_CONDITIONS = ["stock", "stock-secure-delete", "tracked-policy"]
+
+
+def _open_for_condition(db_path, condition):
+    if condition == "tracked-policy":
+        conn = sqlite_policy.connect(db_path)
+    else:
+        conn = sqlite3.connect(str(db_path))
+        secure = "ON" if condition == "stock-secure-delete" else "OFF"
+        conn.execute(f"PRAGMA secure_delete = {secure}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def run_policy_condition(
+    cond_dir, condition, n_rounds, seed, purge_every=10, n_seed_todos=4000
+):
+    """Run the Core-like workload under one condition; return its stats.
+
+    Every round is one git commit. Every purge_every-th round is a purge.
+    The tracked-policy condition runs maintain_tracked_layout before each
+    commit, as the Manager does before publishing core.db.
+    """
+    cond_dir = pathlib.Path(cond_dir)
+    cond_dir.mkdir(parents=True, exist_ok=True)
+    git_init(cond_dir)
+    random.seed(seed)
+    rng = random.Random(seed)
+
+    db_path = cond_dir / "core.db"
+    conn = _open_for_condition(db_path, condition)
+    if condition == "tracked-policy":
+        sqlite_policy.apply_tracked_layout(conn)
+    conn.executescript(SCHEMA)
+    seed_db(conn, rng, n_seed_todos)
+    conn.close()
+    git_commit(cond_dir, "initial schema and seed data")
+
+    bundles = []
+    relayouts = 0
+    for i in range(n_rounds):
+        conn = _open_for_condition(db_path, condition)
+        if purge_every and (i + 1) % purge_every == 0:
+            do_purge_round(conn, rng)
+        else:
+            do_small_round(conn, rng)
+        conn.close()
+        if condition == "tracked-policy" and sqlite_policy.maintain_tracked_layout(db_path):
+            relayouts += 1
+        before = git_head(cond_dir)
+        git_commit(cond_dir, f"round {i + 1}")
+        bundles.append(bundle_bytes(cond_dir, before))
+
+    return {
+        "condition": condition,
+        "db_size": db_path.stat().st_size,
+        "bundle_bytes": bundles,
+        "avg_bundle_bytes": sum(bundles) / len(bundles) if bundles else 0,
+        "total_bundle_bytes": sum(bundles),
+        "relayouts": relayouts,
+    }
+
+
+def run_policy_comparison(scratch_dir, n_rounds, seed, purge_every=10, n_seed_todos=4000):
+    scratch = pathlib.Path(scratch_dir)
+    print(f"Running {len(POLICY_CONDITIONS)} conditions x {n_rounds} Core-sized rounds (seed={seed})")
+    results = {}
+    for condition in POLICY_CONDITIONS:
+        stats = run_policy_condition(
+            scratch / condition, condition, n_rounds, seed, purge_every, n_seed_todos
+        )
+        results[condition] = stats
+        print(
+            f"  {condition:<22} db={stats['db_size']:>10,}  "
+            f"avg_bundle={stats['avg_bundle_bytes']:>8,.0f}  "
+            f"total_bundles={stats['total_bundle_bytes']:>10,}  "
+            f"relayouts={stats['relayouts']}"
+        )
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -438,8 +572,16 @@ def main():
         default=42,
         help="Random seed for reproducibility (default: 42)",
     )
+    parser.add_argument(
+        "--policy",
+        action="store_true",
+        help="Compare stock SQLite against the tracked-file policy on a Core-like workload",
+    )
     args = parser.parse_args()
-    run_experiment(args.scratch_dir, args.rounds, args.seed)
+    if args.policy:
+        run_policy_comparison(args.scratch_dir, args.rounds, args.seed)
+    else:
+        run_experiment(args.scratch_dir, args.rounds, args.seed)
 
 
 if __name__ == "__main__":
@@ -25,10 +25,21 @@ extension point is open: unknown keys inside `extensions` are accepted,
 preserved through a decode/encode round trip, and covered by canonical
 signing. Minor and patch evolution may add ignorable data there; a change to
 traversal, validation, or adoption semantics requires a new major.
+
+Links are small and fixed-shape, but they are decoded once per chain step and
+encoded twice per publication, so the codec has a fast path for exactly the
+block-mapping subset PyYAML itself emits for a link. The fast path either
+produces byte-identical output to `yaml.dump` (and the same mapping as
+`yaml.safe_load`) or declines, and a declined input goes through PyYAML
+unchanged. Signatures therefore never depend on which path ran.
 """
 
 import base64
+import hashlib
+import re
 import secrets
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from types import MappingProxyType
 from typing import Any, Mapping, Optional, Tuple
@@ -49,6 +60,12 @@ _TOP_LEVEL_KEYS = frozenset(
 )
 _PREVIOUS_KEYS = frozenset({"link_id", "head"})
 
+#: libyaml's loader when PyYAML was built with it; same results, less time.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+#: How many decoded links decode_archived_link keeps, by content hash.
+ARCHIVED_LINK_CACHE_SIZE = 1024
+
 
 class LinkFormatError(Exception):
     """Raised when link bytes do not decode as a well-formed link."""
@@ -185,7 +202,10 @@ def decode_link(data: bytes) -> Link:
     if not isinstance(data, (bytes, bytearray)):
         raise LinkFormatError(f"link bytes must be bytes, got {type(data).__name__}")
     try:
-        parsed = yaml.safe_load(bytes(data).decode("utf-8"))
+        text = bytes(data).decode("utf-8")
+        parsed = _fast_load(text)
+        if parsed is None:
+            parsed = yaml.load(text, Loader=_YAML_LOADER)
     except (yaml.YAMLError, UnicodeDecodeError) as exc:
         raise LinkFormatError(f"link is not valid YAML: {exc}") from exc
 
@@ -222,6 +242,162 @@ def decode_link(data: bytes) -> Link:
     )
 
 
+_archived_cache: "OrderedDict[bytes, Link]" = OrderedDict()
+_archived_cache_lock = threading.Lock()
+
+
+def decode_archived_link(data: bytes) -> Link:
+    """decode_link, memoized by the bytes' content hash.
+
+    Archived links are written once and never replaced, so a chain walk that
+    rereads one (a later fetch of the same peer, a settlement pass after an
+    observation) pays for the hash rather than the parse. Keying on content
+    rather than link_id means a store that served different bytes under the
+    same name still gets them decoded and checked afresh. Callers must treat
+    the returned link's extensions as read-only, as they do for any Link.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        raise LinkFormatError(f"link bytes must be bytes, got {type(data).__name__}")
+    digest = hashlib.sha256(data).digest()
+    with _archived_cache_lock:
+        link = _archived_cache.get(digest)
+        if link is not None:
+            _archived_cache.move_to_end(digest)
+            return link
+    link = decode_link(data)
+    with _archived_cache_lock:
+        _archived_cache[digest] = link
+        while len(_archived_cache) > ARCHIVED_LINK_CACHE_SIZE:
+            _archived_cache.popitem(last=False)
+    return link
+
+
+# ---------------------------------------------------------------------- #
+# Fast path for PyYAML's own block-mapping output
+# ---------------------------------------------------------------------- #
+
+#: Scalars the fast path handles: hex ids, versions, base64 signatures, and
+#: snake_case keys. Nothing here needs escaping, folding, or double quotes.
+_FAST_SCALAR = re.compile(r"[A-Za-z0-9+/=._]+\Z")
+_FAST_LINE = re.compile(
+    r"(?P<indent> *)(?P<key>'[A-Za-z0-9+/=._]+'|[A-Za-z0-9+/=._]+):"
+    r"(?: (?P<value>\S+))?\Z"
+)
+_STR_TAG = "tag:yaml.org,2002:str"
+_resolver = yaml.resolver.Resolver()
+
+
+class _NotFast(Exception):
+    """The value is outside the subset the fast path reproduces exactly."""
+
+
+def _plain_is_str(value: str) -> bool:
+    return _resolver.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+
+
+def _emit_scalar(value: str) -> str:
+    # "..." opens a document marker, which the emitter quotes on its own terms.
+    if not _FAST_SCALAR.match(value) or value.startswith("..."):
+        raise _NotFast
+    # PyYAML quotes exactly the strings that would read back as another type.
+    return value if _plain_is_str(value) else f"'{value}'"
+
+
+def _emit_mapping(mapping: dict, indent: str, out: list) -> None:
+    for key in sorted(mapping):
+        if type(key) is not str or len(key) > 100:
+            raise _NotFast
+        value = mapping[key]
+        prefix = f"{indent}{_emit_scalar(key)}:"
+        if type(value) is dict:
+            if not value:
+                out.append(f"{prefix} {{}}\n")
+            else:
+                out.append(f"{prefix}\n")
+                _emit_mapping(value, indent + "  ", out)
+        elif value is None:
+            out.append(f"{prefix} null\n")
+        elif type(value) is str:
+            out.append(f"{prefix} {_emit_scalar(value)}\n")
+        else:
+            raise _NotFast
+
+
+def _dump(mapping: dict) -> bytes:
+    out: list = []
+    try:
+        _emit_mapping(mapping, "", out)
+    except _NotFast:
+        return yaml.dump(mapping, default_flow_style=False, sort_keys=True).encode(
+            "utf-8"
+        )
+    return "".join(out).encode("utf-8")
+
+
+def _load_scalar(token: str):
+    """Return the scalar token as yaml.safe_load would, or raise _NotFast."""
+    if token.startswith("'"):
+        if len(token) < 3 or not token.endswith("'"):
+            raise _NotFast
+        inner = token[1:-1]
+        if not _FAST_SCALAR.match(inner):
+            raise _NotFast
+        return inner
+    if not _FAST_SCALAR.match(token) or not _plain_is_str(token):
+        raise _NotFast
+    return token
+
+
+def _fast_load(text: str) -> Optional[dict]:
+    """Parse the block-mapping subset _dump emits, or return None.
+
+    None means "not provably in the subset", never "invalid": the caller hands
+    such text to PyYAML, which then decides. Duplicate keys, unexpected
+    indentation, non-string scalars, and empty nested values all decline.
+    """
+    if not text.endswith("\n"):
+        return None
+    root: dict = {}
+    stack = [(0, root)]
+    pending = None
+    try:
+        for line in text[:-1].split("\n"):
+            match = _FAST_LINE.match(line)
+            if match is None:
+                return None
+            indent = len(match["indent"])
+            if pending is not None:
+                parent_indent, container, parent_key = pending
+                if indent != parent_indent + 2:
+                    return None
+                child: dict = {}
+                container[parent_key] = child
+                stack.append((indent, child))
+                pending = None
+            while stack[-1][0] > indent:
+                stack.pop()
+            if stack[-1][0] != indent:
+                return None
+            mapping = stack[-1][1]
+            key = _load_scalar(match["key"])
+            if key in mapping:
+                return None
+            token = match["value"]
+            if token is None:
+                pending = (indent, mapping, key)
+            elif token == "null":
+                mapping[key] = None
+            elif token == "{}":
+                mapping[key] = {}
+            else:
+                mapping[key] = _load_scalar(token)
+    except _NotFast:
+        return None
+    if pending is not None:
+        return None
+    return root
+
+
 def _link_mapping(link: Link) -> dict:
     previous = None
     if link.previous is not None:
@@ -238,9 +414,7 @@ def _link_mapping(link: Link) -> dict:
 
 def encode_link(link: Link) -> bytes:
     """Serialize a link to its wire bytes."""
-    return yaml.dump(
-        _link_mapping(link), default_flow_style=False, sort_keys=True
-    ).encode("utf-8")
+    return _dump(_link_mapping(link))
 
 
 def canonical_link_bytes(link: Link) -> bytes:
@@ -255,7 +429,7 @@ def canonical_link_bytes(link: Link) -> bytes:
         for key, value in mapping["extensions"].items()
         if key != SIGNATURES_KEY
     }
-    return yaml.dump(mapping, default_flow_style=False, sort_keys=True).encode("utf-8")
+    return _dump(mapping)
 
 
 def sign_link(private_key_bytes: bytes, canonical_bytes: bytes) -> str:
@@ -298,3 +472,68 @@ def signed_link(
     }
     extensions[SIGNATURES_KEY] = signatures
     return link.with_extensions(extensions)
+
+
+# ---------------------------------------------------------------------- #
+# Head manifest
+# ---------------------------------------------------------------------- #
+
+HEAD_MANIFEST_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class ChainHead:
+    """One chain's entry in a head manifest: its latest link and `main` head."""
+
+    link_id: str
+    head: str
+
+
+def encode_head_manifest(chains: Mapping[str, ChainHead]) -> bytes:
+    """Serialize a mapping of chain path prefix to ChainHead.
+
+        chains:
+          niches/photos/:
+            head: <main commit object id>
+            link_id: 0123456789abcdef
+        version: '1'
+    """
+    return _dump(
+        {
+            "version": HEAD_MANIFEST_VERSION,
+            "chains": {
+                prefix: {"link_id": entry.link_id, "head": entry.head}
+                for prefix, entry in chains.items()
+            },
+        }
+    )
+
+
+def decode_head_manifest(data: bytes) -> dict:
+    """Decode head manifest bytes into {path prefix: ChainHead}.
+
+    A manifest is a hint about where chains stand, never a substitute for
+    reading and validating a chain, but a malformed one is still an error
+    rather than an empty manifest: callers fall back to probing every chain.
+    """
+    try:
+        text = bytes(data).decode("utf-8")
+        parsed = _fast_load(text)
+        if parsed is None:
+            parsed = yaml.load(text, Loader=_YAML_LOADER)
+    except (yaml.YAMLError, UnicodeDecodeError, TypeError) as exc:
+        raise LinkFormatError(f"head manifest is not valid YAML: {exc}") from exc
+    if not isinstance(parsed, dict) or parsed.get("version") != HEAD_MANIFEST_VERSION:
+        raise LinkFormatError("head manifest has an unsupported shape or version")
+    chains = parsed.get("chains") or {}
+    if not isinstance(chains, dict):
+        raise LinkFormatError("head manifest chains must be a mapping")
+    result = {}
+    for prefix, entry in chains.items():
+        if not isinstance(prefix, str) or not isinstance(entry, dict):
+            raise LinkFormatError(f"head manifest entry {prefix!r} is malformed")
+        result[prefix] = ChainHead(
+            link_id=_require_uid(entry.get("link_id"), "manifest link_id"),
+            head=_require_object_id(entry.get("head"), "manifest head"),
+        )
+    return result
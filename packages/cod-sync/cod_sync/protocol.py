@@ -21,6 +21,7 @@ What a publication may move
     touches a work tree, or constructs a merge.
 """
 
+import contextlib
 import logging
 import tempfile
 from dataclasses import dataclass
@@ -30,16 +31,27 @@ from typing import Dict, List, Optional, Set
 from cod_sync.format import (
     COD_SYNC_VERSION,
     BundleDescriptor,
+    ChainHead,
     Link,
+    LinkFormatError,
     Predecessor,
+    decode_archived_link,
+    decode_head_manifest,
     decode_link,
+    encode_head_manifest,
     encode_link,
     new_uid,
     parse_version,
     signed_link,
 )
 from cod_sync.repo import RefDivergedError, Repo
-from cod_sync.store import CasConflictError, ObjectNotFoundError, StoreError
+from cod_sync.store import (
+    CasConflictError,
+    ObjectNotFoundError,
+    StoreError,
+    bundle_path as bundle_object_path,
+    link_path as link_object_path,
+)
 
 logger = logging.getLogger("cod_sync")
 
@@ -54,6 +66,9 @@ PHASE_BUNDLE = "bundle"
 PHASE_ARCHIVED_LINK = "archived_link"
 PHASE_HEAD = "head"
 
+#: Attempts at a contended head manifest update before giving up on it.
+HEAD_MANIFEST_RETRIES = 5
+
 
 def parked_ref_name(link_uid: str) -> str:
     return f"{PARKED_REF_PREFIX}/{link_uid}"
@@ -367,6 +382,9 @@ class CodSync:
                 state = self._git_state(observed.head, attempted_head)
                 if state == "contains":
                     # No head write has been attempted, so none can be open.
+                    # An earlier publication may have moved the head and then
+                    # failed to record it, so the manifest catches up here.
+                    self._record_head(observed.link_uid, observed.head)
                     return PublishResult(
                         disposition="already_present",
                         attempted_head=attempted_head,
@@ -468,8 +486,7 @@ class CodSync:
         imported = False
         if self.repo.has_commit(stored.head):
             stored_bundle = work / f"{stored.bundle_id}.bundle"
-            self.store.download_bundle(stored.bundle_id, stored_bundle)
-            self._require_bundle_matches(stored, stored_bundle)
+            self._download_matching_bundle(stored, stored_bundle)
             self._verify_stored_bundle(stored, stored_bundle)
         else:
             pending, _links_read, _downloads = self._resolve(stored, work)
@@ -570,6 +587,7 @@ class CodSync:
         except StoreError as exc:
             return self._settle(exc, link, attempted_head, predecessor, work)
 
+        self._record_head(link.link_id, attempted_head)
         return PublishResult(
             disposition="published",
             attempted_head=attempted_head,
@@ -581,6 +599,54 @@ class CodSync:
             attempted_link_uid=link.link_id,
         )
 
+    # -- head manifest -- #
+
+    def _record_head(self, link_uid: str, head: str):
+        """Bring this chain's head manifest entry up to date, best effort.
+
+        Runs only after the head is stored, so an entry may lag its chain but
+        never lead it, and a store that keeps a manifest notifies teammates on
+        the manifest write rather than the head write. A failure here is
+        logged and leaves the publication's outcome alone: the next
+        publication of this chain, even one that finds nothing new to
+        publish, brings the entry up to date. The head has moved all the
+        same, so the store is asked to notify teammates without the manifest.
+        """
+        if not getattr(self.store, "records_heads", False):
+            return
+        prefix = self.store.path_prefix
+        entry = ChainHead(link_id=link_uid, head=head)
+        lock = getattr(self.store, "head_manifest_lock", None) or contextlib.nullcontext()
+        try:
+            with lock:
+                for _attempt in range(HEAD_MANIFEST_RETRIES):
+                    try:
+                        data, etag = self.store.get_head_manifest()
+                        chains = decode_head_manifest(data)
+                    except ObjectNotFoundError:
+                        chains, etag = {}, None
+                    except LinkFormatError as exc:
+                        logger.warning(f"replacing an unreadable head manifest: {exc}")
+                        chains = {}
+                    if chains.get(prefix) == entry:
+                        return
+                    chains[prefix] = entry
+                    try:
+                        self.store.put_head_manifest(encode_head_manifest(chains), etag)
+                        return
+                    except CasConflictError:
+                        continue
+                logger.warning(f"head manifest entry for {prefix!r} still contended; left stale")
+        except StoreError as exc:
+            logger.warning(f"head manifest entry for {prefix!r} not recorded: {exc}")
+        notify = getattr(self.store, "notify_head_moved", None)
+        if notify is None:
+            return
+        try:
+            notify()
+        except StoreError as exc:
+            logger.warning(f"teammates not notified of {prefix!r}'s new head: {exc}")
+
     # -- settlement -- #
 
     def _settle(
@@ -778,6 +844,7 @@ class CodSync:
         many links were read and how many bundles were downloaded. Every bundle
         is downloaded once, to its own path.
         """
+        self._prefetch_step(latest)
         entry = self._download_and_check(latest, work)
         links_read = 1
         downloads = 1
@@ -801,15 +868,14 @@ class CodSync:
                 )
             visited.add(previous_uid)
             try:
-                previous_bytes = self.store.get_link(previous_uid)
+                previous = self._read_predecessor(current)
             except ObjectNotFoundError as exc:
                 raise ChainError(
                     "the chain names a predecessor the store does not hold",
                     link_uid=previous_uid,
                 ) from exc
-            previous = decode_link(previous_bytes)
             links_read += 1
-            self._require_predecessor_consistent(current, previous)
+            self._prefetch_step(previous)
             pending.append(self._download_and_check(previous, work))
             downloads += 1
             current = previous
@@ -817,12 +883,53 @@ class CodSync:
         pending.reverse()
         return pending, links_read, downloads
 
+    def _prefetch_step(self, link: Link):
+        """Ask the store for link's bundle and, if the walk will need it, the
+        next predecessor link in one request.
+
+        Each link names only its predecessor, so the walk cannot look further
+        ahead than this. The reads that follow still validate every byte.
+        """
+        prefetch = getattr(self.store, "prefetch", None)
+        if prefetch is None:
+            return
+        paths = [bundle_object_path(link.bundle_id)]
+        if link.previous is not None and not self.repo.has_commit(link.previous.head):
+            paths.append(link_object_path(link.previous.link_id))
+        if len(paths) > 1:
+            prefetch(paths)
+
     def _download_and_check(self, link: Link, work: Path) -> _ChainEntry:
         bundle_path = work / f"{link.bundle_id}.bundle"
-        self.store.download_bundle(link.bundle_id, bundle_path)
-        descriptor = self._require_bundle_matches(link, bundle_path)
+        descriptor = self._download_matching_bundle(link, bundle_path)
         return _ChainEntry(link=link, bundle_path=bundle_path, descriptor=descriptor)
 
+    def _reads_validated(self) -> bool:
+        """True when the store can try another copy of a read that fails a check."""
+        return getattr(self.store, "validates_reads", False)
+
+    def _download_matching_bundle(self, link: Link, bundle_path: Path) -> BundleDescriptor:
+        check = lambda path: self._require_bundle_matches(link, path)
+        if self._reads_validated():
+            return self.store.download_bundle(link.bundle_id, bundle_path, validate=check)
+        self.store.download_bundle(link.bundle_id, bundle_path)
+        return check(bundle_path)
+
+    def _read_predecessor(self, child: Link) -> Link:
+        accepted = {}
+
+        def check(data: bytes) -> Link:
+            parent = decode_archived_link(data)
+            self._require_predecessor_consistent(child, parent)
+            accepted[data] = parent
+            return parent
+
+        previous_uid = child.previous.link_id
+        if self._reads_validated():
+            # The store returns the bytes of the copy check accepted.
+            return accepted[self.store.get_link(previous_uid, validate=check)]
+        return check(self.store.get_link(previous_uid))
+
     def _already_satisfied(self, entry: _ChainEntry) -> bool:
         """True when the validated latest bundle needs no import."""
         link = entry.link
@@ -990,3 +1097,19 @@ class CodSync:
                 f"the chain regresses from version {parent.version} to {child.version}",
                 link_uid=parent.link_id,
             )
+
+
+def read_head_manifest(store) -> Optional[Dict[str, ChainHead]]:
+    """Return a store's head manifest as {chain prefix: ChainHead}.
+
+    None means the manifest cannot be used — absent, unreadable, or not
+    supported by this store — and the caller should probe every chain. Other
+    store failures propagate, as for any read.
+    """
+    if not hasattr(store, "get_head_manifest"):
+        return None
+    try:
+        data, _etag = store.get_head_manifest()
+        return decode_head_manifest(data)
+    except (ObjectNotFoundError, LinkFormatError):
+        return None
@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Union
 
 from cod_sync.git import GitCmdFailed, gitCmd as _gitCmd
+from small_sea_sqlite import sqlite_policy
 
 
 class RepoError(Exception):
@@ -496,8 +497,24 @@ class Repo:
         if files is None:
             self._run_wt(["add", "--all"], method_name="stage")
         else:
+            self._checkpoint_sqlite(files)
             self._run_wt(["add", "--"] + list(files), method_name="stage")
 
+    def renormalize(self, files: List[str]):
+        """Re-stage files through their current attributes, e.g. a new filter."""
+        self._checkpoint_sqlite(files)
+        self._run_wt(
+            ["add", "--renormalize", "--"] + list(files), method_name="renormalize"
+        )
+
+    def _checkpoint_sqlite(self, paths: List[str]):
+        # A SQLite file whose newest pages still sit in a WAL beside it would
+        # be committed stale; see small_sea_sqlite.sqlite_policy.
+        if self.work_tree is None:
+            return
+        for path in paths:
+            sqlite_policy.checkpoint(self.work_tree / path)
+
     def commit(self, message: str) -> Optional[str]:
         """Commit staged changes. Returns the new SHA, or None if nothing staged."""
         check = self._run_wt(
@@ -544,6 +561,7 @@ class Repo:
         paths = list(paths)
         if not paths:
             raise ValueError("paths must contain at least one path")
+        self._checkpoint_sqlite(paths)
         if not self.work_tree_paths_differ_from_head(paths):
             return None
         self._run_wt(
@@ -12,12 +12,17 @@ Object naming inside a store:
     L-{link_uid}.yaml   an archived link, written once and never replaced
     B-{bundle_uid}.bundle   a bundle, written once and never replaced
 
+Hub stores can also read and write head-manifest.yaml at the bucket root, a
+summary of every chain's head that is only ever a hint.
+
 Production stores reach the network only through the Hub. LocalFolderStore
 performs local filesystem I/O; the direct-provider stores in cod_sync.testing
 are test infrastructure, not a production exception to the gateway rule.
+MirroredStore composes other stores rather than reaching anything itself.
 """
 
 import base64
+import concurrent.futures
 import fcntl
 import hashlib
 import logging
@@ -25,7 +30,10 @@ import os
 import pathlib
 import shutil
 import tempfile
-from typing import Optional, Protocol, Tuple
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Protocol, Sequence, Tuple
 
 import requests
 
@@ -33,6 +41,9 @@ logger = logging.getLogger("cod_sync")
 
 LATEST_LINK_PATH = "latest-link.yaml"
 
+#: One per bucket, outside every path prefix: {chain prefix: (link_id, head)}.
+HEAD_MANIFEST_PATH = "head-manifest.yaml"
+
 #: Passed as expected_etag to request a create-only write.
 CREATE_ONLY = "*"
 
@@ -352,6 +363,9 @@ class _HubStore:
         self.session_hex = session_hex
         self._auth = {"Authorization": f"Bearer {session_hex}"}
         self._path_prefix = path_prefix
+        # (remote path, extra params) → (data, etag, body) or the StoreError
+        # its read produced; filled by prefetch, consumed by the next read.
+        self._prefetched: dict = {}
         if client is not None:
             self._http_get = client.get
             self._http_post = client.post
@@ -367,6 +381,12 @@ class _HubStore:
     def _transform_download(self, data: bytes) -> bytes:
         return data
 
+    def _batch_read_request(self, remote_paths: List[str]) -> Optional[Tuple[str, dict, dict]]:
+        """(endpoint, JSON body, extra params) for reading several objects at
+        once, or None when this store has no batch endpoint. The extra params
+        are those a single read of the same objects would carry."""
+        return None
+
     # -- status classification -- #
 
     @staticmethod
@@ -380,20 +400,25 @@ class _HubStore:
         return str(body)
 
     def _classify(self, resp, cloud_path: str) -> StoreError:
-        detail = self._detail(resp)
-        if resp.status_code == 404:
-            return ObjectNotFoundError(cloud_path)
-        if resp.status_code == 401:
-            return StoreAuthenticationError(f"{cloud_path}: {detail}")
-        if resp.status_code == 403:
-            return StoreAuthorizationError(f"{cloud_path}: {detail}")
         try:
             error_code = resp.json().get("error")
         except Exception:
             error_code = None
-        if resp.status_code == 409 and error_code == "cas_conflict":
+        return self._classify_status(
+            resp.status_code, error_code, self._detail(resp), cloud_path
+        )
+
+    @staticmethod
+    def _classify_status(status_code, error_code, detail, cloud_path: str) -> StoreError:
+        if status_code == 404:
+            return ObjectNotFoundError(cloud_path)
+        if status_code == 401:
+            return StoreAuthenticationError(f"{cloud_path}: {detail}")
+        if status_code == 403:
+            return StoreAuthorizationError(f"{cloud_path}: {detail}")
+        if status_code == 409 and error_code == "cas_conflict":
             return CasConflictError(f"{cloud_path}: {detail}")
-        return StoreProviderError(f"{cloud_path}: HTTP {resp.status_code}: {detail}")
+        return StoreProviderError(f"{cloud_path}: HTTP {status_code}: {detail}")
 
     def _send(self, send, *args, **kwargs):
         try:
@@ -404,19 +429,77 @@ class _HubStore:
             raise StoreTransportError(f"request failed: {exc}") from exc
 
     def _download(self, cloud_path: str) -> Tuple[bytes, Optional[str]]:
-        endpoint, params = self._download_endpoint(cloud_path)
+        data, etag, _body = self._download_with_body(self._path_prefix + cloud_path)
+        return data, etag
+
+    @staticmethod
+    def _prefetch_key(remote_path: str, extra_params: dict):
+        return remote_path, tuple(sorted(extra_params.items()))
+
+    def prefetch(self, cloud_paths: Sequence[str]) -> None:
+        """Read several objects in one Hub request, ahead of their reads.
+
+        Each later read of one of these objects, with the same parameters,
+        takes the prefetched result instead of making its own request, and
+        sees exactly what its own read would have: the bytes and etag, or
+        the typed failure. Best effort: if the batch request itself fails
+        (including against a Hub without batch endpoints), nothing is
+        prefetched and the reads go out one by one as before.
+        """
+        remote_paths = [self._path_prefix + path for path in cloud_paths]
+        request = self._batch_read_request(remote_paths)
+        self._prefetched = {}
+        if request is None:
+            return
+        endpoint, payload, extra_params = request
+        try:
+            resp = self._http_post(endpoint, json=payload, headers=self._auth)
+            if resp.status_code != 200:
+                logger.debug(f"batch read unavailable: HTTP {resp.status_code}")
+                return
+            items = resp.json()["results"]
+        except Exception as exc:
+            logger.debug(f"batch read failed, reading one by one: {exc}")
+            return
+        for item in items:
+            remote_path = item.get("path")
+            if remote_path not in remote_paths:
+                continue
+            key = self._prefetch_key(remote_path, extra_params)
+            if item.get("status") != 200:
+                detail = str(item.get("detail") or item.get("error") or "")
+                self._prefetched[key] = self._classify_status(
+                    item.get("status"), item.get("error"), detail, remote_path
+                )
+                continue
+            try:
+                data = self._transform_download(base64.b64decode(item["data"]))
+            except Exception:
+                # Let the object's own read report what is wrong with it.
+                continue
+            self._prefetched[key] = (data, item.get("etag"), item)
+
+    def _download_with_body(self, remote_path: str, **extra_params):
+        """Read remote_path, which already carries any path prefix."""
+        prefetched = self._prefetched.pop(self._prefetch_key(remote_path, extra_params), None)
+        if isinstance(prefetched, StoreError):
+            raise prefetched
+        if prefetched is not None:
+            return prefetched
+        endpoint, params = self._download_endpoint(remote_path)
+        params = {**params, **extra_params}
         resp = self._send(self._http_get, endpoint, params=params, headers=self._auth)
         if resp.status_code != 200:
-            raise self._classify(resp, cloud_path)
+            raise self._classify(resp, remote_path)
         try:
             body = resp.json()
             data = base64.b64decode(body["data"])
             etag = body.get("etag")
         except Exception as exc:
             raise MalformedStoreResponseError(
-                f"{cloud_path}: unreadable Hub response: {exc}"
+                f"{remote_path}: unreadable Hub response: {exc}"
             ) from exc
-        return self._transform_download(data), etag
+        return self._transform_download(data), etag, body
 
     # -- reads -- #
 
@@ -431,12 +514,32 @@ class _HubStore:
         with open(local_path, "wb") as handle:
             handle.write(data)
 
+    @property
+    def path_prefix(self) -> str:
+        return self._path_prefix
+
+    def get_head_manifest(self) -> Tuple[bytes, Optional[str]]:
+        """Read the bucket's head manifest bytes and etag.
+
+        The manifest sits at the bucket root, outside every path prefix, so one
+        read covers every chain its publisher keeps there.
+        """
+        data, etag, _body = self._download_with_body(HEAD_MANIFEST_PATH)
+        return data, etag
+
 
 class SmallSeaStore(_HubStore):
     """The session's own cloud storage, reached through the Hub.
 
     path_prefix namespaces one Cod Sync chain within a bucket, so several
     chains and the Hub's own signals.yaml can share it.
+
+    With head_manifest=True, Cod Sync also keeps this chain's entry in the
+    bucket's head manifest current after each publication, so a teammate
+    watching several chains here can tell which moved from one read.
+    Stores in one process that publish chains of the same bucket can share
+    head_manifest_lock, so their manifest updates queue rather than race
+    each other's conditional writes.
     """
 
     def __init__(
@@ -445,11 +548,18 @@ class SmallSeaStore(_HubStore):
         base_url: str = "http://localhost:11437",
         client=None,
         path_prefix: str = "",
+        head_manifest: bool = False,
+        head_manifest_lock: Optional[threading.Lock] = None,
     ):
         super().__init__(session_hex, base_url, client=client, path_prefix=path_prefix)
+        self.records_heads = head_manifest
+        self.head_manifest_lock = head_manifest_lock
 
-    def _download_endpoint(self, cloud_path: str):
-        return "/cloud_file", {"path": self._path_prefix + cloud_path}
+    def _download_endpoint(self, remote_path: str):
+        return "/cloud_file", {"path": remote_path}
+
+    def _batch_read_request(self, remote_paths):
+        return "/cloud_files/read", {"paths": remote_paths}, {}
 
     def _upload(
         self,
@@ -457,9 +567,20 @@ class SmallSeaStore(_HubStore):
         data: bytes,
         expected_etag: Optional[str],
         notify: bool = False,
+    ) -> Optional[str]:
+        return self._upload_remote(
+            self._path_prefix + cloud_path, data, expected_etag, notify=notify
+        )
+
+    def _upload_remote(
+        self,
+        remote_path: str,
+        data: bytes,
+        expected_etag: Optional[str],
+        notify: bool = False,
     ) -> Optional[str]:
         payload = {
-            "path": self._path_prefix + cloud_path,
+            "path": remote_path,
             "data": base64.b64encode(data).decode(),
         }
         if expected_etag is not None:
@@ -468,12 +589,12 @@ class SmallSeaStore(_HubStore):
             payload["notify"] = True
         resp = self._send(self._http_post, "/cloud_file", json=payload, headers=self._auth)
         if resp.status_code != 200:
-            raise self._classify(resp, cloud_path)
+            raise self._classify(resp, remote_path)
         try:
             return resp.json().get("etag")
         except Exception as exc:
             raise MalformedStoreResponseError(
-                f"{cloud_path}: unreadable Hub response: {exc}"
+                f"{remote_path}: unreadable Hub response: {exc}"
             ) from exc
 
     def put_bundle(self, bundle_uid: str, local_path) -> None:
@@ -487,12 +608,14 @@ class SmallSeaStore(_HubStore):
         self, data: bytes, expected_etag: Optional[str], link_uid: Optional[str] = None
     ) -> Optional[str]:
         # notify=True tells the Hub to bump signals.yaml once the head moves.
+        # With a head manifest the manifest write notifies instead, so a
+        # teammate woken by the signal always finds the entry already moved.
         try:
             return self._upload(
                 LATEST_LINK_PATH,
                 data,
                 CREATE_ONLY if expected_etag is None else expected_etag,
-                notify=True,
+                notify=not self.records_heads,
             )
         except (StoreTransportError, MalformedStoreResponseError) as exc:
             raise PublicationOutcomeUnknownError(
@@ -501,14 +624,39 @@ class SmallSeaStore(_HubStore):
                 link_uid=link_uid,
             ) from exc
 
+    def put_head_manifest(self, data: bytes, expected_etag: Optional[str]) -> Optional[str]:
+        """Write the bucket's head manifest: create-only for None, else CAS.
+
+        This write, not the head's, bumps signals.yaml (see put_latest_link).
+        """
+        return self._upload_remote(
+            HEAD_MANIFEST_PATH,
+            data,
+            CREATE_ONLY if expected_etag is None else expected_etag,
+            notify=True,
+        )
+
+    def notify_head_moved(self) -> None:
+        """Bump signals.yaml for a head whose manifest entry could not be written."""
+        resp = self._send(self._http_post, "/signals/bump", headers=self._auth)
+        if resp.status_code != 200:
+            raise self._classify(resp, "signals.yaml")
+
 
 class PeerSmallSeaStore(_HubStore):
     """Read-only view of a teammate's chain, proxied by the Hub.
 
     The Hub authenticates the session, resolves the peer's cloud location, and
     returns the bytes, so the client never talks to cloud storage itself.
+
+    Validated reads of archived links and bundles ask the Hub for source="auto",
+    which may serve them from a teammate's Hub on the local network. Those
+    bytes are only a faster cache: when they fail validation the object is
+    read again from the cloud. Unvalidated reads always go to the cloud.
     """
 
+    validates_reads = True
+
     def __init__(
         self,
         session_hex: str,
@@ -516,16 +664,65 @@ class PeerSmallSeaStore(_HubStore):
         base_url: str = "http://localhost:11437",
         client=None,
         path_prefix: str = "",
+        lan: bool = True,
     ):
         super().__init__(session_hex, base_url, client=client, path_prefix=path_prefix)
         self.teammate_id_hex = teammate_id_hex
+        self.lan = lan
 
-    def _download_endpoint(self, cloud_path: str):
+    def _read_validated(self, cloud_path: str, accept: Callable):
+        """Read via the LAN when allowed; accept(data) raises on bad bytes."""
+        if self.lan:
+            data, _etag, body = self._download_with_body(
+                self._path_prefix + cloud_path, source="auto"
+            )
+            if body.get("source") != "lan":
+                return accept(data)
+            try:
+                return accept(data)
+            except Exception as exc:
+                logger.warning(f"LAN copy of {cloud_path} rejected, using the cloud: {exc}")
+        data, _etag = self._download(cloud_path)
+        return accept(data)
+
+    def get_link(self, link_uid: str, validate: Optional[Callable] = None) -> bytes:
+        if validate is None:
+            return super().get_link(link_uid)
+
+        def accept(data):
+            validate(data)
+            return data
+
+        return self._read_validated(link_path(link_uid), accept)
+
+    def download_bundle(self, bundle_uid: str, local_path, validate: Optional[Callable] = None):
+        if validate is None:
+            return super().download_bundle(bundle_uid, local_path)
+
+        def accept(data):
+            with open(local_path, "wb") as handle:
+                handle.write(data)
+            return validate(local_path)
+
+        return self._read_validated(bundle_path(bundle_uid), accept)
+
+    def _download_endpoint(self, remote_path: str):
         return "/peer_cloud_file", {
             "teammate_id": self.teammate_id_hex,
-            "path": self._path_prefix + cloud_path,
+            "path": remote_path,
         }
 
+    def _batch_read_request(self, remote_paths):
+        # Prefetch serves the validated reads, which ask for the LAN when
+        # this store may use it.
+        source = "auto" if self.lan else "cloud"
+        extra_params = {"source": "auto"} if self.lan else {}
+        return (
+            "/cloud_files/read",
+            {"paths": remote_paths, "teammate_id": self.teammate_id_hex, "source": source},
+            extra_params,
+        )
+
 
 class ExplicitProxyStore(_HubStore):
     """Read-only view of a chain at explicit cloud coordinates.
@@ -574,3 +771,322 @@ class BootstrapProxyStore(_HubStore):
 
     def _download_endpoint(self, cloud_path: str):
         return "/bootstrap/cloud_file", {"path": cloud_path}
+
+
+# ---------------------------------------------------------------------- #
+# Mirrors
+# ---------------------------------------------------------------------- #
+
+
+@dataclass
+class MirrorStats:
+    """What one source of a MirroredStore has done so far.
+
+    latency_seconds is an exponentially weighted average over successful
+    reads, None until the first one.
+    """
+
+    label: str
+    reads: int = 0
+    wins: int = 0
+    failures: int = 0
+    rejections: int = 0
+    writes: int = 0
+    write_failures: int = 0
+    latency_seconds: Optional[float] = None
+    last_latency_seconds: Optional[float] = None
+
+
+class MirroredStore:
+    """One chain published to a primary store and copied to mirrors.
+
+    Only the primary's head is authoritative: the head is read from and written
+    to the primary alone, so the serialization point and its compare-and-swap
+    are exactly the primary's. Bundles and archived links are write-once, so
+    they are written to the primary and then once to every mirror, and any
+    source that holds a copy may serve it.
+
+    Reads of write-once objects are hedged. The source with the best observed
+    latency is asked first, and each further source is asked after hedge_delay
+    seconds or as soon as an earlier one fails, whichever comes first. The
+    first copy that passes the caller's validation wins; a copy that fails it
+    is a rejection, not an answer, and the race continues. Absence is only
+    reported when every source confirmed it.
+
+    A mirror that fails a write is logged and skipped: it will answer reads
+    for that object with absence, which hedging treats like any other miss.
+    A failed primary write fails the publication exactly as it would without
+    mirrors.
+    """
+
+    #: Tells CodSync that reads accept a validate callback.
+    validates_reads = True
+
+    def __init__(
+        self,
+        primary,
+        mirrors: Sequence,
+        hedge_delay: float = 0.25,
+        labels: Optional[Sequence[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.primary = primary
+        self.mirrors = list(mirrors)
+        self.hedge_delay = hedge_delay
+        sources = [primary, *self.mirrors]
+        if labels is None:
+            labels = ["primary"] + [f"mirror-{n}" for n in range(1, len(sources))]
+        if len(labels) != len(sources):
+            raise ValueError("MirroredStore needs one label per store")
+        self._sources = list(zip(labels, sources))
+        self._stats = {label: MirrorStats(label=label) for label in labels}
+        self._stats_lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or max(2, 2 * len(sources)),
+            thread_name_prefix="cod-sync-mirror",
+        )
+
+    def close(self) -> None:
+        """Stop the read and copy workers; reads still running are awaited."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # -- stats -- #
+
+    def mirror_stats(self) -> dict:
+        """Return a snapshot of per-source counters, keyed by label."""
+        with self._stats_lock:
+            return {
+                label: MirrorStats(**vars(stats))
+                for label, stats in self._stats.items()
+            }
+
+    def _record(self, label: str, **changes) -> None:
+        with self._stats_lock:
+            stats = self._stats[label]
+            for name, delta in changes.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+
+    def _record_latency(self, label: str, seconds: float) -> None:
+        with self._stats_lock:
+            stats = self._stats[label]
+            stats.last_latency_seconds = seconds
+            if stats.latency_seconds is None:
+                stats.latency_seconds = seconds
+            else:
+                stats.latency_seconds = 0.7 * stats.latency_seconds + 0.3 * seconds
+
+    def _read_order(self) -> List[Tuple[str, object]]:
+        """Fastest observed source first; unmeasured sources keep their place."""
+        with self._stats_lock:
+            latency = {
+                label: stats.latency_seconds for label, stats in self._stats.items()
+            }
+
+        def key(indexed):
+            index, (label, _store) = indexed
+            seconds = latency[label]
+            return (seconds is None, seconds or 0.0, index)
+
+        return [source for _index, source in sorted(enumerate(self._sources), key=key)]
+
+    # -- hedged reads -- #
+
+    def _hedged(self, what: str, read: Callable, validate: Optional[Callable]):
+        """Run read(label, store) across sources until one validated result.
+
+        read returns (value, cleanup); cleanup discards a losing result's side
+        effects, such as a temporary file.
+        """
+        order = self._read_order()
+        pending = {}
+        failures: List[Tuple[str, Exception]] = []
+        next_index = 0
+
+        def attempt(label, store):
+            started = time.monotonic()
+            self._record(label, reads=1)
+            try:
+                value, cleanup = read(label, store)
+            except Exception:
+                self._record(label, failures=1)
+                raise
+            elapsed = time.monotonic() - started
+            self._record_latency(label, elapsed)
+            if validate is not None:
+                try:
+                    checked = validate(value)
+                except Exception:
+                    self._record(label, rejections=1)
+                    cleanup()
+                    raise
+                return value, checked, cleanup
+            return value, None, cleanup
+
+        def launch():
+            nonlocal next_index
+            label, store = order[next_index]
+            next_index += 1
+            pending[self._pool.submit(attempt, label, store)] = label
+
+        launch()
+        winner = None
+        while pending:
+            timeout = self.hedge_delay if next_index < len(order) else None
+            done, _ = concurrent.futures.wait(
+                pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                launch()
+                continue
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    failures.append((label, exc))
+                    continue
+                if winner is None:
+                    winner = (label, result)
+                else:
+                    result[2]()
+            if winner is not None:
+                break
+            if next_index < len(order):
+                launch()
+
+        if winner is None:
+            raise self._combined_failure(what, failures)
+
+        label, (value, checked, _cleanup) = winner
+        self._record(label, wins=1)
+        # Stragglers still running discard their own results.
+        for future in pending:
+            future.add_done_callback(self._discard_straggler)
+        return value, checked
+
+    @staticmethod
+    def _discard_straggler(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        _value, _checked, cleanup = future.result()
+        cleanup()
+
+    @staticmethod
+    def _combined_failure(what: str, failures: List[Tuple[str, Exception]]) -> Exception:
+        """Absence only when every source confirmed it, else the first other failure.
+
+        A rejected copy surfaces as the validator's own exception, so a chain
+        that every source serves wrongly fails exactly as it would unmirrored.
+        """
+        for label, exc in failures:
+            if not isinstance(exc, ObjectNotFoundError):
+                logger.debug("%s: no source succeeded; reporting %s's failure", what, label)
+                return exc
+        return failures[0][1]
+
+    # -- reads -- #
+
+    def get_latest_link(self) -> Tuple[bytes, Optional[str]]:
+        started = time.monotonic()
+        self._record(self._sources[0][0], reads=1)
+        try:
+            result = self.primary.get_latest_link()
+        except Exception:
+            self._record(self._sources[0][0], failures=1)
+            raise
+        self._record_latency(self._sources[0][0], time.monotonic() - started)
+        return result
+
+    def get_link(self, link_uid: str, validate: Optional[Callable] = None) -> bytes:
+        """Return an archived link from whichever source answers first.
+
+        validate receives the bytes and raises to reject a copy.
+        """
+        data, _checked = self._hedged(
+            link_path(link_uid),
+            lambda _label, store: (store.get_link(link_uid), lambda: None),
+            validate,
+        )
+        return data
+
+    def download_bundle(
+        self, bundle_uid: str, local_path, validate: Optional[Callable] = None
+    ):
+        """Write the first validated copy of a bundle to local_path.
+
+        Each source downloads to its own temporary file beside local_path, so
+        a rejected or losing copy never touches it. validate receives the
+        temporary path, raises to reject the copy, and its return value is
+        returned here.
+        """
+        local_path = pathlib.Path(local_path)
+
+        def read(label, store):
+            handle, temp_name = tempfile.mkstemp(
+                dir=local_path.parent, prefix=f".{local_path.name}.{label}-"
+            )
+            os.close(handle)
+
+            def cleanup():
+                try:
+                    os.unlink(temp_name)
+                except FileNotFoundError:
+                    pass
+
+            try:
+                store.download_bundle(bundle_uid, temp_name)
+            except Exception:
+                cleanup()
+                raise
+            return pathlib.Path(temp_name), cleanup
+
+        temp_path, checked = self._hedged(bundle_path(bundle_uid), read, validate)
+        os.replace(temp_path, local_path)
+        return checked
+
+    # -- writes -- #
+
+    def _copy_to_mirrors(self, what: str, write: Callable) -> None:
+        futures = {
+            self._pool.submit(write, store): label
+            for label, store in self._sources[1:]
+        }
+        for future, label in futures.items():
+            try:
+                future.result()
+            except CasConflictError:
+                # Write-once objects are named by fresh uids, so an existing
+                # copy is this same object from an earlier attempt.
+                self._record(label, writes=1)
+            except Exception as exc:
+                self._record(label, write_failures=1)
+                logger.warning("mirror %s: writing %s failed: %s", label, what, exc)
+            else:
+                self._record(label, writes=1)
+
+    def put_bundle(self, bundle_uid: str, local_path) -> None:
+        self.primary.put_bundle(bundle_uid, local_path)
+        self._record(self._sources[0][0], writes=1)
+        self._copy_to_mirrors(
+            bundle_path(bundle_uid), lambda store: store.put_bundle(bundle_uid, local_path)
+        )
+
+    def put_link(self, link_uid: str, data: bytes) -> None:
+        self.primary.put_link(link_uid, data)
+        self._record(self._sources[0][0], writes=1)
+        self._copy_to_mirrors(
+            link_path(link_uid), lambda store: store.put_link(link_uid, data)
+        )
+
+    def put_latest_link(
+        self, data: bytes, expected_etag: Optional[str], link_uid: Optional[str] = None
+    ) -> Optional[str]:
+        etag = self.primary.put_latest_link(data, expected_etag, link_uid=link_uid)
+        self._record(self._sources[0][0], writes=1)
+        return etag
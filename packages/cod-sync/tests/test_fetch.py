@@ -12,6 +12,7 @@ a bundle whose actual prerequisites disagree with its link.
 """
 
 import pathlib
+import time
 
 import pytest
 from cod_sync_test_helpers import (
@@ -484,3 +485,118 @@ def test_a_published_merge_round_trips(scratch_dir):
     assert result.observed_head == merged.observed_head
     bob.checkout_branch("main", result.observed_head)
     assert working_tree_files(bob) == working_tree_files(alice)
+
+
+# ------------------------------------------------------------------ mirrors #
+
+
+def mirrored_chain(scratch, length):
+    from cod_sync.store import MirroredStore
+
+    repo = make_repo(scratch / "alice", "alice")
+    primary_path, mirror_path = scratch / "primary", scratch / "mirror"
+    heads = []
+    with MirroredStore(
+        make_store(primary_path), [make_store(mirror_path)], hedge_delay=0.01
+    ) as store:
+        for index in range(length):
+            commit_file(repo, f"file{index}.txt", f"content {index}\n")
+            heads.append(make_cod_sync(repo, store).publish().observed_head)
+    return primary_path, mirror_path, heads
+
+
+def test_mirrors_receive_write_once_objects_but_not_the_head(scratch_dir):
+    scratch = pathlib.Path(scratch_dir)
+    primary, mirror, _heads = mirrored_chain(scratch, 2)
+
+    assert (primary / "latest-link.yaml").exists()
+    assert not (mirror / "latest-link.yaml").exists()
+    immutable = lambda path: sorted(
+        p.name for p in path.iterdir() if p.name[:2] in ("L-", "B-")
+    )
+    assert immutable(mirror) == immutable(primary)
+
+
+class SlowStore(LocalFolderStore):
+    def get_link(self, link_uid):
+        time.sleep(0.05)
+        return super().get_link(link_uid)
+
+    def download_bundle(self, bundle_uid, local_path):
+        time.sleep(0.05)
+        return super().download_bundle(bundle_uid, local_path)
+
+
+def test_a_fetch_survives_a_fast_mirror_serving_a_wrong_bundle(scratch_dir):
+    from cod_sync.store import MirroredStore
+
+    scratch = pathlib.Path(scratch_dir)
+    primary, mirror, heads = mirrored_chain(scratch, 2)
+    for bundle in mirror.glob("B-*.bundle"):
+        bundle.write_bytes(b"not a bundle")
+
+    bob = reader(scratch)
+    with MirroredStore(
+        SlowStore(str(primary)), [store_at(mirror)], hedge_delay=0.001
+    ) as store:
+        result = make_cod_sync(bob, store).fetch()
+
+    assert result.observed_head == heads[-1]
+    stats = store.mirror_stats()
+    assert stats["mirror-1"].rejections >= 1
+    assert stats["primary"].wins >= 1
+    assert stats["primary"].last_latency_seconds >= 0.05
+    assert_no_scratch(bob)
+
+
+class ServedBundlesStore(LocalFolderStore):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.served = []
+
+    def download_bundle(self, bundle_uid, local_path):
+        result = super().download_bundle(bundle_uid, local_path)
+        self.served.append(bundle_uid)
+        return result
+
+
+def test_a_fetch_uses_a_mirror_when_the_primary_lost_an_object(scratch_dir):
+    from cod_sync.store import MirroredStore
+
+    scratch = pathlib.Path(scratch_dir)
+    primary, mirror, heads = mirrored_chain(scratch, 3)
+    for bundle in primary.glob("B-*.bundle"):
+        bundle.unlink()
+
+    mirror_store = ServedBundlesStore(str(mirror))
+    with MirroredStore(store_at(primary), [mirror_store], hedge_delay=10) as store:
+        result = make_cod_sync(reader(scratch), store).fetch()
+    assert result.observed_head == heads[-1]
+    # Links may come from either source, depending on which reads faster.
+    assert len(mirror_store.served) == 3
+    assert store.mirror_stats()["mirror-1"].wins >= 3
+
+
+def test_absence_is_reported_only_when_every_source_confirms_it(scratch_dir):
+    from cod_sync.store import MirroredStore, ObjectNotFoundError
+
+    scratch = pathlib.Path(scratch_dir)
+    with MirroredStore(
+        make_store(scratch / "p"), [make_store(scratch / "m")], hedge_delay=0
+    ) as store:
+        with pytest.raises(ObjectNotFoundError):
+            store.get_link("0" * 16)
+        with pytest.raises(ObjectNotFoundError):
+            store.download_bundle("0" * 16, scratch / "out.bundle")
+    assert not (scratch / "out.bundle").exists()
+    assert list(scratch.glob(".out.bundle.*")) == []
+
+
+def test_a_closed_mirrored_store_stops_its_workers(scratch_dir):
+    from cod_sync.store import MirroredStore
+
+    scratch = pathlib.Path(scratch_dir)
+    store = MirroredStore(make_store(scratch / "p"), [make_store(scratch / "m")])
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.get_link("0" * 16)
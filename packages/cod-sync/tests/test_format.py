@@ -245,3 +245,97 @@ def test_sign_link_is_deterministic_over_canonical_bytes():
     key = b"\x11" * 32
     canonical = canonical_link_bytes(initial_link())
     assert sign_link(key, canonical) == sign_link(key, canonical)
+
+
+# ---------------------------------------------------------------------- #
+# Fast path
+# ---------------------------------------------------------------------- #
+
+
+def signed_fixture() -> Link:
+    signatures = {
+        "0" * 32: {"device_public_key": "1" * 64, "signature": "+/Ab" * 22},
+        "c" * 32: {"device_public_key": "d" * 64, "signature": "QUJD" * 21 + "QQ=="},
+    }
+    return incremental_link(
+        link_id="0b01010101010101",
+        bundle_id="1" * 16,
+        extensions={"signatures": signatures, "weather": {"sky": None, "sea": {}}},
+    )
+
+
+@pytest.mark.parametrize(
+    "link", [initial_link(), incremental_link(), signed_fixture()]
+)
+def test_encoding_is_byte_identical_to_pyyaml(link):
+    from cod_sync.format import _link_mapping
+
+    assert encode_link(link) == bytes_of(_link_mapping(link))
+
+
+def test_canonical_bytes_are_byte_identical_to_pyyaml():
+    link = signed_fixture()
+    expected = mapping_of(link)
+    del expected["extensions"]["signatures"]
+    assert canonical_link_bytes(link) == bytes_of(expected)
+
+
+def test_ids_that_read_as_numbers_stay_strings():
+    # All-digit and 0b-prefixed hex would load as ints if emitted plain.
+    link = signed_fixture()
+    assert b"'0b01010101010101'" in encode_link(link)
+    assert decode_link(encode_link(link)) == link
+
+
+def test_values_outside_the_fast_subset_still_round_trip():
+    link = initial_link(extensions={"n": 3, "note": "two words", "flag": True})
+    assert encode_link(link) == bytes_of(mapping_of(link))
+    assert decode_link(encode_link(link)).extensions["flag"] is True
+
+
+def test_fast_decoder_agrees_with_pyyaml_on_duplicate_keys():
+    data = encode_link(initial_link()) + f"link_id: '{LINK_B}'\n".encode()
+    assert decode_link(data).link_id == yaml.safe_load(data)["link_id"]
+
+
+def test_archived_decode_is_memoized_by_content():
+    from cod_sync.format import decode_archived_link
+
+    data = encode_link(incremental_link())
+    first = decode_archived_link(data)
+    assert decode_archived_link(bytes(data)) is first
+    other = decode_archived_link(encode_link(incremental_link(head="c" * 40)))
+    assert other.head == "c" * 40
+
+
+def test_archived_decode_still_rejects_bad_bytes():
+    from cod_sync.format import decode_archived_link
+
+    with pytest.raises(LinkFormatError):
+        decode_archived_link(b"- [a, b]\n")
+
+
+def test_head_manifest_round_trips_every_prefix():
+    from cod_sync.format import ChainHead, decode_head_manifest, encode_head_manifest
+
+    chains = {
+        "": ChainHead("0123456789abcdef", "a" * 40),
+        "registry/": ChainHead("1123456789abcdef", "b" * 40),
+        "niches/Tax Returns 2024/": ChainHead("2123456789abcdef", "c" * 64),
+    }
+    assert decode_head_manifest(encode_head_manifest(chains)) == chains
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [
+        b"not: [valid",
+        b"version: '2'\nchains: {}\n",
+        b"version: '1'\nchains:\n  registry/:\n    link_id: nope\n    head: x\n",
+    ],
+)
+def test_a_malformed_head_manifest_is_a_format_error(blob):
+    from cod_sync.format import decode_head_manifest
+
+    with pytest.raises(LinkFormatError):
+        decode_head_manifest(blob)
@@ -812,3 +812,149 @@ def test_a_covering_head_needs_no_etag(alice):
     assert result.disposition == "already_present"
     assert result.observed_head == first.observed_head
     assert scripted.head_writes == 0
+
+
+# --------------------------------------------------------- head manifest #
+
+
+class ManifestBucket:
+    """The bucket root several prefixed chains share, holding only the manifest."""
+
+    def __init__(self):
+        self.data = None
+        self.etag = None
+        self.writes = 0
+        self.conflicts = 0
+
+    def get(self):
+        if self.data is None:
+            raise ObjectNotFoundError("head-manifest.yaml")
+        return self.data, self.etag
+
+    def put(self, data, expected_etag):
+        if self.conflicts:
+            self.conflicts -= 1
+            raise CasConflictError("head-manifest.yaml")
+        if expected_etag != self.etag:
+            raise CasConflictError("head-manifest.yaml")
+        self.writes += 1
+        self.data, self.etag = data, f"m{self.writes}"
+        return self.etag
+
+
+class ManifestStore:
+    """A LocalFolderStore chain that records its head in a shared bucket."""
+
+    records_heads = True
+
+    def __init__(self, inner, bucket, path_prefix):
+        self.inner = inner
+        self.bucket = bucket
+        self.path_prefix = path_prefix
+        self.notifications = 0
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def get_head_manifest(self):
+        return self.bucket.get()
+
+    def put_head_manifest(self, data, expected_etag):
+        return self.bucket.put(data, expected_etag)
+
+    def notify_head_moved(self):
+        self.notifications += 1
+
+
+def test_publication_records_each_chain_in_one_manifest(scratch_dir):
+    from cod_sync.protocol import read_head_manifest
+
+    scratch = pathlib.Path(scratch_dir)
+    bucket = ManifestBucket()
+    heads = {}
+    for name in ("registry/", "niches/photos/"):
+        repo = make_repo(scratch / name.replace("/", "_"), "alice")
+        commit_file(repo, "README.md", name)
+        store = ManifestStore(make_store(scratch / f"store-{len(heads)}"), bucket, name)
+        result = make_cod_sync(repo, store).publish()
+        heads[name] = (result.observed_link_uid, result.observed_head)
+
+    manifest = read_head_manifest(ManifestStore(None, bucket, ""))
+    assert {p: (e.link_id, e.head) for p, e in manifest.items()} == heads
+
+
+def test_chains_sharing_a_manifest_lock_update_it_one_at_a_time(scratch_dir):
+    import threading
+
+    from cod_sync.protocol import read_head_manifest
+
+    class LockedBucket(ManifestBucket):
+        def get(self):
+            assert lock.locked()
+            return super().get()
+
+        def put(self, data, expected_etag):
+            assert lock.locked()
+            return super().put(data, expected_etag)
+
+    scratch = pathlib.Path(scratch_dir)
+    bucket, lock = LockedBucket(), threading.Lock()
+    publications = []
+    for name in ("registry/", "niches/photos/", "niches/docs/"):
+        repo = make_repo(scratch / name.replace("/", "_"), "alice")
+        commit_file(repo, "README.md", name)
+        store = ManifestStore(make_store(scratch / f"store-{len(publications)}"), bucket, name)
+        store.head_manifest_lock = lock
+        publications.append(make_cod_sync(repo, store).publish)
+    threads = [threading.Thread(target=publish) for publish in publications]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert bucket.writes == 3
+    with lock:
+        assert len(read_head_manifest(ManifestStore(None, bucket, ""))) == 3
+
+
+def test_an_unchanged_publication_heals_a_missing_manifest_entry(alice):
+    repo, store = alice
+    bucket = ManifestBucket()
+    first = make_cod_sync(repo, store).publish()  # no manifest support
+    assert bucket.data is None
+
+    result = make_cod_sync(repo, ManifestStore(store, bucket, "")).publish()
+    assert result.disposition == "already_present"
+    assert bucket.writes == 1
+    make_cod_sync(repo, ManifestStore(store, bucket, "")).publish()
+    assert bucket.writes == 1  # already current: no rewrite, no signal
+    assert first.observed_head in bucket.data.decode()
+
+
+def test_a_manifest_that_cannot_be_written_leaves_the_publication_alone(alice):
+    repo, store = alice
+    bucket = ManifestBucket()
+    bucket.conflicts = 100
+    manifest_store = ManifestStore(store, bucket, "")
+    result = make_cod_sync(repo, manifest_store).publish()
+    assert result.disposition == "published"
+    assert bucket.data is None
+    # The head moved without a manifest write, so teammates are told directly.
+    assert manifest_store.notifications == 1
+
+
+def test_a_recorded_manifest_entry_sends_no_extra_notification(alice):
+    repo, store = alice
+    manifest_store = ManifestStore(store, ManifestBucket(), "")
+    make_cod_sync(repo, manifest_store).publish()
+    assert manifest_store.notifications == 0
+
+
+def test_an_absent_or_unreadable_manifest_reads_as_none():
+    from cod_sync.protocol import read_head_manifest
+
+    bucket = ManifestBucket()
+    assert read_head_manifest(ManifestStore(None, bucket, "")) is None
+    bucket.data = b"version: '99'\n"
+    assert read_head_manifest(ManifestStore(None, bucket, "")) is None
+    assert read_head_manifest(object()) is None
@@ -2,6 +2,7 @@
 
 import io
 import pathlib
+import sqlite3
 import subprocess
 
 import pytest
@@ -228,6 +229,30 @@ def test_commit_paths_commits_unstaged_work_tree_change(scratch_dir):
     assert committed == "v2\n"
 
 
+def test_commit_paths_folds_a_sqlite_wal_into_the_committed_file(scratch_dir):
+    work, repo = _commit_paths_fixture(scratch_dir)
+    (work / "core.db").unlink()
+    writer = sqlite3.connect(str(work / "core.db"))
+    writer.execute("PRAGMA journal_mode = WAL")
+    writer.execute("CREATE TABLE item (name TEXT)")
+    writer.execute("INSERT INTO item VALUES ('only in the wal')")
+    writer.commit()
+    assert (work / "core.db-wal").stat().st_size > 0
+
+    sha = repo.commit_paths(["core.db"], "Update core")
+
+    committed = subprocess.run(
+        ["git", "-C", str(work), "show", f"{sha}:core.db"],
+        capture_output=True, check=True,
+    ).stdout
+    writer.close()
+    copy = pathlib.Path(scratch_dir) / "committed.db"
+    copy.write_bytes(committed)
+    with sqlite3.connect(str(copy)) as conn:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        assert conn.execute("SELECT name FROM item").fetchall() == [("only in the wal",)]
+
+
 def test_path_scoped_operations_reject_empty_paths(scratch_dir):
     work, repo = _commit_paths_fixture(scratch_dir)
 
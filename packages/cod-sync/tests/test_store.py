@@ -7,6 +7,7 @@ existed. And archived objects must be write-once, because a link's predecessor
 pointer is only meaningful if the bytes it names cannot change afterwards.
 """
 
+import base64
 import pathlib
 
 import pytest
@@ -17,6 +18,7 @@ from cod_sync.store import (
     LocalFolderStore,
     MalformedStoreResponseError,
     ObjectNotFoundError,
+    PeerSmallSeaStore,
     SmallSeaStore,
     StoreAuthenticationError,
     StoreAuthorizationError,
@@ -344,6 +346,131 @@ def test_path_prefix_namespaces_every_object():
     assert client.calls[0][2]["params"]["path"] == "files/registry/" + link_path("L1")
 
 
+def test_a_head_manifest_lives_outside_the_prefix_and_carries_the_signal():
+    client = FakeHubClient(FakeResponse(200, {"etag": "e1"}))
+    store = SmallSeaStore(
+        "session", client=client, path_prefix="niches/photos/", head_manifest=True
+    )
+    store.put_latest_link(b"head", expected_etag="e0")
+    store.put_head_manifest(b"manifest", expected_etag=None)
+
+    head_write, manifest_write = [call[2]["json"] for call in client.calls]
+    assert head_write["path"] == "niches/photos/" + LATEST_LINK_PATH
+    assert "notify" not in head_write
+    assert manifest_write["path"] == "head-manifest.yaml"
+    assert manifest_write["expected_etag"] == "*"
+    assert manifest_write["notify"] is True
+
+    store.notify_head_moved()
+    assert client.calls[-1][:2] == ("POST", "/signals/bump")
+
+
+class LanAwareHub(FakeHubClient):
+    """A Hub whose LAN copy of every object is wrong and whose cloud is right."""
+
+    def get(self, path, **kwargs):
+        source = kwargs["params"].get("source", "cloud")
+        self.calls.append(source)
+        data = b"lan bytes" if source == "auto" else b"cloud bytes"
+        served_by = "lan" if source == "auto" else "cloud"
+        return FakeResponse(
+            200, {"data": base64.b64encode(data).decode(), "source": served_by}
+        )
+
+
+def _only(expected):
+    def validate(data):
+        if not isinstance(data, bytes):
+            data = pathlib.Path(data).read_bytes()
+        if data != expected:
+            raise ValueError("mismatch")
+        return data
+
+    return validate
+
+
+def test_peer_reads_fall_back_to_the_cloud_when_lan_bytes_fail_validation(scratch_dir):
+    hub = LanAwareHub()
+    store = PeerSmallSeaStore("session", "ab" * 16, client=hub)
+
+    assert store.get_link("L1", validate=_only(b"cloud bytes")) == b"cloud bytes"
+    assert hub.calls == ["auto", "cloud"]
+
+    target = pathlib.Path(scratch_dir) / "bundle"
+    assert store.download_bundle("B1", target, validate=_only(b"cloud bytes")) == b"cloud bytes"
+    assert target.read_bytes() == b"cloud bytes"
+
+
+def test_peer_reads_keep_validated_lan_bytes():
+    hub = LanAwareHub()
+    store = PeerSmallSeaStore("session", "ab" * 16, client=hub)
+    assert store.get_link("L1", validate=_only(b"lan bytes")) == b"lan bytes"
+    assert hub.calls == ["auto"]
+
+
+def test_unvalidated_and_lan_disabled_peer_reads_use_the_cloud():
+    hub = LanAwareHub()
+    assert PeerSmallSeaStore("session", "ab" * 16, client=hub).get_link("L1") == b"cloud bytes"
+    store = PeerSmallSeaStore("session", "ab" * 16, client=hub, lan=False)
+    assert store.get_link("L1", validate=_only(b"cloud bytes")) == b"cloud bytes"
+    assert hub.calls == ["cloud", "cloud"]
+
+
+class BatchHub(FakeHubClient):
+    """A Hub answering batch reads; every single-object read is a 404."""
+
+    def __init__(self, results):
+        super().__init__(FakeResponse(404, {"detail": "not found"}))
+        self.results = results
+
+    def post(self, path, **kwargs):
+        self.calls.append(("POST", path, kwargs))
+        return FakeResponse(200, {"results": self.results})
+
+
+def _read_item(path, data, **extra):
+    return {"path": path, "status": 200, "data": base64.b64encode(data).decode(), **extra}
+
+
+def test_prefetched_reads_make_no_further_requests():
+    hub = BatchHub(
+        [
+            _read_item("p/" + link_path("L1"), b"link", etag="e1"),
+            {"path": "p/" + link_path("L2"), "status": 404, "error": "not_found"},
+        ]
+    )
+    store = SmallSeaStore("session", client=hub, path_prefix="p/")
+    store.prefetch([link_path("L1"), link_path("L2")])
+    assert hub.calls[0][2]["json"] == {"paths": ["p/" + link_path("L1"), "p/" + link_path("L2")]}
+
+    assert store.get_link("L1") == b"link"
+    with pytest.raises(ObjectNotFoundError):
+        store.get_link("L2")
+    assert len(hub.calls) == 1
+    # A prefetched result is used once; the next read asks the Hub.
+    with pytest.raises(ObjectNotFoundError):
+        store.get_link("L1")
+    assert len(hub.calls) == 2
+
+
+def test_a_failed_prefetch_leaves_reads_to_go_one_by_one():
+    hub = FakeHubClient(FakeResponse(404, {"detail": "Not Found"}))  # an older Hub
+    store = SmallSeaStore("session", client=hub)
+    store.prefetch([link_path("L1"), bundle_path("B1")])
+    with pytest.raises(ObjectNotFoundError):
+        store.get_link("L1")
+    assert [call[0] for call in hub.calls] == ["POST", "GET"]
+
+
+def test_peer_prefetch_serves_validated_lan_reads():
+    hub = BatchHub([_read_item(link_path("L1"), b"lan bytes", source="lan")])
+    store = PeerSmallSeaStore("session", "ab" * 16, client=hub)
+    store.prefetch([link_path("L1")])
+    assert hub.calls[0][2]["json"]["source"] == "auto"
+    assert store.get_link("L1", validate=_only(b"lan bytes")) == b"lan bytes"
+    assert len(hub.calls) == 1
+
+
 # ------------------------------------------- testing stores, same contract #
 
 
@@ -1,8 +1,20 @@
 import base64
-from typing import Optional
+import json
+import time
+from typing import Iterator, Optional
 
 import httpx
 
+#: Extra seconds a long-poll's HTTP request waits beyond the Hub-side timeout.
+_LONG_POLL_GRACE = 10
+
+#: Seconds a stream may go silent before the connection is treated as lost.
+#: The Hub sends a keepalive comment every 15 s.
+_STREAM_READ_TIMEOUT = 45
+
+#: Seconds to wait before reconnecting a dropped stream.
+_STREAM_RETRY = 2
+
 
 class SmallSeaError(Exception):
     """Unexpected error response from the Hub."""
@@ -87,6 +99,17 @@ def _check_response(resp: httpx.Response) -> None:
     raise SmallSeaError(f"HTTP {resp.status_code}: {detail}")
 
 
+def _item_error(item: dict) -> SmallSeaError:
+    """The exception a single-object call would have raised for a batch item."""
+    status = item.get("status")
+    detail = str(item.get("detail") or item.get("error") or "")
+    if status == 404:
+        return SmallSeaNotFound(detail)
+    if status == 409:
+        return SmallSeaConflict(detail)
+    return SmallSeaError(f"HTTP {status}: {detail}")
+
+
 class SmallSeaClient:
     """HTTP transport and session factory for the Small Sea Hub."""
 
@@ -227,15 +250,20 @@ class SmallSeaClient:
         json_data: dict,
         *,
         token: Optional[str] = None,
+        http_timeout: Optional[float] = None,
     ):
         headers = {}
         if token is not None:
             headers["Authorization"] = f"Bearer {token}"
+        # Long-polls pass an http_timeout beyond what they ask the Hub to wait.
+        extra = {} if http_timeout is None else {"timeout": http_timeout}
         try:
             if self._http_client is not None:
-                resp = self._http_client.post(path, json=json_data, headers=headers)
+                resp = self._http_client.post(path, json=json_data, headers=headers, **extra)
             else:
-                resp = httpx.post(f"{self._base_url}{path}", json=json_data, headers=headers)
+                resp = httpx.post(
+                    f"{self._base_url}{path}", json=json_data, headers=headers, **extra
+                )
         except httpx.ConnectError:
             raise SmallSeaHubUnavailable()
         _check_response(resp)
@@ -247,20 +275,63 @@ class SmallSeaClient:
         *,
         params: Optional[dict] = None,
         token: Optional[str] = None,
+        http_timeout: Optional[float] = None,
     ):
         headers = {}
         if token is not None:
             headers["Authorization"] = f"Bearer {token}"
+        extra = {} if http_timeout is None else {"timeout": http_timeout}
         try:
             if self._http_client is not None:
-                resp = self._http_client.get(path, params=params, headers=headers)
+                resp = self._http_client.get(path, params=params, headers=headers, **extra)
             else:
-                resp = httpx.get(f"{self._base_url}{path}", params=params, headers=headers)
+                resp = httpx.get(
+                    f"{self._base_url}{path}", params=params, headers=headers, **extra
+                )
         except httpx.ConnectError:
             raise SmallSeaHubUnavailable()
         _check_response(resp)
         return resp.json()
 
+    def _stream_events(
+        self,
+        path: str,
+        *,
+        params: Optional[dict] = None,
+        token: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Yield the JSON data of each server-sent event until the Hub ends the stream."""
+        headers = {}
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+        timeout = httpx.Timeout(10, read=_STREAM_READ_TIMEOUT)
+        try:
+            if self._http_client is not None:
+                stream = self._http_client.stream(
+                    "GET", path, params=params, headers=headers, timeout=timeout
+                )
+            else:
+                stream = httpx.stream(
+                    "GET",
+                    f"{self._base_url}{path}",
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            with stream as resp:
+                if resp.status_code >= 400:
+                    resp.read()
+                    _check_response(resp)
+                data = []
+                for line in resp.iter_lines():
+                    if line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        yield json.loads("\n".join(data))
+                        data = []
+        except httpx.ConnectError:
+            raise SmallSeaHubUnavailable()
+
 
 class SmallSeaSession:
     """An authenticated session with the Hub, scoped to one berth."""
@@ -269,6 +340,7 @@ class SmallSeaSession:
         self._client = client
         self._token = token
         self._last_notification_id: Optional[str] = None
+        self._notification_cursor: Optional[str] = None
 
     @property
     def token(self) -> str:
@@ -389,6 +461,71 @@ class SmallSeaSession:
         )
         return base64.b64decode(result["data"]), result["etag"]
 
+    def download_from_peer(
+        self, teammate_id: str, path: str, source: str = "cloud"
+    ) -> tuple[bytes, str]:
+        """Download a file from a teammate's storage. Returns (data, etag).
+
+        source="auto" lets an immutable object come from a teammate's Hub on
+        the LAN. Raises SmallSeaNotFound if the teammate has no such file.
+        """
+        result = self._client._get(
+            "/peer_cloud_file",
+            params={"teammate_id": teammate_id, "path": path, "source": source},
+            token=self._token,
+        )
+        return base64.b64decode(result["data"]), result["etag"]
+
+    def download_many(
+        self,
+        paths: list[str],
+        teammate_id: Optional[str] = None,
+        source: str = "cloud",
+    ) -> dict:
+        """Download several files in one Hub request.
+
+        Reads this session's own storage, or teammate_id's as
+        download_from_peer does. Returns {path: (data, etag)} for each file
+        read and {path: SmallSeaError} for each that failed, a missing file
+        being SmallSeaNotFound. Failures of the request as a whole raise.
+        """
+        body = {"paths": list(paths), "source": source}
+        if teammate_id is not None:
+            body["teammate_id"] = teammate_id
+        result = self._client._post("/cloud_files/read", body, token=self._token)
+        out = {}
+        for item in result["results"]:
+            if item["status"] == 200:
+                out[item["path"]] = (base64.b64decode(item["data"]), item.get("etag"))
+            else:
+                out[item["path"]] = _item_error(item)
+        return out
+
+    def upload_many(self, items: list[tuple], notify: bool = False) -> dict:
+        """Upload several files in one Hub request.
+
+        items are (path, data) or (path, data, expected_etag) tuples, each
+        with its own compare-and-swap condition. The writes are independent
+        and may land in any order. Returns {path: etag} for each write that
+        landed and {path: SmallSeaError} for each that did not, a lost CAS
+        being SmallSeaConflict.
+        """
+        body_items = []
+        for path, data, *rest in items:
+            entry = {"path": path, "data": base64.b64encode(data).decode()}
+            if rest and rest[0] is not None:
+                entry["expected_etag"] = rest[0]
+            body_items.append(entry)
+        result = self._client._post(
+            "/cloud_files/write",
+            {"items": body_items, "notify": notify},
+            token=self._token,
+        )
+        return {
+            item["path"]: item["etag"] if item["status"] == 200 else _item_error(item)
+            for item in result["results"]
+        }
+
     # ---- Sync notifications ----
 
     def watch_notifications(
@@ -409,7 +546,50 @@ class SmallSeaSession:
         payload = {"known": known, "timeout": timeout}
         if known_self_count is not None:
             payload["known_self_count"] = known_self_count
-        return self._client._post("/notifications/watch", payload, token=self._token)
+        return self._client._post(
+            "/notifications/watch",
+            payload,
+            token=self._token,
+            http_timeout=timeout + _LONG_POLL_GRACE,
+        )
+
+    def stream_notifications(
+        self,
+        cursor: Optional[str] = None,
+        reconnect: bool = True,
+        max_duration: Optional[float] = None,
+    ) -> Iterator[dict]:
+        """Iterate over sync count changes pushed by the Hub.
+
+        Each item is {"cursor": str, "snapshot": bool, "peers":
+        {teammate_id_hex: count}, "self_count": int (when it changed)}. The
+        first item of a new subscription is a snapshot of every count; later
+        items carry only the counts that grew. Pass the last cursor seen to
+        resume after a restart without missing changes.
+
+        The iterator blocks between changes on one open connection. With
+        reconnect, a dropped connection (or one ended by max_duration) is
+        reopened from the last cursor; without it, iteration ends there.
+        Errors from the Hub, such as an expired session, are always raised.
+        """
+        self._notification_cursor = cursor
+        params = {} if max_duration is None else {"max_duration": max_duration}
+        while True:
+            if self._notification_cursor is not None:
+                params["cursor"] = self._notification_cursor
+            try:
+                for event in self._client._stream_events(
+                    "/notifications/stream", params=params, token=self._token
+                ):
+                    self._notification_cursor = event["cursor"]
+                    yield event
+            except (SmallSeaHubUnavailable, httpx.TransportError):
+                if not reconnect:
+                    raise
+                time.sleep(_STREAM_RETRY)
+                continue
+            if not reconnect:
+                return
 
     # ---- ntfy Notifications ----
 
@@ -439,6 +619,7 @@ class SmallSeaSession:
             "/notifications",
             params={"since": effective_since, "timeout": str(timeout)},
             token=self._token,
+            http_timeout=timeout + _LONG_POLL_GRACE,
         )
         messages = result["messages"]
         if messages:
@@ -449,3 +630,8 @@ class SmallSeaSession:
     def last_notification_id(self) -> Optional[str]:
         """The ID of the last notification seen, for persisting the poll cursor."""
         return self._last_notification_id
+
+    @property
+    def notification_cursor(self) -> Optional[str]:
+        """The cursor of the last stream_notifications event, for resuming the stream."""
+        return self._notification_cursor
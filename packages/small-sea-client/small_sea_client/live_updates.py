@@ -0,0 +1,101 @@
+"""Server-sent UI events shared by the Small Sea app web UIs.
+
+A page opens one EventSource on `/events` (see REFRESH_SCRIPT). Each event's
+data is a name such as `peers:ProjectX`; elements whose `data-refresh-on`
+attribute matches get an htmx `refresh` and re-fetch themselves. What feeds
+the broker is up to each app.
+"""
+
+import asyncio
+import threading
+import time
+
+KEEPALIVE_SECONDS = 20.0
+MAX_PENDING_EVENTS = 256
+
+# A file modified this recently may change again within one mtime tick
+# without its stamp changing (git's "racy clean" problem), so an answer read
+# over it is returned but not cached.
+RACY_STAMP_NS = 2_000_000_000
+
+#: The page side of the event stream; web UIs render it at the end of <body>.
+REFRESH_SCRIPT = """\
+<script>
+    // One server-sent-events stream per page. An element with
+    // data-refresh-on="<event name>" gets an htmx "refresh" when that event
+    // arrives; the server only sends one when the fragment's inputs changed.
+    if (window.EventSource) {
+      new EventSource("/events").onmessage = function (event) {
+        document.querySelectorAll("[data-refresh-on]").forEach(function (elt) {
+          if (elt.dataset.refreshOn === event.data) htmx.trigger(elt, "refresh");
+        });
+      };
+    }
+  </script>"""
+
+
+def stamp_is_settled(mtime_ns: int) -> bool:
+    """True when a file last modified at mtime_ns can be cached by its stamp."""
+    return mtime_ns <= time.time_ns() - RACY_STAMP_NS
+
+
+class EventBroker:
+    """Fans named events out to every open `/events` stream.
+
+    publish may be called from any thread; each subscriber's queue lives on
+    the event loop that subscribed it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    def publish(self, name: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, name)
+            except RuntimeError:
+                # The subscriber's loop has closed; its stream is gone.
+                self.unsubscribe(queue)
+
+
+def _offer(queue: asyncio.Queue, name: str) -> None:
+    # Events are idempotent "re-fetch" hints, so a stalled reader that fills
+    # its queue loses nothing it will not already re-fetch.
+    try:
+        queue.put_nowait(name)
+    except asyncio.QueueFull:
+        pass
+
+
+async def event_stream(broker: EventBroker, request, keepalive: float = KEEPALIVE_SECONDS):
+    """Yield `text/event-stream` chunks for one page until it disconnects."""
+    queue = broker.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            try:
+                name = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {name}\n\n"
+    finally:
+        broker.unsubscribe(queue)
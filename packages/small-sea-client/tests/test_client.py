@@ -383,6 +383,63 @@ def test_download_sends_path_param(session):
     assert route.calls[0].request.url.params["path"] == "sub/dir/file.txt"
 
 
+# ---- Batches ----
+
+
+@respx.mock
+def test_download_many_returns_per_path_results(session):
+    import json
+
+    route = respx.post(f"{BASE_URL}/cloud_files/read").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "results": [
+                    {
+                        "path": "L-a.yaml",
+                        "status": 200,
+                        "data": base64.b64encode(b"link").decode(),
+                        "etag": "e1",
+                    },
+                    {"path": "L-b.yaml", "status": 404, "error": "not_found"},
+                    {"path": "L-c.yaml", "status": 502, "detail": "provider down"},
+                ]
+            },
+        )
+    )
+    results = session.download_many(
+        ["L-a.yaml", "L-b.yaml", "L-c.yaml"], teammate_id="cd" * 16
+    )
+    assert results["L-a.yaml"] == (b"link", "e1")
+    assert isinstance(results["L-b.yaml"], SmallSeaNotFound)
+    assert type(results["L-c.yaml"]) is SmallSeaError
+    body = json.loads(route.calls[0].request.content)
+    assert body["teammate_id"] == "cd" * 16
+
+
+@respx.mock
+def test_upload_many_sends_per_item_conditions(session):
+    import json
+
+    route = respx.post(f"{BASE_URL}/cloud_files/write").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "results": [
+                    {"path": "B-a.bundle", "status": 200, "etag": "e1"},
+                    {"path": "L-a.yaml", "status": 409, "error": "cas_conflict"},
+                ]
+            },
+        )
+    )
+    results = session.upload_many([("B-a.bundle", b"b"), ("L-a.yaml", b"l", "*")])
+    assert results["B-a.bundle"] == "e1"
+    assert isinstance(results["L-a.yaml"], SmallSeaConflict)
+    items = json.loads(route.calls[0].request.content)["items"]
+    assert "expected_etag" not in items[0]
+    assert items[1]["expected_etag"] == "*"
+
+
 # ---- Notifications ----
 
 
@@ -478,6 +535,58 @@ def test_poll_notifications_no_messages_leaves_cursor_unchanged(session):
     assert session.last_notification_id == "m5"
 
 
+def _sse(*events):
+    import json
+
+    body = ": keepalive\n\n"
+    for event in events:
+        body += f"id: {event['cursor']}\nevent: counts\ndata: {json.dumps(event)}\n\n"
+    return httpx.Response(
+        200, content=body.encode(), headers={"content-type": "text/event-stream"}
+    )
+
+
+@respx.mock
+def test_stream_notifications_yields_events_and_tracks_cursor(session):
+    route = respx.get(f"{BASE_URL}/notifications/stream").mock(
+        return_value=_sse(
+            {"cursor": "s.1", "snapshot": True, "peers": {"aa": 1}, "self_count": 0},
+            {"cursor": "s.2", "snapshot": False, "peers": {"aa": 2}},
+        )
+    )
+    events = list(session.stream_notifications(reconnect=False))
+
+    assert [e["peers"] for e in events] == [{"aa": 1}, {"aa": 2}]
+    assert session.notification_cursor == "s.2"
+    assert "cursor" not in route.calls[0].request.url.params
+
+
+@respx.mock
+def test_stream_notifications_resumes_from_the_last_cursor(session):
+    route = respx.get(f"{BASE_URL}/notifications/stream").mock(
+        side_effect=[
+            _sse({"cursor": "s.3", "snapshot": False, "peers": {"aa": 3}}),
+            _sse({"cursor": "s.4", "snapshot": False, "peers": {"bb": 1}}),
+        ]
+    )
+    stream = session.stream_notifications(cursor="s.2", max_duration=60)
+    assert next(stream)["cursor"] == "s.3"
+    assert next(stream)["cursor"] == "s.4"
+
+    first, second = (call.request.url.params for call in route.calls)
+    assert (first["cursor"], second["cursor"]) == ("s.2", "s.3")
+    assert second["max_duration"] == "60"
+
+
+@respx.mock
+def test_stream_notifications_raises_hub_errors(session):
+    respx.get(f"{BASE_URL}/notifications/stream").mock(
+        return_value=httpx.Response(404, json={"detail": "Session not found"})
+    )
+    with pytest.raises(SmallSeaNotFound):
+        next(session.stream_notifications())
+
+
 # ---- App-bootstrap sighting cleanup ----
 
 
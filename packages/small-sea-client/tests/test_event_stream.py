@@ -0,0 +1,29 @@
+"""The shared server-sent UI event stream."""
+
+import asyncio
+
+from small_sea_client import live_updates
+
+
+def test_event_stream_delivers_published_names_until_disconnect():
+    class _Request:
+        def __init__(self):
+            self.polls = 0
+
+        async def is_disconnected(self):
+            self.polls += 1
+            return self.polls > 1
+
+    async def run():
+        broker = live_updates.EventBroker()
+        stream = live_updates.event_stream(broker, _Request(), keepalive=5)
+        chunks = [await stream.__anext__()]
+        assert broker.subscriber_count == 1
+        broker.publish("sync-status:ProjectX")
+        chunks.append(await stream.__anext__())
+        chunks += [chunk async for chunk in stream]
+        return broker, chunks
+
+    broker, chunks = asyncio.run(run())
+    assert chunks == ["retry: 3000\n\n", "data: sync-status:ProjectX\n\n"]
+    assert broker.subscriber_count == 0
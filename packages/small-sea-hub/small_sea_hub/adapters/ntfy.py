@@ -45,15 +45,19 @@ class SmallSeaNtfyAdapter:
                 messages.append(msg)
         return messages
 
-    async def subscribe(self):
+    async def subscribe(self, since=None):
         """Async generator: yield message dicts from the ntfy SSE stream.
 
         Connects to {base_url}/{topic}/sse and yields each ntfy message event.
-        The caller is responsible for reconnect logic.
+        The topic may be several comma-separated topics; each message's
+        "topic" says which one it arrived on. since (a message id or Unix
+        time) first replays messages published after it. The caller is
+        responsible for reconnect logic.
         """
         url = f"{self.base_url}/{self.topic}/sse"
+        params = {} if since is None else {"since": str(since)}
         async with httpx.AsyncClient(timeout=httpx.Timeout(None)) as client:
-            async with client.stream("GET", url) as resp:
+            async with client.stream("GET", url, params=params) as resp:
                 resp.raise_for_status()
                 async for line in resp.aiter_lines():
                     if not line.startswith("data:"):
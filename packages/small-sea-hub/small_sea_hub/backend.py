@@ -6,13 +6,12 @@ import pathlib
 import secrets
 import sqlite3
 import sys
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from logging.handlers import RotatingFileHandler
 from typing import Optional, Tuple
 
-import yaml
-
 import plyer
 from sqlalchemy import (Column, DateTime, Integer, LargeBinary, String,
                         create_engine, text)
@@ -43,8 +42,16 @@ from small_sea_hub.cloud_errors import (
 from small_sea_hub.crypto import (commit_encrypted_upload,
                                   decrypt_group_payload,
                                   prepare_encrypted_upload)
-from small_sea_note_to_self.db import attached_note_to_self_connection
+from small_sea_hub.lan import is_immutable_object_path
+from small_sea_hub.object_cache import DEFAULT_MAX_BYTES as OBJECT_CACHE_MAX_BYTES
+from small_sea_hub.object_cache import ObjectCache
+from small_sea_hub.signal_coalescer import DEFAULT_WINDOW as SIGNAL_COALESCE_WINDOW
+from small_sea_hub.signal_coalescer import SignalCoalescer
+from small_sea_hub.signals import decode_signals, encode_signals
+from small_sea_hub.singleflight import SingleFlight
+from small_sea_note_to_self.db import pooled_note_to_self_connection
 from small_sea_note_to_self.ids import uuid7
+from small_sea_sqlite import sqlite_policy
 from wrasse_trust.keys import key_id_from_public
 from wrasse_trust.transport import (
     TeammateBerthStorageAnnouncement,
@@ -260,7 +267,9 @@ class SmallSeaBackend:
     def __init__(self, root_dir, auto_approve_sessions: bool = False,
                  sandbox_mode: bool = False, log_level: str = "INFO",
                  sighting_stale_window: Optional[timedelta] = None,
-                 now_fn=None):
+                 now_fn=None,
+                 object_cache_max_bytes: int = OBJECT_CACHE_MAX_BYTES,
+                 signal_coalesce_window: float = SIGNAL_COALESCE_WINDOW):
         self.root_dir = pathlib.Path(root_dir)
         self.auto_approve_sessions = auto_approve_sessions
         self.sandbox_mode = sandbox_mode
@@ -274,22 +283,54 @@ class SmallSeaBackend:
         )
         os.makedirs(self.root_dir, exist_ok=True)
         self.path_local_db = self.root_dir / "small_sea_collective_local.db"
+        self._engine_local = None
+        self._engine_local_lock = threading.Lock()
+        # Sender-key state per (participant, team) is read, advanced and saved
+        # by each encrypt and decrypt; endpoints now run those concurrently.
+        self._crypto_locks: dict = {}
+        self._crypto_locks_lock = threading.Lock()
+        # Concurrent identical provider reads share one round trip, and
+        # immutable objects are read from the provider once.
+        self._reads = SingleFlight()
+        self.object_cache = (
+            ObjectCache(self.root_dir / "ObjectCache", max_bytes=object_cache_max_bytes)
+            if object_cache_max_bytes > 0
+            else None
+        )
         os.makedirs(self.root_dir / "Logging", exist_ok=True)
         log_path = self.root_dir / "Logging" / "small_sea_hub.log"
         console_level = getattr(logging, log_level.upper(), logging.INFO)
         self.logger = setup_logging(log_file=log_path, console_level=console_level)
+        # Bumps of one berth's signals.yaml that land together share a write.
+        self._signals = SignalCoalescer(
+            self._write_signal_bump, window=signal_coalesce_window, logger=self.logger
+        )
+        # A small_sea_hub.lan.LanService when LAN exchange is enabled.
+        self.lan = None
         self._initialize_small_sea_db()
 
     def _now(self) -> datetime:
         return self._now_fn()
 
+    def _local_engine(self):
+        # Endpoints run backend calls on worker threads; build one engine.
+        with self._engine_local_lock:
+            if self._engine_local is None:
+                self._engine_local = create_engine(
+                    f"sqlite:///{self.path_local_db}",
+                    connect_args=sqlite_policy.engine_connect_args(),
+                )
+        return self._engine_local
+
     def _initialize_small_sea_db(self):
         try:
             conn = None
-            conn = sqlite3.connect(self.path_local_db)
+            conn = sqlite_policy.connect(self.path_local_db)
             cursor = conn.cursor()
             self._initialize_small_sea_schema(cursor)
             conn.commit()
+            # Hub-private and never git-tracked; see sqlite_policy.
+            sqlite_policy.use_wal(conn)
 
         except sqlite3.Error as e:
             print(f"SQLite error occurred: '{e}'")
@@ -429,11 +470,17 @@ class SmallSeaBackend:
             # Direct match by participant directory name (hex ID).
             if d.name == nickname:
                 note_to_self_db_path = d / "NoteToSelf" / "Sync" / "core.db"
-                engine = create_engine(f"sqlite:///{note_to_self_db_path}")
+                engine = create_engine(
+                    f"sqlite:///{note_to_self_db_path}",
+                    connect_args=sqlite_policy.engine_connect_args(),
+                )
                 matching.append((d, engine))
                 continue
             note_to_self_db_path = d / "NoteToSelf" / "Sync" / "core.db"
-            engine = create_engine(f"sqlite:///{note_to_self_db_path}")
+            engine = create_engine(
+                f"sqlite:///{note_to_self_db_path}",
+                connect_args=sqlite_policy.engine_connect_args(),
+            )
             with Session(engine) as sess:
                 results = sess.query(Nickname).filter(Nickname.name == nickname).all()
                 if results:
@@ -453,7 +500,7 @@ class SmallSeaBackend:
         schema (team_app_berth intentionally omits team_id).
         """
         note_to_self_db = str(participant_dir / "NoteToSelf" / "Sync" / "core.db")
-        conn = sqlite3.connect(note_to_self_db)
+        conn = sqlite_policy.connect(note_to_self_db)
         try:
             row = conn.execute(
                 "SELECT id FROM team WHERE name = ?", (team_name,)
@@ -521,7 +568,7 @@ class SmallSeaBackend:
 
     @staticmethod
     def _app_rows_for_name(db_path, app_name):
-        conn = sqlite3.connect(db_path)
+        conn = sqlite_policy.connect(db_path)
         try:
             rows = conn.execute(
                 "SELECT id FROM app WHERE name = ?",
@@ -533,7 +580,7 @@ class SmallSeaBackend:
 
     @staticmethod
     def _single_berth_id_for_app(db_path, app_id, app_name, team_name, team_id=None):
-        conn = sqlite3.connect(db_path)
+        conn = sqlite_policy.connect(db_path)
         try:
             if team_id is None:
                 rows = conn.execute(
@@ -558,11 +605,12 @@ class SmallSeaBackend:
             )
         return rows[0][0]
 
+    @sqlite_policy.retry_on_lock
     def record_unknown_app_sighting(
         self, participant_hex, app_name, team_name, client_name, reason
     ):
         now = _format_sighting_timestamp(self._now())
-        conn = sqlite3.connect(self.path_local_db)
+        conn = sqlite_policy.connect(self.path_local_db)
         try:
             conn.execute(
                 """
@@ -598,7 +646,7 @@ class SmallSeaBackend:
             conn.close()
 
     def list_unknown_app_sightings(self, participant_hex=None):
-        conn = sqlite3.connect(self.path_local_db)
+        conn = sqlite_policy.connect(self.path_local_db)
         conn.row_factory = sqlite3.Row
         try:
             where_clause = ""
@@ -627,6 +675,7 @@ class SmallSeaBackend:
             conn.close()
         return [dict(row) for row in rows]
 
+    @sqlite_policy.retry_on_lock
     def delete_unknown_app_sighting(
         self,
         participant_hex,
@@ -642,7 +691,7 @@ class SmallSeaBackend:
         returns 0 rather than raising. Empty strings are literal values; there
         is no wildcard delete.
         """
-        conn = sqlite3.connect(self.path_local_db)
+        conn = sqlite_policy.connect(self.path_local_db)
         try:
             cursor = conn.execute(
                 """
@@ -664,6 +713,7 @@ class SmallSeaBackend:
         finally:
             conn.close()
 
+    @sqlite_policy.retry_on_lock
     def prune_stale_unknown_app_sightings(self, participant_hex) -> int:
         """Delete the participant's sightings whose last_seen_at is strictly
         older than (now - sighting_stale_window).
@@ -674,7 +724,7 @@ class SmallSeaBackend:
         cutoff = _format_sighting_timestamp(
             self._now() - self._sighting_stale_window
         )
-        conn = sqlite3.connect(self.path_local_db)
+        conn = sqlite_policy.connect(self.path_local_db)
         try:
             cursor = conn.execute(
                 """
@@ -731,7 +781,7 @@ class SmallSeaBackend:
         expires_at = now + timedelta(minutes=5)
         pending_id = uuid7()
 
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             pending = PendingSession(
                 id=pending_id,
@@ -756,7 +806,7 @@ class SmallSeaBackend:
         Raises SmallSeaBackendExn on invalid or expired PIN.
         """
         pending_id = bytes.fromhex(pending_id_hex)
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
 
         with Session(engine_local) as sess:
             pending = (
@@ -860,7 +910,7 @@ class SmallSeaBackend:
         has already expired.
         """
         pending_id = bytes.fromhex(pending_id_hex)
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             pending = (
                 sess.query(PendingSession)
@@ -890,7 +940,7 @@ class SmallSeaBackend:
         Team and app names are also excluded: they are private to participants
         and must not be readable by any process that can reach localhost.
         """
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             rows = sess.query(PendingSession).all()
             return [
@@ -906,7 +956,7 @@ class SmallSeaBackend:
 
     def count_active_sessions(self) -> int:
         """Return the number of currently active (confirmed) sessions."""
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             return sess.query(SmallSeaSession).count()
 
@@ -915,7 +965,7 @@ class SmallSeaBackend:
 
         Only for sandbox use. Do not expose in production — pins are secrets.
         """
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             rows = sess.query(PendingSession).all()
             return [
@@ -947,7 +997,7 @@ class SmallSeaBackend:
 
     def _lookup_session(self, session_hex):
         session_token = bytes.fromhex(session_hex)
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as session:
             ss_session = (
                 session.query(SmallSeaSession)
@@ -985,7 +1035,7 @@ class SmallSeaBackend:
                 raise SmallSeaBackendExn("Bootstrap session expiry must be in the future")
 
         token = secrets.token_bytes(32)
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as sess:
             sess.add(
                 BootstrapSession(
@@ -1003,7 +1053,7 @@ class SmallSeaBackend:
 
     def _lookup_bootstrap_session(self, token_hex: str) -> BootstrapSession:
         session_token = bytes.fromhex(token_hex)
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as session:
             bootstrap = (
                 session.query(BootstrapSession)
@@ -1025,7 +1075,7 @@ class SmallSeaBackend:
 
     def all_session_tokens(self) -> list[str]:
         """Return hex tokens for all confirmed sessions."""
-        engine_local = create_engine(f"sqlite:///{self.path_local_db}")
+        engine_local = self._local_engine()
         with Session(engine_local) as session:
             rows = session.query(SmallSeaSession.token).all()
         return [row.token.hex() for row in rows]
@@ -1072,7 +1122,7 @@ class SmallSeaBackend:
         ss_session = self._lookup_session(session_hex)
 
         # TODO: Should we check permissions? Probably.
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as conn:
             cloud_id = uuid7()
@@ -1105,7 +1155,7 @@ class SmallSeaBackend:
 
     def _get_cloud_link(self, ss_session: SmallSeaSession):
         # TODO: Should we check permissions? Probably.
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as conn:
             row = conn.execute(
@@ -1136,7 +1186,7 @@ class SmallSeaBackend:
         return CloudStorageRecord(*row)
 
     def _resolve_berth_cloud_or_raise(self, ss_session: SmallSeaSession):
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as conn:
             row = conn.execute(
@@ -1233,6 +1283,7 @@ class SmallSeaBackend:
         self._handle_materialization_outcome(ss_session, cloud, adapter, outcome)
         return MaterializationOutcome(outcome.status, outcome.final_location or cloud.location)
 
+    @sqlite_policy.retry_on_lock
     def _writeback_locator(
         self,
         participant_hex: str,
@@ -1240,7 +1291,7 @@ class SmallSeaBackend:
         expected_location: str,
         new_location: str,
     ) -> bool:
-        with attached_note_to_self_connection(self.root_dir, participant_hex) as conn:
+        with pooled_note_to_self_connection(self.root_dir, participant_hex) as conn:
             cur = conn.execute(
                 """
                 UPDATE berth_cloud_allocation
@@ -1268,7 +1319,7 @@ class SmallSeaBackend:
         else:
             raise SmallSeaBackendExn(f"No token refresh for protocol: {cloud.protocol}")
 
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as conn:
             cloud_storage_id = getattr(cloud, "id", None) or cloud.cloud_storage_id
@@ -1317,14 +1368,115 @@ class SmallSeaBackend:
     def ensure_cloud_ready(self, session_hex):
         return self.materialize_for_session(session_hex)
 
+    def transfer_route(self, session_hex):
+        """(berth hex, own cloud protocol) for scheduling a session's transfers.
+
+        The protocol is None when the berth has no cloud location yet; the
+        transfer itself reports that properly.
+        """
+        ss_session = self._lookup_session(session_hex)
+        with pooled_note_to_self_connection(
+            self.root_dir, ss_session.participant_id.hex()
+        ) as conn:
+            row = conn.execute(
+                """
+                SELECT cs.protocol
+                FROM berth_cloud_allocation bca
+                JOIN cloud_storage cs ON cs.id = bca.cloud_storage_id
+                WHERE bca.berth_id = ?
+                """,
+                (ss_session.berth_id,),
+            ).fetchone()
+        return ss_session.berth_id.hex(), (row[0] if row else None)
+
     def download_from_peer(self, session_hex, teammate_id_hex, path):
         """Download a file from a peer's public cloud bucket via the Hub proxy."""
-        ss_session = self._lookup_session(session_hex)
-        ok, data, etag = self._download_peer_file(session_hex, teammate_id_hex, path)
-        if ok and ss_session.mode == "encrypted":
-            data = decrypt_group_payload(ss_session, data)
+        ok, data, etag, _served_by = self.download_from_peer_via(
+            session_hex, teammate_id_hex, path
+        )
         return ok, data, etag
 
+    def download_from_peer_via(self, session_hex, teammate_id_hex, path, source="cloud"):
+        """download_from_peer, also reporting which source served the bytes.
+
+        With source="auto", an immutable object is read from a LAN Hub serving
+        the teammate when one has it, and from the cloud otherwise. Returns
+        (ok, data, etag, served_by) where served_by is "lan" or "cloud". LAN
+        bytes are unverified: only callers that check them afterwards, and
+        re-read with source="cloud" on a mismatch, should ask for "auto".
+        """
+        return self.peer_reader(session_hex, teammate_id_hex, source=source)(path)
+
+    def peer_reader(self, session_hex, teammate_id_hex, source="cloud"):
+        """A function path -> download_from_peer_via(...) for one teammate.
+
+        The session and the teammate's storage are resolved once, so a batch
+        of reads pays for them once. A teammate with no known storage still
+        has its LAN copies read; only a cloud read raises SmallSeaNotFoundExn.
+        """
+        ss_session = self._lookup_session(session_hex)
+        try:
+            route = self._peer_route(ss_session, teammate_id_hex)
+            route_error = None
+        except SmallSeaNotFoundExn as exc:
+            route, route_error = None, exc
+
+        def read(path):
+            if source == "auto" and self.lan is not None and is_immutable_object_path(path):
+                data = self._download_peer_file_from_lan(ss_session, teammate_id_hex, path)
+                if data is not None:
+                    try:
+                        if ss_session.mode == "encrypted":
+                            data = self._decrypt(ss_session, data)
+                        return True, data, None, "lan"
+                    except Exception as exc:
+                        self.logger.warning(
+                            f"LAN copy of {path} from {teammate_id_hex[:8]} unreadable, "
+                            f"using the cloud: {exc}"
+                        )
+            if route_error is not None:
+                raise route_error
+            ok, data, etag = self._read_peer(ss_session, route, path)
+            if ok and ss_session.mode == "encrypted":
+                data = self._decrypt(ss_session, data)
+            return ok, data, etag, "cloud"
+
+        return read
+
+    def _download_peer_file_from_lan(self, ss_session, teammate_id_hex, path):
+        try:
+            return self.lan.fetch(
+                ss_session.berth_id.hex(),
+                ss_session.participant_id.hex(),
+                ss_session.team_name,
+                teammate_id_hex,
+                path,
+            )
+        except Exception as exc:
+            self.logger.warning(f"LAN read of {path} failed, using the cloud: {exc}")
+            return None
+
+    def _offer_to_lan(self, ss_session, path, data):
+        """Spool a just-uploaded immutable object for LAN teammates.
+
+        Best effort: the upload already succeeded, and the cloud copy is
+        what teammates fall back to.
+        """
+        try:
+            teammate_id = self._self_teammate_id_for_session(ss_session)
+            if teammate_id is None:
+                return
+            self.lan.publish(
+                ss_session.berth_id.hex(),
+                ss_session.participant_id.hex(),
+                ss_session.team_name,
+                teammate_id.hex(),
+                path,
+                data,
+            )
+        except Exception as exc:
+            self.logger.warning(f"LAN spool of {path} failed: {exc}")
+
     def list_peers(self, session_hex):
         """Return peer details visible to the current team session.
 
@@ -1336,7 +1488,7 @@ class SmallSeaBackend:
         if ss_session.team_name == "NoteToSelf":
             return []
 
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as nts_conn:
             self_row = nts_conn.execute(
@@ -1346,7 +1498,7 @@ class SmallSeaBackend:
         self_in_team = self_row[0] if self_row is not None else None
 
         team_db_path = str(ss_session.participant_path / ss_session.team_name / "Sync" / "core.db")
-        conn = sqlite3.connect(team_db_path)
+        conn = sqlite_policy.connect(team_db_path)
         try:
             rows = conn.execute(
                 "SELECT id, display_name FROM teammate WHERE id != ? ORDER BY id",
@@ -1378,50 +1530,166 @@ class SmallSeaBackend:
             )
         return result
 
+    # ---- Shared reads ----
+
+    @staticmethod
+    def _own_location(ss_session, cloud):
+        return (cloud.protocol, cloud.url, cloud.location, ss_session.participant_id.hex())
+
+    @staticmethod
+    def _read_location(ss_session, protocol, url, bucket):
+        """Where a read goes, and whose credentials it uses.
+
+        S3 reads of another bucket are anonymous, so any session may share
+        them; other providers read with the participant's own token.
+        """
+        principal = None if protocol == "s3" else ss_session.participant_id.hex()
+        return (protocol, url, bucket, principal)
+
+    def _coalesced_read(self, ss_session, location, path, fetch):
+        """fetch() -> (ok, data, etag), shared with concurrent identical reads.
+
+        The key carries the session mode, so encrypted and passthrough
+        sessions never share a read; either way the bytes shared are the
+        provider's, and each caller decrypts for itself. Immutable objects
+        come from the object cache when it has them.
+        """
+        cache = self.object_cache
+        if cache is not None and cache.cacheable(path):
+            hit = cache.get(location, path)
+            if hit is not None:
+                data, etag = hit
+                return True, data, etag
+            fetch = self._caching_fetch(location, path, fetch)
+        return self._reads.do((location, path, ss_session.mode), fetch)
+
+    def _caching_fetch(self, location, path, fetch):
+        def fetch_and_keep():
+            result = fetch()
+            ok, data, etag = result
+            if ok:
+                self._cache_object(location, path, data, etag)
+            return result
+
+        return fetch_and_keep
+
+    def _cache_object(self, location, path, data, etag):
+        """Best effort: a cache that cannot write only costs a later fetch."""
+        try:
+            self.object_cache.put(location, path, data, etag)
+        except OSError as exc:
+            self.logger.warning(f"object cache write for {path} failed: {exc}")
+
+    def _forget_reads(self, location, path):
+        """After a write, make later reads of the object fetch it afresh."""
+        self._reads.forget(
+            lambda key: key[0][:3] == location[:3] and key[1] == path
+        )
+
+    def _download_own(self, ss_session, cloud, path):
+        """Raw (ok, data, etag) for path in the session's own berth storage."""
+
+        def fetch():
+            adapter = self._make_materialized_storage_adapter(ss_session, cloud)
+            return adapter.download(path)
+
+        location = self._own_location(ss_session, cloud)
+        return self._coalesced_read(ss_session, location, path, fetch)
+
     def upload_to_cloud(self, session_hex, path, data, expected_etag=None):
+        return self.cloud_writer(session_hex)(path, data, expected_etag)
+
+    def cloud_writer(self, session_hex):
+        """A function (path, data, expected_etag) -> upload_to_cloud(...) result.
+
+        Session, cloud location and storage announcement are resolved, and the
+        adapter built, once for all the writes made through it.
+        """
         ss_session = self._lookup_session(session_hex)
         cloud = self._resolve_berth_cloud_or_raise(ss_session)
         self._require_own_storage_announcement(ss_session, cloud)
         adapter = self._make_materialized_storage_adapter(ss_session, cloud)
-        if ss_session.mode == "encrypted":
-            next_sender_key, data = prepare_encrypted_upload(ss_session, data)
-        else:
-            next_sender_key = None
-        if expected_etag is not None:
-            result = adapter.upload_if_match(path, data, expected_etag)
-        else:
-            result = adapter.upload_overwrite(path, data)
-        if result[0] and next_sender_key is not None:
-            commit_encrypted_upload(ss_session, next_sender_key)
-        return result
+        location = self._own_location(ss_session, cloud)
+
+        def upload(path, data, expected_etag):
+            if expected_etag is not None:
+                return adapter.upload_if_match(path, data, expected_etag)
+            return adapter.upload_overwrite(path, data)
+
+        def write(path, data, expected_etag=None):
+            if ss_session.mode == "encrypted":
+                # The sender key advances only when the upload lands, so
+                # the whole encrypt-upload-commit runs under the team lock.
+                with self._crypto_lock(ss_session):
+                    next_sender_key, data = prepare_encrypted_upload(ss_session, data)
+                    result = upload(path, data, expected_etag)
+                    if result[0]:
+                        commit_encrypted_upload(ss_session, next_sender_key)
+            else:
+                result = upload(path, data, expected_etag)
+            if result[0]:
+                self._forget_reads(location, path)
+                if self.object_cache is not None:
+                    self._cache_object(location, path, data, result[1])
+            if result[0] and self.lan is not None and is_immutable_object_path(path):
+                self._offer_to_lan(ss_session, path, data)
+            return result
+
+        return write
 
     def download_from_cloud(self, session_hex, path):
+        return self.cloud_reader(session_hex)(path)
+
+    def cloud_reader(self, session_hex):
+        """A function path -> download_from_cloud(...) result.
+
+        Session, cloud location and storage announcement are resolved once
+        for all the reads made through it.
+        """
         ss_session = self._lookup_session(session_hex)
         cloud = self._resolve_berth_cloud_or_raise(ss_session)
         self._require_own_storage_announcement(ss_session, cloud)
-        adapter = self._make_materialized_storage_adapter(ss_session, cloud)
-        ok, data, etag = adapter.download(path)
-        if ok and ss_session.mode == "encrypted":
-            data = decrypt_group_payload(ss_session, data)
-        return ok, data, etag
+
+        def read(path):
+            ok, data, etag = self._download_own(ss_session, cloud, path)
+            if ok and ss_session.mode == "encrypted":
+                data = self._decrypt(ss_session, data)
+            return ok, data, etag
+
+        return read
+
+    def _crypto_lock(self, ss_session) -> threading.Lock:
+        key = (ss_session.participant_id, ss_session.team_id)
+        with self._crypto_locks_lock:
+            lock = self._crypto_locks.get(key)
+            if lock is None:
+                lock = self._crypto_locks[key] = threading.Lock()
+        return lock
+
+    def _decrypt(self, ss_session, payload):
+        with self._crypto_lock(ss_session):
+            return decrypt_group_payload(ss_session, payload)
 
     def upload_runtime_artifact(self, session_hex, path, data, expected_etag=None):
         """Upload a runtime-control artifact without group-layer encryption."""
         ss_session = self._lookup_session(session_hex)
-        adapter = self._make_storage_adapter(ss_session)
+        cloud = self._resolve_berth_cloud_or_raise(ss_session)
+        adapter = self._make_materialized_storage_adapter(ss_session, cloud)
         if expected_etag is not None:
             result = adapter.upload_if_match(path, data, expected_etag)
         else:
             result = adapter.upload_overwrite(path, data)
         if result[0]:
-            self._bump_signal(session_hex)
+            self._forget_reads(self._own_location(ss_session, cloud), path)
+            # Artifacts go out in bursts; flush_signal ends the burst early.
+            self._bump_signal(session_hex, wait=False)
         return result
 
     def download_runtime_artifact_from_cloud(self, session_hex, path):
         """Download a raw runtime-control artifact from this session's own bucket."""
         ss_session = self._lookup_session(session_hex)
-        adapter = self._make_storage_adapter(ss_session)
-        return adapter.download(path)
+        cloud = self._resolve_berth_cloud_or_raise(ss_session)
+        return self._download_own(ss_session, cloud, path)
 
     def download_runtime_artifact_from_peer(self, session_hex, teammate_id_hex, path):
         """Download a raw runtime-control artifact from a peer bucket."""
@@ -1430,37 +1698,58 @@ class SmallSeaBackend:
     def get_local_signal(self, session_hex):
         """Return (signals_dict, etag) from this session's own signals.yaml."""
         ss_session = self._lookup_session(session_hex)
-        adapter = self._make_storage_adapter(ss_session)
-        ok, data, etag = adapter.download(self._SIGNAL_PATH)
+        cloud = self._resolve_berth_cloud_or_raise(ss_session)
+        ok, data, etag = self._download_own(ss_session, cloud, self._SIGNAL_PATH)
         if not ok:
             return None, None
-        signals = yaml.safe_load(data.decode("utf-8")) or {}
-        if not isinstance(signals, dict):
-            signals = {}
-        return signals, etag
+        return decode_signals(data), etag
 
     # ---- Signal file ----
 
     _SIGNAL_PATH = "signals.yaml"
     _SIGNAL_MAX_RETRIES = 5
 
-    def _bump_signal(self, session_hex):
+    def _signal_key(self, session_hex):
+        ss_session = self._lookup_session(session_hex)
+        return ss_session.participant_id.hex(), ss_session.berth_id.hex()
+
+    def _bump_signal(self, session_hex, wait=True, alone=False):
+        """Announce a change by bumping this session's berth counter in signals.yaml.
+
+        Bumps of the same berth within a short window share one write and one
+        ntfy push (see SignalCoalescer), unless alone asks for an increment
+        of its own. With wait, returns the count written, or None if it
+        could not be; otherwise returns None at once and the bump is written
+        when the window closes.
+        """
+        return self._signals.bump(
+            self._signal_key(session_hex), session_hex, wait=wait, alone=alone
+        )
+
+    def flush_signal(self, session_hex):
+        """Write this berth's pending signal bumps now. Returns the new count,
+        or None when nothing was pending or the write failed (the bumps then
+        stay pending and are retried)."""
+        return self._signals.flush(self._signal_key(session_hex))
+
+    def _write_signal_bump(self, session_hex):
         """Atomically increment the berth counter in this session's signals.yaml.
 
         Uses a CAS retry loop. On network failure after all retries, logs a
-        warning and returns — teammates will catch up on the next push.
-        Over-counting (from concurrent device pushes) is acceptable.
+        warning and returns None. Over-counting (from concurrent device
+        pushes) is acceptable.
         """
         ss_session = self._lookup_session(session_hex)
         berth_id_hex = ss_session.berth_id.hex()
-        adapter = self._make_storage_adapter(ss_session)
+        cloud = self._resolve_berth_cloud_or_raise(ss_session)
+        adapter = self._make_materialized_storage_adapter(ss_session, cloud)
 
         for attempt in range(self._SIGNAL_MAX_RETRIES):
+            # Read directly, not through self._reads: a CAS retry needs the
+            # object as it is now, not a copy fetched before the conflict.
             ok, data, etag = adapter.download(self._SIGNAL_PATH)
             if ok:
-                signals = yaml.safe_load(data.decode("utf-8")) or {}
-                if not isinstance(signals, dict):
-                    signals = {}
+                signals = decode_signals(data)
             else:
                 signals = {}
                 etag = None
@@ -1468,19 +1757,22 @@ class SmallSeaBackend:
             signals.setdefault("version", 1)
             signals[berth_id_hex] = signals.get(berth_id_hex, 0) + 1
 
-            payload = yaml.dump(signals, default_flow_style=False).encode("utf-8")
+            payload = encode_signals(signals)
             if etag is not None:
                 upload_ok, _, msg = adapter.upload_if_match(self._SIGNAL_PATH, payload, etag)
             else:
                 upload_ok, _, msg = adapter.upload_overwrite(self._SIGNAL_PATH, payload)
 
             if upload_ok:
+                self._forget_reads(
+                    self._own_location(ss_session, cloud), self._SIGNAL_PATH
+                )
                 self._ntfy_publish_signal(ss_session, signals[berth_id_hex])
                 return signals[berth_id_hex]
             # CAS conflict — re-read and retry
 
         self.logger.warning(
-            f"_bump_signal: gave up after {self._SIGNAL_MAX_RETRIES} retries "
+            f"signal bump: gave up after {self._SIGNAL_MAX_RETRIES} retries "
             f"(session {session_hex[:8]})"
         )
         return None
@@ -1514,10 +1806,7 @@ class SmallSeaBackend:
         )
         if not ok:
             return None, None
-        signals = yaml.safe_load(data.decode("utf-8")) or {}
-        if not isinstance(signals, dict):
-            signals = {}
-        return signals, etag
+        return decode_signals(data), etag
 
     def proxy_cloud_file(self, session_hex, protocol, url, bucket, path):
         """Download a file from an arbitrary cloud location using session credentials.
@@ -1532,7 +1821,16 @@ class SmallSeaBackend:
         ss_session = self._lookup_session(session_hex)
         if ss_session.team_name != "NoteToSelf":
             raise SmallSeaBackendExn("proxy_cloud_file requires a NoteToSelf session")
+        if protocol not in ("s3", "dropbox"):
+            raise SmallSeaBackendExn(f"Unsupported proxy protocol: {protocol}")
+        return self._coalesced_read(
+            ss_session,
+            self._read_location(ss_session, protocol, url, bucket),
+            path,
+            lambda: self._fetch_proxied_file(ss_session, protocol, url, bucket, path),
+        )
 
+    def _fetch_proxied_file(self, ss_session, protocol, url, bucket, path):
         if protocol == "s3":
             import boto3
             from botocore import UNSIGNED
@@ -1596,9 +1894,13 @@ class SmallSeaBackend:
     def _download_peer_file(self, session_hex, teammate_id_hex, path):
         """Core of download_from_peer, factored out for reuse."""
         ss_session = self._lookup_session(session_hex)
+        route = self._peer_route(ss_session, teammate_id_hex)
+        return self._read_peer(ss_session, route, path)
 
+    def _peer_route(self, ss_session, teammate_id_hex):
+        """(protocol, url, bucket) of the teammate's storage for this berth."""
         teammate_id = bytes.fromhex(teammate_id_hex)
-        conn = sqlite3.connect(self._team_db_path_for_session(ss_session))
+        conn = sqlite_policy.connect(self._team_db_path_for_session(ss_session))
         try:
             selection = self._select_teammate_berth_storage(
                 conn,
@@ -1613,10 +1915,18 @@ class SmallSeaBackend:
         if transport is None:
             raise SmallSeaNotFoundExn(f"No peer found for teammate {teammate_id_hex}")
 
-        protocol = transport.protocol
-        url = transport.url
-        bucket = transport.bucket
+        return transport.protocol, transport.url, transport.bucket
+
+    def _read_peer(self, ss_session, route, path):
+        protocol, url, bucket = route
+        return self._coalesced_read(
+            ss_session,
+            self._read_location(ss_session, protocol, url, bucket),
+            path,
+            lambda: self._fetch_peer_file(ss_session, protocol, url, bucket, path),
+        )
 
+    def _fetch_peer_file(self, ss_session, protocol, url, bucket, path):
         if protocol == "s3":
             import boto3
             from botocore import UNSIGNED
@@ -1732,7 +2042,7 @@ class SmallSeaBackend:
         )
 
     def _self_teammate_id_for_session(self, ss_session: SmallSeaSession) -> bytes | None:
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir,
             ss_session.participant_id.hex(),
         ) as conn:
@@ -1746,7 +2056,7 @@ class SmallSeaBackend:
         self,
         ss_session: SmallSeaSession,
     ) -> bytes | None:
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir,
             ss_session.participant_id.hex(),
         ) as conn:
@@ -1792,7 +2102,7 @@ class SmallSeaBackend:
         teammate_id = self._self_teammate_id_for_session(ss_session)
         if teammate_id is None:
             raise CloudAnnouncementMissingExn()
-        conn = sqlite3.connect(self._team_db_path_for_session(ss_session))
+        conn = sqlite_policy.connect(self._team_db_path_for_session(ss_session))
         try:
             selection = self._select_teammate_berth_storage(
                 conn,
@@ -1829,7 +2139,7 @@ class SmallSeaBackend:
         if signer_public_key is None:
             return False
         signer_key_id = key_id_from_public(signer_public_key)
-        conn = sqlite3.connect(self._team_db_path_for_session(ss_session))
+        conn = sqlite_policy.connect(self._team_db_path_for_session(ss_session))
         try:
             announcements = self._load_teammate_berth_storage_announcements(
                 conn,
@@ -1856,7 +2166,7 @@ class SmallSeaBackend:
     # ---- Notifications ----
 
     def _get_notification_service(self, ss_session):
-        with attached_note_to_self_connection(
+        with pooled_note_to_self_connection(
             self.root_dir, ss_session.participant_id.hex()
         ) as conn:
             row = conn.execute(
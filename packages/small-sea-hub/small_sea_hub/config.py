@@ -19,6 +19,15 @@ class Settings(BaseSettings):
     sandbox_mode: bool = False
     log_level: str = "INFO"  # console log level; file always gets DEBUG
     watcher_interval: int = 60  # seconds between peer-signal poll rounds
+    lan_enabled: bool = False  # serve/read published objects to/from LAN teammates
+    lan_port: int = 11438  # LAN object server, bound on all interfaces
+    lan_discovery_port: int = 11439  # UDP broadcast beacons
+    lan_spool_max_bytes: int = 2 * 1024**3
+    backend_workers: int = 32  # threads for blocking backend calls
+    berth_concurrency: int = 4  # backend calls at once per berth
+    provider_concurrency: int = 8  # per cloud provider; some default lower
+    object_cache_max_bytes: int = 512 * 1024**2  # immutable objects; 0 disables
+    signal_coalesce_window: float = 0.1  # seconds signals.yaml bumps gather before a write
 
     def get_root_dir(self) -> str:
         if self.root_dir:
@@ -0,0 +1,199 @@
+"""Bounded executor for blocking backend work.
+
+SmallSeaBackend is synchronous: a provider call blocks its thread until the
+provider answers, and a notification poll blocks for up to its timeout.
+The Hub's endpoints are coroutines on one event loop, so they hand that
+work to a BackendExecutor instead of calling the backend directly.
+
+Each call names the lanes it occupies:
+
+    ("berth", <berth hex>)        the session's berth
+    ("provider", <protocol>)      the berth's own cloud provider
+    ("peer", <teammate hex>)      a teammate's storage, read through the berth
+    ("notifications", "poll")     long polls, which hold a thread until timeout
+
+A lane admits a bounded number of calls at once; the rest wait on the event
+loop, in arrival order, without holding a thread. One berth's bulk transfer
+therefore cannot take every thread, a slow provider cannot starve the
+others, and endpoints that never touch the pool (/session/info,
+/notifications/watch) answer while transfers queue. Lanes are acquired in a
+fixed order (berth, provider, peer, then the rest), so two calls can never
+each hold a lane the other is waiting for.
+
+A lane exists only while some call holds or awaits it. `stats()` reports
+what is running and what is queued, per lane; `stats(berth=...)` limits
+the lanes to those that berth's calls hold or await.
+"""
+
+import asyncio
+import collections
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 32
+DEFAULT_BERTH_CONCURRENCY = 4
+DEFAULT_PROVIDER_CONCURRENCY = 8
+# Providers whose APIs rate-limit a single account well below the default.
+PROVIDER_CONCURRENCY = {"dropbox": 4, "gdrive": 4}
+# Long polls hold a thread for their whole timeout; cap how many may.
+NOTIFICATION_POLL_CONCURRENCY = 8
+
+_LANE_ORDER = {"berth": 0, "provider": 1, "peer": 2}
+
+
+class _Lane:
+    """A FIFO counting semaphore whose waiters are event-loop futures."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self._waiters: collections.deque = collections.deque()
+        # Calls holding or awaiting the lane, by the berth they came from.
+        self.callers: collections.Counter = collections.Counter()
+
+    @property
+    def idle(self) -> bool:
+        return not self.callers
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self):
+        if self.running < self.limit and not self.queued:
+            self.running += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to this waiter.
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+
+class BackendExecutor:
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        berth_concurrency: int = DEFAULT_BERTH_CONCURRENCY,
+        provider_concurrency: int = DEFAULT_PROVIDER_CONCURRENCY,
+    ):
+        self.workers = workers
+        self.berth_concurrency = berth_concurrency
+        self.provider_concurrency = provider_concurrency
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="hub-backend")
+        self._lanes: dict[tuple[str, str], _Lane] = {}
+        self._running = 0
+        self._queued = 0
+
+    def _limit_for(self, kind: str, name: str) -> int:
+        if kind == "berth":
+            return self.berth_concurrency
+        if kind == "provider":
+            return min(
+                PROVIDER_CONCURRENCY.get(name, self.provider_concurrency),
+                self.provider_concurrency,
+            )
+        if kind == "peer":
+            return self.provider_concurrency
+        if kind == "notifications":
+            return min(NOTIFICATION_POLL_CONCURRENCY, self.workers)
+        return self.workers
+
+    def _lane(self, kind: str, name: str) -> _Lane:
+        lane = self._lanes.get((kind, name))
+        if lane is None:
+            lane = self._lanes[(kind, name)] = _Lane(self._limit_for(kind, name))
+        return lane
+
+    def _leave(self, key: tuple[str, str], lane: _Lane, berth) -> None:
+        lane.callers[berth] -= 1
+        if lane.callers[berth] <= 0:
+            del lane.callers[berth]
+        if lane.idle and self._lanes.get(key) is lane:
+            del self._lanes[key]
+
+    async def run(self, func, *args, lanes=(), **kwargs):
+        """Run func(*args, **kwargs) on a worker thread once every lane admits it.
+
+        lanes is an iterable of (kind, name) pairs; a pair whose name is None
+        is skipped, so callers can pass a provider they could not resolve.
+        """
+        wanted = sorted(
+            {(kind, name) for kind, name in lanes if name is not None},
+            key=lambda lane: (_LANE_ORDER.get(lane[0], len(_LANE_ORDER)), lane),
+        )
+        berth = next((name for kind, name in wanted if kind == "berth"), None)
+        joined = []
+        for key in wanted:
+            lane = self._lane(*key)
+            lane.callers[berth] += 1
+            joined.append((key, lane))
+        held = []
+        self._queued += 1
+        try:
+            for _key, lane in joined:
+                await lane.acquire()
+                held.append(lane)
+        except BaseException:
+            self._queued -= 1
+            for lane in reversed(held):
+                lane.release()
+            for key, lane in joined:
+                self._leave(key, lane, berth)
+            raise
+        self._queued -= 1
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self._running -= 1
+            for lane in reversed(held):
+                lane.release()
+            for key, lane in joined:
+                self._leave(key, lane, berth)
+
+    def stats(self, berth=None) -> dict:
+        """Running and queued calls, overall and for every lane in use.
+
+        Given a berth hex, only the lanes that berth's calls hold or await
+        are listed, so one session does not see another's berth or peers.
+        """
+        lanes = {}
+        for (kind, name), lane in sorted(self._lanes.items()):
+            if berth is not None and berth not in lane.callers:
+                continue
+            if lane.running or lane.queued:
+                lanes.setdefault(kind, {})[name] = {
+                    "running": lane.running,
+                    "queued": lane.queued,
+                    "limit": lane.limit,
+                }
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queued,
+            "lanes": lanes,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
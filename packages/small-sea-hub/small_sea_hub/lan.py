@@ -0,0 +1,534 @@
+"""Hub-to-Hub exchange of published Cod Sync objects on the local network.
+
+Every archived link (L-*.yaml) and bundle (B-*.bundle) a Hub uploads is
+immutable once written, so a teammate on the same network can read it from
+the publishing Hub instead of the cloud. Three pieces make that work:
+
+- LanSpool keeps a copy of each immutable object this Hub uploaded, as the
+  exact bytes that went to the cloud (ciphertext in encrypted mode).
+- LanObjectServer serves spooled objects to team devices only. Each request
+  carries the requester's team-device public key and an Ed25519 signature over
+  the object it asks for and the endpoint it sent the request to; the key
+  must be trusted for the berth's team, and the endpoint must be the one the
+  request arrived on.
+- LanDiscovery broadcasts which teammates this Hub serves and records other
+  Hubs' broadcasts in a LanPeerDirectory.
+
+A LAN read is never authoritative. The serving Hub is found by an
+unauthenticated broadcast, so callers only take LAN bytes where they are
+verified afterwards (Cod Sync's predecessor and bundle checks) and go back to
+the cloud on any miss or mismatch. Heads (latest-link.yaml) and signals are
+mutable and never served here.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import re
+import socket
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import httpx
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+
+LAN_PROTOCOL_VERSION = 2
+
+#: Seconds between discovery beacons, and how long a peer stays listed
+#: after its last one.
+BEACON_INTERVAL = 10
+PEER_TTL = 35
+
+#: Largest accepted clock difference between requester and server, in seconds.
+SIGNATURE_WINDOW = 60
+
+#: A LAN read that takes longer than this is abandoned for the cloud.
+FETCH_TIMEOUT = 2.0
+
+_IMMUTABLE_NAME = re.compile(
+    r"(?:L-[A-Za-z0-9]+\.yaml|B-[A-Za-z0-9]+\.bundle|C-[0-9a-f]+\.chunk)\Z"
+)
+_HEX = re.compile(r"[0-9a-f]+\Z")
+_SAFE_PART = re.compile(r"[A-Za-z0-9._-]+\Z")
+
+_KEY_HEADER = "X-Small-Sea-Device-Key"
+_TIME_HEADER = "X-Small-Sea-Timestamp"
+_SIGNATURE_HEADER = "X-Small-Sea-Signature"
+
+logger = logging.getLogger("small_sea_hub.lan")
+
+
+def is_immutable_object_path(path: str) -> bool:
+    """True for archived links, bundles and Files chunks, under any path prefix."""
+    return bool(_IMMUTABLE_NAME.match(path.rsplit("/", 1)[-1]))
+
+
+def _safe_relative_parts(path: str) -> Optional[List[str]]:
+    parts = path.split("/")
+    if not all(_SAFE_PART.match(part) and part not in (".", "..") for part in parts):
+        return None
+    return parts
+
+
+# ---------------------------------------------------------------- spool #
+
+
+class LanSpool:
+    """On-disk copies of the immutable objects this Hub published.
+
+    Layout is {root}/{berth_id_hex}/{cloud path}, plus index.json recording
+    which participant, team, and teammate each berth belongs to, so the server
+    can authenticate requests for it after a restart. Least recently used
+    objects are evicted once the spool exceeds max_bytes; the sizes are
+    indexed in memory, from one scan at startup, so a put never walks the
+    spool.
+    """
+
+    def __init__(self, root, max_bytes: int = 2 * 1024**3):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self._index_path = self.root / "index.json"
+        try:
+            self._berths = json.loads(self._index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            self._berths = {}
+        self._objects: OrderedDict = OrderedDict()  # object path → size, LRU first
+        self._bytes = 0
+        self._load()
+
+    def _load(self):
+        found = []
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if not is_immutable_object_path(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+        for _mtime, path, size in sorted(found):
+            self._objects[path] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def record_berth(self, berth_id_hex, participant_hex, team_name, teammate_id_hex):
+        entry = {
+            "participant_hex": participant_hex,
+            "team_name": team_name,
+            "teammate_id_hex": teammate_id_hex,
+        }
+        with self._lock:
+            if self._berths.get(berth_id_hex) == entry:
+                return
+            self._berths[berth_id_hex] = entry
+            self._write_atomic(self._index_path, json.dumps(self._berths).encode())
+
+    def berth(self, berth_id_hex) -> Optional[dict]:
+        with self._lock:
+            return self._berths.get(berth_id_hex)
+
+    def teammates(self) -> List[str]:
+        with self._lock:
+            return sorted({entry["teammate_id_hex"] for entry in self._berths.values()})
+
+    def _object_path(self, berth_id_hex, path) -> Optional[pathlib.Path]:
+        if not _HEX.match(berth_id_hex) or not is_immutable_object_path(path):
+            return None
+        parts = _safe_relative_parts(path)
+        if parts is None:
+            return None
+        return self.root.joinpath(berth_id_hex, *parts)
+
+    def put(self, berth_id_hex, path, data: bytes) -> bool:
+        """Keep a copy of a published object; False if it is not spoolable."""
+        target = self._object_path(berth_id_hex, path)
+        if target is None:
+            return False
+        key = str(target)
+        with self._lock:
+            if not target.exists():
+                os.makedirs(target.parent, exist_ok=True)
+                self._write_atomic(target, data)
+                self._bytes -= self._objects.pop(key, 0)
+                self._objects[key] = len(data)
+                self._bytes += len(data)
+                self._evict()
+        return True
+
+    def get(self, berth_id_hex, path) -> Optional[bytes]:
+        target = self._object_path(berth_id_hex, path)
+        if target is None:
+            return None
+        try:
+            data = target.read_bytes()
+        except FileNotFoundError:
+            return None
+        key = str(target)
+        with self._lock:
+            if key in self._objects:
+                self._objects.move_to_end(key)
+        try:
+            os.utime(target)
+        except FileNotFoundError:
+            pass
+        return data
+
+    @staticmethod
+    def _write_atomic(target: pathlib.Path, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._objects:
+            path, size = self._objects.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+# ----------------------------------------------------------- discovery #
+
+
+@dataclass
+class LanPeer:
+    host: str
+    port: int
+    seen_at: float
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class LanPeerDirectory:
+    """Which Hubs on the local network serve which teammates."""
+
+    def __init__(self, ttl: float = PEER_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._peers: Dict[str, Dict[Tuple[str, int], LanPeer]] = {}
+
+    def record(self, teammate_ids: Iterable[str], host: str, port: int, now=None):
+        seen_at = time.time() if now is None else now
+        with self._lock:
+            for teammate_id_hex in teammate_ids:
+                self._peers.setdefault(teammate_id_hex, {})[(host, port)] = LanPeer(
+                    host, port, seen_at
+                )
+
+    def handle_beacon(self, payload: bytes, host: str, now=None) -> bool:
+        """Record one discovery datagram; False if it is not a valid beacon."""
+        try:
+            beacon = json.loads(payload.decode("utf-8"))
+            if beacon.get("v") != LAN_PROTOCOL_VERSION:
+                return False
+            port = int(beacon["port"])
+            teammates = [t for t in beacon["teammates"] if _HEX.match(t)]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
+        self.record(teammates, host, port, now=now)
+        return True
+
+    def peers_for(self, teammate_id_hex: str, now=None) -> List[LanPeer]:
+        """Live Hubs serving a teammate, most recently heard from first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            known = self._peers.get(teammate_id_hex, {})
+            for key in [k for k, peer in known.items() if now - peer.seen_at > self.ttl]:
+                del known[key]
+            return sorted(known.values(), key=lambda peer: -peer.seen_at)
+
+
+class LanDiscovery:
+    """Broadcast our served teammates and listen for other Hubs' broadcasts."""
+
+    def __init__(
+        self,
+        directory: LanPeerDirectory,
+        spool: LanSpool,
+        service_port: int,
+        discovery_port: int,
+        interval: float = BEACON_INTERVAL,
+    ):
+        self.directory = directory
+        self.spool = spool
+        self.service_port = service_port
+        self.discovery_port = discovery_port
+        self.interval = interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._listen_socket = None
+
+    def beacon(self) -> bytes:
+        return json.dumps(
+            {
+                "v": LAN_PROTOCOL_VERSION,
+                "port": self.service_port,
+                "teammates": self.spool.teammates(),
+            }
+        ).encode("utf-8")
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("", self.discovery_port))
+        sock.settimeout(1.0)
+        self._listen_socket = sock
+        for target in (self._listen, self._announce):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        if self._listen_socket is not None:
+            self._listen_socket.close()
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                payload, (host, _port) = self._listen_socket.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.directory.handle_beacon(payload, host)
+
+    def _announce(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        try:
+            while not self._stop.is_set():
+                if self.spool.teammates():
+                    try:
+                        sock.sendto(self.beacon(), ("<broadcast>", self.discovery_port))
+                    except OSError as exc:
+                        logger.debug(f"LAN beacon failed: {exc}")
+                self._stop.wait(self.interval)
+        finally:
+            sock.close()
+
+
+# ------------------------------------------------------ authentication #
+
+
+def _request_message(endpoint: str, berth_id_hex: str, path: str, timestamp: str) -> bytes:
+    return (
+        f"small-sea-lan/v{LAN_PROTOCOL_VERSION}\n{endpoint}\n{berth_id_hex}\n{path}\n{timestamp}"
+    ).encode()
+
+
+def sign_request(
+    private_key: bytes, public_key: bytes, endpoint, berth_id_hex, path, now=None
+) -> dict:
+    """Headers proving a team device asked this endpoint for this object just now.
+
+    endpoint is the "host:port" the request goes to. Binding it stops a Hub
+    that answered a spoofed beacon from replaying the request to the real one.
+    """
+    timestamp = str(int(time.time() if now is None else now))
+    signature = Ed25519PrivateKey.from_private_bytes(private_key).sign(
+        _request_message(endpoint, berth_id_hex, path, timestamp)
+    )
+    return {
+        _KEY_HEADER: public_key.hex(),
+        _TIME_HEADER: timestamp,
+        _SIGNATURE_HEADER: signature.hex(),
+    }
+
+
+def verify_request(
+    headers, endpoint, berth_id_hex, path, trusted_keys: Iterable[bytes], now=None
+) -> bool:
+    try:
+        public_key = bytes.fromhex(headers.get(_KEY_HEADER, ""))
+        signature = bytes.fromhex(headers.get(_SIGNATURE_HEADER, ""))
+        timestamp = headers.get(_TIME_HEADER, "")
+        skew = abs((time.time() if now is None else now) - int(timestamp))
+    except (TypeError, ValueError):
+        return False
+    if skew > SIGNATURE_WINDOW or public_key not in set(trusted_keys):
+        return False
+    try:
+        Ed25519PublicKey.from_public_bytes(public_key).verify(
+            signature, _request_message(endpoint, berth_id_hex, path, timestamp)
+        )
+    except Exception:
+        return False
+    return True
+
+
+# -------------------------------------------------------------- server #
+
+
+class LanObjectServer:
+    """Serve spooled objects at GET /objects/{berth_id_hex}/{path}.
+
+    trusted_keys(participant_hex, team_name) returns the team-device public
+    keys allowed to read that team's berths. Unauthenticated requests get 403
+    before the spool is consulted, so they learn nothing about its contents.
+    """
+
+    def __init__(
+        self,
+        spool: LanSpool,
+        trusted_keys: Callable[[str, str], Iterable[bytes]],
+        host: str = "0.0.0.0",
+        port: int = 0,
+    ):
+        self.spool = spool
+        self.trusted_keys = trusted_keys
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host, port = self.connection.getsockname()[:2]
+                status, body = server.handle(self.path, self.headers, f"{host}:{port}")
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def handle(self, request_path: str, headers, endpoint: str) -> Tuple[int, bytes]:
+        """Answer one request that arrived on endpoint, our "host:port"."""
+        parts = request_path.split("/", 3)
+        if len(parts) != 4 or parts[1] != "objects":
+            return 404, b""
+        berth_id_hex, path = parts[2], unquote(parts[3])
+        entry = self.spool.berth(berth_id_hex)
+        if entry is None:
+            return 403, b""
+        try:
+            trusted = self.trusted_keys(entry["participant_hex"], entry["team_name"])
+        except Exception as exc:
+            logger.warning(f"LAN trust lookup failed for berth {berth_id_hex[:8]}: {exc}")
+            return 403, b""
+        if not verify_request(headers, endpoint, berth_id_hex, path, trusted):
+            return 403, b""
+        data = self.spool.get(berth_id_hex, path)
+        if data is None:
+            return 404, b""
+        return 200, data
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def fetch_object(peer: LanPeer, berth_id_hex, path, headers, timeout=FETCH_TIMEOUT) -> Optional[bytes]:
+    """GET one object from a LAN peer; None on any miss or failure."""
+    url = f"http://{peer.host}:{peer.port}/objects/{berth_id_hex}/{quote(path)}"
+    try:
+        resp = httpx.get(url, headers=headers, timeout=timeout)
+    except httpx.HTTPError as exc:
+        logger.debug(f"LAN fetch from {peer.host}:{peer.port} failed: {exc}")
+        return None
+    if resp.status_code != 200:
+        return None
+    return resp.content
+
+
+# ------------------------------------------------------------- service #
+
+
+class LanService:
+    """The Hub's LAN exchange: spool, object server, and discovery together.
+
+    signer(participant_hex, team_name) returns this device's current team
+    device key as (private_key, public_key); trusted_keys has the shape
+    LanObjectServer expects.
+    """
+
+    def __init__(
+        self,
+        root_dir,
+        *,
+        signer: Callable[[str, str], Tuple[bytes, bytes]],
+        trusted_keys: Callable[[str, str], Iterable[bytes]],
+        host: str = "0.0.0.0",
+        port: int = 0,
+        discovery_port: Optional[int] = None,
+        max_spool_bytes: int = 2 * 1024**3,
+    ):
+        self.spool = LanSpool(pathlib.Path(root_dir) / "LanSpool", max_bytes=max_spool_bytes)
+        self.directory = LanPeerDirectory()
+        self.server = LanObjectServer(self.spool, trusted_keys, host=host, port=port)
+        self.signer = signer
+        self.discovery = None
+        if discovery_port is not None:
+            self.discovery = LanDiscovery(
+                self.directory, self.spool, self.server.port, discovery_port
+            )
+
+    def start(self):
+        self.server.start()
+        if self.discovery is not None:
+            self.discovery.start()
+
+    def stop(self):
+        if self.discovery is not None:
+            self.discovery.stop()
+        self.server.stop()
+
+    def publish(self, berth_id_hex, participant_hex, team_name, teammate_id_hex, path, data):
+        """Offer an object this Hub just uploaded to LAN teammates."""
+        if not is_immutable_object_path(path):
+            return
+        self.spool.record_berth(berth_id_hex, participant_hex, team_name, teammate_id_hex)
+        self.spool.put(berth_id_hex, path, data)
+
+    def fetch(self, berth_id_hex, participant_hex, team_name, teammate_id_hex, path) -> Optional[bytes]:
+        """Read a teammate's object from whichever LAN Hub serves it, if any."""
+        if not is_immutable_object_path(path):
+            return None
+        peers = self.directory.peers_for(teammate_id_hex)
+        if not peers:
+            return None
+        private_key, public_key = self.signer(participant_hex, team_name)
+        for peer in peers:
+            headers = sign_request(private_key, public_key, peer.endpoint, berth_id_hex, path)
+            data = fetch_object(peer, berth_id_hex, path, headers)
+            if data is not None:
+                return data
+        return None
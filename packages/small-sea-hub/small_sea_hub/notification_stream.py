@@ -0,0 +1,135 @@
+"""Per-subscriber state for the /notifications/stream push channel.
+
+/notifications/watch is a long poll: every time it returns or times out the
+app posts its whole known map again, and the Hub looks the session up again
+to answer it. A stream subscriber instead holds one connection while the Hub
+remembers what it has already been sent, so each wakeup only has to compare
+the berth's counts with that record and send what grew.
+
+Each event carries a cursor, "{subscription id}.{seq}". An app that
+reconnects with the last cursor it saw resumes the same subscription: the
+events it missed are replayed from a short history, or, when they are no
+longer held (or the Hub restarted and forgot the subscription), it gets a
+snapshot of every current count instead. Counts only ever grow, so a
+snapshot is always a safe substitute for the deltas it replaces.
+"""
+
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+HISTORY_EVENTS = 64
+IDLE_TTL = 600  # seconds a disconnected subscription is kept for resuming
+
+
+class StreamSubscriber:
+    def __init__(self, berth_id_hex: str, session_hex: str):
+        self.subscription_id = secrets.token_hex(8)
+        self.berth_id_hex = berth_id_hex
+        self.session_hex = session_hex
+        self.seq = 0
+        self.peers: dict = {}  # teammate_id_hex → highest count sent
+        self.self_count: Optional[int] = None
+        self.history: deque = deque(maxlen=HISTORY_EVENTS)
+        self.connections = 0
+        self.last_active = time.monotonic()
+        self._snapshot_due = True
+
+    def cursor(self, seq: Optional[int] = None) -> str:
+        return f"{self.subscription_id}.{self.seq if seq is None else seq}"
+
+    def advance(self, peer_counts: dict, self_count: int) -> Optional[dict]:
+        """The event that brings this subscriber up to the given counts, or
+        None when it has already been sent all of them."""
+        if self._snapshot_due:
+            self._snapshot_due = False
+            self.peers = {t: max(c, self.peers.get(t, 0)) for t, c in peer_counts.items()}
+            self.self_count = max(self_count, self.self_count or 0)
+            return self._record(
+                {"snapshot": True, "peers": dict(self.peers), "self_count": self.self_count}
+            )
+        changed = {t: c for t, c in peer_counts.items() if c > self.peers.get(t, 0)}
+        event = {"snapshot": False, "peers": changed}
+        if self_count > (self.self_count or 0):
+            event["self_count"] = self.self_count = self_count
+        if not changed and "self_count" not in event:
+            return None
+        self.peers.update(changed)
+        return self._record(event)
+
+    def _record(self, event: dict) -> dict:
+        self.seq += 1
+        event["cursor"] = self.cursor()
+        self.history.append((self.seq, event))
+        return event
+
+    def replay_after(self, seq: int) -> list:
+        """Events after seq, or a snapshot next time if they are gone."""
+        if seq == self.seq:
+            return []
+        oldest = self.history[0][0] if self.history else self.seq + 1
+        if seq > self.seq or seq < oldest - 1:
+            self._snapshot_due = True
+            return []
+        return [event for event_seq, event in self.history if event_seq > seq]
+
+
+class StreamRegistry:
+    """Every stream subscription on this Hub, connected or resumable."""
+
+    def __init__(self, idle_ttl: float = IDLE_TTL):
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._subscribers: dict = {}  # subscription id → StreamSubscriber
+
+    def open(self, berth_id_hex: str, session_hex: str, cursor: Optional[str] = None):
+        """(subscriber, events to replay) for a new or resumed connection.
+
+        A cursor only resumes a subscription of the same session; anything
+        else starts a new subscription, whose first event is a snapshot.
+        """
+        with self._lock:
+            self._expire()
+            subscriber, seq = self._resume(session_hex, cursor)
+            if subscriber is None:
+                subscriber = StreamSubscriber(berth_id_hex, session_hex)
+                self._subscribers[subscriber.subscription_id] = subscriber
+                replay = []
+            else:
+                replay = subscriber.replay_after(seq)
+            subscriber.connections += 1
+            subscriber.last_active = time.monotonic()
+            return subscriber, replay
+
+    def _resume(self, session_hex, cursor):
+        if not cursor:
+            return None, 0
+        subscription_id, _, seq = cursor.partition(".")
+        subscriber = self._subscribers.get(subscription_id)
+        if subscriber is None or subscriber.session_hex != session_hex:
+            return None, 0
+        try:
+            return subscriber, int(seq)
+        except ValueError:
+            return subscriber, -1
+
+    def close(self, subscriber: StreamSubscriber):
+        with self._lock:
+            subscriber.connections -= 1
+            subscriber.last_active = time.monotonic()
+
+    def _expire(self):
+        now = time.monotonic()
+        for subscription_id, subscriber in list(self._subscribers.items()):
+            if subscriber.connections <= 0 and now - subscriber.last_active > self.idle_ttl:
+                del self._subscribers[subscription_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return {
+            "subscriptions": len(subscribers),
+            "connected": sum(1 for s in subscribers if s.connections > 0),
+        }
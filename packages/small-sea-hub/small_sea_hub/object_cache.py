@@ -0,0 +1,193 @@
+"""On-disk cache of immutable Cod Sync objects read through the Hub.
+
+Archived links (L-*.yaml), bundles (B-*.bundle) and Files chunks
+(C-*.chunk) are named by random uids and created conditionally, so once one
+exists its bytes never change. The Hub still used to fetch one from the
+provider on every /cloud_file, /peer_cloud_file and /cloud_proxy read. The
+ObjectCache keeps the provider's bytes instead: ciphertext for encrypted
+berths, exactly as stored. Each session still decrypts for itself.
+
+Entries are keyed by the read location (protocol, url, bucket, and whose
+credentials the read uses) plus the object path. One cache serves every
+session and app on the device. Heads (latest-link.yaml) and signals.yaml
+are mutable and never cached (see `lan.is_immutable_object_path`).
+
+Each entry records the etag the provider returned. Where that etag is the
+object's MD5, as S3 gives for single-part uploads, bytes whose digest does
+not match are never stored and an entry that stops matching is dropped;
+otherwise a SHA-256 recorded alongside catches a damaged file. The cache is
+bounded by max_bytes and evicts least recently used entries first; recency
+survives a restart through file mtimes.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from small_sea_hub.lan import is_immutable_object_path
+
+DEFAULT_MAX_BYTES = 512 * 1024**2
+
+_MD5_ETAG = re.compile(r"[0-9a-f]{32}\Z")
+_ENTRY_SUFFIX = ".obj"
+
+
+def _etag_md5(etag) -> Optional[str]:
+    """The MD5 an etag states, when it is one (not a multipart or opaque etag)."""
+    if not isinstance(etag, str):
+        return None
+    etag = etag.strip('"').lower()
+    return etag if _MD5_ETAG.match(etag) else None
+
+
+class ObjectCache:
+    def __init__(self, root, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()  # digest → size, LRU first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        found = []
+        for entry in self.root.glob(f"*/*{_ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, entry.stem, stat.st_size))
+        for _mtime, digest, size in sorted(found):
+            self._entries[digest] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def cacheable(path: str) -> bool:
+        return is_immutable_object_path(path)
+
+    @staticmethod
+    def _digest(location, path) -> str:
+        key = json.dumps([list(location), path], separators=(",", ":"))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _entry_path(self, digest: str) -> pathlib.Path:
+        return self.root / digest[:2] / f"{digest}{_ENTRY_SUFFIX}"
+
+    def get(self, location, path) -> Optional[Tuple[bytes, Optional[str]]]:
+        """(data, etag) for a cached object, or None on a miss."""
+        if not self.cacheable(path):
+            return None
+        digest = self._digest(location, path)
+        with self._lock:
+            cached = digest in self._entries
+        entry = self._read_entry(digest, location, path) if cached else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                if cached:
+                    self._drop(digest)
+                return None
+            self.hits += 1
+            self.bytes_saved += len(entry[0])
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+        try:
+            os.utime(self._entry_path(digest))
+        except FileNotFoundError:
+            pass
+        return entry
+
+    def _read_entry(self, digest, location, path):
+        try:
+            raw = self._entry_path(digest).read_bytes()
+            header, data = raw.split(b"\n", 1)
+            meta = json.loads(header)
+        except (FileNotFoundError, ValueError):
+            return None
+        if meta.get("key") != [list(location), path]:
+            return None
+        if hashlib.sha256(data).hexdigest() != meta.get("sha256"):
+            return None
+        md5 = _etag_md5(meta.get("etag"))
+        if md5 is not None and hashlib.md5(data).hexdigest() != md5:
+            return None
+        return data, meta.get("etag")
+
+    def put(self, location, path, data: bytes, etag) -> bool:
+        """Keep a copy of an object just read from or written to the provider.
+
+        Returns False, storing nothing, for a mutable path, for bytes that
+        contradict their etag, or for an object larger than the whole cache.
+        """
+        if not self.cacheable(path) or len(data) > self.max_bytes:
+            return False
+        md5 = _etag_md5(etag)
+        if md5 is not None and hashlib.md5(data).hexdigest() != md5:
+            return False
+        digest = self._digest(location, path)
+        header = json.dumps(
+            {
+                "key": [list(location), path],
+                "etag": etag,
+                "sha256": hashlib.sha256(data).hexdigest(),
+            },
+            separators=(",", ":"),
+        ).encode()
+        target = self._entry_path(digest)
+        os.makedirs(target.parent, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(header + b"\n" + data)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        size = target.stat().st_size
+        with self._lock:
+            self._bytes -= self._entries.pop(digest, 0)
+            self._entries[digest] = size
+            self._bytes += size
+            self._evict()
+        return True
+
+    def _drop(self, digest):
+        self._bytes -= self._entries.pop(digest, 0)
+        try:
+            self._entry_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            digest = next(iter(self._entries))
+            self._drop(digest)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "evictions": self.evictions,
+            }
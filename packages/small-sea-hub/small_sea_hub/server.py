@@ -10,7 +10,7 @@ import pathlib
 
 import pydantic
 from fastapi import Depends, FastAPI, Form, Header, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from small_sea_manager import admission_events as AdmissionEvents
 import small_sea_manager.provisioning as Provisioning
@@ -22,6 +22,9 @@ from small_sea_hub.backend import (
 )
 from small_sea_hub.cloud_errors import CloudStorageRequiredExn
 from small_sea_hub.config import Settings
+from small_sea_hub.executor import BackendExecutor
+from small_sea_hub.lan import LanService
+from small_sea_hub.notification_stream import StreamRegistry
 
 _templates = Jinja2Templates(directory=str(pathlib.Path(__file__).parent / "templates"))
 
@@ -45,7 +48,7 @@ def _refresh_session_peers(app: FastAPI, session_hex: str):
     Adds new peers (pulsing the berth event so waiters wake and re-enumerate)
     and removes peers that are no longer in the DB.
     """
-    import sqlite3 as _sqlite3
+    from small_sea_sqlite import sqlite_policy
 
     session_info = app.state.watched_sessions.get(session_hex)
     if session_info is None:
@@ -58,7 +61,7 @@ def _refresh_session_peers(app: FastAPI, session_hex: str):
     self_in_team = session_info.get("self_in_team")
 
     try:
-        conn = _sqlite3.connect(team_db_path)
+        conn = sqlite_policy.connect(team_db_path)
         try:
             rows = conn.execute(
                 "SELECT id FROM teammate WHERE id != ?",
@@ -205,6 +208,11 @@ def _team_db_revision(team_db_path: str):
     return (stat.st_mtime_ns, stat.st_size)
 
 
+def _team_trust_revision(team_db_path: str):
+    """A digest of core.db's trust tables; read only once the file has changed."""
+    return Provisioning.trust_tables_fingerprint(team_db_path)
+
+
 def _run_runtime_reconciliation_for_session(app: FastAPI, session_hex: str):
     session_info = app.state.watched_sessions.get(session_hex)
     if session_info is None:
@@ -212,35 +220,38 @@ def _run_runtime_reconciliation_for_session(app: FastAPI, session_hex: str):
     if session_info.get("watch_self_only"):
         return False
     try:
-        revision = _team_db_revision(session_info["team_db_path"])
+        file_revision = _team_db_revision(session_info["team_db_path"])
     except FileNotFoundError:
         return False
-    team_db_revision = session_info.get("team_db_revision")
-    linked_device_notification_revision = session_info.get("linked_device_notification_revision")
     linked_device_retry_needed = bool(session_info.get("linked_device_notification_retry_needed"))
-    revision_changed = revision != team_db_revision
-    should_run_reconciliation = revision_changed
+    if file_revision == session_info.get("team_db_revision") and not linked_device_retry_needed:
+        return False
+    # Most writes to core.db (announcements, sightings, ...) leave the trust
+    # tables alone; only a change to those needs reconciling.
+    revision = _team_trust_revision(session_info["team_db_path"])
+    should_run_reconciliation = revision != session_info.get("trust_revision")
     should_run_notifications = (
-        revision != linked_device_notification_revision
+        revision != session_info.get("linked_device_notification_revision")
         or linked_device_retry_needed
     )
     if not should_run_reconciliation and not should_run_notifications:
+        session_info["team_db_revision"] = file_revision
         return False
 
     ss_session = app.state.backend._lookup_session(session_hex)
+    published = True
     if should_run_reconciliation:
         result = Provisioning.reconcile_runtime_state(
             app.state.backend.root_dir,
             ss_session.participant_id.hex(),
             ss_session.team_name,
         )
-        for artifact in result.get("redistribution_artifacts", []):
-            ok, _etag, msg = app.state.backend.upload_runtime_artifact(
-                session_hex,
-                artifact["artifact_path"],
-                artifact["distribution_payload"].encode("utf-8"),
-            )
-            if ok:
+        artifacts = result.get("redistribution_artifacts", [])
+        published = not artifacts or _publish_redistribution_artifacts(
+            app, session_hex, artifacts
+        )
+        if artifacts and published:
+            for artifact in artifacts:
                 Provisioning.mark_redistribution_delivery(
                     app.state.backend.root_dir,
                     ss_session.participant_id.hex(),
@@ -249,23 +260,83 @@ def _run_runtime_reconciliation_for_session(app: FastAPI, session_hex: str):
                     sender_chain_id=bytes.fromhex(artifact["sender_chain_id_hex"]),
                     target_device_key_id=bytes.fromhex(artifact["target_device_key_id_hex"]),
                 )
-            else:
-                app.state.logger.warning(
-                    "Runtime artifact upload failed for %s -> %s: %s",
-                    artifact["sender_device_key_id_hex"][:8],
-                    artifact["target_device_key_id_hex"][:8],
-                    msg,
-                )
     if should_run_notifications:
         retry_needed = _notify_linked_device_events_for_session(app, session_hex, ss_session)
         session_info["linked_device_notification_revision"] = revision
         session_info["linked_device_notification_retry_needed"] = retry_needed
     try:
+        # Reconciliation may itself have written core.db.
+        file_revision = _team_db_revision(session_info["team_db_path"])
         if should_run_reconciliation:
-            session_info["team_db_revision"] = _team_db_revision(session_info["team_db_path"])
+            # Undelivered artifacts are retried on the next change to core.db.
+            session_info["trust_revision"] = (
+                _team_trust_revision(session_info["team_db_path"])
+                if published
+                else None
+            )
+        session_info["team_db_revision"] = file_revision
     except FileNotFoundError:
         session_info["team_db_revision"] = None
-    return revision_changed
+        session_info["trust_revision"] = None
+    return should_run_reconciliation
+
+
+REDISTRIBUTION_INBOX_MAX_RETRIES = 5
+
+
+def _publish_redistribution_artifacts(app: FastAPI, session_hex: str, artifacts) -> bool:
+    """Add a rotation's artifacts to our inbox object in one CAS write.
+
+    Other devices of ours write their own sections of the same inbox, so a
+    lost race re-reads and merges again. Returns True once the write lands.
+    """
+    backend = app.state.backend
+    inbox_path = Provisioning.RUNTIME_REDISTRIBUTION_INBOX_PATH
+    msg = None
+    try:
+        trusted_sender_hexes = _own_trusted_device_key_hexes(app, session_hex)
+    except Exception as exc:
+        app.state.logger.warning("Runtime artifact upload skipped: %s", exc)
+        return False
+    for _attempt in range(REDISTRIBUTION_INBOX_MAX_RETRIES):
+        try:
+            ok, data, etag = backend.download_runtime_artifact_from_cloud(session_hex, inbox_path)
+            merged = Provisioning.merge_redistribution_inbox(
+                data if ok else None, artifacts, trusted_sender_hexes
+            )
+            ok, _etag, msg = backend.upload_runtime_artifact(
+                session_hex, inbox_path, merged, expected_etag=etag if ok else "*"
+            )
+        except Exception as exc:
+            msg = exc
+            break
+        if ok:
+            # Announce the rotation now rather than when the bump window closes.
+            backend.flush_signal(session_hex)
+            return True
+        # CAS conflict — re-read and merge again
+    app.state.logger.warning(
+        "Runtime artifact upload failed for %d targets: %s", len(artifacts), msg
+    )
+    return False
+
+
+def _own_trusted_device_key_hexes(app: FastAPI, session_hex: str) -> set:
+    """Key ids (hex) of our own devices the team still trusts: the only
+    senders whose sections belong in our inbox."""
+    ss_session = app.state.backend._lookup_session(session_hex)
+    root_dir = app.state.backend.root_dir
+    participant_hex = ss_session.participant_id.hex()
+    _team_id, self_in_team = Provisioning._team_row(
+        root_dir, participant_hex, ss_session.team_name
+    )
+    trusted = Provisioning.get_trusted_device_keys_by_teammate(
+        root_dir, participant_hex, ss_session.team_name
+    )
+    return {
+        Provisioning.key_id_from_public(public_key).hex()
+        for public_key in trusted.get(self_in_team, [])
+    }
 
 
 def _process_runtime_inbox_from_teammate(
@@ -295,37 +366,54 @@ def _process_runtime_inbox_from_teammate(
     if teammate_id not in trusted_public_keys_by_teammate:
         return
 
-    for public_key in trusted_public_keys_by_teammate[teammate_id]:
-        sender_device_key_id = Provisioning.key_id_from_public(public_key)
-        if sender_device_key_id == local_device_key_id:
-            continue
-        artifact_path = Provisioning.runtime_redistribution_artifact_path(
-            local_device_key_id,
-            sender_device_key_id,
-        )
+    def download(path):
         if use_local_bucket:
-            ok, data, _etag = app.state.backend.download_runtime_artifact_from_cloud(
-                session_hex,
-                artifact_path,
-            )
-        else:
-            ok, data, _etag = app.state.backend.download_runtime_artifact_from_peer(
-                session_hex,
-                teammate_id_hex,
-                artifact_path,
+            return app.state.backend.download_runtime_artifact_from_cloud(session_hex, path)
+        return app.state.backend.download_runtime_artifact_from_peer(
+            session_hex, teammate_id_hex, path
+        )
+
+    sender_device_key_ids = [
+        Provisioning.key_id_from_public(public_key)
+        for public_key in trusted_public_keys_by_teammate[teammate_id]
+    ]
+    sender_device_key_ids = [
+        sender_device_key_id
+        for sender_device_key_id in sender_device_key_ids
+        if sender_device_key_id != local_device_key_id
+    ]
+    ok, data, _etag = download(Provisioning.RUNTIME_REDISTRIBUTION_INBOX_PATH)
+    # One read covers every device of the teammate that writes the inbox.
+    data = data if ok else None
+    in_inbox = Provisioning.redistribution_inbox_payloads(data, local_device_key_id)
+    with_section = Provisioning.redistribution_inbox_senders(data)
+    payloads = []
+    for sender_device_key_id in sender_device_key_ids:
+        if sender_device_key_id.hex() in in_inbox:
+            payloads.append(in_inbox[sender_device_key_id.hex()])
+        elif sender_device_key_id.hex() not in with_section:
+            # A device that predates the inbox, or has not rotated since it
+            # appeared: its artifact for us sits at the per-sender path.
+            ok, data, _etag = download(
+                Provisioning.runtime_redistribution_artifact_path(
+                    local_device_key_id,
+                    sender_device_key_id,
+                )
             )
-        if not ok:
-            continue
-        distribution_payload = data.decode("utf-8")
+            if ok:
+                payloads.append(data.decode("utf-8"))
+    if not payloads:
+        return
+
+    receipts = Provisioning.redistribution_receipts(root_dir, participant_hex, team_id)
+    for distribution_payload in payloads:
         metadata = Provisioning.peek_redistribution_payload_metadata(distribution_payload)
-        if Provisioning._receipt_exists(
-            root_dir,
-            participant_hex,
-            team_id=team_id,
-            sender_device_key_id=bytes.fromhex(metadata["sender_device_key_id_hex"]),
-            sender_chain_id=bytes.fromhex(metadata["sender_chain_id_hex"]),
-            target_device_key_id=bytes.fromhex(metadata["target_device_key_id_hex"]),
-        ):
+        receipt_key = (
+            bytes.fromhex(metadata["sender_device_key_id_hex"]),
+            bytes.fromhex(metadata["sender_chain_id_hex"]),
+            bytes.fromhex(metadata["target_device_key_id_hex"]),
+        )
+        if receipt_key in receipts:
             continue
         try:
             received = Provisioning.receive_sender_key_distribution(
@@ -406,17 +494,25 @@ def _refresh_note_to_self_self_signal(app: FastAPI, session_hex: str):
         _pulse_berth_event(app, berth_id_hex)
 
 
-def _watcher_pass(app: FastAPI):
+def _watcher_pass(app: FastAPI, berth_ids=None):
     """Single poll round: refresh peer lists and check all peer signals for changes.
 
     Called from both the polling loop (_peer_watcher_loop) and the ntfy push
     listener (_ntfy_listener_loop) so that a push event triggers an immediate
-    signal check without waiting for the next poll interval.
+    signal check without waiting for the next poll interval. A push names the
+    berth it is about, so the listener passes berth_ids to check only the
+    sessions and peers on those berths.
     """
     logger = app.state.logger
 
+    def wanted(berth_id_hex):
+        return berth_ids is None or berth_id_hex in berth_ids
+
     # Refresh peer lists for all active sessions before polling signals.
     for session_hex in list(app.state.watched_sessions):
+        session_info = app.state.watched_sessions.get(session_hex, {})
+        if not wanted(session_info.get("berth_id_hex")):
+            continue
         _refresh_session_peers(app, session_hex)
         if _run_runtime_reconciliation_for_session(app, session_hex):
             berth_id_hex = app.state.watched_sessions.get(session_hex, {}).get("berth_id_hex")
@@ -433,6 +529,8 @@ def _watcher_pass(app: FastAPI):
     for key, state in list(peers.items()):
         session_hex, teammate_id_hex = key
         berth_id_hex = state.get("berth_id_hex")
+        if not wanted(berth_id_hex):
+            continue
         try:
             signals, etag = app.state.backend.get_peer_signal(
                 session_hex, teammate_id_hex
@@ -479,6 +577,7 @@ def _watcher_pass(app: FastAPI):
             stale_keys = [k for k in app.state.watched_peers if k[0] == session_hex]
             for k in stale_keys:
                 app.state.watched_peers.pop(k, None)
+            _release_ntfy_berth(app, berth_id_hex)
             logger.info(f"Removed expired session {session_hex[:8]} from watcher")
         except Exception as exc:
             logger.warning(f"Peer watcher error for {teammate_id_hex[:8]}: {exc}")
@@ -506,27 +605,81 @@ async def _peer_watcher_loop(app: FastAPI):
         _watcher_pass(app)
 
 
-async def _ntfy_listener_loop(app: FastAPI, ntfy_url: str, berth_id_hex: str):
-    """Async task: subscribe to ntfy SSE for a berth and trigger watcher passes on push.
+def _start_lan_service(app: FastAPI, settings: Settings):
+    """Start LAN exchange and attach it to the backend.
+
+    Authentication uses each team's certificate history: a request is served
+    only when signed by a device key trusted for the berth's team.
+    """
+    root_dir = app.state.backend.root_dir
+
+    def signer(participant_hex, team_name):
+        return Provisioning.get_current_team_device_key(root_dir, participant_hex, team_name)
+
+    def trusted_keys(participant_hex, team_name):
+        by_teammate = Provisioning.get_trusted_device_keys_by_teammate(
+            root_dir, participant_hex, team_name
+        )
+        return [key for keys in by_teammate.values() for key in keys]
+
+    service = LanService(
+        root_dir,
+        signer=signer,
+        trusted_keys=trusted_keys,
+        port=settings.lan_port,
+        discovery_port=settings.lan_discovery_port,
+        max_spool_bytes=settings.lan_spool_max_bytes,
+    )
+    service.start()
+    app.state.backend.lan = service
+    app.state.logger.info(
+        f"LAN exchange on port {service.server.port}, "
+        f"discovery on {settings.lan_discovery_port}"
+    )
+    return service
+
+
+NTFY_TOPIC_PREFIX = "ss-"
+
+
+async def _ntfy_listener_loop(
+    app: FastAPI, ntfy_url: str, berth_ids: frozenset, since: Optional[int] = None
+):
+    """Async task: one ntfy SSE subscription for every watched berth on a server.
+
+    ntfy takes comma-separated topics, so a single connection carries every
+    berth's topic; each push is routed to a watcher pass over just the berth
+    its topic names. The task is replaced whenever the server's set of
+    berths changes (see _restart_ntfy_listener). since replays what was
+    published while the previous connection was down.
 
     Reconnects automatically on error with a 5-second back-off. Runs until
     cancelled (e.g. on Hub shutdown).
     """
+    import time
+
     from small_sea_hub.adapters.ntfy import SmallSeaNtfyAdapter
 
     logger = app.state.logger
-    topic = f"ss-{berth_id_hex}"
-    logger.info(f"ntfy listener starting: {ntfy_url}/{topic}")
-    adapter = SmallSeaNtfyAdapter(ntfy_url, topic)
+    topics = ",".join(NTFY_TOPIC_PREFIX + berth_id_hex for berth_id_hex in sorted(berth_ids))
+    logger.info(f"ntfy listener starting: {ntfy_url} ({len(berth_ids)} berths)")
+    adapter = SmallSeaNtfyAdapter(ntfy_url, topics)
     while True:
         try:
-            async for _msg in adapter.subscribe():
-                logger.debug(f"ntfy push received on {topic}, running watcher pass")
-                _watcher_pass(app)
+            async for msg in adapter.subscribe(since=since):
+                since = None
+                topic = msg.get("topic", "")
+                berth_id_hex = topic[len(NTFY_TOPIC_PREFIX):]
+                if not topic.startswith(NTFY_TOPIC_PREFIX) or berth_id_hex not in berth_ids:
+                    continue
+                logger.debug(f"ntfy push received on {topic}, checking berth {berth_id_hex[:8]}")
+                _watcher_pass(app, berth_ids={berth_id_hex})
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            logger.warning(f"ntfy listener error ({topic}), reconnecting in 5s: {exc}")
+            logger.warning(f"ntfy listener error ({ntfy_url}), reconnecting in 5s: {exc}")
+            if since is None:
+                since = int(time.time())
             await asyncio.sleep(5)
 
 
@@ -539,6 +692,8 @@ async def lifespan(app: FastAPI):
             auto_approve_sessions=settings.auto_approve_sessions,
             sandbox_mode=settings.sandbox_mode,
             log_level=settings.log_level,
+            object_cache_max_bytes=settings.object_cache_max_bytes,
+            signal_coalesce_window=settings.signal_coalesce_window,
         )
     if not hasattr(app.state, "watched_sessions"):
         app.state.watched_sessions = {}   # session_hex → {berth_id_hex, team_db_path}
@@ -553,7 +708,9 @@ async def lifespan(app: FastAPI):
     if not hasattr(app.state, "watcher_interval"):
         app.state.watcher_interval = Settings().watcher_interval
     if not hasattr(app.state, "ntfy_listener_tasks"):
-        app.state.ntfy_listener_tasks = {}  # berth_id_hex → asyncio.Task
+        app.state.ntfy_listener_tasks = {}  # ntfy server url → asyncio.Task
+    if not hasattr(app.state, "ntfy_berths"):
+        app.state.ntfy_berths = {}  # ntfy server url → set of berth_id_hex
     app.state.logger = app.state.backend.logger
     logger = app.state.backend.logger
     logger.info("Starting up...")
@@ -565,17 +722,65 @@ async def lifespan(app: FastAPI):
 
     watcher_task = asyncio.create_task(_peer_watcher_loop(app))
 
+    lan_service = None
+    settings = Settings()
+    if settings.lan_enabled and app.state.backend.lan is None:
+        try:
+            lan_service = _start_lan_service(app, settings)
+        except OSError as exc:
+            logger.warning(f"LAN exchange disabled: {exc}")
+
     yield
 
     watcher_task.cancel()
+    if lan_service is not None:
+        lan_service.stop()
+        app.state.backend.lan = None
     for task in app.state.ntfy_listener_tasks.values():
         task.cancel()
+    executor = getattr(app.state, "backend_executor", None)
+    if executor is not None:
+        executor.shutdown()
+        del app.state.backend_executor
     logger.info("Shutting down...")
 
 
 app = FastAPI(lifespan=lifespan)
 
 
+def _backend_executor(app: FastAPI) -> BackendExecutor:
+    """The executor for blocking backend calls, created on first use.
+
+    Created lazily rather than in the lifespan so tests that skip the
+    lifespan still get one.
+    """
+    executor = getattr(app.state, "backend_executor", None)
+    if executor is None:
+        settings = Settings()
+        executor = BackendExecutor(
+            workers=settings.backend_workers,
+            berth_concurrency=settings.berth_concurrency,
+            provider_concurrency=settings.provider_concurrency,
+        )
+        app.state.backend_executor = executor
+    return executor
+
+
+async def _run_blocking(func, *args, lanes=(), **kwargs):
+    return await _backend_executor(app).run(func, *args, lanes=lanes, **kwargs)
+
+
+async def _transfer_lanes(session_hex: str, teammate_id_hex: Optional[str] = None):
+    """Lanes for a transfer made by this session: its berth, plus its own
+    provider or, for a teammate's object, that teammate."""
+    berth_id_hex, protocol = await _run_blocking(
+        app.state.backend.transfer_route, session_hex
+    )
+    if teammate_id_hex is not None:
+        return [("berth", berth_id_hex), ("peer", teammate_id_hex)]
+    return [("berth", berth_id_hex), ("provider", protocol)]
+
+
 @app.exception_handler(SmallSeaNotFoundExn)
 async def not_found_handler(request: Request, exc: SmallSeaNotFoundExn):
     return JSONResponse(status_code=404, content={"detail": str(exc)})
@@ -643,24 +848,63 @@ class SessionRequestReq(pydantic.BaseModel):
 
 
 def _maybe_start_ntfy_listener(app: FastAPI, ss_session, berth_id_hex: str):
-    """Start an ntfy SSE listener task for a berth if ntfy is configured and not already running."""
+    """Add a berth to its ntfy server's listener if ntfy is configured and it is not already there."""
     ntfy_listener_tasks = getattr(app.state, "ntfy_listener_tasks", None)
     if ntfy_listener_tasks is None:
         return
-    if berth_id_hex in ntfy_listener_tasks:
-        return  # already running for this berth
     try:
         adapter = app.state.backend._make_notification_adapter(ss_session)
         ntfy_url = adapter.base_url
     except Exception:
         return  # no ntfy configured — polling only
     try:
-        loop = asyncio.get_running_loop()
+        asyncio.get_running_loop()
     except RuntimeError:
         return  # not in an async context (e.g. tests that skip lifespan)
-    task = loop.create_task(_ntfy_listener_loop(app, ntfy_url, berth_id_hex))
-    ntfy_listener_tasks[berth_id_hex] = task
-    app.state.logger.info(f"ntfy listener task started for berth {berth_id_hex[:8]}")
+    if not hasattr(app.state, "ntfy_berths"):
+        app.state.ntfy_berths = {}
+    berths = app.state.ntfy_berths.setdefault(ntfy_url, set())
+    if berth_id_hex in berths and ntfy_url in ntfy_listener_tasks:
+        return  # already subscribed for this berth
+    berths.add(berth_id_hex)
+    _restart_ntfy_listener(app, ntfy_url)
+    app.state.logger.info(f"ntfy listener now covers berth {berth_id_hex[:8]}")
+
+
+def _release_ntfy_berth(app: FastAPI, berth_id_hex: str):
+    """Drop a berth from its ntfy listener once no watched session is on it."""
+    if any(
+        info.get("berth_id_hex") == berth_id_hex
+        for info in app.state.watched_sessions.values()
+    ):
+        return
+    for ntfy_url, berths in list(getattr(app.state, "ntfy_berths", {}).items()):
+        if berth_id_hex in berths:
+            berths.discard(berth_id_hex)
+            _restart_ntfy_listener(app, ntfy_url)
+
+
+def _restart_ntfy_listener(app: FastAPI, ntfy_url: str):
+    """Replace a server's listener task with one for its current berths."""
+    import time
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    ntfy_listener_tasks = app.state.ntfy_listener_tasks
+    since = None
+    previous = ntfy_listener_tasks.pop(ntfy_url, None)
+    if previous is not None:
+        previous.cancel()
+        since = int(time.time())  # replay what lands during the swap
+    berths = app.state.ntfy_berths.get(ntfy_url)
+    if not berths:
+        app.state.ntfy_berths.pop(ntfy_url, None)
+        return
+    ntfy_listener_tasks[ntfy_url] = loop.create_task(
+        _ntfy_listener_loop(app, ntfy_url, frozenset(berths), since)
+    )
 
 
 def _register_session_peers(session_hex: str):
@@ -687,6 +931,7 @@ def _register_session_peers(session_hex: str):
                 "berth_id_hex": berth_id_hex,
                 "team_db_path": None,
                 "team_db_revision": None,
+                "trust_revision": None,
                 "linked_device_notification_revision": None,
                 "linked_device_notification_retry_needed": False,
                 "self_signal_etag": etag,
@@ -704,6 +949,7 @@ def _register_session_peers(session_hex: str):
             "berth_id_hex": berth_id_hex,
             "team_db_path": team_db_path,
             "team_db_revision": None,
+            "trust_revision": None,
             "linked_device_notification_revision": None,
             "linked_device_notification_retry_needed": False,
             "self_signal_etag": None,
@@ -894,7 +1140,10 @@ async def session_peers(session_hex: str = Depends(_require_session)):
     berth_id_hex = ss_session.berth_id.hex()
     peer_counts = getattr(app.state, "peer_counts", {})
     peers = []
-    for peer in small_sea.list_peers(session_hex):
+    listed = await _run_blocking(
+        small_sea.list_peers, session_hex, lanes=[("berth", berth_id_hex)]
+    )
+    for peer in listed:
         teammate_id_hex = peer["teammate_id"]
         name = peer.get("name")
         peers.append(
@@ -953,9 +1202,15 @@ async def upload_to_cloud(
 
     small_sea = app.state.backend
     decoded_data = base64.b64decode(req.data)
+    lanes = await _transfer_lanes(session_hex)
     try:
-        ok, etag, msg = small_sea.upload_to_cloud(
-            session_hex, req.path, decoded_data, expected_etag=req.expected_etag
+        ok, etag, msg = await _run_blocking(
+            small_sea.upload_to_cloud,
+            session_hex,
+            req.path,
+            decoded_data,
+            expected_etag=req.expected_etag,
+            lanes=lanes,
         )
     except CloudStorageRequiredExn as exn:
         return _cloud_storage_required_response(exn)
@@ -967,37 +1222,66 @@ async def upload_to_cloud(
             )
         raise HTTPException(status_code=500, detail=str(msg))
     if req.notify:
-        _logger = getattr(app.state, "logger", None)
-        try:
-            new_count = small_sea._bump_signal(session_hex)
-        except Exception as exc:
-            new_count = None
-            if _logger:
-                _logger.warning(f"_bump_signal failed: {exc}")
-        # Pulse the local berth event so other sessions on this berth
-        # (e.g. a second browser tab) are also notified.
-        try:
-            ss_session = small_sea._lookup_session(session_hex)
-            if (
-                new_count is not None
-                and ss_session.team_name == "NoteToSelf"
-                and session_hex in getattr(app.state, "watched_sessions", {})
-            ):
-                app.state.watched_sessions[session_hex]["ignore_self_signal_count"] = new_count
-            _pulse_berth_event(app, ss_session.berth_id.hex())
-        except Exception as exc:
-            if _logger:
-                _logger.warning(f"local berth pulse failed: {exc}")
+        await _notify_after_upload(session_hex, lanes)
     return {"ok": True, "etag": etag, "message": msg}
 
 
+async def _notify_after_upload(session_hex: str, lanes, alone: bool = False):
+    """Bump signals.yaml for teammates and wake this berth's local watchers."""
+    small_sea = app.state.backend
+    _logger = getattr(app.state, "logger", None)
+    try:
+        new_count = await _run_blocking(
+            small_sea._bump_signal, session_hex, alone=alone, lanes=lanes
+        )
+    except Exception as exc:
+        new_count = None
+        if _logger:
+            _logger.warning(f"_bump_signal failed: {exc}")
+    # Pulse the local berth event so other sessions on this berth
+    # (e.g. a second browser tab) are also notified.
+    try:
+        ss_session = small_sea._lookup_session(session_hex)
+        if (
+            new_count is not None
+            and ss_session.team_name == "NoteToSelf"
+            and session_hex in getattr(app.state, "watched_sessions", {})
+        ):
+            app.state.watched_sessions[session_hex]["ignore_self_signal_count"] = new_count
+        _pulse_berth_event(app, ss_session.berth_id.hex())
+    except Exception as exc:
+        if _logger:
+            _logger.warning(f"local berth pulse failed: {exc}")
+
+
+@app.post("/signals/bump")
+async def bump_signal(session_hex: str = Depends(_require_session)):
+    """Notify teammates of a change made without a notifying write.
+
+    Cod Sync calls this when a chain's head moved but the head manifest
+    write that would have carried the signal failed. The bump is never
+    folded into another: a reader that sees more bumps than moved manifest
+    entries knows the manifest lags. Best effort, like the notify flag on
+    uploads.
+    """
+    await _notify_after_upload(
+        session_hex, await _transfer_lanes(session_hex), alone=True
+    )
+    return {"ok": True}
+
+
 @app.get("/cloud_file")
 async def download_from_cloud(path: str, session_hex: str = Depends(_require_session)):
     import base64
 
     small_sea = app.state.backend
     try:
-        ok, data, etag = small_sea.download_from_cloud(session_hex, path)
+        ok, data, etag = await _run_blocking(
+            small_sea.download_from_cloud,
+            session_hex,
+            path,
+            lanes=await _transfer_lanes(session_hex),
+        )
     except CloudStorageRequiredExn as exn:
         return _cloud_storage_required_response(exn)
     if not ok:
@@ -1005,10 +1289,147 @@ async def download_from_cloud(path: str, session_hex: str = Depends(_require_ses
     return {"ok": True, "data": base64.b64encode(data).decode(), "etag": etag}
 
 
+# ---- Batches ----
+
+BATCH_MAX_ITEMS = 64
+
+
+def _download_failure_item(path: str, failure) -> dict:
+    """Per-item form of _download_failure_response."""
+    if getattr(failure, "absent", False):
+        return {"path": path, "status": 404, "error": "not_found", "detail": str(failure)}
+    return {
+        "path": path,
+        "status": 502,
+        "error": "cloud_provider_failure",
+        "detail": str(failure),
+    }
+
+
+class BatchReadReq(pydantic.BaseModel):
+    paths: list[str]
+    teammate_id: Optional[str] = None  # read a teammate's objects, as /peer_cloud_file
+    source: str = "cloud"
+
+
+@app.post("/cloud_files/read")
+async def batch_read(req: BatchReadReq, session_hex: str = Depends(_require_session)):
+    """Read several objects in one request.
+
+    Session, storage and announcement checks run once for the batch, and the
+    provider reads run concurrently within the berth's executor lanes. Each
+    result carries the status the single-object endpoint would have
+    returned: 200 with data and etag, 404 for a confirmed-absent object, 502
+    for a failed read, 409 peer_storage_unknown when the teammate has no
+    known storage.
+    """
+    import base64
+
+    if len(req.paths) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} paths")
+    if req.source not in ("cloud", "auto"):
+        raise HTTPException(status_code=400, detail=f"Unknown source: {req.source}")
+    small_sea = app.state.backend
+    try:
+        if req.teammate_id is None:
+            reader = await _run_blocking(small_sea.cloud_reader, session_hex)
+        else:
+            reader = await _run_blocking(
+                small_sea.peer_reader, session_hex, req.teammate_id, source=req.source
+            )
+    except CloudStorageRequiredExn as exn:
+        return _cloud_storage_required_response(exn)
+    lanes = await _transfer_lanes(session_hex, req.teammate_id)
+
+    async def read_one(path):
+        try:
+            ok, data, etag, *served_by = await _run_blocking(reader, path, lanes=lanes)
+        except SmallSeaNotFoundExn as exn:
+            return {
+                "path": path,
+                "status": 409,
+                "error": "peer_storage_unknown",
+                "detail": str(exn),
+            }
+        except Exception as exn:
+            return {"path": path, "status": 500, "error": "read_failed", "detail": str(exn)}
+        if not ok:
+            return _download_failure_item(path, etag)
+        item = {
+            "path": path,
+            "status": 200,
+            "data": base64.b64encode(data).decode(),
+            "etag": etag,
+        }
+        if served_by:
+            item["source"] = served_by[0]
+        return item
+
+    return {"results": await asyncio.gather(*(read_one(path) for path in req.paths))}
+
+
+class BatchWriteItem(pydantic.BaseModel):
+    path: str
+    data: str  # base64-encoded
+    expected_etag: Optional[str] = None
+
+
+class BatchWriteReq(pydantic.BaseModel):
+    items: list[BatchWriteItem]
+    notify: bool = False  # bump signals.yaml once if any write landed
+
+
+@app.post("/cloud_files/write")
+async def batch_write(req: BatchWriteReq, session_hex: str = Depends(_require_session)):
+    """Write several objects in one request, each with its own CAS condition.
+
+    Writes are independent and run concurrently: callers that need one
+    object visible before another (a head after the bundle it names) must
+    put them in separate requests. Each result is 200 with the new etag,
+    409 cas_conflict, or 500.
+    """
+    import base64
+
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} items")
+    small_sea = app.state.backend
+    try:
+        writer = await _run_blocking(small_sea.cloud_writer, session_hex)
+    except CloudStorageRequiredExn as exn:
+        return _cloud_storage_required_response(exn)
+    lanes = await _transfer_lanes(session_hex)
+
+    async def write_one(item):
+        try:
+            ok, etag, msg = await _run_blocking(
+                writer,
+                item.path,
+                base64.b64decode(item.data),
+                item.expected_etag,
+                lanes=lanes,
+            )
+        except Exception as exn:
+            return {"path": item.path, "status": 500, "error": "upload_failed", "detail": str(exn)}
+        if ok:
+            return {"path": item.path, "status": 200, "etag": etag}
+        if getattr(msg, "cas_conflict", False):
+            return {"path": item.path, "status": 409, "error": "cas_conflict", "detail": str(msg)}
+        return {"path": item.path, "status": 500, "error": "upload_failed", "detail": str(msg)}
+
+    results = await asyncio.gather(*(write_one(item) for item in req.items))
+    if req.notify and any(result["status"] == 200 for result in results):
+        await _notify_after_upload(session_hex, lanes)
+    return {"results": results}
+
+
 @app.post("/cloud/setup")
 async def cloud_setup(session_hex: str = Depends(_require_session)):
     try:
-        outcome = app.state.backend.materialize_for_session(session_hex)
+        outcome = await _run_blocking(
+            app.state.backend.materialize_for_session,
+            session_hex,
+            lanes=await _transfer_lanes(session_hex),
+        )
     except CloudStorageRequiredExn as exn:
         return _cloud_storage_required_response(exn)
     return {
@@ -1021,13 +1442,29 @@ async def cloud_setup(session_hex: str = Depends(_require_session)):
 async def download_peer_cloud_file(
     teammate_id: str,
     path: str,
+    source: str = "cloud",
     session_hex: str = Depends(_require_session),
 ):
+    """Read a teammate's object.
+
+    source="auto" lets an immutable object come from a LAN Hub; the response's
+    "source" says where it came from, so a client that finds LAN bytes wrong
+    can re-read with source="cloud".
+    """
     import base64
 
+    if source not in ("cloud", "auto"):
+        raise HTTPException(status_code=400, detail=f"Unknown source: {source}")
     small_sea = app.state.backend
     try:
-        ok, data, etag = small_sea.download_from_peer(session_hex, teammate_id, path)
+        ok, data, etag, served_by = await _run_blocking(
+            small_sea.download_from_peer_via,
+            session_hex,
+            teammate_id,
+            path,
+            source=source,
+            lanes=await _transfer_lanes(session_hex, teammate_id),
+        )
     except SmallSeaNotFoundExn as exn:
         # No known storage for this peer is a routing gap, not an absent
         # object: the peer may well have published.
@@ -1037,7 +1474,12 @@ async def download_peer_cloud_file(
         )
     if not ok:
         return _download_failure_response(path, etag)
-    return {"ok": True, "data": base64.b64encode(data).decode(), "etag": etag}
+    return {
+        "ok": True,
+        "data": base64.b64encode(data).decode(),
+        "etag": etag,
+        "source": served_by,
+    }
 
 
 @app.get("/cloud_proxy")
@@ -1058,7 +1500,18 @@ async def proxy_cloud_file(
     import base64
 
     small_sea = app.state.backend
-    ok, data, etag = small_sea.proxy_cloud_file(session_hex, protocol, url, bucket, path)
+    berth_id_hex, _own_protocol = await _run_blocking(
+        small_sea.transfer_route, session_hex
+    )
+    ok, data, etag = await _run_blocking(
+        small_sea.proxy_cloud_file,
+        session_hex,
+        protocol,
+        url,
+        bucket,
+        path,
+        lanes=[("berth", berth_id_hex), ("provider", protocol)],
+    )
     if not ok:
         return _download_failure_response(path, etag)
     return {"ok": True, "data": base64.b64encode(data).decode(), "etag": etag}
@@ -1071,7 +1524,9 @@ async def bootstrap_cloud_file(
 ):
     import base64
 
-    ok, data, etag = app.state.backend.bootstrap_cloud_file(session_hex, path)
+    ok, data, etag = await _run_blocking(
+        app.state.backend.bootstrap_cloud_file, session_hex, path
+    )
     if not ok:
         return _download_failure_response(path, etag)
     return {"ok": True, "data": base64.b64encode(data).decode(), "etag": etag}
@@ -1084,7 +1539,12 @@ async def get_peer_signal(
     if_none_match: Optional[str] = Header(default=None),
 ):
     small_sea = app.state.backend
-    signals, etag = small_sea.get_peer_signal(session_hex, teammate_id)
+    signals, etag = await _run_blocking(
+        small_sea.get_peer_signal,
+        session_hex,
+        teammate_id,
+        lanes=await _transfer_lanes(session_hex, teammate_id),
+    )
     if signals is None:
         raise HTTPException(status_code=404, detail="No signal file found for peer")
     if if_none_match and etag == if_none_match:
@@ -1153,6 +1613,89 @@ async def watch_notifications(
     return _check()
 
 
+STREAM_KEEPALIVE = 15  # seconds between comment lines on an idle stream
+
+
+def _stream_registry(app: FastAPI) -> StreamRegistry:
+    registry = getattr(app.state, "notification_streams", None)
+    if registry is None:
+        registry = app.state.notification_streams = StreamRegistry()
+    return registry
+
+
+def _berth_peer_counts(app: FastAPI, berth_id_hex: str) -> dict:
+    return {
+        teammate_id_hex: count
+        for (bid, teammate_id_hex), count in getattr(app.state, "peer_counts", {}).items()
+        if bid == berth_id_hex
+    }
+
+
+def _sse_event(event: dict) -> str:
+    import json
+
+    return f"id: {event['cursor']}\nevent: counts\ndata: {json.dumps(event)}\n\n"
+
+
+@app.get("/notifications/stream")
+async def stream_notifications(
+    cursor: Optional[str] = None,
+    max_duration: Optional[float] = None,
+    last_event_id: Optional[str] = Header(None),
+    session_hex: str = Depends(_require_session),
+):
+    """Server-sent events with this berth's peer and self signal counts.
+
+    The first event of a new subscription is a snapshot of every count the
+    Hub knows for the berth; each later event carries only the counts that
+    grew, as they grow. Every event's id is a cursor: reconnecting with it
+    (as ?cursor= or a Last-Event-ID header) resumes the subscription, so
+    nothing raised while disconnected is lost. The session is checked once,
+    when the stream opens. max_duration ends the stream after that many
+    seconds, for callers that would rather reconnect than hold it open.
+    """
+    ss_session = app.state.backend._lookup_session(session_hex)
+    berth_id_hex = ss_session.berth_id.hex()
+    registry = _stream_registry(app)
+    subscriber, replay = registry.open(berth_id_hex, session_hex, cursor or last_event_id)
+    if not hasattr(app.state, "peer_signal_events"):
+        app.state.peer_signal_events = {}
+    loop = asyncio.get_running_loop()
+    deadline = None if max_duration is None else loop.time() + max_duration
+
+    async def events():
+        try:
+            for event in replay:
+                yield _sse_event(event)
+            while True:
+                # Take the event before reading the counts, so a pulse that
+                # lands in between still wakes the wait below.
+                wake = app.state.peer_signal_events.setdefault(berth_id_hex, asyncio.Event())
+                event = subscriber.advance(
+                    _berth_peer_counts(app, berth_id_hex),
+                    getattr(app.state, "self_signal_counts", {}).get(berth_id_hex, 0),
+                )
+                if event is not None:
+                    yield _sse_event(event)
+                wait = STREAM_KEEPALIVE
+                if deadline is not None:
+                    wait = min(wait, deadline - loop.time())
+                    if wait <= 0:
+                        return
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            registry.close(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 class SendNotificationReq(pydantic.BaseModel):
     message: str
     title: Optional[str] = None
@@ -1163,8 +1706,8 @@ async def send_notification(
     req: SendNotificationReq, session_hex: str = Depends(_require_session)
 ):
     small_sea = app.state.backend
-    ok, msg_id, err = small_sea.send_notification(
-        session_hex, req.message, title=req.title
+    ok, msg_id, err = await _run_blocking(
+        small_sea.send_notification, session_hex, req.message, title=req.title
     )
     if not ok:
         raise HTTPException(status_code=500, detail=err)
@@ -1178,5 +1721,33 @@ async def poll_notifications(
     timeout: int = 30,
 ):
     small_sea = app.state.backend
-    messages = small_sea.poll_notifications(session_hex, since=since, timeout=timeout)
+    # A long poll holds its thread until timeout, so it takes a slot in the
+    # notification lane rather than one of its berth's transfer slots.
+    messages = await _run_blocking(
+        small_sea.poll_notifications,
+        session_hex,
+        since=since,
+        timeout=timeout,
+        lanes=[("notifications", "poll")],
+    )
     return {"ok": True, "messages": messages}
+
+
+# ---- Diagnostics ----
+
+
+@app.get("/backend/queue")
+async def backend_queue(session_hex: str = Depends(_require_session)):
+    """Running and queued backend calls, overall and per lane of this berth."""
+    ss_session = app.state.backend._lookup_session(session_hex)
+    return _backend_executor(app).stats(berth=ss_session.berth_id.hex())
+
+
+@app.get("/backend/cache")
+async def backend_cache(session_hex: str = Depends(_require_session)):
+    """Object cache size, hit ratio, bytes saved and evictions."""
+    app.state.backend._lookup_session(session_hex)
+    cache = app.state.backend.object_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
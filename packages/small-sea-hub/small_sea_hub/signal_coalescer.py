@@ -0,0 +1,186 @@
+"""Coalesce signals.yaml bumps per berth.
+
+Every notifying upload and every runtime artifact used to rewrite the
+berth's counter in signals.yaml on its own: a download, a CAS upload (with
+retries on conflict) and an ntfy publish each. A burst of N uploads meant N
+rewrites and N pushes, though teammates only need to learn that something
+changed. SignalCoalescer gathers the bumps that arrive for a berth within a
+short window into one batch and writes the batch as a single increment,
+with a single push.
+
+A bump is never folded into a write that has already read signals.yaml:
+while a batch is being written, new bumps start the next batch, and only
+one batch per berth is written at a time. A batch whose write fails, by
+losing every CAS retry or by raising, is never dropped: it is carried into
+the berth's next batch and retried after a backoff, from the berth's other
+sessions first when the write raised, since the session that wrote it may
+have closed.
+
+Callers either wait for the batch holding their bump to be written and get
+the new count, or leave it to be written when the window closes. flush()
+writes a berth's pending batch at once.
+"""
+
+import threading
+
+DEFAULT_WINDOW = 0.1  # seconds a batch stays open for more bumps
+RETRY_DELAY = 5.0  # seconds before a carried batch is first retried
+MAX_RETRY_DELAY = 300.0  # the backoff stops doubling here
+
+
+class _Batch:
+    def __init__(self):
+        self.bumps = 0
+        self.carries = 0
+        self.sessions = []  # sessions that bumped it, the one to write from last
+        self.timer = None
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    @property
+    def session_hex(self):
+        return self.sessions[-1]
+
+    def add_session(self, session_hex):
+        # The most recent session is likeliest still open.
+        if session_hex in self.sessions:
+            self.sessions.remove(session_hex)
+        self.sessions.append(session_hex)
+
+
+class SignalCoalescer:
+    def __init__(self, write, window: float = DEFAULT_WINDOW, logger=None):
+        self._write = write  # write(session_hex) → new count, or None on give-up
+        self.window = window
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._pending: dict = {}  # key → open _Batch
+        self._writing: dict = {}  # key → lock held while that key's batch is written
+        self.bumps = 0
+        self.writes = 0
+
+    def bump(self, key, session_hex: str, wait: bool = True, alone: bool = False):
+        """Add one bump to key's open batch.
+
+        With wait, block until that batch is written and return the count
+        it wrote, or None (or the error raised) if that write failed and the
+        bump was carried into a retry; otherwise return None at once and let
+        the window close the batch.
+
+        alone writes the bump at once as an increment of its own, after the
+        berth's pending batch, for a reader that counts increments (see
+        `/signals/bump`). It always waits.
+        """
+        if alone:
+            return self._bump_alone(key, session_hex)
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch()
+                self._arm(key, batch, self.window)
+            batch.bumps += 1
+            batch.add_session(session_hex)
+            self.bumps += 1
+        if not wait:
+            return None
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.result
+
+    def flush(self, key):
+        """Write key's pending batch now.
+
+        Returns the new count, or None if none was pending or the write
+        failed, in which case the batch stays pending for a retry.
+        """
+        with self._writing_lock(key):
+            return self._flush_locked(key)
+
+    def _bump_alone(self, key, session_hex: str):
+        batch = _Batch()
+        batch.bumps = 1
+        batch.add_session(session_hex)
+        with self._writing_lock(key):
+            # Bumps already waiting get their own increment first; any that
+            # arrive meanwhile open a batch this one never joins.
+            self._flush_locked(key)
+            with self._lock:
+                self.bumps += 1
+            result = self._write_batch(key, batch)
+        if batch.error is not None:
+            raise batch.error
+        return result
+
+    def _flush_locked(self, key):
+        with self._lock:
+            batch = self._pending.pop(key, None)
+        if batch is None:
+            return None
+        if batch.timer is not None:
+            batch.timer.cancel()
+        return self._write_batch(key, batch)
+
+    def _write_batch(self, key, batch: _Batch):
+        try:
+            result = self._write(batch.session_hex)
+        except Exception as exc:
+            batch.error = exc
+            # Try the berth's other sessions before this one again.
+            batch.sessions.insert(0, batch.sessions.pop())
+            self._carry(key, batch)
+            batch.done.set()
+            return None
+        with self._lock:
+            self.writes += 1
+        if result is None:
+            self._carry(key, batch)
+        batch.result = result
+        batch.done.set()
+        return result
+
+    def _carry(self, key, failed: _Batch):
+        delay = min(RETRY_DELAY * 2**failed.carries, MAX_RETRY_DELAY)
+        if self.logger:
+            self.logger.warning(
+                f"signal bump for {key} not written; retrying in {delay:.0f}s"
+            )
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch()
+                self._arm(key, batch, delay)
+            batch.bumps += failed.bumps
+            batch.carries = max(batch.carries, failed.carries + 1)
+            # Sessions that bumped since the failure stay preferred.
+            batch.sessions = [
+                s for s in failed.sessions if s not in batch.sessions
+            ] + batch.sessions
+
+    def _arm(self, key, batch: _Batch, delay: float):
+        batch.timer = threading.Timer(delay, self._flush_quietly, args=(key,))
+        batch.timer.daemon = True
+        batch.timer.start()
+
+    def _flush_quietly(self, key):
+        try:
+            self.flush(key)
+        except Exception as exc:
+            if self.logger:
+                self.logger.warning(f"signal flush for {key} failed: {exc}")
+
+    def _writing_lock(self, key) -> threading.Lock:
+        with self._lock:
+            lock = self._writing.get(key)
+            if lock is None:
+                lock = self._writing[key] = threading.Lock()
+            return lock
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "bumps": self.bumps,
+                "writes": self.writes,
+                "pending": sum(batch.bumps for batch in self._pending.values()),
+            }
@@ -0,0 +1,73 @@
+"""Codec for a berth's signals.yaml.
+
+The file is a flat mapping from berth id hex to a push counter, plus a
+`version` key:
+
+    0123456789abcdef0123456789abcdef: 7
+    version: 1
+
+The watcher reads every watched peer's copy each pass and `_bump_signal`
+rewrites our own on every notifying upload, so the common shape skips PyYAML
+entirely. Anything outside that shape goes through PyYAML (libyaml when
+available), and the fast path is byte-identical to `yaml.dump` on the shapes
+it accepts.
+"""
+
+import re
+
+import yaml
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_KEY = re.compile(r"[A-Za-z0-9_]+\Z")
+_LINE = re.compile(r"(?P<key>'[A-Za-z0-9_]+'|[A-Za-z0-9_]+): (?P<count>0|[1-9][0-9]*)\Z")
+_STR_TAG = "tag:yaml.org,2002:str"
+_resolver = yaml.resolver.Resolver()
+
+
+def _plain_is_str(value: str) -> bool:
+    return _resolver.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+
+
+def _fast_decode(text: str):
+    if not text.endswith("\n"):
+        return None
+    signals = {}
+    for line in text[:-1].split("\n"):
+        match = _LINE.match(line)
+        if match is None:
+            return None
+        key = match["key"]
+        if key.startswith("'"):
+            key = key[1:-1]
+        elif not _plain_is_str(key):
+            return None
+        if key in signals:
+            return None
+        signals[key] = int(match["count"])
+    return signals
+
+
+def decode_signals(data: bytes) -> dict:
+    """Return the counters in signals.yaml bytes; anything unreadable is empty."""
+    text = data.decode("utf-8")
+    signals = _fast_decode(text)
+    if signals is None:
+        signals = yaml.load(text, Loader=_YAML_LOADER) or {}
+    if not isinstance(signals, dict):
+        signals = {}
+    return signals
+
+
+def encode_signals(signals: dict) -> bytes:
+    """Serialize counters exactly as `yaml.dump(..., default_flow_style=False)`."""
+    if not signals or not all(
+        type(key) is str and _KEY.match(key) and type(value) is int and value >= 0
+        for key, value in signals.items()
+    ):
+        return yaml.dump(signals, default_flow_style=False).encode("utf-8")
+    lines = []
+    for key in sorted(signals):
+        rendered = key if _plain_is_str(key) else f"'{key}'"
+        lines.append(f"{rendered}: {signals[key]}\n")
+    return "".join(lines).encode("utf-8")
@@ -0,0 +1,70 @@
+"""Share one in-flight provider read among concurrent identical requests.
+
+Several apps and sessions on a device often ask the Hub for the same object
+at the same moment: the Manager and Files both reading a teammate's
+latest-link after one notification, or a watcher pass and an app both
+reading signals.yaml. SmallSeaBackend runs each such read through a
+SingleFlight keyed by (location, path, mode). The first caller makes the
+provider round trip; callers that arrive while it is in flight wait for it
+and get the same result.
+
+Nothing is kept once the read finishes, so a read that starts afterwards
+always goes to the provider. Only the raw provider bytes are shared: each
+caller still decrypts for its own session. `forget` stops new callers from
+joining reads of a path this device has just written, so a read that
+begins after a write never gets bytes fetched before it.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self.started = 0  # reads that went to the provider
+        self.joined = 0  # reads served by another caller's round trip
+
+    def do(self, key, func):
+        """func() once per key at a time; concurrent callers share its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.started += 1
+            else:
+                self.joined += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def forget(self, match):
+        """Let no new caller join an in-flight call whose key matches."""
+        with self._lock:
+            for key in [key for key in self._calls if match(key)]:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -1,5 +1,6 @@
 # Top Matter
 
+import hashlib
 import os
 import pathlib
 import shutil
@@ -8,6 +9,10 @@ import tempfile
 import time
 
 import pytest
+import small_sea_hub.backend as SmallSea
+import small_sea_manager.provisioning as Provisioning
+from small_sea_hub.backend import BerthCloudRecord
+from small_sea_hub.cloud_errors import absent, cas_conflict, provider_failure
 
 
 @pytest.fixture(autouse=True)
@@ -126,3 +131,91 @@ def ntfy_server():
     yield {"port": port, "url": url}
 
     subprocess.run(["docker", "rm", "-f", container_name])
+
+
+class FakeCloudAdapter:
+    """A berth's storage as a dict, standing in for a provider adapter.
+
+    ETags are the MD5 of the bytes, as S3 gives for a single-part upload.
+    Every download is recorded, and blocks until gate is set when one is
+    given. Paths in broken fail as a provider outage.
+    """
+
+    def __init__(self, objects=None, gate=None):
+        self.objects = dict(objects or {})
+        self.gate = gate
+        self.broken = set()
+        self.downloads = []
+        self.uploads = []
+
+    def download(self, path):
+        self.downloads.append(path)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if path in self.broken:
+            return False, None, provider_failure("provider down")
+        if path not in self.objects:
+            return False, None, absent("no such object")
+        data = self.objects[path]
+        return True, data, etag_of(data)
+
+    def upload_overwrite(self, path, data):
+        self.uploads.append(path)
+        self.objects[path] = data
+        return True, etag_of(data), "ok"
+
+    def upload_if_match(self, path, data, expected_etag):
+        current = etag_of(self.objects[path]) if path in self.objects else None
+        if current != (None if expected_etag == "*" else expected_etag):
+            return False, None, cas_conflict("ETag mismatch")
+        return self.upload_overwrite(path, data)
+
+
+def etag_of(data):
+    return hashlib.md5(data).hexdigest()
+
+
+class FakeCloudHub:
+    """A Hub backend for "alice" whose berth storage is a FakeCloudAdapter."""
+
+    def __init__(self, backend, adapter):
+        self.backend = backend
+        self.adapter = adapter
+        self.pushes = []
+
+    def session(self, mode="passthrough"):
+        token = self.backend.open_session(
+            "alice", "SmallSeaCollectiveCore", "NoteToSelf", "Smoke Tests", mode=mode
+        )
+        return token.hex()
+
+
+@pytest.fixture()
+def fake_cloud_hub(playground_dir, monkeypatch):
+    """Return make(adapter=None, **backend_kwargs) -> FakeCloudHub.
+
+    Cloud resolution, the storage announcement check and ntfy pushes are
+    patched out, so reads and writes reach only the adapter.
+    """
+
+    def make(adapter=None, **backend_kwargs):
+        backend = SmallSea.SmallSeaBackend(root_dir=playground_dir, **backend_kwargs)
+        Provisioning.create_new_participant(playground_dir, "alice")
+        hub = FakeCloudHub(backend, adapter or FakeCloudAdapter())
+        cloud = BerthCloudRecord(
+            b"alloc", b"berth", "bucket-1", b"cs", "s3", "http://s3.test",
+            "ak", "sk", None, None, None, None, None, None,
+        )
+        monkeypatch.setattr(backend, "_resolve_berth_cloud_or_raise", lambda ss: cloud)
+        monkeypatch.setattr(
+            backend, "_require_own_storage_announcement", lambda ss, c: None
+        )
+        monkeypatch.setattr(
+            backend, "_make_materialized_storage_adapter", lambda ss, c: hub.adapter
+        )
+        monkeypatch.setattr(
+            backend, "_ntfy_publish_signal", lambda ss, count: hub.pushes.append(count)
+        )
+        return hub
+
+    return make
@@ -0,0 +1,191 @@
+"""Tests for the bounded executor that runs blocking backend calls."""
+
+import asyncio
+import base64
+import threading
+import time
+
+import small_sea_hub.backend as SmallSea
+import small_sea_manager.provisioning as Provisioning
+from fastapi.testclient import TestClient
+from small_sea_hub.executor import BackendExecutor
+from small_sea_hub.server import app
+
+
+def _gated_calls(executor, lanes_for_call, n_calls):
+    """Start n_calls blocked calls; report peak concurrency and queue stats."""
+    release = threading.Event()
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def work():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        release.wait(5)
+        with lock:
+            state["running"] -= 1
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(executor.run(work, lanes=lanes_for_call(i)))
+            for i in range(n_calls)
+        ]
+        await asyncio.sleep(0.2)
+        stats = executor.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    return state["peak"], stats
+
+
+def test_berth_lane_bounds_one_berths_calls():
+    executor = BackendExecutor(workers=8, berth_concurrency=2)
+    peak, stats = _gated_calls(executor, lambda i: [("berth", "aa")], 5)
+
+    assert peak == 2
+    assert stats["running"] == 2
+    assert stats["queued"] == 3
+    assert stats["lanes"]["berth"]["aa"] == {"running": 2, "queued": 3, "limit": 2}
+    assert executor.stats()["lanes"] == {}
+    assert executor._lanes == {}
+
+
+def test_provider_lane_spans_berths():
+    executor = BackendExecutor(workers=8, berth_concurrency=4, provider_concurrency=8)
+    peak, stats = _gated_calls(
+        executor,
+        lambda i: [("berth", f"{i:02x}"), ("provider", "dropbox")],
+        6,
+    )
+
+    # dropbox is capped below the default provider limit.
+    assert peak == 4
+    assert stats["lanes"]["provider"]["dropbox"]["queued"] == 2
+
+
+def test_stats_for_a_berth_list_only_its_lanes_and_idle_lanes_go_away():
+    executor = BackendExecutor(workers=8)
+    berths = ["aa", "bb"]
+    release = threading.Event()
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(
+                executor.run(release.wait, 5, lanes=[("berth", b), ("peer", f"p{b}")])
+            )
+            for b in berths
+        ]
+        await asyncio.sleep(0.1)
+        own = executor.stats(berth="aa")
+        release.set()
+        await asyncio.gather(*tasks)
+        return own
+
+    try:
+        own = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert own["lanes"] == {
+        "berth": {"aa": {"running": 1, "queued": 0, "limit": 4}},
+        "peer": {"paa": {"running": 1, "queued": 0, "limit": 8}},
+    }
+    assert executor._lanes == {}
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    executor = BackendExecutor(workers=4, berth_concurrency=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(
+            executor.run(release.wait, 5, lanes=[("berth", "aa")])
+        )
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(executor.run(lambda: None, lanes=[("berth", "aa")]))
+        await asyncio.sleep(0.05)
+        second.cancel()
+        release.set()
+        await first
+        # The slot first held must be free again for a new caller.
+        return await asyncio.wait_for(
+            executor.run(lambda: "ok", lanes=[("berth", "aa")]), timeout=2
+        )
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert executor.stats()["queued"] == 0
+        assert executor._lanes == {}
+    finally:
+        executor.shutdown()
+
+
+def _open_session(client):
+    resp = client.post(
+        "/sessions/request",
+        json={
+            "participant": "alice",
+            "app": "SmallSeaCollectiveCore",
+            "team": "NoteToSelf",
+            "client": "Smoke Tests",
+            "mode": "passthrough",
+        },
+    )
+    result = resp.json()
+    resp = client.post(
+        "/sessions/confirm", json={"pending_id": result["pending_id"], "pin": result["pin"]}
+    )
+    return resp.json()
+
+
+def test_session_info_answers_while_an_upload_blocks(playground_dir, monkeypatch):
+    backend = SmallSea.SmallSeaBackend(root_dir=playground_dir)
+    Provisioning.create_new_participant(playground_dir, "alice")
+    app.state.backend = backend
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_upload(session_hex, path, data, expected_etag=None):
+        started.set()
+        release.wait(10)
+        return True, "etag-1", "ok"
+
+    monkeypatch.setattr(backend, "upload_to_cloud", slow_upload)
+
+    with TestClient(app) as client:
+        session_hex = _open_session(client)
+        headers = {"Authorization": f"Bearer {session_hex}"}
+        upload_result = {}
+
+        def upload():
+            upload_result["resp"] = client.post(
+                "/cloud_file",
+                json={"path": "x", "data": base64.b64encode(b"x").decode()},
+                headers=headers,
+            )
+
+        uploader = threading.Thread(target=upload)
+        uploader.start()
+        try:
+            assert started.wait(5)
+            t0 = time.monotonic()
+            info = client.get("/session/info", headers=headers)
+            assert info.status_code == 200
+            assert time.monotonic() - t0 < 2
+            queue = client.get("/backend/queue", headers=headers).json()
+            assert queue["running"] == 1
+            berth_id_hex = info.json()["berth_id"]
+            assert queue["lanes"]["berth"][berth_id_hex]["running"] == 1
+        finally:
+            release.set()
+            uploader.join(10)
+
+    assert upload_result["resp"].status_code == 200
+    assert upload_result["resp"].json()["etag"] == "etag-1"
@@ -0,0 +1,73 @@
+"""Tests for the batch read and write endpoints."""
+
+import base64
+import hashlib
+
+from fastapi.testclient import TestClient
+from small_sea_hub.server import app
+
+
+def _hub(fake_cloud_hub, monkeypatch, objects):
+    hub = fake_cloud_hub()
+    hub.adapter.objects.update(objects)
+    hub.adapter.broken.add("broken")
+    bumps = []
+    monkeypatch.setattr(
+        hub.backend, "_bump_signal", lambda session_hex, **_kw: bumps.append(1) or 1
+    )
+    app.state.backend = hub.backend
+    return hub.adapter, bumps, {"Authorization": f"Bearer {hub.session()}"}
+
+
+def test_batch_read_reports_each_object(fake_cloud_hub, monkeypatch):
+    adapter, _bumps, headers = _hub(fake_cloud_hub, monkeypatch, {"L-a.yaml": b"link"})
+    client = TestClient(app)
+    resp = client.post(
+        "/cloud_files/read",
+        json={"paths": ["L-a.yaml", "L-missing.yaml", "broken"]},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    found, missing, broken = resp.json()["results"]
+
+    assert found["status"] == 200
+    assert base64.b64decode(found["data"]) == b"link"
+    assert found["etag"] == hashlib.md5(b"link").hexdigest()
+    assert (missing["path"], missing["status"]) == ("L-missing.yaml", 404)
+    assert broken["status"] == 502
+    assert sorted(adapter.downloads) == ["L-a.yaml", "L-missing.yaml", "broken"]
+
+
+def test_batch_read_is_bounded(fake_cloud_hub, monkeypatch):
+    _adapter, _bumps, headers = _hub(fake_cloud_hub, monkeypatch, {})
+    resp = TestClient(app).post(
+        "/cloud_files/read", json={"paths": ["x"] * 65}, headers=headers
+    )
+    assert resp.status_code == 400
+
+
+def test_batch_write_checks_each_item_and_notifies_once(fake_cloud_hub, monkeypatch):
+    adapter, bumps, headers = _hub(fake_cloud_hub, monkeypatch, {"B-old.bundle": b"old"})
+
+    def item(path, data, expected_etag="*"):
+        encoded = base64.b64encode(data).decode()
+        return {"path": path, "data": encoded, "expected_etag": expected_etag}
+
+    resp = TestClient(app).post(
+        "/cloud_files/write",
+        json={
+            "items": [
+                item("B-new.bundle", b"new"),
+                item("B-old.bundle", b"clobber"),
+                item("L-new.yaml", b"link"),
+            ],
+            "notify": True,
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    statuses = {r["path"]: r["status"] for r in resp.json()["results"]}
+    assert statuses == {"B-new.bundle": 200, "B-old.bundle": 409, "L-new.yaml": 200}
+    assert adapter.objects["B-old.bundle"] == b"old"
+    assert adapter.objects["L-new.yaml"] == b"link"
+    assert bumps == [1]
@@ -0,0 +1,190 @@
+"""LAN exchange: spool, authenticated object server, and peer directory.
+
+A LAN Hub is a cache of objects already published to the cloud, so the tests
+pin down what it may serve (immutable objects only), to whom (trusted team
+devices only), and that a miss is a miss rather than an error.
+"""
+
+import json
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from small_sea_hub.lan import (
+    LAN_PROTOCOL_VERSION,
+    LanPeer,
+    LanPeerDirectory,
+    LanService,
+    LanSpool,
+    fetch_object,
+    is_immutable_object_path,
+    sign_request,
+    verify_request,
+)
+
+BERTH = "0a" * 16
+TEAMMATE = "0b" * 16
+
+
+def _key_pair():
+    private = Ed25519PrivateKey.generate()
+    return (
+        private.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption()),
+        private.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw),
+    )
+
+
+@pytest.fixture
+def team_key():
+    return _key_pair()
+
+
+@pytest.fixture
+def lan_pair(tmp_path, team_key):
+    """A serving Hub and a reading Hub that both trust team_key."""
+    private, public = team_key
+
+    def make(name):
+        return LanService(
+            tmp_path / name,
+            signer=lambda participant_hex, team_name: (private, public),
+            trusted_keys=lambda participant_hex, team_name: [public],
+            host="127.0.0.1",
+        )
+
+    serving, reading = make("serving"), make("reading")
+    serving.start()
+    reading.directory.record([TEAMMATE], "127.0.0.1", serving.server.port)
+    yield serving, reading
+    serving.stop()
+
+
+def test_only_archived_links_and_bundles_are_immutable():
+    assert is_immutable_object_path("L-0123abcd.yaml")
+    assert is_immutable_object_path("files/registry/B-0123abcd.bundle")
+    assert is_immutable_object_path("chunks/C-0123abcd.chunk")
+    assert not is_immutable_object_path("latest-link.yaml")
+    assert not is_immutable_object_path("signals.yaml")
+    assert not is_immutable_object_path("runtime/L-0123abcd.yaml.tmp")
+
+
+def test_spool_refuses_mutable_and_escaping_paths(tmp_path):
+    spool = LanSpool(tmp_path)
+    assert not spool.put(BERTH, "latest-link.yaml", b"head")
+    assert not spool.put(BERTH, "../L-0123.yaml", b"escape")
+    assert not spool.put("not-hex", "L-0123.yaml", b"bad berth")
+    assert spool.put(BERTH, "files/L-0123.yaml", b"link")
+    assert spool.get(BERTH, "files/L-0123.yaml") == b"link"
+
+
+def test_spool_keeps_the_first_copy_and_survives_restart(tmp_path):
+    spool = LanSpool(tmp_path)
+    spool.record_berth(BERTH, "aa", "ProjectX", TEAMMATE)
+    spool.put(BERTH, "L-0123.yaml", b"first")
+    spool.put(BERTH, "L-0123.yaml", b"second")
+
+    reopened = LanSpool(tmp_path)
+    assert reopened.get(BERTH, "L-0123.yaml") == b"first"
+    assert reopened.berth(BERTH)["team_name"] == "ProjectX"
+    assert reopened.teammates() == [TEAMMATE]
+
+
+def test_spool_evicts_oldest_objects_past_its_budget(tmp_path):
+    spool = LanSpool(tmp_path, max_bytes=10)
+    spool.put(BERTH, "B-01.bundle", b"x" * 6)
+    spool.put(BERTH, "B-02.bundle", b"y" * 6)
+    assert spool.get(BERTH, "B-01.bundle") is None
+    assert spool.get(BERTH, "B-02.bundle") == b"y" * 6
+
+
+def test_request_signatures_bind_endpoint_object_and_time(team_key):
+    private, public = team_key
+    hub = "192.168.1.7:11438"
+    headers = sign_request(private, public, hub, BERTH, "L-01.yaml", now=1000)
+    assert verify_request(headers, hub, BERTH, "L-01.yaml", [public], now=1010)
+    assert not verify_request(headers, hub, BERTH, "L-02.yaml", [public], now=1010)
+    assert not verify_request(headers, hub, BERTH, "L-01.yaml", [public], now=2000)
+    assert not verify_request(headers, hub, BERTH, "L-01.yaml", [_key_pair()[1]], now=1010)
+    assert not verify_request({}, hub, BERTH, "L-01.yaml", [public], now=1010)
+    assert not verify_request(
+        headers, "192.168.1.8:11438", BERTH, "L-01.yaml", [public], now=1010
+    )
+
+
+def test_published_object_is_read_over_the_lan(lan_pair):
+    serving, reading = lan_pair
+    serving.publish(BERTH, "aa", "ProjectX", TEAMMATE, "files/B-01.bundle", b"bundle")
+    assert reading.fetch(BERTH, "bb", "ProjectX", TEAMMATE, "files/B-01.bundle") == b"bundle"
+    assert reading.fetch(BERTH, "bb", "ProjectX", TEAMMATE, "files/B-02.bundle") is None
+
+
+def test_mutable_paths_are_never_spooled_or_fetched(lan_pair):
+    serving, reading = lan_pair
+    serving.publish(BERTH, "aa", "ProjectX", TEAMMATE, "latest-link.yaml", b"head")
+    assert serving.spool.berth(BERTH) is None
+    assert reading.fetch(BERTH, "bb", "ProjectX", TEAMMATE, "latest-link.yaml") is None
+
+
+def test_untrusted_devices_are_refused(lan_pair):
+    serving, _reading = lan_pair
+    serving.publish(BERTH, "aa", "ProjectX", TEAMMATE, "L-01.yaml", b"link")
+    peer = LanPeer("127.0.0.1", serving.server.port, 0)
+
+    stranger_private, stranger_public = _key_pair()
+    headers = sign_request(
+        stranger_private, stranger_public, peer.endpoint, BERTH, "L-01.yaml"
+    )
+    assert fetch_object(peer, BERTH, "L-01.yaml", headers) is None
+    assert fetch_object(peer, BERTH, "L-01.yaml", {}) is None
+
+
+def test_a_request_signed_for_another_hub_is_refused(lan_pair, team_key):
+    serving, _reading = lan_pair
+    serving.publish(BERTH, "aa", "ProjectX", TEAMMATE, "L-01.yaml", b"link")
+    peer = LanPeer("127.0.0.1", serving.server.port, 0)
+    private, public = team_key
+
+    # A request that a Hub answering a spoofed beacon captured and replays here.
+    spoofed = LanPeer("127.0.0.1", serving.server.port + 1, 0)
+    replayed = sign_request(private, public, spoofed.endpoint, BERTH, "L-01.yaml")
+    assert fetch_object(peer, BERTH, "L-01.yaml", replayed) is None
+
+    headers = sign_request(private, public, peer.endpoint, BERTH, "L-01.yaml")
+    assert fetch_object(peer, BERTH, "L-01.yaml", headers) == b"link"
+
+
+def test_directory_records_beacons_and_forgets_silent_peers():
+    directory = LanPeerDirectory(ttl=30)
+    beacon = json.dumps({"v": LAN_PROTOCOL_VERSION, "port": 11438, "teammates": [TEAMMATE]}).encode()
+    assert directory.handle_beacon(beacon, "192.168.1.7", now=100)
+    assert not directory.handle_beacon(b"not json", "192.168.1.8", now=100)
+    assert not directory.handle_beacon(b'{"v": 99}', "192.168.1.9", now=100)
+
+    [peer] = directory.peers_for(TEAMMATE, now=110)
+    assert (peer.host, peer.port) == ("192.168.1.7", 11438)
+    assert directory.peers_for(TEAMMATE, now=200) == []
+
+
+def test_spool_counts_objects_from_before_a_restart(tmp_path):
+    spool = LanSpool(tmp_path, max_bytes=10)
+    spool.put(BERTH, "B-01.bundle", b"x" * 6)
+    reopened = LanSpool(tmp_path, max_bytes=10)
+    reopened.put(BERTH, "B-02.bundle", b"y" * 6)
+    assert reopened.get(BERTH, "B-01.bundle") is None
+    assert reopened.get(BERTH, "B-02.bundle") == b"y" * 6
+
+
+def test_spool_evicts_the_least_recently_read_object(tmp_path):
+    spool = LanSpool(tmp_path, max_bytes=12)
+    spool.put(BERTH, "B-01.bundle", b"x" * 5)
+    spool.put(BERTH, "B-02.bundle", b"y" * 5)
+    assert spool.get(BERTH, "B-01.bundle") == b"x" * 5
+    spool.put(BERTH, "B-03.bundle", b"z" * 5)
+    assert spool.get(BERTH, "B-01.bundle") == b"x" * 5
+    assert spool.get(BERTH, "B-02.bundle") is None
@@ -0,0 +1,58 @@
+"""Tests for per-subscriber notification stream state."""
+
+from small_sea_hub.notification_stream import HISTORY_EVENTS, StreamRegistry
+
+
+def test_only_counts_that_grew_are_sent():
+    registry = StreamRegistry()
+    subscriber, replay = registry.open("berth", "session")
+    assert replay == []
+
+    first = subscriber.advance({"bob": 1}, 0)
+    assert (first["snapshot"], first["peers"], first["self_count"]) == (True, {"bob": 1}, 0)
+    assert subscriber.advance({"bob": 1}, 0) is None
+
+    second = subscriber.advance({"bob": 1, "eve": 2}, 3)
+    assert second["peers"] == {"eve": 2}
+    assert second["self_count"] == 3
+    assert second["cursor"] == f"{subscriber.subscription_id}.2"
+
+
+def test_a_resumed_subscription_replays_what_it_missed():
+    registry = StreamRegistry()
+    subscriber, _ = registry.open("berth", "session")
+    subscriber.advance({"bob": 1}, 0)
+    cursor = subscriber.cursor()
+    subscriber.advance({"bob": 2}, 0)
+    subscriber.advance({"bob": 3}, 0)
+    registry.close(subscriber)
+
+    resumed, replay = registry.open("berth", "session", cursor)
+    assert resumed is subscriber
+    assert [event["peers"] for event in replay] == [{"bob": 2}, {"bob": 3}]
+    assert registry.open("berth", "session", resumed.cursor())[1] == []
+
+
+def test_a_gap_in_history_becomes_a_snapshot():
+    registry = StreamRegistry()
+    subscriber, _ = registry.open("berth", "session")
+    subscriber.advance({"bob": 0}, 0)
+    for count in range(1, HISTORY_EVENTS + 2):
+        subscriber.advance({"bob": count}, 0)
+
+    _, replay = registry.open("berth", "session", f"{subscriber.subscription_id}.1")
+    assert replay == []
+    snapshot = subscriber.advance({"bob": HISTORY_EVENTS + 1}, 0)
+    assert snapshot["snapshot"] is True
+    assert snapshot["peers"] == {"bob": HISTORY_EVENTS + 1}
+
+
+def test_idle_subscriptions_expire():
+    registry = StreamRegistry(idle_ttl=0)
+    subscriber, _ = registry.open("berth", "session")
+    cursor = subscriber.cursor()
+    registry.close(subscriber)
+
+    fresh, _ = registry.open("berth", "session", cursor)
+    assert fresh is not subscriber
+    assert registry.stats() == {"subscriptions": 1, "connected": 1}
@@ -0,0 +1,117 @@
+"""Tests for the multiplexed ntfy listener and its per-berth watcher passes."""
+
+import asyncio
+import logging
+
+import pytest
+
+import small_sea_hub.server as Server
+from small_sea_hub.adapters.ntfy import SmallSeaNtfyAdapter
+from small_sea_hub.server import app
+
+BERTH_A = "aa" * 16
+BERTH_B = "bb" * 16
+BERTH_C = "cc" * 16
+NTFY_URL = "http://ntfy.test"
+
+
+class _StubAdapter:
+    base_url = NTFY_URL
+
+
+class _StubBackend:
+    def __init__(self):
+        self.signal_reads = []
+
+    def _make_notification_adapter(self, ss_session):
+        return _StubAdapter()
+
+    def get_peer_signal(self, session_hex, teammate_id_hex):
+        self.signal_reads.append(teammate_id_hex)
+        return None, None
+
+
+@pytest.fixture()
+def watcher_state():
+    backend = _StubBackend()
+    app.state.backend = backend
+    app.state.watched_sessions = {}
+    app.state.watched_peers = {}
+    app.state.ntfy_listener_tasks = {}
+    app.state.ntfy_berths = {}
+    app.state.logger = logging.getLogger("test")
+    yield backend
+    for attr in (
+        "backend", "watched_sessions", "watched_peers",
+        "ntfy_listener_tasks", "ntfy_berths", "logger",
+    ):
+        try:
+            delattr(app.state, attr)
+        except (AttributeError, KeyError):
+            pass
+
+
+def test_one_subscription_per_server_follows_its_berths(watcher_state, monkeypatch):
+    started = []
+
+    async def fake_loop(app_, ntfy_url, berth_ids, since=None):
+        started.append((ntfy_url, berth_ids, since))
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(Server, "_ntfy_listener_loop", fake_loop)
+
+    async def scenario():
+        app.state.watched_sessions = {
+            "s1": {"berth_id_hex": BERTH_A},
+            "s2": {"berth_id_hex": BERTH_B},
+        }
+        Server._maybe_start_ntfy_listener(app, None, BERTH_A)
+        Server._maybe_start_ntfy_listener(app, None, BERTH_B)
+        Server._maybe_start_ntfy_listener(app, None, BERTH_A)  # already covered
+        await asyncio.sleep(0)
+        assert list(app.state.ntfy_listener_tasks) == [NTFY_URL]
+
+        del app.state.watched_sessions["s2"]
+        Server._release_ntfy_berth(app, BERTH_B)
+        await asyncio.sleep(0)
+        for task in app.state.ntfy_listener_tasks.values():
+            task.cancel()
+
+    asyncio.run(scenario())
+
+    # The listeners replaced before they ever ran never opened a connection.
+    assert [berths for _url, berths, _since in started] == [{BERTH_A, BERTH_B}, {BERTH_A}]
+    # A replacement listener replays what was published during the swap.
+    assert started[1][2] is not None
+
+
+def test_each_push_checks_only_its_berth(watcher_state, monkeypatch):
+    topics = []
+    passes = []
+
+    async def fake_subscribe(self, since=None):
+        topics.append(self.topic)
+        for berth_id_hex in (BERTH_B, BERTH_C, BERTH_A):
+            yield {"event": "message", "topic": f"ss-{berth_id_hex}"}
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(SmallSeaNtfyAdapter, "subscribe", fake_subscribe)
+    monkeypatch.setattr(Server, "_watcher_pass", lambda app_, berth_ids=None: passes.append(berth_ids))
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(Server._ntfy_listener_loop(app, NTFY_URL, frozenset({BERTH_A, BERTH_B})))
+
+    assert topics == [f"ss-{BERTH_A},ss-{BERTH_B}"]
+    assert passes == [{BERTH_B}, {BERTH_A}]
+
+
+def test_a_targeted_watcher_pass_reads_only_that_berths_peers(watcher_state):
+    app.state.watched_peers = {
+        ("s1", "p1"): {"etag": None, "signals": {}, "berth_id_hex": BERTH_A},
+        ("s2", "p2"): {"etag": None, "signals": {}, "berth_id_hex": BERTH_B},
+    }
+    Server._watcher_pass(app, berth_ids={BERTH_B})
+    assert watcher_state.signal_reads == ["p2"]
+
+    Server._watcher_pass(app)
+    assert sorted(watcher_state.signal_reads) == ["p1", "p2", "p2"]
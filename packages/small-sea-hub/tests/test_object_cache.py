@@ -0,0 +1,85 @@
+"""Tests for the Hub's on-disk cache of immutable objects."""
+
+import hashlib
+
+from small_sea_hub.object_cache import ObjectCache
+
+LOCATION = ("s3", "http://s3.test", "bucket-1", None)
+
+
+def _md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+def test_hit_miss_and_bytes_saved(tmp_path):
+    cache = ObjectCache(tmp_path)
+    path = "links/L-abc123.yaml"
+    assert cache.get(LOCATION, path) is None
+    assert cache.put(LOCATION, path, b"link", _md5(b"link"))
+
+    assert cache.get(LOCATION, path) == (b"link", _md5(b"link"))
+    # Same path at another location is a different object.
+    assert cache.get(("s3", "http://s3.test", "bucket-2", None), path) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["bytes_saved"] == 4
+    assert stats["hit_ratio"] == 1 / 3
+
+
+def test_mutable_paths_bypass_the_cache(tmp_path):
+    cache = ObjectCache(tmp_path)
+    for path in ("latest-link.yaml", "signals.yaml"):
+        assert not cache.put(LOCATION, path, b"x", _md5(b"x"))
+        assert cache.get(LOCATION, path) is None
+    assert cache.stats()["misses"] == 0
+
+
+def test_bytes_that_contradict_their_etag_are_not_kept(tmp_path):
+    cache = ObjectCache(tmp_path)
+    assert not cache.put(LOCATION, "B-abc.bundle", b"bundle", _md5(b"other"))
+    # Opaque etags (multipart, other providers) fall back to the SHA-256.
+    assert cache.put(LOCATION, "B-def.bundle", b"bundle", "etag-2")
+
+    entry = next(tmp_path.glob("*/*.obj"))
+    entry.write_bytes(entry.read_bytes()[:-1] + b"X")
+    assert cache.get(LOCATION, "B-def.bundle") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted_first(tmp_path):
+    cache = ObjectCache(tmp_path, max_bytes=3700)
+    data = b"x" * 1000  # plus a header of under 300 bytes
+    for name in ("B-a.bundle", "B-b.bundle", "B-c.bundle"):
+        cache.put(LOCATION, name, data, _md5(data))
+    assert cache.get(LOCATION, "B-a.bundle") is not None
+    cache.put(LOCATION, "B-d.bundle", data, _md5(data))
+
+    assert cache.get(LOCATION, "B-b.bundle") is None
+    assert cache.get(LOCATION, "B-a.bundle") is not None
+    assert cache.stats()["evictions"] == 1
+
+    # A restart keeps the entries and the byte bound.
+    reopened = ObjectCache(tmp_path, max_bytes=3700)
+    assert reopened.stats()["entries"] == 3
+    assert reopened.get(LOCATION, "B-d.bundle") == (data, _md5(data))
+
+
+def test_backend_reads_immutable_objects_once(fake_cloud_hub):
+    hub = fake_cloud_hub()
+    backend, adapter = hub.backend, hub.adapter
+    adapter.objects.update({"latest-link.yaml": b"head", "L-abc.yaml": b"link"})
+    first = hub.session()
+    second = hub.session()
+
+    for session_hex in (first, second, first):
+        assert backend.download_from_cloud(session_hex, "L-abc.yaml")[1] == b"link"
+        assert backend.download_from_cloud(session_hex, "latest-link.yaml")[1] == b"head"
+    assert adapter.downloads.count("L-abc.yaml") == 1
+    assert adapter.downloads.count("latest-link.yaml") == 3
+
+    # An uploaded object is cached as written.
+    assert backend.upload_to_cloud(first, "B-new.bundle", b"bundle")[0]
+    assert backend.download_from_cloud(second, "B-new.bundle")[1] == b"bundle"
+    assert "B-new.bundle" not in adapter.downloads
+    assert backend.object_cache.stats()["hits"] == 3
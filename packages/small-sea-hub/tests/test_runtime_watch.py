@@ -7,7 +7,12 @@ from fastapi.testclient import TestClient
 import small_sea_hub.backend as SmallSea
 from cod_sync.store import LocalFolderStore
 from cod_sync.repo import Repo
-from small_sea_hub.server import app, _register_session_peers, _run_runtime_reconciliation_for_session
+from small_sea_hub.server import (
+    _process_runtime_inbox_from_teammate,
+    _register_session_peers,
+    _run_runtime_reconciliation_for_session,
+    app,
+)
 from small_sea_manager import admission_events as AdmissionEvents
 from small_sea_manager import provisioning
 from small_sea_manager.provisioning import _serialize_prekey_bundle
@@ -163,14 +168,87 @@ def test_watcher_reconciliation_uploads_runtime_artifact_once(playground_dir, mo
         return True, None, ""
 
     monkeypatch.setattr(backend, "upload_runtime_artifact", _fake_upload_runtime_artifact)
+    monkeypatch.setattr(
+        backend,
+        "download_runtime_artifact_from_cloud",
+        lambda session_hex_arg, path: (False, None, None),
+    )
 
     _run_runtime_reconciliation_for_session(app, session_hex)
     assert len(uploads) == 1
-    assert linked_device_key_id.hex() in uploads[0][1]
+    assert uploads[0][1] == provisioning.RUNTIME_REDISTRIBUTION_INBOX_PATH
+    assert linked_device_key_id.hex() in uploads[0][2]
     _run_runtime_reconciliation_for_session(app, session_hex)
     assert len(uploads) == 1
 
 
+def test_runtime_inbox_drops_removed_senders_and_probes_legacy_paths(playground_dir, monkeypatch):
+    root = Path(playground_dir)
+    backend = SmallSea.SmallSeaBackend(root_dir=playground_dir)
+    alice_hex = provisioning.create_new_participant(playground_dir, "alice")
+    provisioning.create_team(playground_dir, alice_hex, "ProjectX")
+    linked_device_key_id = _add_same_teammate_linked_device_bundle(root, alice_hex, "ProjectX")
+    app.state.backend = backend
+    app.state.watched_sessions = {}
+    app.state.watched_peers = {}
+    app.state.peer_counts = {}
+    app.state.peer_signal_events = {}
+    app.state.ntfy_listener_tasks = {}
+    app.state.logger = backend.logger
+    with TestClient(app) as client:
+        session_hex = _request_and_confirm(client)
+    _register_session_peers(session_hex)
+
+    removed_hex = "ff" * 16
+    inbox = provisioning.merge_redistribution_inbox(
+        None,
+        [
+            {
+                "sender_device_key_id_hex": removed_hex,
+                "sender_chain_id_hex": "00" * 16,
+                "target_device_key_id_hex": linked_device_key_id.hex(),
+                "distribution_payload": "stale",
+            }
+        ],
+    )
+    uploads = []
+    downloads = []
+
+    def _fake_download(session_hex_arg, path):
+        downloads.append(path)
+        if path == provisioning.RUNTIME_REDISTRIBUTION_INBOX_PATH:
+            return True, inbox, "etag-1"
+        return False, None, None
+
+    def _fake_upload_runtime_artifact(session_hex_arg, path, data, expected_etag=None):
+        uploads.append(json.loads(data))
+        return True, None, ""
+
+    monkeypatch.setattr(backend, "download_runtime_artifact_from_cloud", _fake_download)
+    monkeypatch.setattr(backend, "upload_runtime_artifact", _fake_upload_runtime_artifact)
+
+    _run_runtime_reconciliation_for_session(app, session_hex)
+    assert len(uploads) == 1
+    assert removed_hex not in uploads[0]["senders"]
+
+    # The linked device has no section in the inbox, so the per-sender path
+    # it would have written before the inbox existed is still read.
+    _team_id, self_in_team = provisioning._team_row(root, alice_hex, "ProjectX")
+    local_device_key_id = key_id_from_public(
+        provisioning.get_current_team_device_key(root, alice_hex, "ProjectX")[1]
+    )
+    downloads.clear()
+    _process_runtime_inbox_from_teammate(
+        app, session_hex, self_in_team.hex(), use_local_bucket=True
+    )
+    assert downloads == [
+        provisioning.RUNTIME_REDISTRIBUTION_INBOX_PATH,
+        provisioning.runtime_redistribution_artifact_path(
+            local_device_key_id, linked_device_key_id
+        ),
+    ]
+
+
 def test_watcher_retries_linked_device_notification_after_missing_adapter(playground_dir, monkeypatch):
     root = Path(playground_dir)
     backend = SmallSea.SmallSeaBackend(root_dir=playground_dir)
@@ -271,3 +349,41 @@ def test_watcher_does_not_notify_for_self_linked_device_events(playground_dir, m
     monkeypatch.setattr(backend, "send_notification", _capture_send)
     assert _run_runtime_reconciliation_for_session(app, session_hex) is True
     assert sends == []
+
+
+def test_watcher_skips_reconciliation_when_trust_tables_are_unchanged(playground_dir, monkeypatch):
+    root = Path(playground_dir)
+    backend = SmallSea.SmallSeaBackend(root_dir=playground_dir)
+    alice_hex = provisioning.create_new_participant(playground_dir, "alice")
+    provisioning.create_team(playground_dir, alice_hex, "ProjectX")
+    app.state.backend = backend
+    app.state.watched_sessions = {}
+    app.state.watched_peers = {}
+    app.state.peer_counts = {}
+    app.state.peer_signal_events = {}
+    app.state.ntfy_listener_tasks = {}
+    app.state.logger = backend.logger
+    with TestClient(app) as client:
+        session_hex = _request_and_confirm(client)
+    _register_session_peers(session_hex)
+
+    reconciled = []
+    reconcile = provisioning.reconcile_runtime_state
+
+    def _counting_reconcile(*args):
+        reconciled.append(args)
+        return reconcile(*args)
+
+    monkeypatch.setattr(provisioning, "reconcile_runtime_state", _counting_reconcile)
+    assert _run_runtime_reconciliation_for_session(app, session_hex) is True
+    assert len(reconciled) == 1
+
+    team_db_path = root / "Participants" / alice_hex / "ProjectX" / "Sync" / "core.db"
+    with sqlite3.connect(team_db_path) as conn:
+        conn.execute("INSERT INTO team_setting (key, value) VALUES ('unrelated', 'x')")
+    assert _run_runtime_reconciliation_for_session(app, session_hex) is False
+    assert len(reconciled) == 1
+
+    _add_same_teammate_linked_device_bundle(root, alice_hex, "ProjectX")
+    assert _run_runtime_reconciliation_for_session(app, session_hex) is True
+    assert len(reconciled) == 2
@@ -0,0 +1,134 @@
+"""Tests for coalescing signals.yaml bumps per berth."""
+
+import threading
+import time
+
+from small_sea_hub.signal_coalescer import SignalCoalescer
+from small_sea_hub.signals import decode_signals
+
+
+class _CountingWriter:
+    def __init__(self, results=None, gate=None):
+        self.calls = []
+        self.results = list(results or [])
+        self.gate = gate
+
+    def __call__(self, session_hex):
+        self.calls.append(session_hex)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.results.pop(0) if self.results else len(self.calls)
+
+
+def test_bumps_in_one_window_share_a_write():
+    write = _CountingWriter()
+    coalescer = SignalCoalescer(write, window=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(coalescer.bump("berth", "s1")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert write.calls == ["s1"]
+    assert results == [1] * 5
+    assert coalescer.stats() == {"bumps": 5, "writes": 1, "pending": 0}
+
+
+def test_flush_writes_deferred_bumps_at_once():
+    write = _CountingWriter()
+    coalescer = SignalCoalescer(write, window=60)
+    for _ in range(3):
+        assert coalescer.bump("berth", "s1", wait=False) is None
+    assert coalescer.bump("other", "s2", wait=False) is None
+
+    assert coalescer.flush("berth") == 1
+    assert coalescer.flush("berth") is None
+    assert write.calls == ["s1"]
+    assert coalescer.stats()["pending"] == 1
+
+
+def test_a_bump_during_a_write_is_written_after_it():
+    gate = threading.Event()
+    write = _CountingWriter(gate=gate)
+    coalescer = SignalCoalescer(write, window=0)
+    first = threading.Thread(target=coalescer.bump, args=("berth", "s1"))
+    first.start()
+    time.sleep(0.1)  # the first batch is now being written
+    late = []
+    second = threading.Thread(target=lambda: late.append(coalescer.bump("berth", "s2")))
+    second.start()
+    time.sleep(0.1)
+    assert write.calls == ["s1"]
+    gate.set()
+    first.join(5)
+    second.join(5)
+
+    assert write.calls == ["s1", "s2"]
+    assert late == [2]
+
+
+def test_an_alone_bump_gets_an_increment_of_its_own():
+    write = _CountingWriter()
+    coalescer = SignalCoalescer(write, window=60)
+    coalescer.bump("berth", "s1", wait=False)
+
+    assert coalescer.bump("berth", "s2", alone=True) == 2
+    assert write.calls == ["s1", "s2"]
+    assert coalescer.stats() == {"bumps": 2, "writes": 2, "pending": 0}
+
+
+def test_a_lost_cas_race_is_carried_not_dropped():
+    write = _CountingWriter(results=[None, 7])
+    coalescer = SignalCoalescer(write, window=60)
+    coalescer.bump("berth", "s1", wait=False)
+    assert coalescer.flush("berth") is None
+    assert coalescer.stats()["pending"] == 1
+    assert coalescer.flush("berth") == 7
+    assert coalescer.stats()["pending"] == 0
+
+
+def test_a_failed_write_is_retried_from_another_session_and_never_dropped(monkeypatch):
+    from small_sea_hub import signal_coalescer
+
+    monkeypatch.setattr(signal_coalescer, "RETRY_DELAY", 60)
+    calls = []
+
+    def write(session_hex):
+        calls.append(session_hex)
+        if session_hex == "closed":
+            raise LookupError("session closed")
+        return None if len(calls) < 8 else 9
+
+    coalescer = SignalCoalescer(write, window=60)
+    coalescer.bump("berth", "open", wait=False)
+    coalescer.bump("berth", "closed", wait=False)
+
+    assert coalescer.flush("berth") is None
+    assert coalescer.stats()["pending"] == 2
+    # Every CAS give-up after that is carried too, however many there are.
+    for _ in range(6):
+        assert coalescer.flush("berth") is None
+        assert coalescer.stats()["pending"] == 2
+    assert coalescer.flush("berth") == 9
+    assert calls == ["closed"] + ["open"] * 7
+    assert coalescer.stats()["pending"] == 0
+
+
+def test_a_runtime_artifact_burst_writes_the_signal_once(fake_cloud_hub):
+    hub = fake_cloud_hub(signal_coalesce_window=60)
+    backend, adapter = hub.backend, hub.adapter
+    session_hex = hub.session()
+
+    for i in range(4):
+        assert backend.upload_runtime_artifact(session_hex, f"runtime/{i}", b"artifact")[0]
+    assert adapter.uploads.count("signals.yaml") == 0
+
+    assert backend.flush_signal(session_hex) == 1
+    assert adapter.uploads.count("signals.yaml") == 1
+    assert hub.pushes == [1]
+    berth_id_hex = backend._lookup_session(session_hex).berth_id.hex()
+    assert decode_signals(adapter.objects["signals.yaml"])[berth_id_hex] == 1
@@ -0,0 +1,28 @@
+import pytest
+import yaml
+
+from small_sea_hub.signals import decode_signals, encode_signals
+
+
+@pytest.mark.parametrize(
+    "signals",
+    [
+        {"version": 1, "ab" * 16: 3},
+        {"version": 1, "1" * 32: 12, "0b" + "1" * 30: 0},
+        {"version": 1, "note": "free text"},
+        {},
+    ],
+)
+def test_encoding_matches_pyyaml_and_round_trips(signals):
+    data = encode_signals(signals)
+    assert data == yaml.dump(signals, default_flow_style=False).encode("utf-8")
+    assert decode_signals(data) == signals
+
+
+@pytest.mark.parametrize("data", [b"", b"- 1\n", b"just a string\n"])
+def test_unreadable_shapes_decode_as_empty(data):
+    assert decode_signals(data) == {}
+
+
+def test_octal_looking_counts_defer_to_pyyaml():
+    assert decode_signals(b"version: 1\nberth: 010\n") == {"version": 1, "berth": 8}
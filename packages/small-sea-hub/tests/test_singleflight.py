@@ -0,0 +1,141 @@
+"""Tests for coalescing concurrent identical provider reads."""
+
+import hashlib
+import threading
+import time
+
+from small_sea_hub.singleflight import SingleFlight
+
+
+def _start_all(funcs):
+    results = [None] * len(funcs)
+
+    def run(i, func):
+        results[i] = func()
+
+    threads = [threading.Thread(target=run, args=(i, f)) for i, f in enumerate(funcs)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return True, b"bytes", "etag"
+
+    threads, results = _start_all([lambda: flight.do("k", fetch)] * 4)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [(True, b"bytes", "etag")] * 4
+    assert flight.joined == 3
+    assert flight.in_flight() == 0
+    # Nothing is kept: a later call goes to the provider again.
+    flight.do("k", fetch)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise RuntimeError("provider down")
+
+    def call():
+        try:
+            flight.do("k", fetch)
+        except RuntimeError as exc:
+            return str(exc)
+
+    threads, results = _start_all([call, call])
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["provider down", "provider down"]
+
+
+def _gated_hub(fake_cloud_hub):
+    """A hub whose provider downloads block until gate is set."""
+    hub = fake_cloud_hub()
+    hub.adapter.gate = threading.Event()
+    return hub, hub.backend, hub.adapter
+
+
+def test_identical_downloads_share_a_round_trip(fake_cloud_hub):
+    hub, backend, adapter = _gated_hub(fake_cloud_hub)
+    adapter.objects["latest-link.yaml"] = b"link"
+    first = hub.session()
+    second = hub.session()
+
+    threads, results = _start_all(
+        [
+            lambda: backend.download_from_cloud(first, "latest-link.yaml"),
+            lambda: backend.download_from_cloud(second, "latest-link.yaml"),
+            lambda: backend.download_runtime_artifact_from_cloud(first, "latest-link.yaml"),
+        ]
+    )
+    time.sleep(0.1)
+    adapter.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert adapter.downloads == ["latest-link.yaml"]
+    assert results == [(True, b"link", hashlib.md5(b"link").hexdigest())] * 3
+
+
+def test_modes_do_not_share_reads(fake_cloud_hub):
+    hub, backend, adapter = _gated_hub(fake_cloud_hub)
+    adapter.objects["x"] = b"raw"
+    passthrough = hub.session()
+    encrypted = hub.session("encrypted")
+
+    threads, _results = _start_all(
+        [
+            lambda: backend.download_runtime_artifact_from_cloud(passthrough, "x"),
+            lambda: backend.download_runtime_artifact_from_cloud(encrypted, "x"),
+        ]
+    )
+    time.sleep(0.1)
+    adapter.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert adapter.downloads == ["x", "x"]
+
+
+def test_read_after_own_write_does_not_join_an_older_read(fake_cloud_hub):
+    hub, backend, adapter = _gated_hub(fake_cloud_hub)
+    adapter.objects["x"] = b"old"
+    session_hex = hub.session()
+
+    threads, _results = _start_all(
+        [lambda: backend.download_runtime_artifact_from_cloud(session_hex, "x")]
+    )
+    time.sleep(0.1)
+    assert backend.upload_to_cloud(session_hex, "x", b"new")[0]
+    late = []
+    late_thread = threading.Thread(
+        target=lambda: late.append(
+            backend.download_runtime_artifact_from_cloud(session_hex, "x")
+        )
+    )
+    late_thread.start()
+    time.sleep(0.1)
+    adapter.gate.set()
+    for thread in threads + [late_thread]:
+        thread.join(5)
+
+    assert adapter.downloads == ["x", "x"]
+    assert late[0][1] == b"new"
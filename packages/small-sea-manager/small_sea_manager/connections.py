@@ -0,0 +1,369 @@
+"""Participant-scoped SQLite connections for Manager operations.
+
+Provisioning helpers open the team, NoteToSelf and device-local DBs by path.
+Outside an operation each helper gets a fresh connection, as it always has.
+Inside `participant_operation(...)` every helper gets the same sqlite3
+connection for a given DB file, and SQLAlchemy engines run on that same
+connection. The connect cost and `PRAGMA foreign_keys` are paid once per
+file per operation, and everything is closed when the operation ends.
+Operations nest: an inner operation joins the outer one.
+
+A helper that opens the file while another helper's `with` block (or
+SQLAlchemy transaction) on it is still open gets a savepoint instead: its
+own `with` releases or rolls back just that savepoint, and its commit waits
+for the enclosing block, so it can neither commit nor undo work that is not
+its own.
+
+`transaction(db_path)` goes further and batches the writes of several
+helpers against one DB into a single transaction. Their own commit points
+become savepoints, so a helper that fails still undoes only its own work,
+and the batch commits once when the block ends. End the block before
+anything reads the file from outside the operation, e.g. staging it in git.
+
+Every finished operation is reported to the hooks registered with
+`add_operation_hook` as an OperationStats, so tests can pin how many
+connections and statements an operation costs.
+"""
+
+import contextvars
+import functools
+import itertools
+import pathlib
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from small_sea_sqlite import sqlite_policy
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+
+@dataclass
+class OperationStats:
+    """What one participant operation cost, by DB file."""
+
+    name: str
+    participant_hex: str
+    connections: dict = field(default_factory=dict)
+    statements: dict = field(default_factory=dict)
+
+    @property
+    def connection_count(self) -> int:
+        return sum(self.connections.values())
+
+    @property
+    def statement_count(self) -> int:
+        return sum(self.statements.values())
+
+
+_current: contextvars.ContextVar[Optional["_Scope"]] = contextvars.ContextVar(
+    "small_sea_manager_participant_operation", default=None
+)
+_operation_hooks: list[Callable[[OperationStats], None]] = []
+
+
+def add_operation_hook(hook: Callable[[OperationStats], None]) -> None:
+    """Call hook(OperationStats) after every outermost participant operation."""
+    _operation_hooks.append(hook)
+
+
+def remove_operation_hook(hook: Callable[[OperationStats], None]) -> None:
+    _operation_hooks.remove(hook)
+
+
+@contextmanager
+def participant_operation(root_dir, participant_hex: str, name: str = "operation"):
+    """Share one connection per DB file across everything in the block."""
+    scope = _current.get()
+    if scope is not None:
+        # Connections are keyed by file, so a nested operation (even on behalf
+        # of another participant in the same process) just joins.
+        yield scope
+        return
+    scope = _Scope(OperationStats(name, participant_hex))
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        scope.close()
+        for hook in list(_operation_hooks):
+            hook(scope.stats)
+
+
+def operation(func):
+    """Run a `(root_dir, participant_hex, ...)` function as a participant operation."""
+
+    @functools.wraps(func)
+    def wrapper(root_dir, participant_hex, *args, **kwargs):
+        with participant_operation(root_dir, participant_hex, func.__name__):
+            return func(root_dir, participant_hex, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def transaction(db_path):
+    """Batch every write to db_path in the block into one transaction.
+
+    Outside a participant operation the block runs as a small operation of
+    its own, so the batch still holds.
+    """
+    with participant_operation(None, None, "transaction") as scope:
+        with scope.transaction(db_path) as conn:
+            yield conn
+
+
+def connect(db_path):
+    """A policy connection to db_path, or the operation's shared connection to it."""
+    scope = _current.get()
+    if scope is None:
+        return sqlite_policy.connect(db_path)
+    return scope.connection(db_path)
+
+
+def sqlite_engine(db_path, on_connect=None):
+    """A SQLAlchemy engine for db_path, on the operation's shared connection if any.
+
+    on_connect runs once per new DBAPI connection, as an engine "connect"
+    listener would. The engine returned inside an operation ignores
+    dispose(); the operation closes it.
+    """
+    scope = _current.get()
+    if scope is None:
+        engine = create_engine(
+            f"sqlite:///{db_path}", connect_args=sqlite_policy.engine_connect_args()
+        )
+        event.listen(engine, "connect", sqlite_policy.configure)
+        if on_connect is not None:
+            event.listen(engine, "connect", on_connect)
+        return engine
+    return scope.engine(db_path, on_connect)
+
+
+class _Scope:
+    def __init__(self, stats: OperationStats):
+        self.stats = stats
+        self._raw: dict[str, sqlite3.Connection] = {}
+        self._engines: dict[str, "_ScopedEngine"] = {}
+        self._batches: dict[str, int] = {}
+        self._owners: dict[str, "_SharedConnection"] = {}
+        self._savepoints = itertools.count(1)
+
+    def _key(self, db_path) -> str:
+        return str(pathlib.Path(db_path).resolve())
+
+    def raw(self, db_path) -> sqlite3.Connection:
+        key = self._key(db_path)
+        conn = self._raw.get(key)
+        if conn is None:
+            conn = sqlite_policy.connect(key, check_same_thread=False)
+            self.stats.connections[key] = self.stats.connections.get(key, 0) + 1
+            self.stats.statements.setdefault(key, 0)
+
+            def count(_statement, key=key):
+                self.stats.statements[key] += 1
+
+            conn.set_trace_callback(count)
+            self._raw[key] = conn
+        return conn
+
+    def connection(self, db_path) -> "_SharedConnection":
+        return _SharedConnection(self, self._key(db_path))
+
+    def engine(self, db_path, on_connect=None) -> "_ScopedEngine":
+        key = self._key(db_path)
+        engine = self._engines.get(key)
+        if engine is None:
+            shared = _SharedConnection(self, key)
+            real = create_engine(
+                f"sqlite:///{key}",
+                creator=lambda: shared,
+                poolclass=StaticPool,
+                pool_reset_on_return=None,
+            )
+            if on_connect is not None:
+                event.listen(real, "connect", on_connect)
+            # SQLAlchemy's own transaction boundaries become savepoints
+            # while the file is inside a batch or another view's block.
+            event.listen(real, "begin", lambda _conn: shared.open_savepoint())
+            event.listen(real, "commit", lambda _conn: shared.release_savepoint())
+            event.listen(real, "rollback", lambda _conn: shared.rollback_savepoint())
+            engine = self._engines[key] = _ScopedEngine(real)
+        return engine
+
+    def in_batch(self, key: str) -> bool:
+        return self._batches.get(key, 0) > 0
+
+    def nested(self, key: str, view: "_SharedConnection") -> bool:
+        """True when view's commits wait for a batch or another view's block."""
+        owner = self._owners.get(key)
+        return self.in_batch(key) or (owner is not None and owner is not view)
+
+    def own(self, key: str, view: "_SharedConnection") -> None:
+        self._owners.setdefault(key, view)
+
+    def disown(self, key: str, view: "_SharedConnection") -> None:
+        if self._owners.get(key) is view:
+            del self._owners[key]
+
+    def next_savepoint(self) -> str:
+        return f"ssm_sp_{next(self._savepoints)}"
+
+    @contextmanager
+    def transaction(self, db_path):
+        key = self._key(db_path)
+        conn = self.raw(key)
+        outermost = not self.in_batch(key)
+        if outermost:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN")
+        self._batches[key] = self._batches.get(key, 0) + 1
+        shared = _SharedConnection(self, key)
+        try:
+            with shared:
+                yield shared
+        except BaseException:
+            self._batches[key] -= 1
+            if outermost:
+                conn.rollback()
+            raise
+        self._batches[key] -= 1
+        if outermost:
+            conn.commit()
+
+    def close(self):
+        for engine in self._engines.values():
+            engine.real.dispose()
+        for conn in self._raw.values():
+            # Work a helper left uncommitted is discarded, as closing its
+            # own connection would have done.
+            conn.close()
+        self._engines.clear()
+        self._raw.clear()
+
+
+class _SharedConnection:
+    """One caller's view of the operation's connection to a DB file.
+
+    Behaves like the sqlite3.Connection a helper would have opened itself:
+    its own row_factory, commit on leaving `with`, and a close() that only
+    discards this caller's uncommitted work. Inside a batch, or inside
+    another view's open block, `with` blocks and SQLAlchemy transactions
+    become savepoints and commit() waits for the enclosing block.
+    """
+
+    def __init__(self, scope: _Scope, key: str):
+        self._scope = scope
+        self._key = key
+        # One entry per open block: a savepoint name, or None for a block
+        # that owns the connection's transaction.
+        self._open_savepoints: list[Optional[str]] = []
+        self.row_factory = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._scope.raw(self._key)
+
+    @property
+    def _nested(self) -> bool:
+        return self._scope.nested(self._key, self)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args):
+        cursor = self._conn.cursor(*args)
+        cursor.row_factory = self.row_factory
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        cursor = self.cursor()
+        return cursor.execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        cursor = self.cursor()
+        return cursor.executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        if not self._nested:
+            self._conn.commit()
+
+    def rollback(self):
+        if self._nested:
+            self.rollback_savepoint(release=False)
+        else:
+            self._conn.rollback()
+
+    def close(self):
+        if not self._nested and self._conn.in_transaction:
+            self._conn.rollback()
+
+    def __enter__(self):
+        self.open_savepoint()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._open_savepoints and self._open_savepoints[-1] is not None:
+            if exc_type is None:
+                self.release_savepoint()
+            else:
+                self.rollback_savepoint()
+            return False
+        if self._open_savepoints:
+            self._end_owned_block()
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def open_savepoint(self):
+        if self._nested:
+            name = self._scope.next_savepoint()
+            self._conn.execute(f"SAVEPOINT {name}")
+            self._open_savepoints.append(name)
+        else:
+            self._scope.own(self._key, self)
+            self._open_savepoints.append(None)
+
+    def release_savepoint(self):
+        if not self._open_savepoints:
+            return
+        if self._open_savepoints[-1] is None:
+            self._end_owned_block()
+        else:
+            self._conn.execute(f"RELEASE {self._open_savepoints.pop()}")
+
+    def rollback_savepoint(self, release=True):
+        if not self._open_savepoints:
+            return
+        name = self._open_savepoints[-1]
+        if name is None:
+            if release:
+                self._end_owned_block()
+            return
+        self._conn.execute(f"ROLLBACK TO {name}")
+        if release:
+            self._open_savepoints.pop()
+            self._conn.execute(f"RELEASE {name}")
+
+    def _end_owned_block(self):
+        self._open_savepoints.pop()
+        if None not in self._open_savepoints:
+            self._scope.disown(self._key, self)
+
+
+class _ScopedEngine:
+    """An operation's engine; dispose() is left to the operation."""
+
+    def __init__(self, real):
+        self.real = real
+
+    def __getattr__(self, name):
+        return getattr(self.real, name)
+
+    def dispose(self):
+        pass
@@ -0,0 +1,140 @@
+"""Server-sent UI events: tell open pages which fragments to re-fetch.
+
+The broker and the `/events` stream come from `small_sea_client.live_updates`.
+The Manager names its events `sync-status:ProjectX` or
+`admission-events:ProjectX`, and sends none unless an input of that fragment
+changed, so an idle page costs no requests at all.
+
+Two sources feed the broker while at least one page is listening:
+
+- a local pass every LOCAL_INTERVAL seconds compares each joined team's
+  `TeamManager.team_state_stamp` (a few stat calls) and re-reads the sync
+  status only when it moved;
+- for each team with an active session, a Hub `/notifications/watch`
+  long-poll announces that admission events may have arrived.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from small_sea_client.live_updates import REFRESH_SCRIPT, EventBroker, event_stream
+
+LOCAL_INTERVAL = 1.0
+TEAM_LIST_INTERVAL = 10.0
+WATCH_TIMEOUT = 15
+WATCH_RETRY = 5.0
+
+_ENCRYPTED = "encrypted"
+_NOTETOSELF = "NoteToSelf"
+
+logger = logging.getLogger("small_sea_manager.live_updates")
+
+
+class LiveUpdates:
+    """Background sources of Manager UI events.
+
+    Stopping waits for at most one Hub long-poll per team.
+    """
+
+    def __init__(
+        self,
+        manager,
+        broker: EventBroker,
+        *,
+        interval: float = LOCAL_INTERVAL,
+        watch_timeout: int = WATCH_TIMEOUT,
+    ):
+        self.manager = manager
+        self.broker = broker
+        self.interval = interval
+        self.watch_timeout = watch_timeout
+        self._stopped = threading.Event()
+        self._threads: dict[str, threading.Thread] = {}
+        self._teams: list[str] = []
+        self._teams_read_at: Optional[float] = None
+        self._stamps: dict[str, tuple] = {}
+        self._sync_status: dict[str, str] = {}
+
+    def start(self) -> None:
+        self._spawn("local", self._local_loop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        for thread in list(self._threads.values()):
+            thread.join(timeout=self.watch_timeout + 5 if timeout is None else timeout)
+        self._threads = {}
+
+    def check_local(self, now: Optional[float] = None) -> list[str]:
+        """Run one local pass; return the event names it published."""
+        published = []
+        for team_name in self._joined_teams(now):
+            stamp = self.manager.team_state_stamp(team_name)
+            previous = self._stamps.get(team_name)
+            self._stamps[team_name] = stamp
+            if previous is None or previous == stamp:
+                continue
+            published.append(f"admission-events:{team_name}")
+            status = self.manager.get_team_sync_status(team_name)
+            if status != self._sync_status.get(team_name):
+                published.append(f"sync-status:{team_name}")
+            self._sync_status[team_name] = status
+        for name in published:
+            self.broker.publish(name)
+        return published
+
+    def _joined_teams(self, now: Optional[float]) -> list[str]:
+        if (
+            now is None
+            or self._teams_read_at is None
+            or now - self._teams_read_at >= TEAM_LIST_INTERVAL
+        ):
+            self._teams = [
+                t["name"] for t in self.manager.list_teams()
+                if t["name"] != _NOTETOSELF and t.get("joined_locally")
+            ]
+            self._teams_read_at = now
+            for team_name in self._teams:
+                if team_name not in self._sync_status:
+                    self._stamps[team_name] = self.manager.team_state_stamp(team_name)
+                    self._sync_status[team_name] = self.manager.get_team_sync_status(team_name)
+        return self._teams
+
+    def _spawn(self, key: str, target, *args) -> None:
+        thread = threading.Thread(
+            target=target, args=args, name=f"manager-live-{key}", daemon=True
+        )
+        self._threads[key] = thread
+        thread.start()
+
+    def _local_loop(self) -> None:
+        elapsed = 0.0
+        while not self._stopped.wait(self.interval):
+            elapsed += self.interval
+            if not self.broker.subscriber_count:
+                continue
+            try:
+                self.check_local(elapsed)
+                for team_name in self._teams:
+                    watching = self._threads.get(f"hub:{team_name}")
+                    if (watching is None or not watching.is_alive()) and (
+                        self.manager.session_state(team_name, _ENCRYPTED) == "active"
+                    ):
+                        self._spawn(f"hub:{team_name}", self._hub_loop, team_name)
+            except Exception:
+                logger.exception("Local UI event pass failed")
+
+    def _hub_loop(self, team_name: str) -> None:
+        while not self._stopped.is_set():
+            if self.manager.session_state(team_name, _ENCRYPTED) != "active":
+                return
+            if not self.broker.subscriber_count:
+                self._stopped.wait(self.interval)
+                continue
+            signalled = self.manager.watch_team_admission_signal(team_name, self.watch_timeout)
+            if signalled:
+                self.broker.publish(f"admission-events:{team_name}")
+            elif signalled is None:
+                # Hub unreachable or the watch failed; the local pass keeps
+                # running meanwhile.
+                self._stopped.wait(WATCH_RETRY)
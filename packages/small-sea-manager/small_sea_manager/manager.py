@@ -1,5 +1,7 @@
 import logging
+import os
 import pathlib
+import threading
 from typing import Optional
 
 from cod_sync.repo import Repo as _Repo
@@ -11,8 +13,10 @@ from small_sea_client.client import (
     SmallSeaError,
     SmallSeaHubUnavailable,
 )
+from small_sea_client.live_updates import stamp_is_settled
 from small_sea_manager import admission_events
 from small_sea_manager import provisioning
+from small_sea_sqlite import sqlite_policy
 
 _CORE_APP = "SmallSeaCollectiveCore"
 _LOG = logging.getLogger(__name__)
@@ -28,6 +32,11 @@ _ROUTE_REASON_BY_CLOUD_REASON = {
 }
 
 
+def _maintain_core_db(repo_dir):
+    """Re-lay out a Sync dir's core.db, if it needs it, before it is committed."""
+    sqlite_policy.maintain_tracked_layout(pathlib.Path(repo_dir) / "core.db")
+
+
 class AppSightingsRefresh(list):
     """List of current app-bootstrap prompts, with an optional cleanup warning.
 
@@ -93,6 +102,10 @@ class TeamManager:
         self._sessions: dict[tuple[str, str], "SmallSeaSession"] = {}
         # Pending PIN requests awaiting confirmation, keyed by (team, mode).
         self._pending: dict[tuple[str, str], str] = {}
+        # get_team_sync_status answers, keyed by team, with the
+        # team_state_stamp they were computed under.
+        self._sync_status_cache: dict[str, tuple[tuple, str]] = {}
+        self._sync_status_lock = threading.Lock()
 
     # ------------------------------------------------------------------ #
     # Session state management
@@ -217,6 +230,7 @@ class TeamManager:
         repo_dir = self._note_to_self_repo_dir()
         # Stage and commit any uncommitted NoteToSelf DB changes.
         nts_repo = _Repo(repo_dir / ".git", repo_dir)
+        _maintain_core_db(repo_dir)
         nts_repo.stage(["core.db"])
         nts_repo.commit("Update NoteToSelf")
         store = SmallSeaStore(
@@ -698,6 +712,7 @@ class TeamManager:
     def _commit_prepared_route(self, team_name, state) -> dict | None:
         """Commit a ready route, returning a retryable failure report if needed."""
         try:
+            _maintain_core_db(self._team_repo_dir(team_name))
             self._team_repo(team_name).commit_paths(
                 ["core.db"], "Announce berth storage"
             )
@@ -867,9 +882,63 @@ class TeamManager:
             return None
         return status_file.read_text().strip() or None
 
+    def team_state_stamp(self, team_name: str) -> tuple:
+        """Cheap fingerprint of a team's local Core state; no git, no SQLite.
+
+        Covers the Sync repo's HEAD and branch ref, its index, core.db and
+        its WAL, and the publication marker: everything get_team_sync_status
+        and the admission-event list read. Each file contributes
+        (inode, size, mtime_ns), or None when absent.
+        """
+        repo_dir = self._team_repo_dir(team_name)
+        git_dir = repo_dir / ".git"
+        paths = [
+            git_dir / "HEAD",
+            git_dir / "packed-refs",
+            git_dir / "index",
+            repo_dir / "core.db",
+            repo_dir / "core.db-wal",
+            self._push_status_file(team_name),
+        ]
+        try:
+            head = (git_dir / "HEAD").read_text().strip()
+        except OSError:
+            head = ""
+        if head.startswith("ref: "):
+            paths.append(git_dir / head[len("ref: "):])
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(stamp)
+
     def get_team_sync_status(self, team_name: str) -> str:
         """Return 'synced', 'needs_push', or 'never_pushed'.
 
+        Answered from cache while team_state_stamp is unchanged, so pages
+        that redraw the badge often run git only after the repo moved. As
+        with git's racy index entries, an answer read while a stamped file
+        is not yet settled is not cached.
+        """
+        stamp = self.team_state_stamp(team_name)
+        with self._sync_status_lock:
+            cached = self._sync_status_cache.get(team_name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        status = self._compute_team_sync_status(team_name)
+        newest = max((part[2] for part in stamp if part is not None), default=0)
+        if stamp_is_settled(newest):
+            with self._sync_status_lock:
+                self._sync_status_cache[team_name] = (stamp, status)
+        return status
+
+    def _compute_team_sync_status(self, team_name: str) -> str:
+        """Return 'synced', 'needs_push', or 'never_pushed'.
+
         Reports Manager-owned outgoing state only. Incoming state (hinted,
         fetched, parked, conflicted) is tracked separately.
 
@@ -913,6 +982,7 @@ class TeamManager:
         """
         repo_dir = self._team_repo_dir(team_name)
         repo = self._team_repo(team_name)
+        _maintain_core_db(repo_dir)
         repo.commit_paths(["core.db"], "Update team Core")
         # Capture the head being published before the remote operation, so the
         # marker names the exact state Cod Sync was handed.
@@ -970,11 +1040,22 @@ class TeamManager:
         )
 
     def wait_for_team_admission_signal(self, team_name: str, timeout: int = 15) -> bool:
-        """Wait for a Hub-backed berth pulse that may imply fresh admission events."""
+        """Wait for a Hub-backed berth pulse that may imply fresh admission events.
+
+        Returns False when no watch could be held (no session, Hub down).
+        """
+        return self.watch_team_admission_signal(team_name, timeout) is not None
+
+    def watch_team_admission_signal(self, team_name: str, timeout: int = 15) -> Optional[bool]:
+        """Like wait_for_team_admission_signal, but tells a pulse from a quiet timeout.
+
+        Returns True if a teammate's signal count moved, False if the watch
+        timed out quietly, and None if no watch could be held.
+        """
         key = (team_name, "encrypted")
         session = self._sessions.get(key)
         if session is None:
-            return False
+            return None
         try:
             known = {
                 peer["teammate_id"]: int(peer.get("signal_count", 0))
@@ -982,11 +1063,13 @@ class TeamManager:
             }
             result = session.watch_notifications(known, timeout=timeout)
         except SmallSeaHubUnavailable:
-            return False
+            return None
         except Exception:
             _LOG.exception("Admission-event watch failed for team %s", team_name)
-            return False
-        return "updated" in result
+            return None
+        if "updated" not in result:
+            return None
+        return bool(result["updated"]) or "self_updated_count" in result
 
     # --- Notification services ---
 
@@ -13,7 +13,9 @@ import json
 import os
 import pathlib
 import secrets
+import shlex
 import sqlite3
+import sys
 from dataclasses import replace
 from datetime import datetime, timezone
 
@@ -21,13 +23,15 @@ from cryptography.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PrivateKey,
     Ed25519PublicKey,
 )
-from sqlalchemy import Column, LargeBinary, String, create_engine, event, text
+from sqlalchemy import Column, LargeBinary, String, text
 from sqlalchemy.orm import Session, declarative_base
 
 Base = declarative_base()
 
 import shutil
 
+from small_sea_manager import connections
+
 
 def _enable_sqlite_foreign_keys(dbapi_connection, _connection_record) -> None:
     cursor = dbapi_connection.cursor()
@@ -38,9 +42,12 @@ def _enable_sqlite_foreign_keys(dbapi_connection, _connection_record) -> None:
 
 
 def _sqlite_engine(db_path) -> object:
-    engine = create_engine(f"sqlite:///{db_path}")
-    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
-    return engine
+    # Inside a participant operation this is the operation's shared engine.
+    return connections.sqlite_engine(db_path, _enable_sqlite_foreign_keys)
+
+
+def _sqlite_connect(db_path):
+    return connections.connect(db_path)
 
 import cod_sync.protocol as CodSync
 import cod_sync.store as CodStore
@@ -122,6 +129,8 @@ from small_sea_note_to_self.sender_keys import (
     serialize_sender_key_record,
     serialize_distribution_message,
 )
+from small_sea_sqlite import sqlite_policy
+from splice_merge import text as splice_text
 from wrasse_trust.constitution import (
     canonical_constitution_bytes,
     derive_record_id,
@@ -303,7 +312,7 @@ def _participant_key_from_public(public_key: bytes) -> ParticipantKey:
 
 
 def _linked_team_bootstrap_session_row(root_dir, participant_hex: str, bootstrap_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -323,7 +332,7 @@ def _linked_team_bootstrap_session_row(root_dir, participant_hex: str, bootstrap
 
 
 def _open_linked_team_bootstrap_session_for_team(root_dir, participant_hex: str, team_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -362,7 +371,7 @@ def _store_linked_team_bootstrap_session(
     finalized_at: str | None = None,
     response_payload_json: str | None = None,
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO linked_team_bootstrap_session (
@@ -439,7 +448,7 @@ def _update_linked_team_bootstrap_session(
     if not assignments:
         return
     values.append(bootstrap_id)
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             f"UPDATE linked_team_bootstrap_session SET {', '.join(assignments)} "
             "WHERE bootstrap_id = ?",
@@ -460,7 +469,7 @@ def _store_pending_linked_team_bootstrap(
 ) -> None:
     # Intentionally retained after finalize for create-side store-and-replay.
     # Cleanup of completed breadcrumbs is deferred for now.
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO pending_linked_team_bootstrap (
@@ -481,7 +490,7 @@ def _store_pending_linked_team_bootstrap(
 
 
 def _load_pending_linked_team_bootstrap(root_dir, participant_hex: str, bootstrap_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -495,7 +504,7 @@ def _load_pending_linked_team_bootstrap(root_dir, participant_hex: str, bootstra
 
 
 def _clear_pending_linked_team_bootstrap(root_dir, participant_hex: str, bootstrap_id: bytes) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             "DELETE FROM pending_linked_team_bootstrap WHERE bootstrap_id = ?",
             (bootstrap_id,),
@@ -532,7 +541,7 @@ REDISTRIBUTION_ONE_TIME_PREKEY_COUNT = 5
 
 
 def _redistribution_prekey_state_row(root_dir, participant_hex: str, team_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -555,7 +564,7 @@ def _redistribution_prekey_state_row(root_dir, participant_hex: str, team_id: by
 
 
 def _available_redistribution_one_time_prekeys(root_dir, participant_hex: str, team_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -580,7 +589,7 @@ def _store_redistribution_prekey_state(
 ) -> None:
     now = _now_iso()
     published = published_at or now
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO redistribution_prekey_state (
@@ -621,7 +630,7 @@ def _replace_redistribution_one_time_prekeys(
     team_id: bytes,
     one_time_prekeys: list[tuple[OneTimePrekey, bytes]],
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             "DELETE FROM redistribution_one_time_prekey WHERE team_id = ?",
             (team_id,),
@@ -652,7 +661,7 @@ def _consume_redistribution_one_time_prekey(
     team_id: bytes,
     prekey_id: bytes,
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             UPDATE redistribution_one_time_prekey
@@ -671,7 +680,7 @@ def _redistribution_one_time_prekey_private(
     team_id: bytes,
     prekey_id: bytes,
 ) -> bytes | None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         row = conn.execute(
             """
             SELECT private_key
@@ -699,20 +708,21 @@ def _ensure_redistribution_prekey_material(
             identity.signing_private_key
         )
         one_time_prekeys = generate_one_time_prekeys(REDISTRIBUTION_ONE_TIME_PREKEY_COUNT)
-        _store_redistribution_prekey_state(
-            root_dir,
-            participant_hex,
-            team_id=team_id,
-            identity=identity,
-            signed_prekey=signed_prekey,
-            signed_prekey_private_key=signed_prekey_private_key,
-        )
-        _replace_redistribution_one_time_prekeys(
-            root_dir,
-            participant_hex,
-            team_id=team_id,
-            one_time_prekeys=one_time_prekeys,
-        )
+        with connections.transaction(device_local_db_path(root_dir, participant_hex)):
+            _store_redistribution_prekey_state(
+                root_dir,
+                participant_hex,
+                team_id=team_id,
+                identity=identity,
+                signed_prekey=signed_prekey,
+                signed_prekey_private_key=signed_prekey_private_key,
+            )
+            _replace_redistribution_one_time_prekeys(
+                root_dir,
+                participant_hex,
+                team_id=team_id,
+                one_time_prekeys=one_time_prekeys,
+            )
         return identity, signed_prekey, signed_prekey_private_key, one_time_prekeys
 
     identity = IdentityKeyPair(
@@ -726,20 +736,21 @@ def _ensure_redistribution_prekey_material(
             identity.signing_private_key
         )
         one_time_prekeys = generate_one_time_prekeys(REDISTRIBUTION_ONE_TIME_PREKEY_COUNT)
-        _store_redistribution_prekey_state(
-            root_dir,
-            participant_hex,
-            team_id=team_id,
-            identity=identity,
-            signed_prekey=signed_prekey,
-            signed_prekey_private_key=signed_prekey_private_key,
-        )
-        _replace_redistribution_one_time_prekeys(
-            root_dir,
-            participant_hex,
-            team_id=team_id,
-            one_time_prekeys=one_time_prekeys,
-        )
+        with connections.transaction(device_local_db_path(root_dir, participant_hex)):
+            _store_redistribution_prekey_state(
+                root_dir,
+                participant_hex,
+                team_id=team_id,
+                identity=identity,
+                signed_prekey=signed_prekey,
+                signed_prekey_private_key=signed_prekey_private_key,
+            )
+            _replace_redistribution_one_time_prekeys(
+                root_dir,
+                participant_hex,
+                team_id=team_id,
+                one_time_prekeys=one_time_prekeys,
+            )
         return identity, signed_prekey, signed_prekey_private_key, one_time_prekeys
 
     signed_prekey = SignedPrekey(
@@ -2403,7 +2414,7 @@ def prepare_identity_bootstrap(root_dir, welcome_bundle_b64):
     _write_local_secret(final_encryption_key_path, pending_encryption_private_key_bytes)
     _write_local_secret(final_signing_key_path, _read_local_secret(pending_signing_private_key_path))
     local_db_path = device_local_db_path(root_dir, bundle.participant_hex)
-    with sqlite3.connect(local_db_path) as conn:
+    with _sqlite_connect(local_db_path) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO note_to_self_device_key_secret (
@@ -2443,7 +2454,7 @@ def finalize_identity_bootstrap(root_dir, prepared: dict):
     state = prepared["pending_state"]
     bundle_plaintext = serialize_welcome_bundle_plaintext(bundle)
     signature = bytes.fromhex(signed_bundle.signature_hex)
-    with sqlite3.connect(note_to_self_sync_db_path(root_dir, bundle.participant_hex)) as conn:
+    with _sqlite_connect(note_to_self_sync_db_path(root_dir, bundle.participant_hex)) as conn:
         signer_row = conn.execute(
             "SELECT signing_key FROM user_device WHERE id = ?",
             (bytes.fromhex(signed_bundle.authorizing_device_id_hex),),
@@ -2521,6 +2532,7 @@ def _migrate_team_db(conn, from_version):
 def ensure_team_db_schema(db_path):
     """Upgrade an existing team DB in place if needed."""
     engine = _sqlite_engine(db_path)
+    migrated = False
     try:
         with engine.begin() as conn:
             user_version = conn.execute(text("PRAGMA user_version")).scalar()
@@ -2529,7 +2541,7 @@ def ensure_team_db_schema(db_path):
             if (0 != user_version) and (user_version < USER_SCHEMA_VERSION):
                 _migrate_team_db(conn, user_version)
                 conn.execute(text(f"PRAGMA user_version = {USER_SCHEMA_VERSION}"))
-                return
+                migrated = True
             if user_version > USER_SCHEMA_VERSION:
                 raise FutureTeamDatabaseVersionError(
                     db_path,
@@ -2538,19 +2550,25 @@ def ensure_team_db_schema(db_path):
                 )
     finally:
         engine.dispose()
+    if migrated:
+        # A migrated file also moves to the tracked layout, in the same commit.
+        sqlite_policy.maintain_tracked_layout(db_path)
 
 
 def migrate_participant_team_dbs(root_dir, participant_hex):
-    """Ensure all existing team DBs for a participant are on the current schema."""
+    """Ensure all existing team DBs for a participant are on the current schema.
+
+    Also moves team repos from before the text form of core.db onto it.
+    """
     root_dir = pathlib.Path(root_dir)
     for team in list_teams(root_dir, participant_hex):
         team_name = team["name"]
         if team_name == "NoteToSelf":
             continue
-        team_db_path = (
-            root_dir / "Participants" / participant_hex / team_name / "Sync" / "core.db"
-        )
+        team_sync_dir = root_dir / "Participants" / participant_hex / team_name / "Sync"
+        team_db_path = team_sync_dir / "core.db"
         if team_db_path.exists():
+            ensure_core_text_format(team_sync_dir)
             ensure_team_db_schema(team_db_path)
 
 
@@ -3019,10 +3037,45 @@ def complete_linked_device_bootstrap(
     )
 
 
+# Writes to these tables can change what runtime reconciliation does: who is
+# trusted, on which devices and in which roles, and which of those devices a
+# sender key can be sent to.
+_TRUST_TABLES = (
+    "teammate",
+    "team_device",
+    "key_certificate",
+    "berth_role",
+    "device_prekey_bundle",
+)
+
+
+def trust_tables_fingerprint(team_db_path) -> str:
+    """A digest of a team core.db's trust tables, for local change detection.
+
+    Computed from the rows themselves, so nothing extra is written to the
+    synced file, and the same rows give the same digest whatever order a
+    merge or checkout left them in. Read it only once the file has changed.
+    """
+    digest = hashlib.sha256()
+    conn = _sqlite_connect(team_db_path)
+    try:
+        for table_name in _TRUST_TABLES:
+            rows = sorted(repr(row) for row in conn.execute(f"SELECT * FROM {table_name}"))
+            digest.update(f"{table_name}:{len(rows)}\n".encode())
+            for row in rows:
+                digest.update(row.encode())
+                digest.update(b"\n")
+    finally:
+        conn.close()
+    return digest.hexdigest()
+
+
 def _init_team_db(db_path):
     """Initialize a team core.db with the team schema. Returns the engine."""
     engine = _sqlite_engine(db_path)
     with engine.begin() as conn:
+        # core.db is git-tracked; its layout must be fixed before any table.
+        sqlite_policy.apply_tracked_layout(conn.connection.driver_connection)
         schema_path = pathlib.Path(__file__).parent / "sql" / "core_other_team.sql"
         with open(schema_path, "r") as f:
             schema_script = f.read()
@@ -3034,28 +3087,87 @@ def _init_team_db(db_path):
     return engine
 
 
+# Before core.db was stored as text, .gitattributes named only the merge driver.
+_LEGACY_CORE_GITATTRIBUTES = "core.db merge=splice-sqlite\n"
+_CORE_GITATTRIBUTES = "core.db filter=splice-sqlite merge=splice-sqlite\n"
+
+
 def _install_sqlite_merge_driver(team_sync_dir):
-    """Install the splice-sqlite-merge git merge driver for core.db.
+    """Install the splice-sqlite merge driver and text filter for core.db.
 
-    Writes .gitattributes (tracked) and configures the merge driver
-    command in .git/config (local only).
+    Writes .gitattributes (tracked) and configures the merge driver and the
+    clean/smudge filter in .git/config (local only). Git stores core.db as
+    its canonical text form (see splice_merge.text); the work-tree file is
+    a database rebuilt from it. A clone checked out before this ran holds
+    the text form, so it is rebuilt here.
     """
     team_sync_dir = pathlib.Path(team_sync_dir)
 
     # .gitattributes — tracked by git, cloned automatically
     gitattributes = team_sync_dir / ".gitattributes"
-    gitattributes.write_text("core.db merge=splice-sqlite\n")
+    gitattributes.write_text(_CORE_GITATTRIBUTES)
+    _configure_sqlite_git_drivers(team_sync_dir)
+    if splice_text.materialize(team_sync_dir / "core.db"):
+        # The index still records the text file's size, which git would
+        # read as a modification; re-staging stores the same blob.
+        _Repo(team_sync_dir / ".git", team_sync_dir).stage(["core.db"])
+
+
+def _configure_sqlite_git_drivers(team_sync_dir):
+    repo = _Repo(team_sync_dir / ".git", team_sync_dir)
 
     # Find the splice-sqlite-merge executable
     merge_bin = shutil.which("splice-sqlite-merge")
     if merge_bin is None:
         # Fallback: try to find it via the Python that's running us
         merge_bin = "splice-sqlite-merge"
-
-    driver_cmd = f"{merge_bin} %O %A %B %L %P"
-    _Repo(team_sync_dir / ".git", team_sync_dir).config(
-        "merge.splice-sqlite.driver", driver_cmd
-    )
+    repo.config("merge.splice-sqlite.driver", f"{merge_bin} %O %A %B %L %P")
+
+    text_bin = shutil.which("splice-sqlite-text")
+    if text_bin is None:
+        text_bin = f"{shlex.quote(sys.executable)} -m splice_merge.text"
+    repo.config("filter.splice-sqlite.clean", f"{text_bin} clean")
+    repo.config("filter.splice-sqlite.smudge", f"{text_bin} smudge")
+    # A missing filter must fail loudly, not store the database as is.
+    repo.config("filter.splice-sqlite.required", "true")
+    # Repeat the attributes where they outrank the tracked file, so an edit to
+    # .gitattributes cannot make git compare the database with its text.
+    info_attributes = team_sync_dir / ".git" / "info" / "attributes"
+    info_attributes.parent.mkdir(parents=True, exist_ok=True)
+    info_attributes.write_text(_CORE_GITATTRIBUTES)
+
+
+def ensure_core_text_format(team_sync_dir) -> bool:
+    """Move a team repo to the text form of core.db, or repair its local setup.
+
+    A repo whose .gitattributes still names only the merge driver gets the
+    filter and one commit that re-stores core.db as text; history keeps the
+    binary, which the filter and merge driver still read. A repo already on
+    the text form but without the filter configured (a clone, a copied
+    workspace) is configured and its core.db rebuilt. Returns True if a
+    commit was made.
+    """
+    team_sync_dir = pathlib.Path(team_sync_dir)
+    gitattributes = team_sync_dir / ".gitattributes"
+    if not gitattributes.exists():
+        return False
+    attributes = gitattributes.read_text()
+    if attributes == _LEGACY_CORE_GITATTRIBUTES:
+        _install_sqlite_merge_driver(team_sync_dir)
+        repo = _Repo(team_sync_dir / ".git", team_sync_dir)
+        repo.renormalize(["core.db"])
+        return (
+            repo.commit_paths([".gitattributes", "core.db"], "Store core.db as text")
+            is not None
+        )
+    if attributes == _CORE_GITATTRIBUTES:
+        git_config = team_sync_dir / ".git" / "config"
+        configured = git_config.exists() and '[filter "splice-sqlite"]' in git_config.read_text()
+        if not configured or splice_text.is_text(
+            (team_sync_dir / "core.db").read_bytes()[:64]
+        ):
+            _install_sqlite_merge_driver(team_sync_dir)
+    return False
 
 
 def _initialize_team_sender_key_state(user_db_path, team_id, sender_device_key_id):
@@ -3848,7 +3960,7 @@ def _delete_peer_sender_key_rows(db_path: str | pathlib.Path, team_id: bytes, se
         return
     placeholders = ", ".join("?" for _ in sender_device_key_ids)
     params = [team_id, *sender_device_key_ids]
-    with sqlite3.connect(str(db_path)) as conn:
+    with _sqlite_connect(str(db_path)) as conn:
         conn.execute(
             f"DELETE FROM peer_sender_key WHERE team_id = ? AND sender_device_key_id IN ({placeholders})",
             params,
@@ -3857,7 +3969,7 @@ def _delete_peer_sender_key_rows(db_path: str | pathlib.Path, team_id: bytes, se
 
 
 def _runtime_reconciliation_state_row(root_dir, participant_hex: str, team_id: bytes):
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.row_factory = sqlite3.Row
         return conn.execute(
             """
@@ -3884,7 +3996,7 @@ def _store_runtime_reconciliation_state(
     last_sender_device_key_id: bytes | None,
     last_sender_chain_id: bytes | None,
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO runtime_reconciliation_state (
@@ -3917,7 +4029,7 @@ def _delivery_exists(
     sender_chain_id: bytes,
     target_device_key_id: bytes,
 ) -> bool:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         row = conn.execute(
             """
             SELECT 1
@@ -3941,7 +4053,7 @@ def mark_redistribution_delivery(
     sender_chain_id: bytes,
     target_device_key_id: bytes,
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO redistribution_delivery (
@@ -3963,30 +4075,6 @@ def mark_redistribution_delivery(
         conn.commit()
 
 
-def _receipt_exists(
-    root_dir,
-    participant_hex: str,
-    *,
-    team_id: bytes,
-    sender_device_key_id: bytes,
-    sender_chain_id: bytes,
-    target_device_key_id: bytes,
-) -> bool:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
-        row = conn.execute(
-            """
-            SELECT 1
-            FROM redistribution_receipt
-            WHERE team_id = ?
-              AND sender_device_key_id = ?
-              AND sender_chain_id = ?
-              AND target_device_key_id = ?
-            """,
-            (team_id, sender_device_key_id, sender_chain_id, target_device_key_id),
-        ).fetchone()
-    return row is not None
-
-
 def mark_redistribution_receipt(
     root_dir,
     participant_hex: str,
@@ -3996,7 +4084,7 @@ def mark_redistribution_receipt(
     sender_chain_id: bytes,
     target_device_key_id: bytes,
 ) -> None:
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO redistribution_receipt (
@@ -4025,6 +4113,86 @@ def runtime_redistribution_artifact_path(target_device_key_id: bytes, sender_dev
     )
 
 
+RUNTIME_REDISTRIBUTION_INBOX_PATH = "runtime/redistribution/inbox.json"
+
+
+def _load_redistribution_inbox(data) -> dict:
+    """The inbox object as a dict; anything unreadable counts as empty."""
+    if data is None:
+        return {"version": 1, "senders": {}}
+    try:
+        inbox = json.loads(data.decode("utf-8") if isinstance(data, bytes) else data)
+    except (UnicodeDecodeError, ValueError):
+        return {"version": 1, "senders": {}}
+    if not isinstance(inbox, dict) or not isinstance(inbox.get("senders"), dict):
+        return {"version": 1, "senders": {}}
+    return inbox
+
+
+def merge_redistribution_inbox(existing, artifacts, trusted_sender_hexes=None) -> bytes:
+    """Add redistribution artifacts to a teammate's inbox object.
+
+    A teammate's bucket holds one inbox, RUNTIME_REDISTRIBUTION_INBOX_PATH,
+    with a section per sending device: its current chain id and the payload
+    for each target device. Every device of the teammate writes its own
+    section (under CAS), so a whole rotation is one write and a receiver
+    reads one object per teammate rather than probing a path per sender.
+    A section for an older chain is replaced, just as the per-target
+    artifact it succeeds used to be overwritten.
+
+    Given trusted_sender_hexes, the sections of every other sending device
+    (one that has since been removed) are dropped.
+    """
+    inbox = _load_redistribution_inbox(existing)
+    senders = inbox["senders"]
+    if trusted_sender_hexes is not None:
+        trusted = set(trusted_sender_hexes)
+        for sender_hex in [s for s in senders if s not in trusted]:
+            del senders[sender_hex]
+    for artifact in artifacts:
+        sender_hex = artifact["sender_device_key_id_hex"]
+        chain_hex = artifact["sender_chain_id_hex"]
+        section = senders.get(sender_hex)
+        if not isinstance(section, dict) or section.get("sender_chain_id") != chain_hex:
+            section = senders[sender_hex] = {"sender_chain_id": chain_hex, "artifacts": {}}
+        section["artifacts"][artifact["target_device_key_id_hex"]] = artifact[
+            "distribution_payload"
+        ]
+    return _json_bytes(inbox)
+
+
+def redistribution_inbox_senders(data) -> set:
+    """sender_device_key_id_hex of every device with a section in the inbox."""
+    return set(_load_redistribution_inbox(data)["senders"])
+
+
+def redistribution_inbox_payloads(data, target_device_key_id: bytes) -> dict:
+    """sender_device_key_id_hex → distribution payload addressed to a target device."""
+    target_hex = target_device_key_id.hex()
+    payloads = {}
+    for sender_hex, section in _load_redistribution_inbox(data)["senders"].items():
+        if not isinstance(section, dict) or not isinstance(section.get("artifacts"), dict):
+            continue
+        payload = section["artifacts"].get(target_hex)
+        if isinstance(payload, str):
+            payloads[sender_hex] = payload
+    return payloads
+
+
+def redistribution_receipts(root_dir, participant_hex: str, team_id: bytes) -> set:
+    """Every (sender device, sender chain, target device) received for a team."""
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
+        rows = conn.execute(
+            """
+            SELECT sender_device_key_id, sender_chain_id, target_device_key_id
+            FROM redistribution_receipt
+            WHERE team_id = ?
+            """,
+            (team_id,),
+        ).fetchall()
+    return {(bytes(row[0]), bytes(row[1]), bytes(row[2])) for row in rows}
+
+
 def peek_redistribution_payload_metadata(distribution_payload: str) -> dict:
     payload = _untokenize(distribution_payload)
     return {
@@ -4035,6 +4203,7 @@ def peek_redistribution_payload_metadata(distribution_payload: str) -> dict:
     }
 
 
+@connections.operation
 def rotate_team_sender_key(root_dir, participant_hex, team_name):
     root_dir = pathlib.Path(root_dir)
     team_id, _teammate_id = _team_row(root_dir, participant_hex, team_name)
@@ -4053,6 +4222,7 @@ def rotate_team_sender_key(root_dir, participant_hex, team_name):
     }
 
 
+@connections.operation
 def redistribute_sender_key(root_dir, participant_hex, team_name, target_device_key_ids=None):
     root_dir = pathlib.Path(root_dir)
     team_id, _self_in_team = _team_row(root_dir, participant_hex, team_name)
@@ -4155,6 +4325,7 @@ def redistribute_sender_key(root_dir, participant_hex, team_name, target_device_
     }
 
 
+@connections.operation
 def receive_sender_key_distribution(root_dir, participant_hex, team_name, distribution_payload):
     root_dir = pathlib.Path(root_dir)
     payload = _untokenize(distribution_payload)
@@ -4275,6 +4446,7 @@ def receive_sender_key_distribution(root_dir, participant_hex, team_name, distri
     }
 
 
+@connections.operation
 def reconcile_runtime_state(root_dir, participant_hex, team_name):
     root_dir = pathlib.Path(root_dir)
     team_id, self_in_team = _team_row(root_dir, participant_hex, team_name)
@@ -4379,6 +4551,7 @@ def reconcile_runtime_state(root_dir, participant_hex, team_name):
     }
 
 
+@connections.operation
 def remove_teammate(root_dir, participant_hex, team_name, teammate):
     root_dir = pathlib.Path(root_dir)
     removed_teammate_id = bytes.fromhex(teammate) if isinstance(teammate, str) else teammate
@@ -5134,6 +5307,7 @@ def activate_app_for_team(root_dir, participant_hex, team_name, app_name):
     return app_id.hex()
 
 
+@connections.operation
 def create_invitation(
     root_dir, participant_hex, team_name, inviter_cloud=None, invitee_label=None, mode_plan=None
 ):
@@ -5283,6 +5457,7 @@ def create_invitation(
     return token_b64
 
 
+@connections.operation
 def accept_invitation(
     root_dir,
     acceptor_participant_hex,
@@ -5578,6 +5753,7 @@ def _import_acceptance_route_sidecar(
     return "imported", None
 
 
+@connections.operation
 def complete_invitation_acceptance(
     root_dir, participant_hex, team_name, acceptance_b64
 ):
@@ -5877,6 +6053,7 @@ def endorse_admission(root_dir, participant_hex, team_name, proposal_id_hex):
     repo.commit("Recorded admission endorsement")
 
 
+@connections.operation
 def finalize_admission(root_dir, participant_hex, team_name, proposal_id_hex):
     root_dir = pathlib.Path(root_dir)
     proposal_id = bytes.fromhex(proposal_id_hex)
@@ -6086,7 +6263,7 @@ def _resolve_berth_id_for_allocation(root_dir, participant_hex, team_name, app_n
     participant_dir = root_dir / "Participants" / participant_hex
     note_to_self_db = note_to_self_sync_db_path(root_dir, participant_hex)
 
-    with sqlite3.connect(str(note_to_self_db)) as conn:
+    with _sqlite_connect(str(note_to_self_db)) as conn:
         team_row = conn.execute(
             "SELECT id FROM team WHERE name = ?",
             (team_name,),
@@ -6110,7 +6287,7 @@ def _resolve_berth_id_for_allocation(root_dir, participant_hex, team_name, app_n
             return row[0]
 
     team_db_path = participant_dir / team_name / "Sync" / "core.db"
-    with sqlite3.connect(str(team_db_path)) as conn:
+    with _sqlite_connect(str(team_db_path)) as conn:
         row = conn.execute(
             """
             SELECT tab.id
@@ -6702,7 +6879,7 @@ def _list_admission_event_dispositions(
 ):
     db_path = _admission_event_store_path(root_dir, participant_hex, team_name)
     team_db_path = _team_db_path(root_dir, participant_hex, team_name)
-    with sqlite3.connect(db_path) as conn:
+    with _sqlite_connect(db_path) as conn:
         _ensure_admission_event_store(conn, team_db_path=team_db_path)
         placeholders = ", ".join("?" for _ in dispositions)
         rows = conn.execute(
@@ -6739,7 +6916,7 @@ def dismiss_admission_event(root_dir, participant_hex, team_name, event_type, ar
     db_path = _admission_event_store_path(root_dir, participant_hex, team_name)
     team_db_path = _team_db_path(root_dir, participant_hex, team_name)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
+    with _sqlite_connect(db_path) as conn:
         _ensure_admission_event_store(conn, team_db_path=team_db_path)
         conn.execute(
             """
@@ -6757,7 +6934,7 @@ def mark_admission_event_notified(root_dir, participant_hex, team_name, event_ty
     db_path = _admission_event_store_path(root_dir, participant_hex, team_name)
     team_db_path = _team_db_path(root_dir, participant_hex, team_name)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
+    with _sqlite_connect(db_path) as conn:
         _ensure_admission_event_store(conn, team_db_path=team_db_path)
         conn.execute(
             """
@@ -6802,7 +6979,7 @@ def _ensure_team_app_disposition_store(conn) -> None:
 
 def dismiss_participant_app_sighting(root_dir, participant_hex, app_name):
     """Suppress participant-level prompts for an app on this device."""
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         _ensure_participant_app_disposition_store(conn)
         conn.execute(
             """
@@ -6827,7 +7004,7 @@ def dismiss_team_app_sighting(root_dir, participant_hex, team_name, app_name):
 
     db_path = _admission_event_store_path(root_dir, participant_hex, team_name)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
+    with _sqlite_connect(db_path) as conn:
         _ensure_team_app_disposition_store(conn)
         conn.execute(
             """
@@ -6943,7 +7120,7 @@ def current_app_sighting_prompt(root_dir, participant_hex, sighting):
             return _conservative_sighting(sighting)
 
     team_db_path = root_dir / "Participants" / participant_hex / team_name / "Sync" / "core.db"
-    with sqlite3.connect(team_db_path) as team:
+    with _sqlite_connect(team_db_path) as team:
         team_app_ids = _app_ids_by_name(team, app_name)
         if len(team_app_ids) > 1:
             return _current_sighting("app_friendly_name_ambiguous", sighting)
@@ -6973,7 +7150,7 @@ def app_sighting_dismissed(root_dir, participant_hex, sighting):
     """Return True if Manager should suppress this sighting on this device."""
     app_name = sighting["app_name"]
     team_name = sighting.get("team_name")
-    with sqlite3.connect(device_local_db_path(root_dir, participant_hex)) as conn:
+    with _sqlite_connect(device_local_db_path(root_dir, participant_hex)) as conn:
         _ensure_participant_app_disposition_store(conn)
         row = conn.execute(
             """
@@ -6991,7 +7168,7 @@ def app_sighting_dismissed(root_dir, participant_hex, sighting):
         # them as not dismissed instead of creating a DB or hiding the prompt.
         if not db_path.exists():
             return False
-        with sqlite3.connect(db_path) as conn:
+        with _sqlite_connect(db_path) as conn:
             _ensure_team_app_disposition_store(conn)
             row = conn.execute(
                 """
@@ -4,10 +4,11 @@ import asyncio
 import base64
 import json
 import pathlib
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from cod_sync.protocol import (
@@ -15,10 +16,12 @@ from cod_sync.protocol import (
     PublicationOutcomeUnresolvedError,
     PublicationRetryableError,
 )
+from small_sea_manager import live_updates
 from small_sea_manager.manager import TeamManager, _CORE_APP
 
 _template_dir = pathlib.Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=_template_dir)
+templates.env.globals["live_updates_script"] = live_updates.REFRESH_SCRIPT
 
 _NOTETOSELF = "NoteToSelf"
 
@@ -43,9 +46,22 @@ _ROUTE_DELIVERY_NOTICE = {
 
 
 def create_app(root_dir: str, participant_hex: str, hub_port: int = 11437) -> FastAPI:
-    """Create a configured FastAPI application."""
-    app = FastAPI(title="Small Sea Manager")
+    """Create a configured FastAPI application.
+
+    While the app is up, a LiveUpdates watcher feeds the `/events` stream
+    that tells open pages which fragments to re-fetch.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        watcher = live_updates.LiveUpdates(app.state.manager, app.state.events)
+        watcher.start()
+        yield
+        watcher.stop(timeout=1)
+
+    app = FastAPI(title="Small Sea Manager", lifespan=lifespan)
     app.state.manager = TeamManager(root_dir, participant_hex, hub_port)
+    app.state.events = live_updates.EventBroker()
 
     _NTS_TEAM = "NoteToSelf"
     _ENCRYPTED = "encrypted"
@@ -125,9 +141,6 @@ def create_app(root_dir: str, participant_hex: str, hub_port: int = 11437) -> Fa
             "sync_status": mgr.get_team_sync_status(team_name),
             "team_session_status": mgr.session_state(team_name, _ENCRYPTED),
             "team_session_mode_badge": _mode_badge(_ENCRYPTED),
-            "admission_watch_delay": _watch_delay(
-                mgr.session_state(team_name, _ENCRYPTED) == "active"
-            ),
             "team_notice": notice,
             "team_error": error,
         }
@@ -226,6 +239,14 @@ def create_app(root_dir: str, participant_hex: str, hub_port: int = 11437) -> Fa
             },
         )
 
+    @app.get("/events")
+    async def events(request: Request):
+        return StreamingResponse(
+            live_updates.event_stream(request.app.state.events, request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     # ------------------------------------------------------------------ #
     # Hub connection (NoteToSelf PIN flow)
     # ------------------------------------------------------------------ #
@@ -720,8 +741,13 @@ def create_app(root_dir: str, participant_hex: str, hub_port: int = 11437) -> Fa
             error = str(e)
         return _render_admission_events(request, team_name, notice=notice, error=error)
 
+    @app.get("/teams/{team_name}/admission-events", response_class=HTMLResponse)
+    async def admission_events(request: Request, team_name: str):
+        return _render_admission_events(request, team_name)
+
     @app.get("/teams/{team_name}/admission-events/watch", response_class=HTMLResponse)
     async def watch_admission_events(request: Request, team_name: str):
+        """Long-poll fallback for clients that do not hold the `/events` stream."""
         mgr = _mgr(request)
         active = mgr.session_state(team_name, _ENCRYPTED) == "active"
         hub_available = True
@@ -0,0 +1,121 @@
+import pathlib
+import sqlite3
+
+import pytest
+
+from small_sea_manager import connections, provisioning
+from small_sea_manager.provisioning import create_new_participant, create_team
+
+
+@pytest.fixture
+def operations():
+    seen = []
+    connections.add_operation_hook(seen.append)
+    yield seen
+    connections.remove_operation_hook(seen.append)
+
+
+def _make_db(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE item (name TEXT PRIMARY KEY)")
+    return path
+
+
+def _insert(path, name):
+    with provisioning._sqlite_connect(path) as conn:
+        conn.execute("INSERT INTO item (name) VALUES (?)", (name,))
+        conn.commit()
+
+
+def _names(path):
+    with sqlite3.connect(path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM item"))
+
+
+def test_an_operation_opens_each_db_once(playground_dir, operations):
+    root = pathlib.Path(playground_dir)
+    alice_hex = create_new_participant(root, "Alice")
+    create_team(root, alice_hex, "ProjectX")
+    operations.clear()
+
+    provisioning.reconcile_runtime_state(root, alice_hex, "ProjectX")
+
+    assert [stats.name for stats in operations] == ["reconcile_runtime_state"]
+    stats = operations[0]
+    assert stats.participant_hex == alice_hex
+    assert set(stats.connections.values()) == {1}
+    assert str(provisioning.device_local_db_path(root, alice_hex).resolve()) in stats.connections
+    assert stats.statement_count > 0
+
+
+def test_engines_and_raw_connections_share_one_connection(tmp_path, operations):
+    db = _make_db(tmp_path / "a.db")
+
+    with connections.participant_operation(tmp_path, "aa", "mixed"):
+        _insert(db, "raw")
+        engine = provisioning._sqlite_engine(db)
+        with engine.begin() as conn:
+            conn.execute(provisioning.text("INSERT INTO item (name) VALUES ('orm')"))
+        engine.dispose()
+        assert provisioning._sqlite_engine(db) is engine
+
+    assert operations[0].connection_count == 1
+    assert _names(db) == ["orm", "raw"]
+
+
+def test_transaction_commits_once_or_not_at_all(tmp_path, operations):
+    db = _make_db(tmp_path / "a.db")
+
+    with connections.transaction(db):
+        _insert(db, "one")
+        _insert(db, "two")
+        # Nothing is visible outside the batch until it ends.
+        assert _names(db) == []
+    assert _names(db) == ["one", "two"]
+
+    with pytest.raises(RuntimeError):
+        with connections.transaction(db):
+            _insert(db, "three")
+            raise RuntimeError("boom")
+    assert _names(db) == ["one", "two"]
+
+
+def test_a_failed_helper_inside_a_batch_undoes_only_its_own_work(tmp_path):
+    db = _make_db(tmp_path / "a.db")
+
+    with connections.transaction(db):
+        _insert(db, "kept")
+        with pytest.raises(sqlite3.IntegrityError):
+            with provisioning._sqlite_connect(db) as conn:
+                conn.execute("INSERT INTO item (name) VALUES ('dropped')")
+                conn.execute("INSERT INTO item (name) VALUES ('kept')")
+
+    assert _names(db) == ["kept"]
+
+
+def test_a_nested_helper_neither_commits_nor_undoes_the_outer_helpers_work(
+    tmp_path, operations
+):
+    db = _make_db(tmp_path / "a.db")
+
+    with connections.participant_operation(tmp_path, "aa", "nested"):
+        with pytest.raises(RuntimeError):
+            with provisioning._sqlite_connect(db) as outer:
+                outer.execute("INSERT INTO item (name) VALUES ('outer')")
+                _insert(db, "inner")
+                # The inner helper's commit waited for the outer block.
+                assert _names(db) == []
+                raise RuntimeError("outer fails after the inner helper finished")
+        assert _names(db) == []
+
+        with provisioning._sqlite_connect(db) as outer:
+            outer.execute("INSERT INTO item (name) VALUES ('outer')")
+            with pytest.raises(sqlite3.IntegrityError):
+                _insert(db, "outer")
+            engine = provisioning._sqlite_engine(db)
+            with engine.begin() as conn:
+                conn.execute(provisioning.text("INSERT INTO item (name) VALUES ('orm')"))
+            assert _names(db) == []
+        assert _names(db) == ["orm", "outer"]
+
+    assert operations[0].connection_count == 1
@@ -0,0 +1,73 @@
+"""core.db is stored in git as canonical text, and older repos move onto it."""
+
+import pathlib
+import sqlite3
+import subprocess
+
+from small_sea_manager.provisioning import (
+    _LEGACY_CORE_GITATTRIBUTES,
+    add_cloud_storage,
+    create_invitation,
+    create_new_participant,
+    create_team,
+    ensure_core_text_format,
+)
+from splice_merge import text
+
+ALICE_CLOUD = {
+    "protocol": "file",
+    "url": "file:///tmp/fake-alice",
+    "access_key": None,
+    "secret_key": None,
+}
+
+
+def _git(sync_dir, *args, check=True):
+    return subprocess.run(
+        ["git", "-C", str(sync_dir), *args], capture_output=True, check=check
+    )
+
+
+def _team(playground_dir):
+    root = pathlib.Path(playground_dir)
+    alice_hex = create_new_participant(root, "Alice")
+    add_cloud_storage(
+        root, alice_hex, protocol=ALICE_CLOUD["protocol"], url=ALICE_CLOUD["url"]
+    )
+    create_team(root, alice_hex, "ProjectX")
+    return root, alice_hex, root / "Participants" / alice_hex / "ProjectX" / "Sync"
+
+
+def test_git_stores_text_and_the_work_tree_keeps_a_database(playground_dir):
+    root, alice_hex, sync_dir = _team(playground_dir)
+
+    assert text.is_text(_git(sync_dir, "show", "HEAD:core.db").stdout)
+    assert text.is_sqlite((sync_dir / "core.db").read_bytes())
+    assert _git(sync_dir, "status", "--porcelain").stdout == b""
+
+    create_invitation(root, alice_hex, "ProjectX", ALICE_CLOUD, invitee_label="Bob")
+    _git(sync_dir, "commit", "-qm", "invite", "--", "core.db", check=False)
+    # A textual diff: git sees changed rows, not an opaque binary.
+    numstat = _git(sync_dir, "diff", "--numstat", "HEAD~1", "HEAD", "--", "core.db").stdout
+    added, removed, _path = numstat.decode().split("\t")
+    assert added != "-" and 0 < int(added) + int(removed) < 20
+
+
+def test_a_repo_from_before_the_text_form_is_migrated(playground_dir):
+    _root, _alice_hex, sync_dir = _team(playground_dir)
+    # Put the repo back the way older releases left it: binary in git.
+    (sync_dir / ".gitattributes").write_text(_LEGACY_CORE_GITATTRIBUTES)
+    _git(sync_dir, "config", "--remove-section", "filter.splice-sqlite")
+    (sync_dir / ".git" / "info" / "attributes").unlink()
+    _git(sync_dir, "add", "--renormalize", "core.db", ".gitattributes")
+    _git(sync_dir, "commit", "-qm", "legacy")
+    assert text.is_sqlite(_git(sync_dir, "show", "HEAD:core.db").stdout)
+
+    assert ensure_core_text_format(sync_dir)
+
+    assert text.is_text(_git(sync_dir, "show", "HEAD:core.db").stdout)
+    assert text.is_sqlite(_git(sync_dir, "show", "HEAD~1:core.db").stdout)
+    assert _git(sync_dir, "status", "--porcelain").stdout == b""
+    with sqlite3.connect(sync_dir / "core.db") as conn:
+        assert conn.execute("SELECT count(*) FROM teammate").fetchone()[0] == 1
+    assert not ensure_core_text_format(sync_dir)
@@ -0,0 +1,64 @@
+"""UI events: the cached sync status and what the local pass announces."""
+
+import pathlib
+
+import small_sea_client.live_updates as shared_live_updates
+import small_sea_manager.provisioning as Provisioning
+from small_sea_manager import live_updates
+from small_sea_manager.manager import TeamManager
+
+_TEAM = "ProjectX"
+
+
+class _RecordingBroker:
+    subscriber_count = 1
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, name):
+        self.published.append(name)
+
+
+def _manager(playground_dir):
+    participant_hex = Provisioning.create_new_participant(playground_dir, "alice")
+    Provisioning.create_team(playground_dir, participant_hex, _TEAM)
+    return TeamManager(playground_dir, participant_hex)
+
+
+def _marker(manager):
+    return pathlib.Path(manager.root_dir) / "Participants" / manager.participant_hex / _TEAM / ".ss_last_push"
+
+
+def test_sync_status_runs_git_only_after_the_team_repo_moved(playground_dir, monkeypatch):
+    manager = _manager(playground_dir)
+    monkeypatch.setattr(shared_live_updates, "RACY_STAMP_NS", 0)
+    computed = []
+    real_compute = manager._compute_team_sync_status
+    monkeypatch.setattr(
+        manager,
+        "_compute_team_sync_status",
+        lambda team: (computed.append(team), real_compute(team))[1],
+    )
+
+    assert manager.get_team_sync_status(_TEAM) == "never_pushed"
+    assert manager.get_team_sync_status(_TEAM) == "never_pushed"
+    assert computed == [_TEAM]
+
+    _marker(manager).write_text(manager._team_repo(_TEAM).head() + "\n")
+    assert manager.get_team_sync_status(_TEAM) == "synced"
+    assert computed == [_TEAM, _TEAM]
+
+
+def test_local_pass_announces_only_fragments_whose_inputs_changed(playground_dir):
+    manager = _manager(playground_dir)
+    broker = _RecordingBroker()
+    watcher = live_updates.LiveUpdates(manager, broker)
+
+    assert watcher.check_local() == []
+    assert watcher.check_local() == []
+
+    _marker(manager).write_text(manager._team_repo(_TEAM).head() + "\n")
+    assert watcher.check_local() == [f"admission-events:{_TEAM}", f"sync-status:{_TEAM}"]
+    assert broker.published == [f"admission-events:{_TEAM}", f"sync-status:{_TEAM}"]
+    assert watcher.check_local() == []
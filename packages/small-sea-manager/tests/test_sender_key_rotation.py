@@ -566,3 +566,110 @@ def test_parallel_device_prekey_bundle_rows_merge(playground_dir):
     device_key_ids = {row[0] for row in rows}
     assert b"a" * 16 in device_key_ids
     assert b"b" * 16 in device_key_ids
+
+
+def _inbox_artifact(sender: str, chain: str, target: str, payload: str) -> dict:
+    return {
+        "sender_device_key_id_hex": sender,
+        "sender_chain_id_hex": chain,
+        "target_device_key_id_hex": target,
+        "distribution_payload": payload,
+    }
+
+
+def test_redistribution_inbox_keeps_one_section_per_sender():
+    t1, t2 = b"\x01" * 16, b"\x02" * 16
+    inbox = provisioning.merge_redistribution_inbox(
+        None,
+        [
+            _inbox_artifact("aa", "c1", t1.hex(), "a-to-t1"),
+            _inbox_artifact("aa", "c1", t2.hex(), "a-to-t2"),
+        ],
+    )
+    inbox = provisioning.merge_redistribution_inbox(
+        inbox, [_inbox_artifact("bb", "c9", t1.hex(), "b-to-t1")]
+    )
+    assert provisioning.redistribution_inbox_payloads(inbox, t1) == {
+        "aa": "a-to-t1",
+        "bb": "b-to-t1",
+    }
+    assert provisioning.redistribution_inbox_payloads(inbox, b"\x03" * 16) == {}
+
+    # A rotation replaces the sender's whole section; other senders stay.
+    rotated = provisioning.merge_redistribution_inbox(
+        inbox, [_inbox_artifact("aa", "c2", t2.hex(), "a2-to-t2")]
+    )
+    assert provisioning.redistribution_inbox_payloads(rotated, t1) == {"bb": "b-to-t1"}
+    assert provisioning.redistribution_inbox_payloads(rotated, t2) == {"aa": "a2-to-t2"}
+    assert json.loads(rotated)["senders"]["aa"]["sender_chain_id"] == "c2"
+
+
+def test_redistribution_inbox_drops_sections_of_untrusted_senders():
+    t1 = b"\x01" * 16
+    inbox = provisioning.merge_redistribution_inbox(
+        None,
+        [
+            _inbox_artifact("aa", "c1", t1.hex(), "a-to-t1"),
+            _inbox_artifact("bb", "c9", t1.hex(), "b-to-t1"),
+        ],
+    )
+    assert provisioning.redistribution_inbox_senders(inbox) == {"aa", "bb"}
+
+    # bb's device was removed; aa's next rotation clears its section.
+    rotated = provisioning.merge_redistribution_inbox(
+        inbox, [_inbox_artifact("aa", "c2", t1.hex(), "a2-to-t1")], {"aa"}
+    )
+    assert provisioning.redistribution_inbox_senders(rotated) == {"aa"}
+    assert provisioning.redistribution_inbox_payloads(rotated, t1) == {"aa": "a2-to-t1"}
+
+
+def test_an_unreadable_redistribution_inbox_counts_as_empty():
+    assert provisioning.redistribution_inbox_payloads(b"not json", b"\x01") == {}
+    assert json.loads(provisioning.merge_redistribution_inbox(b"[]", [])) == {
+        "version": 1,
+        "senders": {},
+    }
+
+
+def test_redistribution_receipts_are_read_in_one_set(playground_dir):
+    root = pathlib.Path(playground_dir)
+    alice_hex = create_new_participant(root, "Alice")
+    create_team(root, alice_hex, "ProjectX")
+    team_id, _teammate_id = _team_row(root, alice_hex, "ProjectX")
+    assert provisioning.redistribution_receipts(root, alice_hex, team_id) == set()
+
+    provisioning.mark_redistribution_receipt(
+        root,
+        alice_hex,
+        team_id=team_id,
+        sender_device_key_id=b"s" * 16,
+        sender_chain_id=b"c" * 16,
+        target_device_key_id=b"t" * 16,
+    )
+    assert provisioning.redistribution_receipts(root, alice_hex, team_id) == {
+        (b"s" * 16, b"c" * 16, b"t" * 16)
+    }
+
+
+def test_trust_tables_fingerprint_moves_only_with_trust_tables(playground_dir):
+    root = pathlib.Path(playground_dir)
+    alice_hex = create_new_participant(root, "Alice")
+    create_team(root, alice_hex, "ProjectX")
+    team_db_path = _team_sync_dir(root, alice_hex, "ProjectX") / "core.db"
+    fingerprint = provisioning.trust_tables_fingerprint(team_db_path)
+
+    def schema_names():
+        with sqlite3.connect(team_db_path) as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+    before = schema_names()
+
+    with sqlite3.connect(team_db_path) as conn:
+        conn.execute("INSERT INTO team_setting (key, value) VALUES ('unrelated', 'x')")
+    assert provisioning.trust_tables_fingerprint(team_db_path) == fingerprint
+
+    with sqlite3.connect(team_db_path) as conn:
+        conn.execute("UPDATE teammate SET display_name = 'Renamed'")
+    assert provisioning.trust_tables_fingerprint(team_db_path) != fingerprint
+    # Detection reads the file; it adds nothing to it.
+    assert schema_names() == before
@@ -25,6 +25,7 @@ from .db import (
     SHARED_DB_FILENAME,
     SHARED_SCHEMA_VERSION,
     attached_note_to_self_connection,
+    close_pooled_note_to_self_connections,
     device_local_db_path,
     list_admission_acceptance_artifacts,
     get_note_to_self_adopted_count,
@@ -32,6 +33,7 @@ from .db import (
     initialize_shared_db,
     mark_admission_acceptance_artifact_exported,
     note_to_self_sync_db_path,
+    pooled_note_to_self_connection,
     save_admission_acceptance_artifact,
     set_note_to_self_adopted_count,
 )
@@ -53,6 +55,7 @@ __all__ = [
     "attached_note_to_self_connection",
     "canonical_join_request_artifact_bytes",
     "canonical_welcome_bundle_bytes",
+    "close_pooled_note_to_self_connections",
     "deserialize_join_request_artifact",
     "deserialize_signed_welcome_bundle_plaintext",
     "deserialize_welcome_bundle_plaintext",
@@ -64,6 +67,7 @@ __all__ = [
     "join_request_auth_string",
     "mark_admission_acceptance_artifact_exported",
     "note_to_self_sync_db_path",
+    "pooled_note_to_self_connection",
     "save_admission_acceptance_artifact",
     "set_note_to_self_adopted_count",
     "serialize_join_request_artifact",
@@ -1,7 +1,13 @@
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
+from small_sea_sqlite import sqlite_policy
+
 
 SHARED_DB_FILENAME = "core.db"
 LOCAL_DB_FILENAME = "device_local.db"
@@ -44,14 +50,71 @@ def _sql_dir() -> Path:
     return Path(__file__).parent / "sql"
 
 
+# Process-wide memo of DB files whose schema version has been checked:
+# resolved path -> (file identity, schema version). A file that is replaced
+# (a fresh workspace, a git checkout) or written by anyone else since gets a
+# new identity and is checked again.
+_verified_schemas: dict[str, tuple[tuple[int, int, int, int], int]] = {}
+_verified_schemas_lock = threading.Lock()
+
+
+def _file_identity(db_path: Path) -> tuple[int, int, int, int] | None:
+    try:
+        st = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    if st.st_size == 0:
+        # Created but never initialized; an inode may be reused, so an empty
+        # file is never trusted.
+        return None
+    # Inode alone misses a file rewritten in place or a reused inode.
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _schema_already_verified(db_path: Path, version: int) -> bool:
+    identity = _file_identity(db_path)
+    if identity is None:
+        return False
+    with _verified_schemas_lock:
+        return _verified_schemas.get(str(db_path.resolve())) == (identity, version)
+
+
+def _remember_verified_schema(db_path: Path, version: int) -> None:
+    identity = _file_identity(db_path)
+    if identity is None:
+        return
+    with _verified_schemas_lock:
+        _verified_schemas[str(db_path.resolve())] = (identity, version)
+
+
+def _carry_verified_schema(db_path: Path, before, after) -> None:
+    """Keep a schema memo across our own writes, which move the identity."""
+    if before is None or after is None or before == after:
+        return
+    with _verified_schemas_lock:
+        key = str(db_path.resolve())
+        memo = _verified_schemas.get(key)
+        if memo is not None and memo[0] == before:
+            _verified_schemas[key] = (after, memo[1])
+
+
+def forget_verified_schemas() -> None:
+    """Drop the schema memo, e.g. after editing a DB's user_version by hand."""
+    with _verified_schemas_lock:
+        _verified_schemas.clear()
+
+
 def initialize_shared_db(shared_db_path: str | Path) -> None:
     shared_db_path = Path(shared_db_path)
+    if _schema_already_verified(shared_db_path, SHARED_SCHEMA_VERSION):
+        return
     shared_db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(shared_db_path)
+    conn = sqlite_policy.connect(shared_db_path)
     try:
         current_version = conn.execute("PRAGMA user_version").fetchone()[0]
         if current_version == SHARED_SCHEMA_VERSION:
+            _remember_verified_schema(shared_db_path, SHARED_SCHEMA_VERSION)
             return
         if current_version > SHARED_SCHEMA_VERSION:
             raise FutureNoteToSelfDatabaseVersionError(
@@ -63,22 +126,30 @@ def initialize_shared_db(shared_db_path: str | Path) -> None:
         if current_version != 0:
             raise NotImplementedError("TODO: shared NoteToSelf DB migrations")
 
+        # The shared DB is git-tracked; see sqlite_policy.
+        sqlite_policy.apply_tracked_layout(conn)
         schema = (_sql_dir() / "shared_schema.sql").read_text()
         conn.executescript(schema)
         conn.execute(f"PRAGMA user_version = {SHARED_SCHEMA_VERSION}")
         conn.commit()
+        _remember_verified_schema(shared_db_path, SHARED_SCHEMA_VERSION)
     finally:
         conn.close()
 
 
 def initialize_device_local_db(local_db_path: str | Path) -> None:
     local_db_path = Path(local_db_path)
+    if _schema_already_verified(local_db_path, LOCAL_SCHEMA_VERSION):
+        return
     local_db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(local_db_path)
+    conn = sqlite_policy.connect(local_db_path)
     try:
         current_version = conn.execute("PRAGMA user_version").fetchone()[0]
         if current_version == LOCAL_SCHEMA_VERSION:
+            # Files an earlier build put in WAL mode are switched back here.
+            sqlite_policy.use_rollback_journal(conn)
+            _remember_verified_schema(local_db_path, LOCAL_SCHEMA_VERSION)
             return
         if current_version > LOCAL_SCHEMA_VERSION:
             raise FutureNoteToSelfDatabaseVersionError(
@@ -91,12 +162,17 @@ def initialize_device_local_db(local_db_path: str | Path) -> None:
             _migrate_device_local_db(conn, current_version)
             conn.execute(f"PRAGMA user_version = {LOCAL_SCHEMA_VERSION}")
             conn.commit()
+            _remember_verified_schema(local_db_path, LOCAL_SCHEMA_VERSION)
             return
 
         schema = (_sql_dir() / "device_local_schema.sql").read_text()
         conn.executescript(schema)
         conn.execute(f"PRAGMA user_version = {LOCAL_SCHEMA_VERSION}")
         conn.commit()
+        # The device-local DB is attached to the shared NoteToSelf DB, and a
+        # commit spanning both files is only atomic without WAL.
+        sqlite_policy.use_rollback_journal(conn)
+        _remember_verified_schema(local_db_path, LOCAL_SCHEMA_VERSION)
     finally:
         conn.close()
 
@@ -132,20 +208,104 @@ def attached_note_to_self_connection(root_dir: str | Path, participant_hex: str)
     local_db = device_local_db_path(root_dir, participant_hex)
     initialize_shared_db(shared_db)
     initialize_device_local_db(local_db)
+    return _open_attached(shared_db, local_db)
 
-    conn = sqlite3.connect(shared_db)
+
+def _open_attached(shared_db: Path, local_db: Path, **connect_kwargs) -> sqlite3.Connection:
+    conn = sqlite_policy.connect(shared_db, **connect_kwargs)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("ATTACH DATABASE ? AS local", (str(local_db),))
     return conn
 
 
+POOLED_CONNECTIONS_PER_PARTICIPANT = 4
+POOLED_PARTICIPANTS = 32
+
+# (shared path, local path) -> idle (connection, file identities) pairs,
+# least recently used participant first.
+_attached_pool: "OrderedDict[tuple[str, str], list]" = OrderedDict()
+_attached_pool_lock = threading.Lock()
+
+
+@contextmanager
+def pooled_note_to_self_connection(root_dir: str | Path, participant_hex: str):
+    """An attached NoteToSelf connection borrowed from a process-wide pool.
+
+    Use it like `attached_note_to_self_connection`: leaving the block
+    commits, or rolls back on error. The connection then goes back to the
+    pool instead of being closed, so hot paths skip the connect, the
+    foreign-key pragma and the ATTACH. A pooled connection is dropped when
+    either file has been replaced or written by someone else since it went
+    back to the pool.
+    """
+    shared_db = note_to_self_sync_db_path(root_dir, participant_hex)
+    local_db = device_local_db_path(root_dir, participant_hex)
+    initialize_shared_db(shared_db)
+    initialize_device_local_db(local_db)
+    key = (str(shared_db.resolve()), str(local_db.resolve()))
+    identities = (_file_identity(shared_db), _file_identity(local_db))
+
+    conn = None
+    stale = []
+    with _attached_pool_lock:
+        idle = _attached_pool.get(key, [])
+        while idle:
+            candidate, candidate_identities = idle.pop()
+            if candidate_identities == identities:
+                conn = candidate
+                break
+            stale.append(candidate)
+    for candidate in stale:
+        candidate.close()
+    if conn is None:
+        conn = _open_attached(shared_db, local_db, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+
+    try:
+        with conn:
+            yield conn
+    except BaseException:
+        conn.close()
+        raise
+    # Our own writes move both files' identities; record them as left.
+    written = (_file_identity(shared_db), _file_identity(local_db))
+    for path, before, after in zip((shared_db, local_db), identities, written):
+        _carry_verified_schema(path, before, after)
+    _return_to_pool(key, conn, written)
+
+
+def _return_to_pool(key, conn: sqlite3.Connection, identities) -> None:
+    evicted = []
+    with _attached_pool_lock:
+        idle = _attached_pool.setdefault(key, [])
+        _attached_pool.move_to_end(key)
+        if len(idle) < POOLED_CONNECTIONS_PER_PARTICIPANT:
+            idle.append((conn, identities))
+        else:
+            evicted.append(conn)
+        while len(_attached_pool) > POOLED_PARTICIPANTS:
+            _old_key, old_idle = _attached_pool.popitem(last=False)
+            evicted.extend(candidate for candidate, _ in old_idle)
+    for candidate in evicted:
+        candidate.close()
+
+
+def close_pooled_note_to_self_connections() -> None:
+    """Close every idle pooled connection."""
+    with _attached_pool_lock:
+        idle = [conn for pairs in _attached_pool.values() for conn, _ in pairs]
+        _attached_pool.clear()
+    for conn in idle:
+        conn.close()
+
+
 def get_note_to_self_adopted_count(
     root_dir: str | Path, participant_hex: str, berth_id: bytes
 ) -> int | None:
     local_db = device_local_db_path(root_dir, participant_hex)
     initialize_device_local_db(local_db)
-    conn = sqlite3.connect(local_db)
+    conn = sqlite_policy.connect(local_db)
     try:
         row = conn.execute(
             """
@@ -165,7 +325,7 @@ def set_note_to_self_adopted_count(
 ) -> None:
     local_db = device_local_db_path(root_dir, participant_hex)
     initialize_device_local_db(local_db)
-    conn = sqlite3.connect(local_db)
+    conn = sqlite_policy.connect(local_db)
     try:
         conn.execute(
             """
@@ -212,7 +372,7 @@ _ACCEPTANCE_ARTIFACT_COLUMNS = (
 def _local_connection(root_dir: str | Path, participant_hex: str) -> sqlite3.Connection:
     local_db = device_local_db_path(root_dir, participant_hex)
     initialize_device_local_db(local_db)
-    return sqlite3.connect(local_db)
+    return sqlite_policy.connect(local_db)
 
 
 def list_admission_acceptance_artifacts(
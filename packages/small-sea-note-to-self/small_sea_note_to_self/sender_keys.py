@@ -7,6 +7,7 @@ from cuttlefish.group import (
     SenderKeyRecord,
     process_sender_key_distribution,
 )
+from small_sea_sqlite import sqlite_policy
 
 
 def distribution_message_from_record(record: SenderKeyRecord) -> SenderKeyDistributionMessage:
@@ -106,13 +107,14 @@ def _record_from_row(row) -> SenderKeyRecord | None:
     )
 
 
+@sqlite_policy.retry_on_lock
 def _save_record(
     db_path: str | Path,
     table_name: str,
     team_id: bytes,
     record: SenderKeyRecord,
 ) -> None:
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     try:
         conn.execute(
             f"""
@@ -154,7 +156,7 @@ def save_peer_sender_key(db_path: str | Path, team_id: bytes, record: SenderKeyR
 
 
 def load_team_sender_key(db_path: str | Path, team_id: bytes) -> SenderKeyRecord | None:
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         row = conn.execute(
@@ -174,7 +176,7 @@ def load_team_sender_key(db_path: str | Path, team_id: bytes) -> SenderKeyRecord
 def load_peer_sender_key(
     db_path: str | Path, team_id: bytes, sender_device_key_id: bytes
 ) -> SenderKeyRecord | None:
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         row = conn.execute(
@@ -192,7 +194,7 @@ def load_peer_sender_key(
 
 
 def load_all_peer_sender_keys(db_path: str | Path, team_id: bytes) -> list[SenderKeyRecord]:
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         rows = conn.execute(
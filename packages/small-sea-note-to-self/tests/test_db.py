@@ -123,3 +123,86 @@ def test_old_device_local_note_to_self_db_version_requires_recreate(tmp_path):
         version = conn.execute("PRAGMA user_version").fetchone()[0]
     assert version == old_version
     assert "note_to_self_sync_state" not in _table_names(db_path)
+
+
+def test_verified_schema_is_not_checked_again_until_the_file_is_replaced(tmp_path, monkeypatch):
+    from small_sea_note_to_self import db
+
+    db_path = tmp_path / "core.db"
+    initialize_shared_db(db_path)
+
+    def no_connect(*_args, **_kwargs):
+        raise AssertionError("schema was checked again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(db.sqlite3, "connect", no_connect)
+        initialize_shared_db(db_path)
+
+    replacement = tmp_path / "replacement.db"
+    _stamp_future_version(replacement, SHARED_SCHEMA_VERSION + 1)
+    replacement.replace(db_path)
+
+    with pytest.raises(FutureNoteToSelfDatabaseVersionError):
+        initialize_shared_db(db_path)
+
+
+def test_verified_schema_is_checked_again_after_a_write_in_place(tmp_path):
+    db_path = tmp_path / "core.db"
+    initialize_shared_db(db_path)
+    inode = db_path.stat().st_ino
+
+    # Same inode, new contents: only the mtime and size tell them apart.
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute(f"PRAGMA user_version = {SHARED_SCHEMA_VERSION + 1}")
+        conn.execute("CREATE TABLE padding (x BLOB)")
+    assert db_path.stat().st_ino == inode
+
+    with pytest.raises(FutureNoteToSelfDatabaseVersionError):
+        initialize_shared_db(db_path)
+
+
+def test_device_local_db_stays_on_the_rollback_journal(tmp_path):
+    # It is attached to the shared DB, and SQLite only commits across
+    # attached files atomically without WAL.
+    fresh = tmp_path / "fresh.db"
+    initialize_device_local_db(fresh)
+
+    converted = tmp_path / "converted.db"
+    initialize_device_local_db(converted)
+    with sqlite3.connect(str(converted)) as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+    initialize_device_local_db(converted)
+
+    for db_path in (fresh, converted):
+        with sqlite3.connect(str(db_path)) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_pooled_connection_is_reused_until_a_file_is_replaced(tmp_path):
+    from small_sea_note_to_self.db import (
+        close_pooled_note_to_self_connections,
+        note_to_self_sync_db_path,
+        pooled_note_to_self_connection,
+    )
+
+    participant_hex = "ab" * 16
+    try:
+        with pooled_note_to_self_connection(tmp_path, participant_hex) as first:
+            first.execute("INSERT INTO local.note_to_self_sync_state VALUES (?, ?, ?)", (b"b", 3, "t"))
+            first.row_factory = None
+        with pooled_note_to_self_connection(tmp_path, participant_hex) as second:
+            row = second.execute("SELECT last_adopted_count FROM local.note_to_self_sync_state").fetchone()
+        assert second is first
+        assert row["last_adopted_count"] == 3
+
+        shared_db = note_to_self_sync_db_path(tmp_path, participant_hex)
+        copy = shared_db.with_name("copy.db")
+        with sqlite3.connect(str(shared_db)) as src, sqlite3.connect(str(copy)) as dst:
+            src.backup(dst)
+        copy.replace(shared_db)
+
+        with pooled_note_to_self_connection(tmp_path, participant_hex) as third:
+            third.execute("SELECT 1 FROM user_device").fetchall()
+        assert third is not first
+    finally:
+        close_pooled_note_to_self_connections()
@@ -0,0 +1,194 @@
+"""How Small Sea opens the SQLite files several processes share.
+
+The Hub, the Manager, ssc-files and the git merge driver all open the same
+files, so they follow one policy:
+
+- Device-local files that git never sees (the Hub's local DB, ssc-files'
+  checkouts.db) run in WAL mode, so readers never block the writer. WAL is
+  a property of the file: `use_wal` sets it once, when the file is created,
+  and every later connection inherits it.
+- A file that gets ATTACHed to another (the NoteToSelf device-local DB)
+  keeps the rollback journal even though git never sees it: SQLite commits
+  a transaction spanning several files atomically only when none of them
+  is in WAL mode. `use_rollback_journal` sets that.
+- Git-tracked files (every `core.db`) keep the rollback journal, which
+  `Experiments/sqlite_storage_stability_comparison.py` found rewrites the
+  fewest pages per commit. Before one is staged, `checkpoint` folds back
+  any WAL left by some other opener, so git never captures a file whose
+  newest pages live beside it.
+- Tracked files also get a fixed layout (`apply_tracked_layout`), so the
+  same rows produce the same pages on every device whatever the local
+  SQLite build defaults, and `maintain_tracked_layout` re-lays out a file
+  before publication once free pages would pad every later bundle.
+- Every connection waits up to BUSY_TIMEOUT_SECONDS for a lock and runs
+  with secure_delete on (see `configure`).
+- Some lock conflicts fail at once instead of waiting (a deferred
+  transaction upgrading to write while another writer holds the lock, or a
+  WAL snapshot gone stale). `retry_on_lock` re-runs the whole unit of work
+  a few times with a short backoff.
+"""
+
+import functools
+import os
+import sqlite3
+import time
+
+BUSY_TIMEOUT_SECONDS = 10.0
+LOCK_RETRY_ATTEMPTS = 5
+LOCK_RETRY_DELAY_SECONDS = 0.05
+
+# Layout of git-tracked files, measured with
+# Experiments/sqlite_storage_stability_comparison.py (--policy). Neither a
+# larger nor a smaller page shrank small-change bundles, and 4096 keeps
+# signature and certificate rows off overflow pages. Auto-vacuum moves pages
+# at every commit; with it off, freed pages are reused where they are.
+# Pinning both means the same rows make the same file on every device.
+TRACKED_PAGE_SIZE = 4096
+TRACKED_AUTO_VACUUM = 0
+# Re-lay out a tracked file before publication once this share of its pages,
+# and at least RELAYOUT_MIN_FREE_PAGES, sit on the freelist.
+RELAYOUT_FREE_FRACTION = 0.25
+RELAYOUT_MIN_FREE_PAGES = 64
+
+
+def connect(db_path, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect with the shared busy timeout and page policy."""
+    kwargs.setdefault("timeout", BUSY_TIMEOUT_SECONDS)
+    conn = sqlite3.connect(str(db_path), **kwargs)
+    configure(conn)
+    return conn
+
+
+def configure(dbapi_connection, _connection_record=None) -> None:
+    """Per-connection settings; also usable as a SQLAlchemy "connect" listener.
+
+    secure_delete is on whatever the SQLite build's default. Freed cells are
+    zeroed on pages that are being rewritten anyway, and zeros compress, so
+    bundles after deletes come out smaller; deleted rows also stop lingering
+    in the free space of a file that gets published.
+    """
+    dbapi_connection.execute("PRAGMA secure_delete = ON")
+
+
+def engine_connect_args() -> dict:
+    """`connect_args` for a SQLAlchemy engine over a shared SQLite file.
+
+    Pair it with `configure` as the engine's "connect" listener.
+    """
+    return {"timeout": BUSY_TIMEOUT_SECONDS}
+
+
+def use_wal(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Put an untracked file in WAL mode. Only for files git never stages."""
+    conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+
+
+def use_rollback_journal(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Keep a file on the rollback journal, undoing an earlier `use_wal`."""
+    conn.execute(f"PRAGMA {schema}.journal_mode = DELETE")
+
+
+def apply_tracked_layout(conn: sqlite3.Connection) -> None:
+    """Fix the page layout of a new tracked file. Call before creating tables."""
+    conn.execute(f"PRAGMA page_size = {TRACKED_PAGE_SIZE}")
+    conn.execute(f"PRAGMA auto_vacuum = {TRACKED_AUTO_VACUUM}")
+
+
+def tracked_layout_needs_relayout(conn: sqlite3.Connection) -> bool:
+    """True if the file has another layout, or enough free pages to matter."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if page_count == 0:
+        return False
+    if page_size != TRACKED_PAGE_SIZE or auto_vacuum != TRACKED_AUTO_VACUUM:
+        return True
+    return (
+        free_pages >= RELAYOUT_MIN_FREE_PAGES
+        and free_pages >= RELAYOUT_FREE_FRACTION * page_count
+    )
+
+
+def maintain_tracked_layout(db_path) -> bool:
+    """Re-lay out a tracked file before it is committed for publication.
+
+    Rewriting the file costs one larger bundle, so it only happens when the
+    file has another layout (a file created before this policy, or by
+    another build) or when free pages make up enough of it that they would
+    pad every later bundle. Rows come back in rowid order. Returns True if
+    the file was rewritten.
+    """
+    if not os.path.exists(db_path):
+        return False
+
+    def relayout():
+        conn = connect(db_path)
+        try:
+            if not tracked_layout_needs_relayout(conn):
+                return False
+            apply_tracked_layout(conn)
+            conn.execute("VACUUM")
+            return True
+        finally:
+            conn.close()
+
+    checkpoint(db_path)
+    return retry_on_lock(relayout)()
+
+
+def checkpoint(db_path) -> bool:
+    """Fold any WAL beside a git-tracked file back into it before staging.
+
+    Costs one stat when there is no WAL, which is the normal case. Returns
+    True if a WAL was found and checkpointed.
+    """
+    if not os.path.exists(f"{db_path}-wal"):
+        return False
+
+    def fold():
+        conn = connect(db_path)
+        try:
+            busy, _log, _checkpointed = conn.execute(
+                "PRAGMA wal_checkpoint(TRUNCATE)"
+            ).fetchone()
+            if busy:
+                raise sqlite3.OperationalError("database is locked")
+        finally:
+            conn.close()
+
+    retry_on_lock(fold)()
+    return True
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    message = str(exc).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def retry_on_lock(func=None, *, attempts: int | None = None):
+    """Re-run func when SQLite reports a lock conflict.
+
+    Wrap a whole unit of work, one that opens its own connection and commits
+    or rolls back, so that a retry starts from a clean transaction.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tries = attempts or LOCK_RETRY_ATTEMPTS
+            for attempt in range(tries):
+                try:
+                    return func(*args, **kwargs)
+                except sqlite3.OperationalError as exc:
+                    if not is_lock_error(exc) or attempt == tries - 1:
+                        raise
+                time.sleep(LOCK_RETRY_DELAY_SECONDS * (2**attempt))
+
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
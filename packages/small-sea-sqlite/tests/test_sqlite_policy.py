@@ -0,0 +1,123 @@
+"""Micro tests for small_sea_sqlite.sqlite_policy."""
+
+import sqlite3
+
+import pytest
+
+from small_sea_sqlite import sqlite_policy
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(sqlite_policy, "LOCK_RETRY_DELAY_SECONDS", 0)
+
+
+def test_retry_on_lock_retries_only_lock_errors():
+    calls = []
+
+    @sqlite_policy.retry_on_lock
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return "done"
+
+    assert flaky() == "done"
+    assert len(calls) == 3
+
+    @sqlite_policy.retry_on_lock
+    def broken():
+        calls.append(1)
+        raise sqlite3.OperationalError("no such table: item")
+
+    calls.clear()
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        broken()
+    assert len(calls) == 1
+
+
+def test_retry_on_lock_gives_up_after_its_attempts():
+    calls = []
+
+    @sqlite_policy.retry_on_lock(attempts=2)
+    def always_locked():
+        calls.append(1)
+        raise sqlite3.OperationalError("database is locked")
+
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        always_locked()
+    assert len(calls) == 2
+
+
+def test_wal_readers_do_not_block_the_writer(tmp_path):
+    db = tmp_path / "local.db"
+    with sqlite_policy.connect(db) as conn:
+        sqlite_policy.use_wal(conn)
+        conn.execute("CREATE TABLE item (name TEXT)")
+
+    reader = sqlite_policy.connect(db)
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT count(*) FROM item").fetchone() == (0,)
+
+    writer = sqlite_policy.connect(db, timeout=0)
+    with writer:
+        writer.execute("INSERT INTO item VALUES ('x')")
+    # The open read transaction keeps its snapshot.
+    assert reader.execute("SELECT count(*) FROM item").fetchone() == (0,)
+    reader.rollback()
+    reader.close()
+    writer.close()
+
+
+def test_checkpoint_is_a_no_op_without_a_wal(tmp_path):
+    db = tmp_path / "core.db"
+    with sqlite_policy.connect(db) as conn:
+        conn.execute("CREATE TABLE item (name TEXT)")
+    assert sqlite_policy.checkpoint(db) is False
+
+
+def _tracked_db(path, rows):
+    conn = sqlite_policy.connect(path)
+    sqlite_policy.apply_tracked_layout(conn)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO t (body) VALUES (?)", [("x" * 200,)] * rows)
+    conn.commit()
+    conn.close()
+
+
+def _layout(path):
+    conn = sqlite3.connect(path)
+    try:
+        return tuple(
+            conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("page_size", "auto_vacuum", "freelist_count")
+        )
+    finally:
+        conn.close()
+
+
+def test_maintain_tracked_layout_only_rewrites_fragmented_files(tmp_path):
+    db = tmp_path / "core.db"
+    _tracked_db(db, 2000)
+    assert not sqlite_policy.maintain_tracked_layout(db)
+
+    with sqlite_policy.connect(db) as conn:
+        conn.execute("DELETE FROM t WHERE id % 4 != 0")
+    assert _layout(db)[2] > 0
+
+    assert sqlite_policy.maintain_tracked_layout(db)
+    assert _layout(db) == (sqlite_policy.TRACKED_PAGE_SIZE, sqlite_policy.TRACKED_AUTO_VACUUM, 0)
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 500
+
+
+def test_maintain_tracked_layout_migrates_other_layouts(tmp_path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("PRAGMA page_size = 1024")
+        conn.execute("PRAGMA auto_vacuum = FULL")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+
+    assert sqlite_policy.maintain_tracked_layout(db)
+    assert _layout(db)[:2] == (sqlite_policy.TRACKED_PAGE_SIZE, sqlite_policy.TRACKED_AUTO_VACUUM)
+    assert not sqlite_policy.maintain_tracked_layout(tmp_path / "missing.db")
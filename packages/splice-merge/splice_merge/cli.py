@@ -5,11 +5,45 @@ Git invokes this as:
 
 Where %O=ancestor, %A=ours (result written here), %B=theirs,
 %L=conflict-marker-size, %P=pathname.
+
+Each side may hold the database itself or its canonical text form (see
+splice_merge.text); a repo moving to the text form has both in its history.
+The result takes the text form if either side already has it.
 """
 
+import pathlib
+import shutil
 import sys
+import tempfile
+
+from . import text
+from .core import apply_delta, compute_delta, reconcile_deltas
+
 
-from .core import apply_delta, compute_delta, reconcile_deltas, sqlite_to_json
+def merge_files(ancestor_path, ours_path, theirs_path):
+    """Three-way merge into ours_path."""
+    ancestor = text.read_json(ancestor_path)
+    ours = text.read_json(ours_path)
+    theirs = text.read_json(theirs_path)
+
+    ours_delta = compute_delta(ancestor, ours)
+    theirs_delta = compute_delta(ancestor, theirs)
+    cleaned = reconcile_deltas(ours_delta, theirs_delta)
+
+    ours_data = pathlib.Path(ours_path).read_bytes()
+    theirs_data = pathlib.Path(theirs_path).read_bytes()
+    if not (text.is_text(ours_data) or text.is_text(theirs_data)):
+        apply_delta(ours_path, cleaned)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        merged_db = pathlib.Path(tmp) / "merged.db"
+        if text.is_text(ours_data):
+            text.load(ours_data.decode("utf-8"), merged_db)
+        else:
+            shutil.copyfile(ours_path, merged_db)
+        apply_delta(merged_db, cleaned)
+        pathlib.Path(ours_path).write_text(text.dump(merged_db), encoding="utf-8")
 
 
 def main():
@@ -24,14 +58,7 @@ def main():
     pathname = sys.argv[5] if len(sys.argv) > 5 else "<unknown>"
 
     try:
-        ancestor = sqlite_to_json(ancestor_path)
-        ours = sqlite_to_json(ours_path)
-        theirs = sqlite_to_json(theirs_path)
-
-        ours_delta = compute_delta(ancestor, ours)
-        theirs_delta = compute_delta(ancestor, theirs)
-        cleaned = reconcile_deltas(ours_delta, theirs_delta)
-        apply_delta(ours_path, cleaned)
+        merge_files(ancestor_path, ours_path, theirs_path)
     except Exception as e:
         print(f"splice-sqlite-merge failed for {pathname}: {e}", file=sys.stderr)
         sys.exit(1)
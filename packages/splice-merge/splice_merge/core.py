@@ -3,6 +3,8 @@
 import sqlite3
 import sys
 
+from small_sea_sqlite import sqlite_policy
+
 
 def sqlite_to_json(db_path):
     """Convert a SQLite database to a JSON-serialisable dict.
@@ -10,7 +12,7 @@ def sqlite_to_json(db_path):
     BLOB columns are encoded as {"__blob__": "<hex>"} so the round-trip
     through JSON is lossless.
     """
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     conn.row_factory = sqlite3.Row
 
     # Grab user_version pragma
@@ -190,18 +192,25 @@ def reconcile_deltas(ours_delta, theirs_delta):
     return cleaned
 
 
+def _in_key_order(rows_by_key):
+    # Keys mix value types, so order by repr: total and the same everywhere.
+    return sorted(rows_by_key.items(), key=lambda item: repr(item[0]))
+
+
 def apply_delta(db_path, delta):
     """Apply a reconciled delta to a SQLite database in-place.
 
     Only touches rows that actually changed — preserves SQLite page stability.
+    Tables and rows are applied in a fixed order, so every device that merges
+    the same delta assigns the same rowids and writes the same pages.
     """
     if not delta:
         return
 
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite_policy.connect(db_path)
     conn.execute("PRAGMA foreign_keys = OFF")
 
-    for table_name, ops in delta.items():
+    for table_name, ops in sorted(delta.items()):
         # Get column names from the actual DB
         col_info = conn.execute(f"PRAGMA table_info('{table_name}')").fetchall()
         col_names = [row[1] for row in col_info]
@@ -211,12 +220,12 @@ def apply_delta(db_path, delta):
         where_clause = " AND ".join(f"{column} = ?" for column in pk_columns)
 
         # DELETEs
-        for key, row in ops.get("deletes", {}).items():
+        for key, row in _in_key_order(ops.get("deletes", {})):
             key_values = tuple(_decode_value(row[column]) for column in pk_columns)
             conn.execute(f"DELETE FROM '{table_name}' WHERE {where_clause}", key_values)
 
         # INSERTs
-        for key, row in ops.get("inserts", {}).items():
+        for key, row in _in_key_order(ops.get("inserts", {})):
             placeholders = ", ".join(["?"] * len(col_names))
             cols = ", ".join(col_names)
             values = [_decode_value(row.get(c)) for c in col_names]
@@ -226,7 +235,7 @@ def apply_delta(db_path, delta):
             )
 
         # UPDATEs
-        for key, row in ops.get("updates", {}).items():
+        for key, row in _in_key_order(ops.get("updates", {})):
             set_clauses = []
             set_values = []
             for c in col_names:
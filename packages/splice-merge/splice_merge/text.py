@@ -0,0 +1,225 @@
+"""Canonical text form of a SQLite database, for storing it in git.
+
+A binary `core.db` defeats git's delta compression: every commit stores the
+changed pages, and every bundle ships them. Git instead stores this text
+form, one line per schema object or row, and `core.db` in the work tree is
+a local cache rebuilt from it.
+
+Git converts between the two through a clean/smudge filter:
+
+    .gitattributes:  core.db filter=splice-sqlite merge=splice-sqlite
+    .git/config:     filter.splice-sqlite.clean  = splice-sqlite-text clean
+                     filter.splice-sqlite.smudge = splice-sqlite-text smudge
+
+Every line is a JSON array:
+
+    ["splice-sqlite-text", 1, {"user_version": N}]
+    ["table", name, sql, [columns], [primary key columns]]
+    ["row", table, [values]]
+    ["index" | "trigger" | "view", name, sql]
+
+Tables come in name order, each followed by its rows in primary-key order
+(or by all columns, for a table without one), then the other schema
+objects. BLOBs are {"__blob__": "<hex>"}, as in `core.sqlite_to_json`. The
+same rows always make the same text, whatever the file's page layout or
+rowids, so a commit's diff is the logical change and nothing more.
+Internal `sqlite_*` tables are not exported.
+"""
+
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+
+from small_sea_sqlite import sqlite_policy
+
+from .core import sqlite_to_json
+
+FORMAT_NAME = "splice-sqlite-text"
+FORMAT_VERSION = 1
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_OTHER_OBJECT_TYPES = ("index", "trigger", "view")
+
+
+def is_sqlite(data: bytes) -> bool:
+    """True if data is a SQLite file rather than its text form."""
+    return data.startswith(_SQLITE_MAGIC)
+
+
+def is_text(data: bytes) -> bool:
+    return data.startswith(b'["' + FORMAT_NAME.encode() + b'"')
+
+
+def _line(item) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return {"__blob__": value.hex()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and "__blob__" in value:
+        return bytes.fromhex(value["__blob__"])
+    return value
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def dump(db_path) -> str:
+    """The canonical text form of the database at db_path."""
+    conn = sqlite3.connect(f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        out = [_line([FORMAT_NAME, FORMAT_VERSION, {"user_version": user_version}])]
+        objects = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE name NOT LIKE 'sqlite_%' AND sql IS NOT NULL "
+            "ORDER BY name"
+        ).fetchall()
+        for kind, name, sql in objects:
+            if kind != "table":
+                continue
+            col_info = conn.execute(f"PRAGMA table_info({_quote(name)})").fetchall()
+            columns = [row[1] for row in col_info]
+            pk_columns = [row[1] for row in sorted(col_info, key=lambda row: row[5]) if row[5]]
+            out.append(_line(["table", name, sql, columns, pk_columns]))
+            order = ", ".join(_quote(column) for column in (pk_columns or columns))
+            rows = conn.execute(f"SELECT * FROM {_quote(name)} ORDER BY {order}")
+            for row in rows:
+                out.append(_line(["row", name, [_encode(value) for value in row]]))
+        for kind in _OTHER_OBJECT_TYPES:
+            for object_kind, name, sql in objects:
+                if object_kind == kind:
+                    out.append(_line([kind, name, sql]))
+        return "".join(out)
+    finally:
+        conn.close()
+
+
+def _parse(text: str):
+    lines = text.splitlines()
+    if not lines:
+        raise ValueError("empty splice-sqlite-text document")
+    header = json.loads(lines[0])
+    if header[:2] != [FORMAT_NAME, FORMAT_VERSION]:
+        raise ValueError(f"not a {FORMAT_NAME} v{FORMAT_VERSION} document")
+    tables = {}
+    others = []
+    for line in lines[1:]:
+        item = json.loads(line)
+        if item[0] == "table":
+            _kind, name, sql, columns, pk_columns = item
+            tables[name] = {"sql": sql, "columns": columns, "pk": pk_columns, "rows": []}
+        elif item[0] == "row":
+            tables[item[1]]["rows"].append(item[2])
+        else:
+            others.append(item)
+    return header[2], tables, others
+
+
+def to_json(text: str) -> dict:
+    """The text form as `core.sqlite_to_json` would render the database."""
+    pragmas, tables, _others = _parse(text)
+    return {
+        "__tables__": {
+            name: [dict(zip(table["columns"], row)) for row in table["rows"]]
+            for name, table in tables.items()
+        },
+        "__pragmas__": {"user_version": pragmas.get("user_version", 0)},
+        "__primary_keys__": {name: table["pk"] for name, table in tables.items()},
+    }
+
+
+def load(text: str, db_path) -> None:
+    """Build a new database file at db_path from its text form."""
+    pragmas, tables, others = _parse(text)
+    conn = sqlite_policy.connect(db_path)
+    try:
+        sqlite_policy.apply_tracked_layout(conn)
+        for name, table in tables.items():
+            conn.execute(table["sql"])
+            if table["rows"]:
+                placeholders = ", ".join("?" * len(table["columns"]))
+                conn.executemany(
+                    f"INSERT INTO {_quote(name)} VALUES ({placeholders})",
+                    ([_decode(value) for value in row] for row in table["rows"]),
+                )
+        # Indexes and triggers last: cheaper to build once, and triggers
+        # must not fire while rows are restored.
+        for _kind, _name, sql in others:
+            conn.execute(sql)
+        conn.execute(f"PRAGMA user_version = {int(pragmas.get('user_version', 0))}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def clean(data: bytes) -> bytes:
+    """Git clean filter: work-tree file to stored form."""
+    if not is_sqlite(data):
+        # Already text (or empty): store it as it is.
+        return data
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = pathlib.Path(tmp) / "clean.db"
+        db_path.write_bytes(data)
+        return dump(db_path).encode("utf-8")
+
+
+def smudge(data: bytes) -> bytes:
+    """Git smudge filter: stored form to work-tree file."""
+    if not is_text(data):
+        # Commits from before the text form store the binary itself.
+        return data
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = pathlib.Path(tmp) / "smudge.db"
+        load(data.decode("utf-8"), db_path)
+        return db_path.read_bytes()
+
+
+def read_json(path) -> dict:
+    """`core.sqlite_to_json` for a file holding either form."""
+    data = pathlib.Path(path).read_bytes()
+    if is_text(data):
+        return to_json(data.decode("utf-8"))
+    return sqlite_to_json(path)
+
+
+def materialize(db_path) -> bool:
+    """Rebuild a work-tree file that holds the text form as a database.
+
+    A checkout made before the filter was configured leaves the text form
+    in the work tree. Returns True if the file was rebuilt.
+    """
+    db_path = pathlib.Path(db_path)
+    if not db_path.exists():
+        return False
+    data = db_path.read_bytes()
+    if not is_text(data):
+        return False
+    tmp_path = db_path.with_name(db_path.name + ".materialize")
+    tmp_path.unlink(missing_ok=True)
+    load(data.decode("utf-8"), tmp_path)
+    os.replace(tmp_path, db_path)
+    return True
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in ("clean", "smudge"):
+        print("usage: splice-sqlite-text clean|smudge", file=sys.stderr)
+        sys.exit(1)
+    convert = clean if argv[0] == "clean" else smudge
+    data = sys.stdin.buffer.read()
+    sys.stdout.buffer.write(convert(data))
+    sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
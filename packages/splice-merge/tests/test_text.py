@@ -0,0 +1,102 @@
+"""Micro tests for splice_merge.text (canonical text form of a database)."""
+
+import shutil
+import sqlite3
+
+from splice_merge import text
+from splice_merge.cli import merge_files
+from splice_merge.core import compute_delta
+
+SCHEMA = """
+CREATE TABLE item (id BLOB PRIMARY KEY, label TEXT, weight REAL, note TEXT);
+CREATE TABLE tag (name TEXT NOT NULL, item_id BLOB NOT NULL);
+CREATE INDEX tag_by_item ON tag (item_id);
+CREATE TRIGGER item_note AFTER INSERT ON item BEGIN
+    UPDATE item SET note = 'trigger' WHERE id = NEW.id AND note IS NULL;
+END;
+"""
+
+
+def _make_db(path, items=(), tags=()):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO item VALUES (?, ?, ?, ?)", items)
+    conn.executemany("INSERT INTO tag VALUES (?, ?)", tags)
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _items(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT id, label, weight, note FROM item ORDER BY id").fetchall()
+
+
+def test_dump_is_canonical_and_round_trips(tmp_path):
+    items = [
+        (b"\x02", "second\nline", 1.5, None),
+        (b"\x01", "first é", None, "kept"),
+    ]
+    tags = [("b", b"\x01"), ("a", b"\x01")]
+    one = _make_db(tmp_path / "one.db", items, tags)
+    # The same rows written in another order give the same text.
+    two = _make_db(tmp_path / "two.db", reversed(items), reversed(tags))
+    dumped = text.dump(one)
+    assert dumped == text.dump(two)
+    assert len(dumped.splitlines()) == 1 + 2 + len(items) + len(tags) + 2
+
+    rebuilt = tmp_path / "rebuilt.db"
+    text.load(dumped, rebuilt)
+    assert text.dump(rebuilt) == dumped
+    assert _items(rebuilt) == _items(one)
+    with sqlite3.connect(rebuilt) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 7
+        # Triggers are restored, and did not fire while rows were loaded.
+        conn.execute("INSERT INTO item VALUES (x'03', 'third', NULL, NULL)")
+        assert conn.execute("SELECT note FROM item WHERE id = x'03'").fetchone() == ("trigger",)
+    assert compute_delta(text.to_json(dumped), text.read_json(one)) == {}
+
+
+def test_filters_convert_only_the_other_form(tmp_path):
+    db = _make_db(tmp_path / "core.db", [(b"\x01", "one", None, None)])
+    data = db.read_bytes()
+
+    stored = text.clean(data)
+    assert text.is_text(stored)
+    assert text.clean(stored) == stored
+    assert text.is_sqlite(text.smudge(stored))
+    # Commits from before the text form still check out.
+    assert text.smudge(data) == data
+
+    db.write_bytes(stored)
+    assert text.materialize(db)
+    assert not text.materialize(db)
+    assert _items(db) == [(b"\x01", "one", None, "trigger")]
+
+
+def test_merge_runs_on_text_and_mixed_forms(tmp_path):
+    base = _make_db(tmp_path / "base.db", [(b"\x01", "one", None, None)])
+    ours = tmp_path / "ours.db"
+    theirs = tmp_path / "theirs.db"
+    shutil.copyfile(base, ours)
+    shutil.copyfile(base, theirs)
+    with sqlite3.connect(ours) as conn:
+        conn.execute("INSERT INTO item VALUES (x'02', 'ours', NULL, 'x')")
+    with sqlite3.connect(theirs) as conn:
+        conn.execute("INSERT INTO item VALUES (x'03', 'theirs', NULL, 'x')")
+
+    # The ancestor predates the text form; both sides have it.
+    ours_text = tmp_path / "ours.txt"
+    theirs_text = tmp_path / "theirs.txt"
+    ours_text.write_text(text.dump(ours))
+    theirs_text.write_text(text.dump(theirs))
+    merge_files(base, ours_text, theirs_text)
+
+    merged = tmp_path / "merged.db"
+    text.load(ours_text.read_text(), merged)
+    assert [row[1] for row in _items(merged)] == ["one", "ours", "theirs"]
+
+    # Ours still binary, theirs already text: the result is text.
+    merge_files(base, ours, theirs_text)
+    assert text.is_text(ours.read_bytes())
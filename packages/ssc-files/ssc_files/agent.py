@@ -0,0 +1,157 @@
+"""Background sync agent: keep a device's niches current without clicking.
+
+One thread per team holds a Hub `/notifications/watch` long-poll with the
+local signal watermarks as its known counts, so the Hub answers as soon as a
+teammate publishes and the agent sleeps otherwise. A wake-up runs one
+`sync.auto_sync_team` pass: only peers past their watermark are read, only
+the chains their head manifests show moved are fetched, and clean checkouts
+behind the fetched work are fast-forwarded. Anything needing a decision — a
+dirty checkout, divergent history — stays parked for an explicit merge.
+
+Hub or network failures back off exponentially; a pass with failed
+repositories backs off too, because the watermarks it held back would
+otherwise wake the next long-poll immediately.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+import httpx
+from small_sea_client.client import SmallSeaClient, SmallSeaError, SmallSeaHubUnavailable
+
+from ssc_files import sync
+
+DEFAULT_WATCH_TIMEOUT = 30
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+logger = logging.getLogger("ssc_files.agent")
+
+
+def teams_with_sessions() -> list[str]:
+    """Team names that have a cached Hub session in the Files config."""
+    return sorted((sync.load_config().get("team_sessions") or {}).keys())
+
+
+class SyncAgent:
+    """Long-polls the Hub for each team and syncs whatever moved.
+
+    on_pass, when given, receives (team_name, TeamSyncResult) after every
+    pass that did any work. Stopping waits for at most one long-poll.
+    """
+
+    def __init__(
+        self,
+        files_root: str,
+        participant_hex: str,
+        team_names: list[str],
+        *,
+        hub_port: int = SmallSeaClient.DEFAULT_PORT,
+        workers: int = sync.DEFAULT_SYNC_WORKERS,
+        watch_timeout: int = DEFAULT_WATCH_TIMEOUT,
+        on_pass: Optional[Callable] = None,
+        _http_client=None,
+    ):
+        self.files_root = files_root
+        self.participant_hex = participant_hex
+        self.team_names = list(team_names)
+        self.hub_port = hub_port
+        self.workers = workers
+        self.watch_timeout = watch_timeout
+        self.on_pass = on_pass
+        self._http_client = _http_client
+        self._stopped = threading.Event()
+        self._threads = []
+        self.passes = 0
+
+    def start(self):
+        for team_name in self.team_names:
+            thread = threading.Thread(
+                target=self._team_loop,
+                args=(team_name,),
+                name=f"ssc-files-agent-{team_name}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout=self.watch_timeout + 5 if timeout is None else timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def wait_for_change(self, team_name: str, session) -> bool:
+        """Block until a peer of team_name may have published; True if one did.
+
+        A peer already past its watermark — at startup, or after a pass that
+        could not fetch everything — answers without waiting.
+        """
+        context = sync.resolve_team_context(self.files_root, self.participant_hex, team_name)
+        known = {}
+        for peer in session.session_peers():
+            teammate_id = peer["teammate_id"]
+            watermark = sync.get_signal_watermark(
+                self.files_root, self.participant_hex, context, teammate_id
+            )
+            if int(peer.get("signal_count", 0)) > watermark:
+                return True
+            known[teammate_id] = watermark
+        if not known:
+            # No teammates yet; the long-poll has nothing to watch.
+            self._stopped.wait(self.watch_timeout)
+            return False
+        result = session.watch_notifications(known, timeout=self.watch_timeout)
+        return bool(result.get("updated"))
+
+    def run_once(self, team_name: str, session) -> sync.TeamSyncResult:
+        result = sync.auto_sync_team(
+            self.files_root,
+            self.participant_hex,
+            team_name,
+            session,
+            workers=self.workers,
+        )
+        self.passes += 1
+        for outcome in result.outcomes:
+            if outcome.status == "failed":
+                logger.warning(
+                    "%s: %s %s from %s failed: %s", team_name, outcome.action,
+                    outcome.repo_label, outcome.teammate_id, outcome.error,
+                )
+            elif outcome.action == "fast-forward":
+                logger.info(
+                    "%s: fast-forwarded %s to %s", team_name, outcome.repo_label,
+                    (outcome.sha or "")[:8],
+                )
+        if self.on_pass is not None and result.outcomes:
+            self.on_pass(team_name, result)
+        return result
+
+    def _team_loop(self, team_name: str):
+        backoff = MIN_BACKOFF
+        while not self._stopped.is_set():
+            try:
+                session = sync.get_team_session(
+                    team_name, hub_port=self.hub_port, _http_client=self._http_client
+                )
+                if not self.wait_for_change(team_name, session) or self._stopped.is_set():
+                    backoff = MIN_BACKOFF
+                    continue
+                result = self.run_once(team_name, session)
+            except (
+                sync.FilesSyncError, SmallSeaError, SmallSeaHubUnavailable, httpx.HTTPError,
+                OSError,
+            ) as exc:
+                logger.warning("%s: sync agent paused %.0fs: %s", team_name, backoff, exc)
+            else:
+                if not result.failed:
+                    backoff = MIN_BACKOFF
+                    continue
+            self._stopped.wait(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
@@ -0,0 +1,539 @@
+"""Large-file mode: content-defined chunks instead of whole git blobs.
+
+A file at or over the niche's threshold is committed as a small manifest
+listing its chunks; the chunk bytes live in a local cache next to the niche
+git dir and, once pushed, in the `chunks/` area of the berth's cloud storage.
+An edit to a 2 GB video then changes a few chunks, not the blob, and a
+teammate downloads only the chunks they do not already hold.
+
+git does the bookkeeping through a long-running filter process (gitattributes
+`filter=ssc-chunks`):
+
+- clean turns a large file into its manifest, storing new chunks locally;
+  anything under the threshold, and a manifest itself, passes through. A
+  path once seen as a manifest stays in large-file mode whatever its size,
+  so devices with different thresholds agree on what a checkout holds.
+- smudge turns a manifest back into the file when every chunk is cached, and
+  otherwise leaves the manifest in the checkout. That is the lazy part: such
+  a pointer file is clean in git's eyes, and `materialize` swaps in the real
+  bytes once the chunks have been downloaded.
+
+Chunk boundaries come from a gear rolling hash (FastCDC with normalized
+chunking), so an insertion shifts boundaries only near the edit. With the
+optional `numpy` package the hash runs vectorized; without it a plain loop
+finds the same boundaries, only slower. Chunk names
+in the cloud are salted with the niche id, which only teammates know, so the
+storage provider cannot confirm a chunk by hashing known content; the bytes
+themselves go through the Hub and are encrypted in an encrypted session.
+"""
+
+import argparse
+import hashlib
+import os
+import pathlib
+import shlex
+import sys
+import tempfile
+from dataclasses import dataclass
+
+from cod_sync.git import gitCmd
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+FILTER_NAME = "ssc-chunks"
+THRESHOLD_KEY = "ssc-files.largeFileThreshold"
+DEFAULT_THRESHOLD = 32 * 1024 * 1024
+
+MIN_CHUNK = 256 * 1024
+AVG_CHUNK = 1024 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+
+MANIFEST_HEADER = b"ssc-files-chunks v1\n"
+#: Manifests stay well under this even for very large files.
+MAX_MANIFEST_SIZE = 8 * 1024 * 1024
+
+_M64 = (1 << 64) - 1
+
+
+def _gear_table():
+    return [
+        int.from_bytes(hashlib.sha256(b"ssc-files gear %d" % i).digest()[:8], "big")
+        for i in range(256)
+    ]
+
+
+_GEAR = _gear_table()
+
+
+def _top_bits(count):
+    return ((1 << count) - 1) << (64 - count)
+
+
+_AVG_BITS = AVG_CHUNK.bit_length() - 1
+# Normalized chunking: a stricter mask before the average size and a looser
+# one after it pulls chunk sizes toward the average.
+_MASK_STRICT = _top_bits(_AVG_BITS + 2)
+_MASK_LOOSE = _top_bits(_AVG_BITS - 2)
+
+#: Bytes hashed per vectorized step; most cuts land in the first few.
+_WINDOW = 128 * 1024
+
+
+def cut_point(data, start=0, end=None):
+    """Return where the chunk starting at `start` ends in data[start:end]."""
+    end = len(data) if end is None else end
+    size = end - start
+    if size <= MIN_CHUNK:
+        return end
+    size = min(size, MAX_CHUNK)
+    normal_stop = start + min(size, AVG_CHUNK)
+    stop = start + size
+    if numpy is not None:
+        return _vector_cut_point(data, start, normal_stop, stop)
+    return _loop_cut_point(data, start, normal_stop, stop)
+
+
+def _loop_cut_point(data, start, normal_stop, stop):
+    gear, mask = _GEAR, _MASK_STRICT
+    h = 0
+    i = start + MIN_CHUNK
+    while i < normal_stop:
+        h = ((h << 1) + gear[data[i]]) & _M64
+        i += 1
+        if not h & mask:
+            return i
+    mask = _MASK_LOOSE
+    while i < stop:
+        h = ((h << 1) + gear[data[i]]) & _M64
+        i += 1
+        if not h & mask:
+            return i
+    return stop
+
+
+def _vector_cut_point(data, start, normal_stop, stop):
+    """cut_point's search, hashing a window of bytes per numpy step.
+
+    The gear hash after byte j is the sum of gear[data[j - k]] << k for the
+    64 bytes up to j (older bytes shift out), counting only bytes from the
+    first hashed one on. Doubling the span each sum covers, from 1 byte to
+    64, gives every position's hash in six passes.
+    """
+    first = start + MIN_CHUNK
+    masks = ((first, normal_stop, _MASK_STRICT), (normal_stop, stop, _MASK_LOOSE))
+    for lo, hi, mask in masks:
+        for a in range(lo, hi, _WINDOW):
+            b = min(a + _WINDOW, hi)
+            context = max(first, a - 63)
+            view = numpy.frombuffer(
+                data, dtype=numpy.uint8, count=b - context, offset=context
+            )
+            hashes = _GEAR_ARRAY[view]
+            span = 1
+            while span < 64:
+                hashes[span:] += hashes[:-span] << numpy.uint64(span)
+                span *= 2
+            del view
+            hits = numpy.flatnonzero((hashes[a - context:] & numpy.uint64(mask)) == 0)
+            if hits.size:
+                return a + int(hits[0]) + 1
+    return stop
+
+
+_GEAR_ARRAY = None if numpy is None else numpy.array(_GEAR, dtype=numpy.uint64)
+
+
+class Chunker:
+    """Split a byte stream into content-defined chunks as it arrives."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        self._buffer += data
+        while len(self._buffer) >= MAX_CHUNK:
+            yield self._take(cut_point(self._buffer))
+
+    def finish(self):
+        while self._buffer:
+            yield self._take(cut_point(self._buffer))
+
+    def _take(self, cut):
+        chunk = bytes(self._buffer[:cut])
+        del self._buffer[:cut]
+        return chunk
+
+
+def chunk_bytes(data):
+    """Split data into chunks; joining them gives data back."""
+    chunker = Chunker()
+    return [*chunker.feed(data), *chunker.finish()]
+
+
+# ---------------------------------------------------------------------------
+# Manifests
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Manifest:
+    size: int
+    sha256: str
+    chunks: tuple  # ((chunk sha256 hex, length), ...)
+
+
+def encode_manifest(manifest):
+    lines = [f"size {manifest.size}", f"sha256 {manifest.sha256}"]
+    lines += [f"{digest} {length}" for digest, length in manifest.chunks]
+    return MANIFEST_HEADER + ("\n".join(lines) + "\n").encode("ascii")
+
+
+def decode_manifest(data):
+    """Return the Manifest in data, or None if data is not a valid manifest."""
+    if not data.startswith(MANIFEST_HEADER) or len(data) > MAX_MANIFEST_SIZE:
+        return None
+    try:
+        lines = data[len(MANIFEST_HEADER):].decode("ascii").splitlines()
+        size_key, size = lines[0].split(" ")
+        sha_key, whole = lines[1].split(" ")
+        chunks = []
+        for line in lines[2:]:
+            digest, length = line.split(" ")
+            if not _is_digest(digest):
+                return None
+            chunks.append((digest, int(length)))
+        if (size_key, sha_key) != ("size", "sha256") or not _is_digest(whole):
+            return None
+        if sum(length for _digest, length in chunks) != int(size):
+            return None
+        return Manifest(int(size), whole, tuple(chunks))
+    except (ValueError, IndexError, UnicodeDecodeError):
+        return None
+
+
+def _is_digest(text):
+    return len(text) == 64 and all(c in "0123456789abcdef" for c in text)
+
+
+def remote_chunk_path(niche_id, digest):
+    """Cloud path of a chunk, salted with the niche id."""
+    salted = hashlib.sha256(f"ssc-files chunk\0{niche_id}\0{digest}".encode()).hexdigest()
+    return f"chunks/C-{salted}.chunk"
+
+
+# ---------------------------------------------------------------------------
+# Local chunk cache
+# ---------------------------------------------------------------------------
+
+
+class ChunkCache:
+    """Chunks held on this device for one niche, plus which are uploaded."""
+
+    def __init__(self, git_dir):
+        self.root = pathlib.Path(git_dir) / "ssc-chunks"
+
+    def _object(self, digest):
+        return self.root / "objects" / digest[:2] / digest
+
+    def _uploaded(self, digest):
+        return self.root / "uploaded" / digest
+
+    def has(self, digest):
+        return self._object(digest).exists()
+
+    def get(self, digest):
+        try:
+            return self._object(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, data, digest=None):
+        """Store a chunk; verifies digest when given. Returns the digest."""
+        actual = hashlib.sha256(data).hexdigest()
+        if digest is not None and digest != actual:
+            raise ValueError(f"chunk content does not match {digest}")
+        path = self._object(actual)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return actual
+
+    def missing(self, manifest):
+        return [d for d, _length in dict.fromkeys(manifest.chunks) if not self.has(d)]
+
+    def pending_uploads(self):
+        objects = self.root / "objects"
+        if not objects.exists():
+            return []
+        return sorted(
+            p.name for p in objects.glob("*/*")
+            if not p.name.startswith(".") and not self._uploaded(p.name).exists()
+        )
+
+    def large_paths(self):
+        """Paths this device has seen stored as manifests."""
+        try:
+            return set((self.root / "paths").read_text().splitlines())
+        except FileNotFoundError:
+            return set()
+
+    def add_large_path(self, path):
+        if "\n" in path:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "paths", "a") as f:
+            f.write(path + "\n")
+
+    def mark_uploaded(self, digest):
+        marker = self._uploaded(digest)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+
+    def write_file(self, manifest, dest):
+        """Assemble a manifest's chunks into dest atomically."""
+        dest = pathlib.Path(dest)
+        whole = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".ssc-materialize-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for digest, _length in manifest.chunks:
+                    data = self.get(digest)
+                    if data is None:
+                        raise FileNotFoundError(f"chunk {digest} is not cached")
+                    whole.update(data)
+                    f.write(data)
+            if whole.hexdigest() != manifest.sha256:
+                raise ValueError(f"reassembled {dest.name} does not match its manifest")
+            os.replace(tmp, dest)
+        except BaseException:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def clean_stream(cache, first, rest):
+    """Chunk a large file given as a first block and an iterator of the rest."""
+    whole = hashlib.sha256()
+    chunker = Chunker()
+    chunks = []
+    size = 0
+
+    def keep(chunk):
+        chunks.append((cache.put(chunk), len(chunk)))
+
+    for block in _chain(first, rest):
+        whole.update(block)
+        size += len(block)
+        for chunk in chunker.feed(block):
+            keep(chunk)
+    for chunk in chunker.finish():
+        keep(chunk)
+    return encode_manifest(Manifest(size, whole.hexdigest(), tuple(chunks)))
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+# ---------------------------------------------------------------------------
+# git configuration
+# ---------------------------------------------------------------------------
+
+
+def filter_command(git_dir):
+    return " ".join(
+        shlex.quote(part)
+        for part in (sys.executable, "-m", "ssc_files.chunks", "--git-dir", str(git_dir))
+    )
+
+
+def configure_git_dir(git_dir):
+    """Route a niche git dir's content through the chunk filter.
+
+    Small files pass through untouched, so this changes nothing for a niche
+    without large files. The filter is not `required`: if it cannot start,
+    git falls back to storing whole blobs rather than failing the command.
+    """
+    git_dir = pathlib.Path(git_dir)
+    command = filter_command(git_dir)
+    key = f"filter.{FILTER_NAME}.process"
+    current = gitCmd(["--git-dir", str(git_dir), "config", "--get", key], raise_on_error=False)
+    if current.stdout.strip() != command:
+        gitCmd(["--git-dir", str(git_dir), "config", key, command])
+    attributes = git_dir / "info" / "attributes"
+    line = f"* filter={FILTER_NAME}"
+    existing = attributes.read_text().splitlines() if attributes.exists() else []
+    if line not in existing:
+        attributes.parent.mkdir(parents=True, exist_ok=True)
+        attributes.write_text("\n".join(existing + [line]) + "\n")
+
+
+def large_file_threshold(git_dir):
+    result = gitCmd(
+        ["--git-dir", str(git_dir), "config", "--get", THRESHOLD_KEY], raise_on_error=False
+    )
+    try:
+        return int(result.stdout.strip())
+    except ValueError:
+        return DEFAULT_THRESHOLD
+
+
+def set_large_file_threshold(git_dir, threshold):
+    gitCmd(["--git-dir", str(git_dir), "config", THRESHOLD_KEY, str(int(threshold))])
+
+
+# ---------------------------------------------------------------------------
+# git long-running filter process (protocol version 2)
+# ---------------------------------------------------------------------------
+
+_MAX_PKT_DATA = 65516
+
+
+def _read_exact(stream, n):
+    data = bytearray()
+    while len(data) < n:
+        block = stream.read(n - len(data))
+        if not block:
+            raise EOFError
+        data += block
+    return bytes(data)
+
+
+def _read_pkt(stream):
+    """Return one packet's payload, or None for a flush packet."""
+    header = stream.read(4)
+    if not header:
+        raise EOFError
+    if len(header) < 4:
+        header += _read_exact(stream, 4 - len(header))
+    length = int(header, 16)
+    if length == 0:
+        return None
+    return _read_exact(stream, length - 4)
+
+
+def _read_text_list(stream):
+    items = {}
+    while (pkt := _read_pkt(stream)) is not None:
+        key, _, value = pkt.decode().rstrip("\n").partition("=")
+        items.setdefault(key, []).append(value)
+    return items
+
+
+def _write_pkt(stream, data):
+    stream.write(b"%04x" % (len(data) + 4) + data)
+
+
+def _write_text(stream, *lines):
+    for line in lines:
+        _write_pkt(stream, (line + "\n").encode())
+    stream.write(b"0000")
+
+
+def _write_content(stream, blocks):
+    for data in blocks:
+        for i in range(0, len(data), _MAX_PKT_DATA):
+            _write_pkt(stream, data[i:i + _MAX_PKT_DATA])
+    stream.write(b"0000")
+
+
+def _content_packets(stream):
+    while (pkt := _read_pkt(stream)) is not None:
+        yield pkt
+
+
+def _maybe_manifest(buffered):
+    head = bytes(buffered[:len(MANIFEST_HEADER)])
+    return MANIFEST_HEADER.startswith(head) and len(buffered) <= MAX_MANIFEST_SIZE
+
+
+def _clean(cache, threshold, packets, large=False):
+    """Return the blob for a file; large forces chunking at any size."""
+    limit = len(MANIFEST_HEADER) if large else threshold
+    buffered = bytearray()
+    for pkt in packets:
+        buffered += pkt
+        if len(buffered) >= limit and not _maybe_manifest(buffered):
+            return [clean_stream(cache, bytes(buffered), packets)]
+    data = bytes(buffered)
+    if decode_manifest(data) is not None:
+        return [data]  # a pointer file cleans to itself
+    if large or len(data) >= threshold:
+        return [clean_stream(cache, data, iter(()))]
+    return [data]
+
+
+def _smudge(cache, packets):
+    data = b"".join(packets)
+    manifest = decode_manifest(data)
+    if manifest is None or cache.missing(manifest):
+        return [data]
+    # Chunks are read one at a time as git consumes them.
+    return (cache.get(digest) for digest, _length in manifest.chunks)
+
+
+def serve_filter(git_dir, stdin, stdout):
+    """Answer git's clean and smudge requests until git closes the pipe."""
+    cache = ChunkCache(git_dir)
+    threshold = large_file_threshold(git_dir)
+    large_paths = cache.large_paths()
+    hello = _read_text_list(stdin)
+    if "git-filter-client" not in hello or "2" not in hello.get("version", []):
+        raise SystemExit("ssc-chunks: unsupported filter protocol")
+    _write_text(stdout, "git-filter-server", "version=2")
+    capabilities = _read_text_list(stdin).get("capability", [])
+    _write_text(stdout, *[f"capability={c}" for c in ("clean", "smudge") if c in capabilities])
+    stdout.flush()
+    while True:
+        try:
+            command = _read_text_list(stdin)
+        except EOFError:
+            return
+        packets = _content_packets(stdin)
+        path = command.get("pathname", [""])[0]
+        try:
+            if command.get("command") == ["clean"]:
+                result = _clean(cache, threshold, packets, path in large_paths)
+                is_manifest = decode_manifest(result[0]) is not None
+            elif command.get("command") == ["smudge"]:
+                data = b"".join(packets)
+                is_manifest = decode_manifest(data) is not None
+                result = _smudge(cache, [data])
+            else:
+                raise ValueError(f"unknown command {command.get('command')}")
+            if is_manifest and path and path not in large_paths:
+                large_paths.add(path)
+                cache.add_large_path(path)
+        except Exception:
+            for _pkt in packets:  # drain, so the next request starts cleanly
+                pass
+            _write_text(stdout, "status=error")
+            stdout.flush()
+            continue
+        _write_text(stdout, "status=success")
+        try:
+            _write_content(stdout, result)
+        except Exception:
+            # Content already started; git takes a trailing status instead.
+            stdout.write(b"0000")
+            _write_text(stdout, "status=error")
+        else:
+            stdout.write(b"0000")  # keep status=success
+        stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ssc-files chunk filter for git")
+    parser.add_argument("--git-dir", required=True)
+    args = parser.parse_args(argv)
+    serve_filter(args.git_dir, sys.stdin.buffer, sys.stdout.buffer)
+
+
+if __name__ == "__main__":
+    main()
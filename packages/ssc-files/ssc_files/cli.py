@@ -55,7 +55,11 @@ def cli():
 @click.option("--host", default="127.0.0.1", show_default=True)
 @click.option("--port", default=8000, show_default=True)
 @click.option("--open/--no-open", "open_browser", default=True, help="Open browser on start")
-def serve_cmd(files_root, participant, host, port, open_browser):
+@click.option(
+    "--auto-sync/--no-auto-sync", default=False,
+    help="Fetch and fast-forward teammates' changes in the background",
+)
+def serve_cmd(files_root, participant, host, port, open_browser, auto_sync):
     """Start the web UI."""
     import threading
     import webbrowser
@@ -72,7 +76,7 @@ def serve_cmd(files_root, participant, host, port, open_browser):
         )
 
     hub_port = _config().get("hub_port", 11437)
-    app = create_app(files_root, participant, hub_port=hub_port)
+    app = create_app(files_root, participant, hub_port=hub_port, auto_sync=auto_sync)
     url = f"http://{host}:{port}"
 
     if open_browser:
@@ -111,39 +115,112 @@ def login_cmd(team_name, participant, hub_port):
     click.echo(f"Logged into {team_name} ({mode}).")
 
 
+def _resolve_workers(workers=None) -> int:
+    if workers is not None:
+        return workers
+    return int(_config().get("sync_workers", sync.DEFAULT_SYNC_WORKERS))
+
+
+def _echo_outcome(outcome) -> None:
+    peer = f" from {outcome.teammate_id[:8]}" if outcome.teammate_id else ""
+    if outcome.error is not None:
+        detail = f"{outcome.status}: {outcome.error}"
+    else:
+        detail = outcome.status.replace("_", " ")
+        if outcome.sha:
+            detail += f" {outcome.sha[:8]}"
+    click.echo(
+        f"  {outcome.action} {outcome.repo_label}{peer}: {detail} ({outcome.seconds:.2f}s)"
+    )
+
+
+def _report_team_result(result) -> None:
+    if result.push_plan is not None and result.push_plan.clean:
+        click.echo(f"  {len(result.push_plan.clean)} niche(s) already published.")
+    if result.fetch_plan is not None:
+        plan = result.fetch_plan
+        if plan.idle_peers:
+            click.echo(f"  {len(plan.idle_peers)} peer(s) with nothing new.")
+        if plan.unchanged_chains:
+            click.echo(f"  {plan.unchanged_chains} peer chain(s) already fetched.")
+    failed = result.failed
+    click.echo(
+        f"{len(result.outcomes) - len(failed)} done, {len(failed)} failed "
+        f"in {result.seconds:.2f}s."
+    )
+    if failed:
+        raise SystemExit(1)
+
+
 @cli.command("push")
 @click.argument("team_name")
-@click.argument("niche_name")
+@click.argument("niche_name", required=False)
+@click.option("--all", "push_all", is_flag=True, help="Push every niche with unpublished commits")
+@click.option("--workers", type=int, default=None, help="Repositories to push concurrently")
 @click.option("--files-root", default=None, help="Override files root from config")
 @click.option("--participant", default=None, help="Override participant hex from config")
 @click.option("--hub-port", type=int, default=None, help="Override Hub port from config")
-def push_cmd(team_name, niche_name, files_root, participant, hub_port):
-    """Push a niche and its registry through the Hub."""
+def push_cmd(team_name, niche_name, push_all, workers, files_root, participant, hub_port):
+    """Push a niche and its registry through the Hub.
+
+    With --all, push every niche that has unpublished commits and publish
+    the registry once, over a single Hub session.
+    """
+    if bool(niche_name) == bool(push_all):
+        _die("Specify exactly one of NICHE_NAME or --all.")
     files_root, participant, hub_port = _resolve_sync(files_root, participant, hub_port)
     try:
         files_root = sync.require_value(files_root, "files_root")
         participant = sync.require_value(participant, "participant_hex")
-        sync.push_via_hub(
-            files_root,
-            participant,
-            team_name,
-            niche_name,
-            hub_port=hub_port,
-        )
+        if push_all:
+            result = sync.push_all_via_hub(
+                files_root,
+                participant,
+                team_name,
+                workers=_resolve_workers(workers),
+                progress=_echo_outcome,
+                hub_port=hub_port,
+            )
+        else:
+            sync.push_via_hub(
+                files_root,
+                participant,
+                team_name,
+                niche_name,
+                hub_port=hub_port,
+            )
     except (sync.FilesSyncError, OSError) as exc:
         _die(str(exc))
 
+    if push_all:
+        if not result.outcomes:
+            click.echo(f"Nothing to push for team '{team_name}'.")
+            return
+        _report_team_result(result)
+        return
     click.echo(f"Pushed niche '{niche_name}' for team '{team_name}'.")
 
 
 @cli.command("fetch")
 @click.argument("team_name")
-@click.argument("niche_name")
-@click.option("--from-teammate", "from_teammate", required=True, help="Peer teammate ID hex")
+@click.argument("niche_name", required=False)
+@click.option("--from-teammate", "from_teammate", default=None, help="Peer teammate ID hex")
+@click.option(
+    "--all-peers", "all_peers", is_flag=True,
+    help="Fetch the registry and every niche from each peer with new signals",
+)
+@click.option(
+    "--ignore-signals", is_flag=True,
+    help="With --all-peers, ask every peer even if its signal count has not moved",
+)
+@click.option("--workers", type=int, default=None, help="Repositories to fetch concurrently")
 @click.option("--files-root", default=None, help="Override files root from config")
 @click.option("--participant", default=None, help="Override participant hex from config")
 @click.option("--hub-port", type=int, default=None, help="Override Hub port from config")
-def fetch_cmd(team_name, niche_name, from_teammate, files_root, participant, hub_port):
+def fetch_cmd(
+    team_name, niche_name, from_teammate, all_peers, ignore_signals, workers,
+    files_root, participant, hub_port,
+):
     """Fetch updates from a peer without merging.
 
     Parks fetched content locally. No checkout is required. Use this as the
@@ -152,8 +229,36 @@ def fetch_cmd(team_name, niche_name, from_teammate, files_root, participant, hub
       1. fetch --from-teammate PEER_ID   (no checkout needed)
       2. checkout ... PATH             (attach a local directory)
       3. merge --from-teammate PEER_ID   (integrate fetched content)
+
+    With --all-peers, fetch every changed chain from every peer whose signal
+    count moved, instead of one niche from one teammate.
     """
+    if all_peers:
+        if niche_name or from_teammate:
+            _die("--all-peers takes no NICHE_NAME or --from-teammate.")
+    elif not (niche_name and from_teammate):
+        _die("Specify NICHE_NAME and --from-teammate, or --all-peers.")
     files_root, participant, hub_port = _resolve_sync(files_root, participant, hub_port)
+    if all_peers:
+        try:
+            files_root = sync.require_value(files_root, "files_root")
+            participant = sync.require_value(participant, "participant_hex")
+            team_result = sync.fetch_all_peers_via_hub(
+                files_root,
+                participant,
+                team_name,
+                workers=_resolve_workers(workers),
+                progress=_echo_outcome,
+                all_peers=ignore_signals,
+                hub_port=hub_port,
+            )
+        except (sync.FilesSyncError, OSError) as exc:
+            _die(str(exc))
+        if not team_result.outcomes and not team_result.fetch_plan.unchanged_chains:
+            click.echo(f"No new updates from teammates in '{team_name}'.")
+            return
+        _report_team_result(team_result)
+        return
     try:
         files_root = sync.require_value(files_root, "files_root")
         participant = sync.require_value(participant, "participant_hex")
@@ -174,6 +279,35 @@ def fetch_cmd(team_name, niche_name, from_teammate, files_root, participant, hub
         click.echo(f"No new niche updates from {from_teammate}.")
 
 
+@cli.command("sync")
+@click.argument("team_name")
+@click.option("--workers", type=int, default=None, help="Repositories to sync concurrently")
+@click.option("--files-root", default=None, help="Override files root from config")
+@click.option("--participant", default=None, help="Override participant hex from config")
+@click.option("--hub-port", type=int, default=None, help="Override Hub port from config")
+def sync_cmd(team_name, workers, files_root, participant, hub_port):
+    """Push every dirty niche, then fetch from every changed peer.
+
+    Fetched updates are parked, not merged; use 'merge' for each niche.
+    """
+    files_root, participant, hub_port = _resolve_sync(files_root, participant, hub_port)
+    try:
+        files_root = sync.require_value(files_root, "files_root")
+        participant = sync.require_value(participant, "participant_hex")
+        result = sync.sync_team_via_hub(
+            files_root,
+            participant,
+            team_name,
+            workers=_resolve_workers(workers),
+            progress=_echo_outcome,
+            hub_port=hub_port,
+        )
+    except (sync.FilesSyncError, OSError) as exc:
+        _die(str(exc))
+
+    _report_team_result(result)
+
+
 @cli.command("merge")
 @click.argument("team_name")
 @click.argument("niche_name")
@@ -295,6 +429,106 @@ def pull_cmd(team_name, niche_name, from_teammate, files_root, participant, hub_
     )
 
 
+@cli.command("materialize")
+@click.argument("team_name")
+@click.argument("niche_name")
+@click.argument("paths", nargs=-1)
+@click.option("--from-teammate", "from_teammate", default=None, help="Peer teammate ID hex")
+@click.option("--files-root", default=None, help="Override files root from config")
+@click.option("--participant", default=None, help="Override participant hex from config")
+@click.option("--hub-port", type=int, default=None, help="Override Hub port from config")
+def materialize_cmd(team_name, niche_name, paths, from_teammate, files_root, participant, hub_port):
+    """Download large files that the checkout still holds as pointers.
+
+    Limit the work to PATHS if given. Chunks come from your own storage
+    first, then from --from-teammate or any teammate.
+    """
+    files_root, participant, hub_port = _resolve_sync(files_root, participant, hub_port)
+    try:
+        files_root = sync.require_value(files_root, "files_root")
+        participant = sync.require_value(participant, "participant_hex")
+        result = sync.materialize_via_hub(
+            files_root,
+            participant,
+            team_name,
+            niche_name,
+            paths=list(paths) or None,
+            from_teammate_id=from_teammate,
+            hub_port=hub_port,
+        )
+    except (sync.FilesSyncError, OSError, ValueError) as exc:
+        _die(str(exc))
+
+    for path in result.materialized:
+        click.echo(f"  materialized {path}")
+    for path in result.unavailable:
+        click.echo(f"  unavailable  {path}", err=True)
+    click.echo(
+        f"Materialized {len(result.materialized)} file(s), "
+        f"{result.chunks_fetched} chunk(s) downloaded."
+    )
+    if result.unavailable:
+        raise SystemExit(1)
+
+
+@cli.command("agent")
+@click.argument("team_names", nargs=-1)
+@click.option("--workers", type=int, default=None, help="Repositories to fetch concurrently")
+@click.option("--watch-timeout", type=int, default=None, help="Seconds per Hub long-poll")
+@click.option("--files-root", default=None, help="Override files root from config")
+@click.option("--participant", default=None, help="Override participant hex from config")
+@click.option("--hub-port", type=int, default=None, help="Override Hub port from config")
+def agent_cmd(team_names, workers, watch_timeout, files_root, participant, hub_port):
+    """Keep checkouts current in the background until interrupted.
+
+    Waits on the Hub for teammates' publications (all teams with a cached
+    session unless TEAM_NAMES are given), fetches what moved, and
+    fast-forwards clean checkouts. Divergent or dirty niches stay parked for
+    `merge`.
+    """
+    import logging
+    import time
+
+    from ssc_files import agent
+
+    files_root, participant, hub_port = _resolve_sync(files_root, participant, hub_port)
+    try:
+        files_root = sync.require_value(files_root, "files_root")
+        participant = sync.require_value(participant, "participant_hex")
+    except sync.FilesSyncError as exc:
+        _die(str(exc))
+    team_names = list(team_names) or agent.teams_with_sessions()
+    if not team_names:
+        _die("No team sessions. Run `ssc-files login <team>` first.")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    def report(team_name, result):
+        for outcome in result.outcomes:
+            if outcome.action == "fast-forward" or outcome.status == "failed":
+                click.echo(f"[{team_name}]", nl=False)
+                _echo_outcome(outcome)
+
+    sync_agent = agent.SyncAgent(
+        files_root,
+        participant,
+        team_names,
+        hub_port=hub_port,
+        workers=_resolve_workers(workers),
+        watch_timeout=watch_timeout or agent.DEFAULT_WATCH_TIMEOUT,
+        on_pass=report,
+    )
+    click.echo(f"Watching {', '.join(team_names)}. Ctrl-C to stop.")
+    sync_agent.start()
+    try:
+        while sync_agent.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sync_agent.stop(timeout=1)
+
+
 # ---------------------------------------------------------------------------
 # files operations
 # ---------------------------------------------------------------------------
@@ -327,7 +561,11 @@ def create_cmd(files_root, participant_hex, team_name, niche_name):
 @click.argument("team_name")
 @click.argument("niche_name")
 @click.argument("dest_path")
-def checkout_cmd(files_root, participant_hex, team_name, niche_name, dest_path):
+@click.option(
+    "--sparse", "sparse_dirs", multiple=True,
+    help="Only check out this directory (repeatable); top-level files are always included",
+)
+def checkout_cmd(files_root, participant_hex, team_name, niche_name, dest_path, sparse_dirs):
     """Attach a checkout of a niche at a filesystem path.
 
     Each niche may have at most one checkout. Remove the existing checkout
@@ -335,12 +573,58 @@ def checkout_cmd(files_root, participant_hex, team_name, niche_name, dest_path):
     """
     context = _team_context(files_root, participant_hex, team_name)
     try:
-        files_core.add_checkout(files_root, participant_hex, context, niche_name, dest_path)
-    except files_core.DuplicateCheckoutError as exc:
+        files_core.add_checkout(
+            files_root, participant_hex, context, niche_name, dest_path,
+            sparse_patterns=list(sparse_dirs) or None,
+        )
+    except (files_core.DuplicateCheckoutError, ValueError) as exc:
         _die(str(exc))
     click.echo(f"Checkout attached at {dest_path}")
 
 
+@cli.command("sparse")
+@click.argument("files_root")
+@click.argument("participant_hex")
+@click.argument("team_name")
+@click.argument("niche_name")
+@click.argument("directories", nargs=-1)
+@click.option("--full", is_flag=True, help="Check out the whole tree again")
+def sparse_cmd(files_root, participant_hex, team_name, niche_name, directories, full):
+    """Show or change which directories a niche checkout holds.
+
+    With no DIRECTORIES and no --full, print the current setting. Widening
+    writes only the added directories; narrowing needs a clean checkout.
+    """
+    context = _team_context(files_root, participant_hex, team_name)
+    if full and directories:
+        _die("Specify either DIRECTORIES or --full, not both.")
+    try:
+        if full or directories:
+            patterns = files_core.set_sparse_patterns(
+                files_root, participant_hex, context, niche_name,
+                None if full else list(directories),
+            )
+        else:
+            patterns = files_core.get_sparse_patterns(
+                files_root, participant_hex, context, niche_name
+            )
+    except files_core.DirtyCheckoutError as exc:
+        click.echo("Narrowing blocked: checkout has uncommitted changes.", err=True)
+        for path in exc.paths:
+            click.echo(f"  {path}", err=True)
+        raise SystemExit(1)
+    except (
+        files_core.NoCheckoutError, files_core.StaleCheckoutError, ValueError
+    ) as exc:
+        _die(str(exc))
+    if patterns is None:
+        click.echo("Full checkout.")
+        return
+    click.echo("Sparse checkout of:")
+    for pattern in patterns:
+        click.echo(f"  {pattern}/")
+
+
 @cli.command("list")
 @click.argument("files_root")
 @click.argument("participant_hex")
@@ -14,11 +14,13 @@ See spec.md for the design. Key points:
 
 import enum
 import json
+import os
 import pathlib
 import re
 import secrets
 import sqlite3
 import struct
+import threading
 import time
 import unicodedata
 from dataclasses import dataclass
@@ -27,6 +29,10 @@ from datetime import datetime, timezone
 import cod_sync.protocol as CS
 from cod_sync.git import gitCmd
 from cod_sync.repo import Repo, RepoError
+from small_sea_client.live_updates import stamp_is_settled
+from small_sea_sqlite import sqlite_policy
+
+from ssc_files import chunks, watch
 
 
 class NicheResidency(enum.Enum):
@@ -316,7 +322,7 @@ def _niche_git_dir(files_root, context, niche_name):
 # SQLite helpers
 # ---------------------------------------------------------------------------
 
-_CHECKOUTS_DB_VERSION = 3
+_CHECKOUTS_DB_VERSION = 4
 
 _CHECKOUTS_SCHEMA = """
 CREATE TABLE IF NOT EXISTS schema_version (
@@ -328,6 +334,7 @@ CREATE TABLE IF NOT EXISTS checkout (
     niche_name    TEXT NOT NULL,
     checkout_path TEXT NOT NULL,
     created_at    TEXT NOT NULL,
+    sparse_patterns TEXT,
     UNIQUE (team_id, niche_name)
 );
 CREATE TABLE IF NOT EXISTS peer_sync (
@@ -352,7 +359,7 @@ CREATE TABLE IF NOT EXISTS peer_signal_watermark (
 
 def _connect_checkouts(files_root, participant_hex):
     db = _checkouts_db_path(files_root, participant_hex)
-    conn = sqlite3.connect(str(db))
+    conn = sqlite_policy.connect(db)
     conn.row_factory = sqlite3.Row
 
     # Check schema version; recreate the DB if stale. checkouts.db is
@@ -365,10 +372,13 @@ def _connect_checkouts(files_root, participant_hex):
 
     if version != _CHECKOUTS_DB_VERSION:
         conn.close()
-        db.unlink(missing_ok=True)
-        conn = sqlite3.connect(str(db))
+        for path in (db, pathlib.Path(f"{db}-wal"), pathlib.Path(f"{db}-shm")):
+            path.unlink(missing_ok=True)
+        conn = sqlite_policy.connect(db)
         conn.row_factory = sqlite3.Row
 
+    # Device-local, never git-tracked; see sqlite_policy.
+    sqlite_policy.use_wal(conn)
     conn.executescript(_CHECKOUTS_SCHEMA)
 
     if not conn.execute("SELECT 1 FROM schema_version LIMIT 1").fetchone():
@@ -525,13 +535,16 @@ def _has_commits(git_dir):
     return r.returncode == 0
 
 
-def _make_work_tree(git_dir, dest):
+def _make_work_tree(git_dir, dest, sparse_patterns=None):
     """Create dest and populate it from git_dir if the repo has commits.
 
     The checkout receives only user files; git metadata stays in git_dir.
+    With sparse_patterns only those directories (and top-level files) are
+    written; see _apply_sparse_patterns.
     """
     dest = pathlib.Path(dest)
     dest.mkdir(parents=True, exist_ok=True)
+    _apply_sparse_patterns(git_dir, dest, sparse_patterns)
     if _has_commits(git_dir):
         gitCmd([
             "--git-dir", str(git_dir), "--work-tree", str(dest),
@@ -555,6 +568,56 @@ def _refresh_work_tree(git_dir, dest):
     ])
 
 
+def _normalize_sparse_patterns(patterns):
+    """Return sparse patterns as sorted, unique directory paths, or None for all.
+
+    Patterns are directories relative to the checkout root, git's "cone"
+    form: a directory brings in everything below it, and top-level files are
+    always present.
+    """
+    if patterns is None:
+        return None
+    normalized = set()
+    for pattern in patterns:
+        text = str(pattern).strip().strip("/")
+        parts = pathlib.PurePosixPath(text).parts
+        if (
+            not parts
+            or any(part in (".", "..") for part in parts)
+            or any(c in text for c in "*?[]\\\n")
+        ):
+            raise ValueError(f"Invalid sparse checkout directory: {pattern!r}")
+        normalized.add("/".join(parts))
+    return sorted(normalized)
+
+
+def _sparse_covers(patterns, pattern):
+    """True when pattern's directory is inside one of patterns (None = all)."""
+    if patterns is None:
+        return True
+    return any(pattern == p or pattern.startswith(p + "/") for p in patterns)
+
+
+def _apply_sparse_patterns(git_dir, work_tree, patterns):
+    """Make git's sparse checkout of work_tree match patterns.
+
+    Entries outside the patterns get git's skip-worktree bit: they are not
+    written, status does not report them missing, and merges and publish
+    leave them alone. git writes directories a pattern change brings in and
+    removes the ones it drops, touching nothing else in the checkout.
+    """
+    git_prefix = ["--git-dir", str(git_dir), "--work-tree", str(work_tree)]
+    if patterns is not None:
+        gitCmd(git_prefix + ["sparse-checkout", "set", "--cone", "--", *patterns])
+        return
+    enabled = gitCmd(
+        ["--git-dir", str(git_dir), "config", "--bool", "--get", "core.sparseCheckout"],
+        raise_on_error=False,
+    )
+    if enabled.stdout.strip() == "true":
+        gitCmd(git_prefix + ["sparse-checkout", "disable"])
+
+
 def _is_checkout_clean(checkout_path, git_dir):
     """Return True if the checkout has no tracked or untracked changes.
 
@@ -572,14 +635,19 @@ def _is_checkout_clean(checkout_path, git_dir):
     """
     if not pathlib.Path(checkout_path).exists():
         return False
-    result = gitCmd(
-        [
-            "--git-dir", str(git_dir), "--work-tree", str(checkout_path),
-            "status", "--porcelain",
-        ],
-        raise_on_error=False,
-    )
-    return result.returncode == 0 and result.stdout.strip() == ""
+    return _checkout_entries(git_dir, checkout_path) == []
+
+
+def _checkout_entries(git_dir, checkout_path):
+    """Return (status, paths) pairs for a checkout, or None if git failed.
+
+    Asks the checkout's tracker when the Files server keeps one, so the cost
+    follows what changed rather than the size of the tree.
+    """
+    tracker = watch.tracker_for(git_dir, checkout_path)
+    if tracker is not None:
+        return tracker.status()
+    return watch.porcelain_status(git_dir, checkout_path)
 
 
 def _conflict_paths(git_dir, work_tree):
@@ -704,6 +772,22 @@ def _init_git_dir(git_dir):
     """
     gitCmd(["init", "--bare", str(git_dir)])
     gitCmd(["--git-dir", str(git_dir), "config", "core.bare", "false"])
+    watch.tune_git_dir(git_dir)
+
+
+def _init_niche_git_dir(git_dir):
+    """Initialise a niche git dir, with large files routed through chunks."""
+    _init_git_dir(git_dir)
+    chunks.configure_git_dir(git_dir)
+
+
+def _niche_id(files_root, context, niche_name):
+    """Return the niche's registry id, or None if the registry lacks it."""
+    record = _registry_checkout_dir(files_root, context) / f"{niche_name}.json"
+    try:
+        return json.loads(record.read_text()).get("id")
+    except (OSError, ValueError):
+        return None
 
 
 def _ensure_registry(files_root, participant_hex, context):
@@ -780,6 +864,30 @@ def _cod_merge_ref(git_dir, checkout, ref_name):
         gitCmd(git_prefix + ["checkout", "-B", "main", ref_name])
 
 
+def _fast_forward_to_ref(git_dir, checkout, ref_name):
+    """Move HEAD and checkout to ref_name if that is a fast-forward.
+
+    Returns the parked SHA HEAD now points at, or None when there is nothing
+    parked, HEAD already contains it, the histories diverged, or git refused
+    because the checkout changed under it. Never creates a merge commit.
+    """
+    parked_sha = _resolve_ref(git_dir, ref_name)
+    if parked_sha is None:
+        return None
+    if _has_commits(git_dir):
+        if _is_ancestor(git_dir, parked_sha, "HEAD"):
+            return None
+        if not _is_ancestor(git_dir, "HEAD", parked_sha):
+            return None
+    git_prefix = ["--git-dir", str(git_dir), "--work-tree", str(checkout)]
+    if _has_commits(git_dir):
+        args = ["merge", "--ff-only", ref_name]
+    else:
+        args = ["checkout", "-B", "main", ref_name]
+    result = gitCmd(git_prefix + args, raise_on_error=False)
+    return parked_sha if result.returncode == 0 else None
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -808,7 +916,7 @@ def create_niche(files_root, participant_hex, context, niche_name):
     git_dir = _niche_git_dir(files_root, context, niche_name)
     if not git_dir.exists():
         git_dir.mkdir(parents=True)
-        _init_git_dir(git_dir)
+        _init_niche_git_dir(git_dir)
 
     # Write niche record to registry checkout and commit
     registry_git = _registry_git_dir(files_root, context)
@@ -848,18 +956,31 @@ def list_niches(files_root, participant_hex, context):
     context = _validate_context(participant_hex, context)
     _ensure_registry(files_root, participant_hex, context)
     registry_co = _registry_checkout_dir(files_root, context)
+    conn = _connect_checkouts(files_root, participant_hex)
+    checked_out = {
+        row["niche_name"]
+        for row in conn.execute(
+            "SELECT niche_name FROM checkout WHERE team_id = ?", (context.team_id,)
+        )
+    }
+    conn.close()
     niches = []
     for f in sorted(registry_co.glob("*.json")):
         data = json.loads(f.read_text())
         if data:
-            data["residency"] = niche_residency(
-                files_root, participant_hex, context, data["name"]
-            ).value
+            if not _niche_git_dir(files_root, context, data["name"]).exists():
+                residency = NicheResidency.REMOTE_ONLY
+            elif data["name"] in checked_out:
+                residency = NicheResidency.CHECKED_OUT
+            else:
+                residency = NicheResidency.CACHED
+            data["residency"] = residency.value
             niches.append(data)
     return niches
 
 
-def add_checkout(files_root, participant_hex, context, niche_name, dest_path):
+def add_checkout(files_root, participant_hex, context, niche_name, dest_path,
+                 sparse_patterns=None):
     """Register a local directory as the checkout of a niche.
 
     Each niche may have at most one checkout on a device. Raises
@@ -867,6 +988,8 @@ def add_checkout(files_root, participant_hex, context, niche_name, dest_path):
     checkout before attaching a new location.
 
     If the niche already has commits, dest_path is populated immediately.
+    sparse_patterns limits the checkout to those directories plus top-level
+    files; None checks out the whole tree.
     """
     context = _validate_context(participant_hex, context)
     git_dir = _niche_git_dir(files_root, context, niche_name)
@@ -877,18 +1000,22 @@ def add_checkout(files_root, participant_hex, context, niche_name, dest_path):
     if existing is not None:
         raise DuplicateCheckoutError(context.team_name, niche_name, existing)
 
-    _make_work_tree(git_dir, dest_path)
+    sparse_patterns = _normalize_sparse_patterns(sparse_patterns)
+    # Niches created before large-file mode pick the filter up here.
+    chunks.configure_git_dir(git_dir)
+    _make_work_tree(git_dir, dest_path, sparse_patterns)
 
     conn = _connect_checkouts(files_root, participant_hex)
     conn.execute(
-        "INSERT INTO checkout (id, team_id, niche_name, checkout_path, created_at) "
-        "VALUES (?, ?, ?, ?, ?)",
+        "INSERT INTO checkout (id, team_id, niche_name, checkout_path, created_at, "
+        "sparse_patterns) VALUES (?, ?, ?, ?, ?, ?)",
         (
             uuid7(),
             context.team_id,
             niche_name,
             str(pathlib.Path(dest_path)),
             datetime.now(timezone.utc).isoformat(),
+            None if sparse_patterns is None else json.dumps(sparse_patterns),
         ),
     )
     conn.commit()
@@ -898,6 +1025,7 @@ def add_checkout(files_root, participant_hex, context, niche_name, dest_path):
 def remove_checkout(files_root, participant_hex, context, niche_name, checkout_path):
     """Unregister a checkout. Does not delete files in the directory."""
     context = _validate_context(participant_hex, context)
+    watch.untrack(_niche_git_dir(files_root, context, niche_name), checkout_path)
     conn = _connect_checkouts(files_root, participant_hex)
     conn.execute(
         "DELETE FROM checkout WHERE team_id = ? AND niche_name = ? AND checkout_path = ?",
@@ -919,6 +1047,61 @@ def get_checkout(files_root, participant_hex, context, niche_name):
     return row["checkout_path"] if row else None
 
 
+def get_sparse_patterns(files_root, participant_hex, context, niche_name):
+    """Return the checkout's sparse directories, or None for a full checkout."""
+    context = _validate_context(participant_hex, context)
+    conn = _connect_checkouts(files_root, participant_hex)
+    row = conn.execute(
+        "SELECT sparse_patterns FROM checkout WHERE team_id = ? AND niche_name = ?",
+        (context.team_id, niche_name),
+    ).fetchone()
+    conn.close()
+    if row is None:
+        raise NoCheckoutError(
+            context.team_name,
+            niche_name,
+            niche_residency(files_root, participant_hex, context, niche_name),
+        )
+    return None if row["sparse_patterns"] is None else json.loads(row["sparse_patterns"])
+
+
+def set_sparse_patterns(files_root, participant_hex, context, niche_name, patterns):
+    """Change which directories of a niche the checkout holds.
+
+    Widening only writes the newly included directories. Narrowing removes
+    files from disk, so it requires a clean checkout (DirtyCheckoutError
+    otherwise), as a merge does. None returns to a full checkout. Returns the
+    normalized patterns.
+    """
+    context = _validate_context(participant_hex, context)
+    patterns = _normalize_sparse_patterns(patterns)
+    current = get_sparse_patterns(files_root, participant_hex, context, niche_name)
+    if patterns == current:
+        return patterns
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    widening = current is not None and all(_sparse_covers(patterns, p) for p in current)
+    if widening:
+        checkout = get_checkout(files_root, participant_hex, context, niche_name)
+        if not pathlib.Path(checkout).exists():
+            raise StaleCheckoutError(context.team_name, niche_name, checkout)
+    else:
+        checkout = _require_clean_checkout(files_root, participant_hex, context, niche_name)
+
+    _apply_sparse_patterns(git_dir, checkout, patterns)
+    conn = _connect_checkouts(files_root, participant_hex)
+    conn.execute(
+        "UPDATE checkout SET sparse_patterns = ? WHERE team_id = ? AND niche_name = ?",
+        (
+            None if patterns is None else json.dumps(patterns),
+            context.team_id,
+            niche_name,
+        ),
+    )
+    conn.commit()
+    conn.close()
+    return patterns
+
+
 def list_checkouts(files_root, participant_hex, context, niche_name):
     """Return list of checkout paths for a niche (at most one element)."""
     checkout = get_checkout(files_root, participant_hex, context, niche_name)
@@ -949,14 +1132,30 @@ def publish(files_root, participant_hex, context, niche_name, checkout_path,
     git_dir = _niche_git_dir(files_root, context, niche_name)
     checkout = pathlib.Path(checkout_path).resolve()
     git_prefix = ["--git-dir", str(git_dir), "--work-tree", str(checkout)]
+    chunks.configure_git_dir(git_dir)
 
+    tracker = watch.tracker_for(git_dir, checkout)
+    entries = tracker.status() if tracker is not None and not files else None
     if files:
+        staged = list(files)
         for f in files:
             gitCmd(git_prefix + ["add", f])
+    elif entries is not None:
+        # Stage exactly what the tracker saw change instead of walking the tree.
+        staged = [path for _code, paths in entries for path in paths]
+        if staged:
+            gitCmd(["--literal-pathspecs"] + git_prefix + ["add", "--all", "--", *staged])
     else:
+        # No tracker, or its status failed: let git walk the tree.
+        staged = None
         gitCmd(git_prefix + ["add", "--all"])
 
     gitCmd(git_prefix + ["commit", "-m", message or "Published changes"])
+    if tracker is not None:
+        if staged is None:
+            tracker.invalidate()
+        else:
+            tracker.after_commit(staged)
 
     result = gitCmd(git_prefix + ["rev-parse", "HEAD"])
     return result.stdout.strip()
@@ -966,17 +1165,153 @@ def status(files_root, participant_hex, context, niche_name, checkout_path):
     """Get git status for a checkout. Returns list of {status, path} dicts."""
     context = _validate_context(participant_hex, context)
     git_dir = _niche_git_dir(files_root, context, niche_name)
-    checkout = pathlib.Path(checkout_path)
-    result = gitCmd(
-        ["--git-dir", str(git_dir), "--work-tree", str(checkout),
-         "status", "--porcelain"],
-        raise_on_error=False,
-    )
-    entries = []
-    for line in result.stdout.strip().splitlines():
-        if line:
-            entries.append({"status": line[:2].strip(), "path": line[3:]})
-    return entries
+    return watch.entry_dicts(_checkout_entries(git_dir, pathlib.Path(checkout_path)) or [])
+
+
+def watch_checkout(files_root, participant_hex, context, niche_name):
+    """Keep an incremental status tracker for a niche's checkout.
+
+    For long-running processes such as the Files server. Returns False when
+    there is no checkout on disk or no filesystem watcher is available, in
+    which case status keeps doing full scans.
+    """
+    context = _validate_context(participant_hex, context)
+    checkout = get_checkout(files_root, participant_hex, context, niche_name)
+    if checkout is None:
+        return False
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    return watch.track(git_dir, checkout) is not None
+
+
+@dataclass
+class MaterializeResult:
+    """What materialize_large_files did. Paths are relative to the checkout."""
+
+    materialized: list
+    unavailable: list
+    chunks_fetched: int = 0
+
+
+def large_file_pointers(files_root, participant_hex, context, niche_name, paths=None):
+    """Return {path: Manifest} for checkout files still holding a chunk manifest.
+
+    Such a file is committed in large-file mode but its chunks were not on
+    this device when git wrote the checkout. paths limits the scan.
+    """
+    context = _validate_context(participant_hex, context)
+    checkout = get_checkout(files_root, participant_hex, context, niche_name)
+    if checkout is None:
+        raise NoCheckoutError(
+            context.team_name,
+            niche_name,
+            niche_residency(files_root, participant_hex, context, niche_name),
+        )
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    if not _has_commits(git_dir):
+        return {}
+    # Only blobs small enough to be a manifest can be a pointer.
+    listing = gitCmd(
+        ["--git-dir", str(git_dir), "ls-tree", "-r", "-l", "-z", "HEAD", "--", *(paths or [])]
+    ).stdout
+    pointers = {}
+    for entry in listing.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _mode, kind, _sha, size = meta.split()
+        if kind != "blob" or int(size) > chunks.MAX_MANIFEST_SIZE:
+            continue
+        local = pathlib.Path(checkout) / path
+        try:
+            with open(local, "rb") as f:
+                if f.read(len(chunks.MANIFEST_HEADER)) != chunks.MANIFEST_HEADER:
+                    continue
+                manifest = chunks.decode_manifest(chunks.MANIFEST_HEADER + f.read())
+        except OSError:
+            continue
+        if manifest is not None:
+            pointers[path] = manifest
+    return pointers
+
+
+def materialize_large_files(
+    files_root, participant_hex, context, niche_name, fetch_chunk, paths=None
+):
+    """Replace pointer files in a niche's checkout with their real content.
+
+    fetch_chunk(digest) returns the chunk's bytes, or None if no source has
+    it; chunks already cached locally are not fetched again. A file whose
+    chunks cannot all be found stays a pointer and is listed as unavailable.
+    The checkout stays clean either way: git cleans the real file back to
+    the manifest it already has committed.
+    """
+    context = _validate_context(participant_hex, context)
+    pointers = large_file_pointers(files_root, participant_hex, context, niche_name, paths)
+    checkout = pathlib.Path(get_checkout(files_root, participant_hex, context, niche_name))
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    cache = chunks.ChunkCache(git_dir)
+    result = MaterializeResult(materialized=[], unavailable=[])
+    for path, manifest in sorted(pointers.items()):
+        complete = True
+        for digest in cache.missing(manifest):
+            data = fetch_chunk(digest)
+            if data is None:
+                complete = False
+                break
+            cache.put(data, digest)
+            cache.mark_uploaded(digest)
+            result.chunks_fetched += 1
+        if not complete:
+            result.unavailable.append(path)
+            continue
+        cache.write_file(manifest, checkout / path)
+        result.materialized.append(path)
+    if result.materialized:
+        # git treats a size change as a modification without re-cleaning the
+        # file, so re-record the (unchanged) blobs with their new stat data.
+        gitCmd(
+            ["--literal-pathspecs", "--git-dir", str(git_dir), "--work-tree", str(checkout),
+             "update-index", "--", *result.materialized]
+        )
+    return result
+
+
+def upload_large_file_chunks(files_root, participant_hex, context, niche_name, put_chunk):
+    """Upload chunks this device holds that are not in its cloud storage yet.
+
+    put_chunk(remote_path, data) uploads one chunk. Must run before the niche
+    itself is pushed, so no published manifest names a chunk teammates cannot
+    find. Returns the number of chunks uploaded.
+    """
+    context = _validate_context(participant_hex, context)
+    cache = chunks.ChunkCache(_niche_git_dir(files_root, context, niche_name))
+    pending = cache.pending_uploads()
+    if not pending:
+        return 0
+    niche_id = _niche_id(files_root, context, niche_name)
+    if niche_id is None:
+        raise ValueError(f"Niche '{niche_name}' is not in the local registry")
+    for digest in pending:
+        put_chunk(chunks.remote_chunk_path(niche_id, digest), cache.get(digest))
+        cache.mark_uploaded(digest)
+    return len(pending)
+
+
+def large_file_chunk_path(files_root, participant_hex, context, niche_name, digest):
+    """Cloud path of one of a niche's chunks, or None if the niche id is unknown."""
+    context = _validate_context(participant_hex, context)
+    niche_id = _niche_id(files_root, context, niche_name)
+    return None if niche_id is None else chunks.remote_chunk_path(niche_id, digest)
+
+
+def set_large_file_threshold(files_root, participant_hex, context, niche_name, threshold):
+    """Set the size from which a niche's files are stored as chunks on this device."""
+    context = _validate_context(participant_hex, context)
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    if not git_dir.exists():
+        raise ValueError(f"Niche '{niche_name}' does not exist in team '{context.team_name}'")
+    chunks.configure_git_dir(git_dir)
+    chunks.set_large_file_threshold(git_dir, threshold)
 
 
 def log(files_root, participant_hex, context, niche_name, limit=20):
@@ -1048,6 +1383,23 @@ def merge_registry(files_root, participant_hex, context, teammate_id):
     return parked_sha
 
 
+def fast_forward_registry(files_root, participant_hex, context, teammate_id):
+    """Fast-forward the registry to a peer's parked ref when no merge is needed.
+
+    For unattended sync. Returns the new registry SHA, or None when the
+    registry was left alone; a divergent registry waits for merge_registry.
+    """
+    context = _validate_context(participant_hex, context)
+    _ensure_registry(files_root, participant_hex, context)
+    git_dir = _registry_git_dir(files_root, context)
+    sha = _fast_forward_to_ref(
+        git_dir, _registry_checkout_dir(files_root, context), _peer_ref_name(teammate_id)
+    )
+    if sha is not None:
+        _record_peer_merge(files_root, participant_hex, context, "registry", None, teammate_id, sha)
+    return sha
+
+
 def merge_self_registry(files_root, participant_hex, context):
     """Integrate parked self-store registry heads into the registry checkout.
 
@@ -1104,7 +1456,7 @@ def pull_niche(files_root, participant_hex, context, niche_name, remote):
     git_dir = _niche_git_dir(files_root, context, niche_name)
     if not git_dir.exists():
         git_dir.mkdir(parents=True)
-        _init_git_dir(git_dir)
+        _init_niche_git_dir(git_dir)
 
     checkout = _require_clean_checkout(files_root, participant_hex, context, niche_name)
 
@@ -1122,7 +1474,7 @@ def fetch_niche(files_root, participant_hex, context, niche_name, teammate_id, r
     git_dir = _niche_git_dir(files_root, context, niche_name)
     if not git_dir.exists():
         git_dir.mkdir(parents=True)
-        _init_git_dir(git_dir)
+        _init_niche_git_dir(git_dir)
 
     ref_name = _peer_ref_name(teammate_id)
     fetched_sha = _cod_fetch(git_dir, remote, ref_name)
@@ -1161,6 +1513,29 @@ def merge_niche(files_root, participant_hex, context, niche_name, teammate_id):
     return parked_sha
 
 
+def fast_forward_niche(files_root, participant_hex, context, niche_name, teammate_id):
+    """Fast-forward a niche's checkout to a peer's parked ref, if it is safe.
+
+    For unattended sync. Only a checkout that is attached, on disk and clean
+    moves, and only when the parked ref descends from HEAD. Returns the new
+    HEAD SHA, or None when the checkout was left alone — anything else is a
+    decision for the user through merge_niche.
+    """
+    context = _validate_context(participant_hex, context)
+    git_dir = _niche_git_dir(files_root, context, niche_name)
+    checkout = get_checkout(files_root, participant_hex, context, niche_name)
+    if checkout is None or not git_dir.exists() or not pathlib.Path(checkout).exists():
+        return None
+    if not _is_checkout_clean(checkout, git_dir):
+        return None
+    sha = _fast_forward_to_ref(git_dir, checkout, _peer_ref_name(teammate_id))
+    if sha is not None:
+        _record_peer_merge(
+            files_root, participant_hex, context, "niche", niche_name, teammate_id, sha
+        )
+    return sha
+
+
 def self_conflict_status(files_root, participant_hex, context, niche_name):
     """Return the outstanding parked self-store heads for one niche and its registry.
 
@@ -1236,6 +1611,38 @@ def niche_conflict_paths(files_root, participant_hex, context, niche_name):
     return []
 
 
+def peer_parked_sha(files_root, participant_hex, context, repo_kind, niche_name, teammate_id):
+    """Return the SHA parked for a peer's registry or niche, or None.
+
+    Reads the local ref only, so callers can compare it against a peer's head
+    manifest without touching the Hub.
+    """
+    context = _validate_context(participant_hex, context)
+    if repo_kind == "registry":
+        git_dir = _registry_git_dir(files_root, context)
+    else:
+        git_dir = _niche_git_dir(files_root, context, niche_name)
+    if not git_dir.exists():
+        return None
+    return _resolve_ref(git_dir, _peer_ref_name(teammate_id))
+
+
+def local_head(files_root, participant_hex, context, repo_kind, niche_name=None):
+    """Return the local main SHA of the registry or a niche, or None.
+
+    None covers both a repo that does not exist on this device and one with
+    no commits yet; neither has anything to publish.
+    """
+    context = _validate_context(participant_hex, context)
+    if repo_kind == "registry":
+        git_dir = _registry_git_dir(files_root, context)
+    else:
+        git_dir = _niche_git_dir(files_root, context, niche_name)
+    if not git_dir.exists():
+        return None
+    return _resolve_ref(git_dir, "refs/heads/main")
+
+
 def peer_update_status(
     files_root, participant_hex, context, repo_kind, niche_name, teammate_id
 ):
@@ -1288,3 +1695,283 @@ def peer_update_status(
         "last_fetched_sha": row["last_fetched_sha"] if row else None,
         "last_merged_sha": row["last_merged_sha"] if row else None,
     }
+
+
+# ---------------------------------------------------------------------------
+# Team status (dashboard reads)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RepoPeerStatus:
+    """One peer's parked ref in one repository, as peer_update_status reports it."""
+
+    teammate_id: str
+    parked_sha: str | None = None
+    already_merged: bool = False
+    last_fetched_sha: str | None = None
+    last_merged_sha: str | None = None
+
+    @property
+    def ready_to_merge(self):
+        return self.parked_sha is not None and not self.already_merged
+
+
+@dataclass(frozen=True)
+class RepoStatus:
+    """HEAD and every parked peer ref of one git dir."""
+
+    head_sha: str | None = None
+    peers: dict | None = None
+
+    def peer(self, teammate_id):
+        found = (self.peers or {}).get(teammate_id)
+        return found or RepoPeerStatus(teammate_id)
+
+
+@dataclass(frozen=True)
+class NicheStatus:
+    """A niche's registry record with its local residency, checkout and refs."""
+
+    record: dict
+    residency: NicheResidency
+    checkout_path: str | None = None
+    repo: RepoStatus = RepoStatus()
+
+    @property
+    def name(self):
+        return self.record["name"]
+
+
+@dataclass(frozen=True)
+class TeamStatus:
+    """Everything the dashboard shows about a team's repositories on this device."""
+
+    registry: RepoStatus
+    niches: dict
+    signal_watermarks: dict
+
+    def niche_records(self):
+        """list_niches-shaped dicts, sorted by niche name."""
+        return [
+            {**status.record, "residency": status.residency.value}
+            for _name, status in sorted(self.niches.items())
+        ]
+
+
+_TEAM_STATUS_CACHE = {}
+_TEAM_STATUS_CACHE_SIZE = 16
+_team_status_lock = threading.Lock()
+
+
+def _stat_stamp(path, mtimes):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    mtimes.append(st.st_mtime_ns)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _refs_stamp(git_dir, mtimes):
+    """Cheap fingerprint of a git dir's HEAD, main and parked peer refs.
+
+    Ref updates replace the loose ref file, so (inode, size, mtime) changes
+    whenever a ref moves; peers appearing change the refs/peers listing.
+    """
+    git_dir = pathlib.Path(git_dir)
+    stamp = [
+        _stat_stamp(git_dir / name, mtimes)
+        for name in ("HEAD", "packed-refs", "refs/heads/main", "refs/peers")
+    ]
+    peers_dir = git_dir / "refs" / "peers"
+    try:
+        teammates = sorted(os.listdir(peers_dir))
+    except OSError:
+        teammates = []
+    for teammate_id in teammates:
+        stamp.append((teammate_id, _stat_stamp(peers_dir / teammate_id / "main", mtimes)))
+    return tuple(stamp)
+
+
+def _team_status_stamp(files_root, participant_hex, context, mtimes):
+    team_dir = _team_dir(files_root, context)
+    registry_git = _registry_git_dir(files_root, context)
+    stamp = [
+        _stat_stamp(_checkouts_db_path(files_root, participant_hex), mtimes),
+        # checkouts.db is in WAL mode: recent writes may only touch the WAL.
+        _stat_stamp(f"{_checkouts_db_path(files_root, participant_hex)}-wal", mtimes),
+        _stat_stamp(registry_git / "index", mtimes),
+        _refs_stamp(registry_git, mtimes),
+    ]
+    niches_dir = team_dir / "niches"
+    try:
+        names = sorted(os.listdir(niches_dir))
+    except OSError:
+        names = []
+    for name in names:
+        git_dir = niches_dir / name / "git"
+        stamp.append((name, git_dir.exists() and _refs_stamp(git_dir, mtimes)))
+    return tuple(stamp)
+
+
+def _read_repo_status(git_dir, peer_rows):
+    """HEAD and parked peer refs of git_dir in two git calls.
+
+    One for-each-ref lists every ref; a second with --merged=HEAD answers
+    "is this parked ref already in HEAD?" for all peers at once instead of a
+    merge-base --is-ancestor per peer.
+    """
+    listing = gitCmd(
+        [
+            "--git-dir", str(git_dir), "for-each-ref",
+            "--format=%(objectname) %(refname)", "refs/heads/", "refs/peers/",
+        ],
+        raise_on_error=False,
+    )
+    refs = {}
+    for line in listing.stdout.splitlines() if listing.returncode == 0 else []:
+        sha, _, ref_name = line.partition(" ")
+        refs[ref_name] = sha
+
+    head_sha = None
+    head = (pathlib.Path(git_dir) / "HEAD").read_text().strip()
+    if head.startswith("ref: "):
+        head_sha = refs.get(head[len("ref: "):])
+    elif head:
+        head_sha = head
+
+    parked = {}
+    for ref_name, sha in refs.items():
+        parts = ref_name.split("/")
+        if len(parts) == 4 and parts[:2] == ["refs", "peers"] and parts[3] == "main":
+            parked[parts[2]] = sha
+
+    merged = set()
+    if parked and head_sha is not None:
+        result = gitCmd(
+            [
+                "--git-dir", str(git_dir), "for-each-ref",
+                f"--merged={head_sha}", "--format=%(refname)", "refs/peers/",
+            ],
+            raise_on_error=False,
+        )
+        if result.returncode == 0:
+            merged = set(result.stdout.split())
+
+    peers = {}
+    for teammate_id in set(parked) | set(peer_rows):
+        row = peer_rows.get(teammate_id)
+        peers[teammate_id] = RepoPeerStatus(
+            teammate_id=teammate_id,
+            parked_sha=parked.get(teammate_id),
+            already_merged=_peer_ref_name(teammate_id) in merged,
+            last_fetched_sha=row["last_fetched_sha"] if row else None,
+            last_merged_sha=row["last_merged_sha"] if row else None,
+        )
+    return RepoStatus(head_sha=head_sha, peers=peers)
+
+
+def _compute_team_status(files_root, participant_hex, context):
+    registry_co = _registry_checkout_dir(files_root, context)
+    records = []
+    for f in sorted(registry_co.glob("*.json")):
+        data = json.loads(f.read_text())
+        if data:
+            records.append(data)
+
+    conn = _connect_checkouts(files_root, participant_hex)
+    try:
+        checkouts = {
+            row["niche_name"]: row["checkout_path"]
+            for row in conn.execute(
+                "SELECT niche_name, checkout_path FROM checkout WHERE team_id = ?",
+                (context.team_id,),
+            )
+        }
+        peer_rows = {}
+        for row in conn.execute(
+            """
+            SELECT repo_kind, niche_name, teammate_id, last_fetched_sha, last_merged_sha
+            FROM peer_sync WHERE team_id = ?
+            """,
+            (context.team_id,),
+        ):
+            key = (row["repo_kind"], row["niche_name"])
+            peer_rows.setdefault(key, {})[row["teammate_id"]] = row
+        watermarks = {
+            row["teammate_id"]: int(row["count"])
+            for row in conn.execute(
+                "SELECT teammate_id, count FROM peer_signal_watermark WHERE team_id = ?",
+                (context.team_id,),
+            )
+        }
+    finally:
+        conn.close()
+
+    registry = _read_repo_status(
+        _registry_git_dir(files_root, context),
+        peer_rows.get(("registry", _peer_sync_niche_key("registry")), {}),
+    )
+    niches = {}
+    for record in records:
+        name = record["name"]
+        rows = peer_rows.get(("niche", _peer_sync_niche_key("niche", name)), {})
+        git_dir = _niche_git_dir(files_root, context, name)
+        if not git_dir.exists():
+            niches[name] = NicheStatus(
+                record=record,
+                residency=NicheResidency.REMOTE_ONLY,
+                repo=RepoStatus(peers={
+                    teammate_id: RepoPeerStatus(
+                        teammate_id,
+                        last_fetched_sha=row["last_fetched_sha"],
+                        last_merged_sha=row["last_merged_sha"],
+                    )
+                    for teammate_id, row in rows.items()
+                }),
+            )
+            continue
+        checkout_path = checkouts.get(name)
+        niches[name] = NicheStatus(
+            record=record,
+            residency=(
+                NicheResidency.CACHED if checkout_path is None
+                else NicheResidency.CHECKED_OUT
+            ),
+            checkout_path=checkout_path,
+            repo=_read_repo_status(git_dir, rows),
+        )
+    return TeamStatus(registry=registry, niches=niches, signal_watermarks=watermarks)
+
+
+def team_status(files_root, participant_hex, context):
+    """Return residency, checkout, parked refs and merge readiness for a whole team.
+
+    This is what the dashboard renders: one checkouts.db connection, two git
+    calls per repository, and a cached answer while neither the registry, any
+    niche's refs, nor checkouts.db have changed since the last call. The
+    cache is keyed on file stamps, so writes from another process are seen
+    too.
+    """
+    context = _validate_context(participant_hex, context)
+    _ensure_registry(files_root, participant_hex, context)
+    key = (str(files_root), participant_hex, context.team_id)
+    mtimes = []
+    stamp = _team_status_stamp(files_root, participant_hex, context, mtimes)
+    with _team_status_lock:
+        cached = _TEAM_STATUS_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    status = _compute_team_status(files_root, participant_hex, context)
+    if mtimes and not stamp_is_settled(max(mtimes)):
+        return status
+    # Stamp taken before the reads: a write racing them leaves a stale stamp,
+    # so the next call recomputes rather than trusting this answer forever.
+    with _team_status_lock:
+        _TEAM_STATUS_CACHE.pop(key, None)
+        _TEAM_STATUS_CACHE[key] = (stamp, status)
+        while len(_TEAM_STATUS_CACHE) > _TEAM_STATUS_CACHE_SIZE:
+            _TEAM_STATUS_CACHE.pop(next(iter(_TEAM_STATUS_CACHE)))
+    return status
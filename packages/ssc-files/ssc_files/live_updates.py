@@ -0,0 +1,153 @@
+"""Server-sent UI events: tell open pages which fragments to re-fetch.
+
+The broker and the `/events` stream come from `small_sea_client.live_updates`.
+Files names its events `peers:ProjectX`, and sends none unless an input of
+that fragment changed, so an idle page costs no requests at all.
+
+Two sources feed the broker while at least one page is listening, for each
+team with a cached Hub session:
+
+- a Hub `/notifications/watch` long-poll, whose `/session/peers` answer is
+  kept as the peer list the panel renders, so showing the panel does not
+  ask the Hub again until a teammate publishes;
+- a local pass every LOCAL_INTERVAL seconds over `files.team_status`, which
+  costs a few stat calls unless a fetch or merge moved a ref.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import httpx
+from small_sea_client.client import SmallSeaClient, SmallSeaError, SmallSeaHubUnavailable
+from small_sea_client.live_updates import REFRESH_SCRIPT, EventBroker, event_stream
+
+from ssc_files import agent, files, sync
+
+LOCAL_INTERVAL = 1.0
+WATCH_TIMEOUT = 30
+WATCH_RETRY = 5.0
+
+logger = logging.getLogger("ssc_files.live_updates")
+
+
+class LiveUpdates:
+    """Background sources of Files UI events.
+
+    Stopping waits for at most one Hub long-poll per team.
+    """
+
+    def __init__(
+        self,
+        files_root: str,
+        participant_hex: str,
+        broker: EventBroker,
+        *,
+        hub_port: int = SmallSeaClient.DEFAULT_PORT,
+        interval: float = LOCAL_INTERVAL,
+        watch_timeout: int = WATCH_TIMEOUT,
+        _http_client=None,
+    ):
+        self.files_root = files_root
+        self.participant_hex = participant_hex
+        self.broker = broker
+        self.hub_port = hub_port
+        self.interval = interval
+        self.watch_timeout = watch_timeout
+        self._http_client = _http_client
+        self._stopped = threading.Event()
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._peers: dict[str, list[dict]] = {}
+        self._team_status: dict[str, files.TeamStatus] = {}
+
+    def start(self) -> None:
+        self._spawn("local", self._local_loop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        for thread in list(self._threads.values()):
+            thread.join(timeout=self.watch_timeout + 5 if timeout is None else timeout)
+        self._threads = {}
+
+    def peers(self, team_name: str) -> Optional[list[dict]]:
+        """The team's `/session/peers` answer while a watch holds it current, else None."""
+        with self._lock:
+            peers = self._peers.get(team_name)
+        return [dict(peer) for peer in peers] if peers is not None else None
+
+    def check_local(self, team_names: list[str]) -> list[str]:
+        """Run one local pass; return the event names it published."""
+        published = []
+        for team_name in team_names:
+            try:
+                context = sync.resolve_team_context(
+                    self.files_root, self.participant_hex, team_name
+                )
+            except sync.FilesSyncError:
+                continue
+            status = files.team_status(self.files_root, self.participant_hex, context)
+            previous = self._team_status.get(team_name)
+            self._team_status[team_name] = status
+            if previous is not None and previous != status:
+                published.append(f"peers:{team_name}")
+        for name in published:
+            self.broker.publish(name)
+        return published
+
+    def _spawn(self, key: str, target, *args) -> None:
+        thread = threading.Thread(
+            target=target, args=args, name=f"ssc-files-live-{key}", daemon=True
+        )
+        self._threads[key] = thread
+        thread.start()
+
+    def _local_loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if not self.broker.subscriber_count:
+                continue
+            try:
+                team_names = agent.teams_with_sessions()
+                self.check_local(team_names)
+                for team_name in team_names:
+                    watching = self._threads.get(f"hub:{team_name}")
+                    if watching is None or not watching.is_alive():
+                        self._spawn(f"hub:{team_name}", self._hub_loop, team_name)
+            except Exception:
+                logger.exception("Local UI event pass failed")
+
+    def _hub_loop(self, team_name: str) -> None:
+        while not self._stopped.is_set():
+            if not self.broker.subscriber_count:
+                with self._lock:
+                    # Nobody watching: the cached peer list would go stale.
+                    self._peers.pop(team_name, None)
+                self._stopped.wait(self.interval)
+                continue
+            try:
+                session = sync.get_team_session(
+                    team_name, hub_port=self.hub_port, _http_client=self._http_client
+                )
+                peers = session.session_peers()
+                with self._lock:
+                    self._peers[team_name] = peers
+                known = {p["teammate_id"]: int(p.get("signal_count", 0)) for p in peers}
+                if not known:
+                    self._stopped.wait(self.watch_timeout)
+                    continue
+                result = session.watch_notifications(known, timeout=self.watch_timeout)
+            except sync.LoginRequiredError:
+                with self._lock:
+                    self._peers.pop(team_name, None)
+                return
+            except (SmallSeaError, SmallSeaHubUnavailable, httpx.HTTPError) as exc:
+                with self._lock:
+                    self._peers.pop(team_name, None)
+                logger.info("%s: peer watch paused %.0fs: %s", team_name, WATCH_RETRY, exc)
+                self._stopped.wait(WATCH_RETRY)
+                continue
+            if result.get("updated"):
+                with self._lock:
+                    # The next session_peers call refreshes the counts.
+                    self._peers.pop(team_name, None)
+                self.broker.publish(f"peers:{team_name}")
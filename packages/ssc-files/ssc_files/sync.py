@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import pathlib
+import threading
+import time
 import tomllib
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from typing import Callable, Optional
 
 from cod_sync.protocol import (
@@ -14,15 +18,22 @@ from cod_sync.protocol import (
     PublicationIntegrationRequiredError,
     PublicationOutcomeUnresolvedError,
     PublicationRetryableError,
+    read_head_manifest,
+)
+from cod_sync.store import PeerSmallSeaStore, SmallSeaStore, StoreError
+from small_sea_client.client import (
+    SmallSeaClient,
+    SmallSeaError,
+    SmallSeaHubUnavailable,
+    SmallSeaSession,
 )
-from cod_sync.store import PeerSmallSeaStore, SmallSeaStore
-from small_sea_client.client import SmallSeaClient, SmallSeaError, SmallSeaSession
 
 from ssc_files import files
 
 _CONFIG_PATH = pathlib.Path.home() / ".config" / "small-sea" / "files.toml"
 HUB_APP_NAME = "SmallSeaCollectiveFiles"
 _CLI_CLIENT_NAME = "SmallSeaCollectiveFilesCLI"
+DEFAULT_SYNC_WORKERS = 4
 
 
 class FilesSyncError(Exception):
@@ -182,6 +193,8 @@ class FetchResult:
     teammate_id: str
     registry_sha: str | None
     niche_sha: str | None
+    # Chains the peer's head manifest showed unchanged, so no fetch ran.
+    skipped: tuple[str, ...] = ()
 
 
 @dataclass
@@ -247,6 +260,69 @@ class LoginResult:
     auto_approved: bool
 
 
+@dataclass
+class RepoSyncOutcome:
+    """What one team-wide push or fetch did to one repository.
+
+    niche_name None means the registry. status is the Cod Sync disposition
+    ("published", "already_present") for a push, "fetched" for a fetch,
+    "fast-forwarded" for an unattended fast-forward, "failed" with the
+    error that stopped it, or "skipped" for a registry push held back
+    because a niche it names failed to publish. A fetch reports one outcome
+    per teammate it read from.
+    """
+    action: str
+    niche_name: str | None
+    status: str
+    seconds: float
+    sha: str | None = None
+    teammate_id: str | None = None
+    error: Exception | None = None
+
+    @property
+    def repo_label(self) -> str:
+        return "registry" if self.niche_name is None else f"niche {self.niche_name}"
+
+
+@dataclass
+class TeamPushPlan:
+    """Repositories a team-wide push will publish, decided before any upload.
+
+    A niche is clean when our own head manifest already records its local
+    head; without a usable manifest every niche with commits is pushed and
+    Cod Sync reports the ones that were already present.
+    """
+    niches: list[str]
+    clean: list[str]
+    registry: bool
+
+
+@dataclass
+class TeamFetchPlan:
+    """Peers and chains a team-wide fetch will read, decided before any fetch.
+
+    repos maps a niche name (None for the registry) to the teammates to fetch
+    it from. signal_counts holds the count observed for each changed peer,
+    which becomes that peer's watermark once all of its fetches succeed.
+    """
+    repos: dict[str | None, list[str]]
+    signal_counts: dict[str, int]
+    idle_peers: list[str]
+    unchanged_chains: int = 0
+
+
+@dataclass
+class TeamSyncResult:
+    outcomes: list[RepoSyncOutcome] = field(default_factory=list)
+    push_plan: TeamPushPlan | None = None
+    fetch_plan: TeamFetchPlan | None = None
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> list[RepoSyncOutcome]:
+        return [o for o in self.outcomes if o.status == "failed"]
+
+
 def config_path() -> pathlib.Path:
     """Return the Files config path, honoring a test override env var."""
     override = os.environ.get("SMALL_SEA_FILES_CONFIG")
@@ -280,9 +356,10 @@ def _dump_toml(config: dict) -> str:
         if value:
             lines.append(f"{key} = {json.dumps(str(value))}")
 
-    hub_port = config.get("hub_port")
-    if hub_port is not None:
-        lines.append(f"hub_port = {int(hub_port)}")
+    for key in ("hub_port", "sync_workers"):
+        value = config.get(key)
+        if value is not None:
+            lines.append(f"{key} = {int(value)}")
 
     team_sessions = config.get("team_sessions") or {}
     for team_name in sorted(team_sessions):
@@ -503,18 +580,29 @@ def _remote_kwargs(session: SmallSeaSession) -> dict:
     }
 
 
-def make_registry_remote(session: SmallSeaSession) -> SmallSeaStore:
+def make_registry_remote(
+    session: SmallSeaSession,
+    head_manifest_lock: Optional[threading.Lock] = None,
+) -> SmallSeaStore:
     return SmallSeaStore(
         session.token,
         path_prefix=registry_path_prefix(),
+        head_manifest=True,
+        head_manifest_lock=head_manifest_lock,
         **_remote_kwargs(session),
     )
 
 
-def make_niche_remote(niche_name: str, session: SmallSeaSession) -> SmallSeaStore:
+def make_niche_remote(
+    niche_name: str,
+    session: SmallSeaSession,
+    head_manifest_lock: Optional[threading.Lock] = None,
+) -> SmallSeaStore:
     return SmallSeaStore(
         session.token,
         path_prefix=niche_path_prefix(niche_name),
+        head_manifest=True,
+        head_manifest_lock=head_manifest_lock,
         **_remote_kwargs(session),
     )
 
@@ -541,6 +629,47 @@ def make_peer_niche_remote(
     )
 
 
+def peer_head_manifest(teammate_id: str, session: SmallSeaSession) -> dict | None:
+    """Read a peer's Files head manifest: {chain path prefix: ChainHead}.
+
+    One read summarizes the peer's registry and every niche. None means the
+    peer keeps no usable manifest (an older client, or nothing published yet)
+    and every chain has to be probed, as does a manifest that failed to read.
+    """
+    try:
+        return read_head_manifest(make_peer_registry_remote(teammate_id, session))
+    except StoreError:
+        return None
+
+
+def peer_chain_unchanged(
+    files_root: str,
+    participant_hex: str,
+    context,
+    manifest: dict | None,
+    teammate_id: str,
+    niche_name: str | None = None,
+) -> bool:
+    """True when the manifest proves a fetch of this chain would bring nothing.
+
+    niche_name None means the registry. Publishers write a manifest entry
+    only after the chain's head has moved, and notify only after that, so an
+    entry equal to what is already parked locally is safe to skip. A chain
+    missing from the manifest is never skipped.
+    """
+    if manifest is None:
+        return False
+    prefix = registry_path_prefix() if niche_name is None else niche_path_prefix(niche_name)
+    entry = manifest.get(prefix)
+    if entry is None:
+        return False
+    repo_kind = "registry" if niche_name is None else "niche"
+    parked = files.peer_parked_sha(
+        files_root, participant_hex, context, repo_kind, niche_name, teammate_id
+    )
+    return parked == entry.head
+
+
 def push_via_hub(
     files_root: str,
     participant_hex: str,
@@ -565,13 +694,7 @@ def push_via_hub(
     niche_result = _publish(
         "niche",
         merge_hint,
-        lambda: files.push_niche(
-            files_root,
-            participant_hex,
-            context,
-            niche_name,
-            make_niche_remote(niche_name, session),
-        ),
+        _niche_publisher(files_root, participant_hex, context, niche_name, session),
     )
     registry_result = _publish(
         "registry",
@@ -592,6 +715,31 @@ def push_via_hub(
         )
 
 
+def _niche_publisher(
+    files_root, participant_hex, context, niche_name, session, head_manifest_lock=None
+):
+    """Return a callable publishing a niche: its new chunks, then its chain.
+
+    Chunks go first so that no published manifest names a chunk teammates
+    cannot download yet.
+    """
+    def upload_chunk(path: str, data: bytes) -> None:
+        session.upload(niche_path_prefix(niche_name) + path, data)
+
+    def publish():
+        files.upload_large_file_chunks(
+            files_root, participant_hex, context, niche_name, upload_chunk
+        )
+        return files.push_niche(
+            files_root,
+            participant_hex,
+            context,
+            niche_name,
+            make_niche_remote(niche_name, session, head_manifest_lock),
+        )
+    return publish
+
+
 def _publish(scope: str, merge_hint: str, publish: Callable):
     """Run one Cod Sync publication and translate its three attention states.
 
@@ -666,34 +814,126 @@ def fetch_via_hub(
     except Exception:
         pass
 
-    registry_sha = files.fetch_registry(
-        files_root,
-        participant_hex,
-        context,
-        from_teammate_id,
-        make_peer_registry_remote(from_teammate_id, session),
-    )
-    niche_sha = files.fetch_niche(
-        files_root,
-        participant_hex,
-        context,
-        niche_name,
-        from_teammate_id,
-        make_peer_niche_remote(niche_name, from_teammate_id, session),
-    )
+    # One manifest read tells which of the two chains moved; the signal count
+    # above was read first, so any push it reflects is already in the manifest.
+    manifest = peer_head_manifest(from_teammate_id, session)
+    watermark = get_signal_watermark(files_root, participant_hex, context, from_teammate_id)
+    moved = [
+        chain
+        for chain in (None, niche_name)
+        if not peer_chain_unchanged(
+            files_root, participant_hex, context, manifest, from_teammate_id, chain
+        )
+    ]
+    explained = manifest_explains_signal(observed_signal_count - watermark, moved)
+    if not explained:
+        # The manifest lags (see manifest_explains_signal): probe both chains,
+        # and leave the watermark for a team fetch to probe the rest.
+        manifest = None
+    skipped = []
+
+    if peer_chain_unchanged(files_root, participant_hex, context, manifest, from_teammate_id):
+        skipped.append("registry")
+        registry_sha = manifest[registry_path_prefix()].head
+    else:
+        registry_sha = files.fetch_registry(
+            files_root,
+            participant_hex,
+            context,
+            from_teammate_id,
+            make_peer_registry_remote(from_teammate_id, session),
+        )
+    if peer_chain_unchanged(
+        files_root, participant_hex, context, manifest, from_teammate_id, niche_name
+    ):
+        skipped.append("niche")
+        niche_sha = manifest[niche_path_prefix(niche_name)].head
+    else:
+        niche_sha = files.fetch_niche(
+            files_root,
+            participant_hex,
+            context,
+            niche_name,
+            from_teammate_id,
+            make_peer_niche_remote(niche_name, from_teammate_id, session),
+        )
 
-    # Advance the watermark now that the fetch succeeded.
-    set_signal_watermark(
-        files_root, participant_hex, context, from_teammate_id, observed_signal_count
-    )
+    # Advance the watermark now that the fetch succeeded, unless some bump
+    # may stand for a chain this fetch did not read.
+    if explained:
+        set_signal_watermark(
+            files_root, participant_hex, context, from_teammate_id, observed_signal_count
+        )
 
     return FetchResult(
         teammate_id=from_teammate_id,
         registry_sha=registry_sha,
         niche_sha=niche_sha,
+        skipped=tuple(skipped),
     )
 
 
+def materialize_via_hub(
+    files_root: str,
+    participant_hex: str,
+    team_name: str,
+    niche_name: str,
+    *,
+    paths: list[str] | None = None,
+    from_teammate_id: str | None = None,
+    hub_port: int = SmallSeaClient.DEFAULT_PORT,
+    _http_client=None,
+) -> files.MaterializeResult:
+    """Download the chunks of large-file pointers in a checkout and swap them in.
+
+    Each chunk is looked for in our own storage first, then with
+    from_teammate_id, or with every peer when none is given; teammates' Hubs
+    on the LAN may serve it. A chunk is only kept if its content matches its
+    name, so a source with wrong bytes is skipped rather than trusted.
+    """
+    context = resolve_team_context(files_root, participant_hex, team_name)
+    session = get_team_session(team_name, hub_port=hub_port, _http_client=_http_client)
+    teammates = None
+
+    def sources():
+        nonlocal teammates
+        yield lambda path: session.download(path)
+        if teammates is None:
+            if from_teammate_id is not None:
+                teammates = [from_teammate_id]
+            else:
+                try:
+                    teammates = [p["teammate_id"] for p in session.session_peers()]
+                except SmallSeaError:
+                    teammates = []
+        for teammate_id in teammates:
+            yield lambda path, t=teammate_id: session.download_from_peer(t, path, source="auto")
+
+    def fetch_chunk(digest: str) -> bytes | None:
+        chunk_path = files.large_file_chunk_path(
+            files_root, participant_hex, context, niche_name, digest
+        )
+        if chunk_path is None:
+            return None
+        for download in sources():
+            try:
+                data, _etag = download(niche_path_prefix(niche_name) + chunk_path)
+            except SmallSeaHubUnavailable:
+                raise
+            except SmallSeaError:
+                continue
+            if hashlib.sha256(data).hexdigest() == digest:
+                return data
+        return None
+
+    try:
+        return files.materialize_large_files(
+            files_root, participant_hex, context, niche_name, fetch_chunk, paths
+        )
+    except files.NoCheckoutError as exc:
+        raise NoCheckoutError(exc.team_name, exc.niche_name, exc.residency) from exc
+
+
 def merge_via_hub(
     files_root: str,
     participant_hex: str,
@@ -842,30 +1082,489 @@ def peer_update_status(
     GET /session/peers response so that has_unfetched_hint can compare
     it against the locally persisted watermark.
     """
-    registry_status = files.peer_update_status(
-        files_root, participant_hex, context, "registry", None, teammate_id
-    )
-    niche_status = files.peer_update_status(
-        files_root, participant_hex, context, "niche", niche_name, teammate_id
-    )
-    parked_sha = niche_status["parked_sha"] or registry_status["parked_sha"]
-    ready_to_merge = (
-        registry_status["ready_to_merge"] or niche_status["ready_to_merge"]
-    )
-    already_merged = bool(parked_sha) and not ready_to_merge
-    return PeerUpdateStatus(
-        teammate_id=teammate_id,
-        parked_sha=parked_sha,
-        ready_to_merge=ready_to_merge,
-        already_merged=already_merged,
-        registry_sha=registry_status["parked_sha"],
-        niche_sha=niche_status["parked_sha"],
-        last_fetched_sha=niche_status["last_fetched_sha"] or registry_status["last_fetched_sha"],
-        last_merged_sha=niche_status["last_merged_sha"] or registry_status["last_merged_sha"],
-        current_signal_count=current_signal_count,
-        last_seen_signal_count=get_signal_watermark(
-            files_root, participant_hex, context, teammate_id
-        ),
+    peer = {"teammate_id": teammate_id, "signal_count": current_signal_count}
+    return peer_update_statuses(files_root, participant_hex, context, niche_name, [peer])[0]
+
+
+def peer_update_statuses(
+    files_root: str,
+    participant_hex: str,
+    context,
+    niche_name: str,
+    peers: list[dict],
+) -> list[PeerUpdateStatus]:
+    """peer_update_status for every peer of a /session/peers response at once.
+
+    Reads files.team_status, so a whole peer panel costs one checkouts.db
+    connection and a few git calls — none at all while nothing changed.
+    """
+    team = files.team_status(files_root, participant_hex, context)
+    niche = team.niches.get(niche_name)
+    statuses = []
+    for peer in peers:
+        teammate_id = peer["teammate_id"]
+        if niche is not None:
+            niche_peer = niche.repo.peer(teammate_id)
+        else:
+            # Not in the registry yet, but a fetch may already have parked it.
+            niche_peer = _repo_peer_status(files.peer_update_status(
+                files_root, participant_hex, context, "niche", niche_name, teammate_id
+            ))
+        registry_peer = team.registry.peer(teammate_id)
+        parked_sha = niche_peer.parked_sha or registry_peer.parked_sha
+        ready_to_merge = registry_peer.ready_to_merge or niche_peer.ready_to_merge
+        statuses.append(PeerUpdateStatus(
+            teammate_id=teammate_id,
+            parked_sha=parked_sha,
+            ready_to_merge=ready_to_merge,
+            already_merged=bool(parked_sha) and not ready_to_merge,
+            registry_sha=registry_peer.parked_sha,
+            niche_sha=niche_peer.parked_sha,
+            last_fetched_sha=niche_peer.last_fetched_sha or registry_peer.last_fetched_sha,
+            last_merged_sha=niche_peer.last_merged_sha or registry_peer.last_merged_sha,
+            current_signal_count=int(peer.get("signal_count", 0)),
+            last_seen_signal_count=team.signal_watermarks.get(teammate_id, 0),
+        ))
+    return statuses
+
+
+def _repo_peer_status(status: dict) -> files.RepoPeerStatus:
+    return files.RepoPeerStatus(
+        teammate_id=status["teammate_id"],
+        parked_sha=status["parked_sha"],
+        already_merged=status["already_merged"],
+        last_fetched_sha=status["last_fetched_sha"],
+        last_merged_sha=status["last_merged_sha"],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Team-wide operations
+# ---------------------------------------------------------------------------
+
+
+def own_head_manifest(session: SmallSeaSession) -> dict | None:
+    """Read this participant's own Files head manifest, or None."""
+    try:
+        return read_head_manifest(make_registry_remote(session))
+    except StoreError:
+        return None
+
+
+def _manifest_niche_names(manifest: dict | None) -> list[str]:
+    """Niche names a manifest covers, ignoring any that are not valid names."""
+    prefix = "niches/"
+    names = []
+    for key in manifest or {}:
+        if not (key.startswith(prefix) and key.endswith("/")):
+            continue
+        name = key[len(prefix):-1]
+        try:
+            if files._canonical_name(name) == name:
+                names.append(name)
+        except ValueError:
+            continue
+    return names
+
+
+def manifest_explains_signal(signal_delta: int, moved: list) -> bool:
+    """True when the moved manifest entries can account for every new bump.
+
+    Each manifest write bumps the peer's signal count once, so each moved
+    entry explains at most one bump. A publisher whose manifest write failed
+    still notifies, on a bump of its own (see SmallSeaStore.notify_head_moved),
+    and that bump is one no entry explains: the manifest lags and every chain
+    has to be probed. A chain that moved twice also reads as unexplained,
+    which costs only a few extra reads.
+    """
+    return signal_delta <= len(moved)
+
+
+def plan_team_push(
+    files_root: str,
+    participant_hex: str,
+    context,
+    manifest: dict | None,
+) -> TeamPushPlan:
+    """Decide which of a team's repositories hold unpublished commits.
+
+    Purely local apart from the manifest the caller already read: a repo is
+    dirty when it has commits and the manifest does not record its head.
+    """
+    def dirty(niche_name=None):
+        repo_kind = "registry" if niche_name is None else "niche"
+        head = files.local_head(files_root, participant_hex, context, repo_kind, niche_name)
+        if head is None:
+            return False
+        if manifest is None:
+            return True
+        prefix = registry_path_prefix() if niche_name is None else niche_path_prefix(niche_name)
+        entry = manifest.get(prefix)
+        return entry is None or entry.head != head
+
+    niches, clean = [], []
+    for niche in files.list_niches(files_root, participant_hex, context):
+        (niches if dirty(niche["name"]) else clean).append(niche["name"])
+    # The registry records every niche, so a new niche always dirties it too.
+    return TeamPushPlan(niches=niches, clean=clean, registry=dirty())
+
+
+def plan_team_fetch(
+    files_root: str,
+    participant_hex: str,
+    context,
+    session: SmallSeaSession,
+    *,
+    all_peers: bool = False,
+) -> TeamFetchPlan:
+    """Decide which peers changed and which of their chains to fetch.
+
+    One /session/peers read gives every peer's signal count; a peer whose
+    count has not passed its watermark is idle unless all_peers is set. Each
+    changed peer costs one head-manifest read, which drops the chains that
+    are already parked locally.
+    """
+    local_niches = [
+        n["name"] for n in files.list_niches(files_root, participant_hex, context)
+    ]
+    repos: dict[str | None, list[str]] = {}
+    signal_counts, idle_peers = {}, []
+    unchanged = 0
+    for peer in session.session_peers():
+        teammate_id = peer["teammate_id"]
+        count = int(peer.get("signal_count", 0))
+        watermark = get_signal_watermark(files_root, participant_hex, context, teammate_id)
+        if count <= watermark and not all_peers:
+            idle_peers.append(teammate_id)
+            continue
+        signal_counts[teammate_id] = count
+        manifest = peer_head_manifest(teammate_id, session)
+        niche_names = list(dict.fromkeys(local_niches + _manifest_niche_names(manifest)))
+        chains = [None, *niche_names]
+        moved = [
+            niche_name
+            for niche_name in chains
+            if not peer_chain_unchanged(
+                files_root, participant_hex, context, manifest, teammate_id, niche_name
+            )
+        ]
+        if not manifest_explains_signal(count - watermark, moved):
+            moved = chains
+        unchanged += len(chains) - len(moved)
+        for niche_name in moved:
+            repos.setdefault(niche_name, []).append(teammate_id)
+    return TeamFetchPlan(
+        repos=repos,
+        signal_counts=signal_counts,
+        idle_peers=idle_peers,
+        unchanged_chains=unchanged,
+    )
+
+
+def _run_repo_jobs(jobs: list[Callable], workers: int, progress) -> list[RepoSyncOutcome]:
+    """Run independent per-repository jobs concurrently.
+
+    Each job owns one git dir and returns its outcomes, so no two workers
+    ever write the same repository. progress sees every outcome as its job
+    finishes.
+    """
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for future in as_completed([pool.submit(job) for job in jobs]):
+            for outcome in future.result():
+                outcomes.append(outcome)
+                if progress is not None:
+                    progress(outcome)
+    return outcomes
+
+
+def _push_job(niche_name, merge_hint, publish):
+    def job():
+        started = time.monotonic()
+        scope = "registry" if niche_name is None else "niche"
+        try:
+            result = _publish(scope, merge_hint, publish)
+        except Exception as exc:
+            return [RepoSyncOutcome(
+                "push", niche_name, "failed", time.monotonic() - started, error=exc
+            )]
+        return [RepoSyncOutcome(
+            "push",
+            niche_name,
+            result.disposition,
+            time.monotonic() - started,
+            sha=result.observed_head,
+        )]
+    return job
+
+
+def _fetch_job(niche_name, teammate_ids, fetch):
+    """Fetch one repository from each teammate in turn."""
+    def job():
+        outcomes = []
+        for teammate_id in teammate_ids:
+            started = time.monotonic()
+            try:
+                sha = fetch(teammate_id)
+            except Exception as exc:
+                outcomes.append(RepoSyncOutcome(
+                    "fetch", niche_name, "failed", time.monotonic() - started,
+                    teammate_id=teammate_id, error=exc,
+                ))
+                continue
+            outcomes.append(RepoSyncOutcome(
+                "fetch", niche_name, "fetched", time.monotonic() - started,
+                sha=sha, teammate_id=teammate_id,
+            ))
+        return outcomes
+    return job
+
+
+def _push_team(files_root, participant_hex, context, session, workers, progress):
+    session.ensure_cloud_ready()
+    plan = plan_team_push(
+        files_root, participant_hex, context, own_head_manifest(session)
+    )
+    team_name = context.team_name
+    # Every chain here shares one head manifest; its updates queue on this
+    # lock instead of spending their retries on each other's writes.
+    manifest_lock = threading.Lock()
+    jobs = []
+    for niche_name in plan.niches:
+        jobs.append(_push_job(
+            niche_name,
+            f"`ssc-files merge --from-self {team_name} {niche_name}`",
+            _niche_publisher(
+                files_root, participant_hex, context, niche_name, session, manifest_lock
+            ),
+        ))
+    outcomes = _run_repo_jobs(jobs, workers, progress)
+    if not plan.registry:
+        return plan, outcomes
+    # The registry goes last, as in push_via_hub: a teammate who fetches it
+    # must find every niche it names already published.
+    failed = sorted(o.niche_name for o in outcomes if o.status == "failed")
+    if failed:
+        outcome = RepoSyncOutcome(
+            "push", None, "skipped", 0.0,
+            error=RuntimeError(f"registry not published; niches failed: {', '.join(failed)}"),
+        )
+        if progress is not None:
+            progress(outcome)
+        return plan, outcomes + [outcome]
+    outcomes += _run_repo_jobs(
+        [_push_job(
+            None,
+            f"`ssc-files merge --from-self {team_name} <niche>`",
+            lambda: files.push_registry(
+                files_root,
+                participant_hex,
+                context,
+                make_registry_remote(session, manifest_lock),
+            ),
+        )],
+        workers,
+        progress,
+    )
+    return plan, outcomes
+
+
+def _fetch_team(files_root, participant_hex, context, session, workers, progress, all_peers):
+    plan = plan_team_fetch(
+        files_root, participant_hex, context, session, all_peers=all_peers
+    )
+    registry_jobs, jobs = [], []
+    for niche_name, teammate_ids in plan.repos.items():
+        if niche_name is None:
+            def fetch(teammate_id):
+                return files.fetch_registry(
+                    files_root,
+                    participant_hex,
+                    context,
+                    teammate_id,
+                    make_peer_registry_remote(teammate_id, session),
+                )
+        else:
+            def fetch(teammate_id, niche_name=niche_name):
+                return files.fetch_niche(
+                    files_root,
+                    participant_hex,
+                    context,
+                    niche_name,
+                    teammate_id,
+                    make_peer_niche_remote(niche_name, teammate_id, session),
+                )
+        (registry_jobs if niche_name is None else jobs).append(
+            _fetch_job(niche_name, teammate_ids, fetch)
+        )
+    # The registry lands first, so niche fetches see the niches it names.
+    outcomes = _run_repo_jobs(registry_jobs, workers, progress)
+    outcomes += _run_repo_jobs(jobs, workers, progress)
+
+    # A peer's watermark only moves once everything planned for it landed;
+    # otherwise the next run would see no hint and skip the failed chain.
+    failed_peers = {o.teammate_id for o in outcomes if o.status == "failed"}
+    for teammate_id, count in plan.signal_counts.items():
+        if teammate_id not in failed_peers:
+            set_signal_watermark(files_root, participant_hex, context, teammate_id, count)
+    return plan, outcomes
+
+
+def push_all_via_hub(
+    files_root: str,
+    participant_hex: str,
+    team_name: str,
+    *,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    progress: Optional[Callable[[RepoSyncOutcome], None]] = None,
+    hub_port: int = SmallSeaClient.DEFAULT_PORT,
+    _http_client=None,
+) -> TeamSyncResult:
+    """Publish every dirty niche and the registry once, over one session.
+
+    Independent repositories publish concurrently on up to `workers` threads.
+    A failed repository does not stop the others; its outcome carries the
+    error, translated the same way push_via_hub translates it.
+    """
+    started = time.monotonic()
+    context = resolve_team_context(files_root, participant_hex, team_name)
+    session = get_team_session(team_name, hub_port=hub_port, _http_client=_http_client)
+    plan, outcomes = _push_team(
+        files_root, participant_hex, context, session, workers, progress
+    )
+    return TeamSyncResult(
+        outcomes=outcomes, push_plan=plan, seconds=time.monotonic() - started
+    )
+
+
+def fetch_all_peers_via_hub(
+    files_root: str,
+    participant_hex: str,
+    team_name: str,
+    *,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    progress: Optional[Callable[[RepoSyncOutcome], None]] = None,
+    all_peers: bool = False,
+    hub_port: int = SmallSeaClient.DEFAULT_PORT,
+    _http_client=None,
+) -> TeamSyncResult:
+    """Fetch the registry and every niche from each changed peer, without merging.
+
+    all_peers ignores signal watermarks and asks every peer's manifest, for
+    when a signal may have been lost.
+    """
+    started = time.monotonic()
+    context = resolve_team_context(files_root, participant_hex, team_name)
+    session = get_team_session(team_name, hub_port=hub_port, _http_client=_http_client)
+    plan, outcomes = _fetch_team(
+        files_root, participant_hex, context, session, workers, progress, all_peers
+    )
+    return TeamSyncResult(
+        outcomes=outcomes, fetch_plan=plan, seconds=time.monotonic() - started
+    )
+
+
+def sync_team_via_hub(
+    files_root: str,
+    participant_hex: str,
+    team_name: str,
+    *,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    progress: Optional[Callable[[RepoSyncOutcome], None]] = None,
+    hub_port: int = SmallSeaClient.DEFAULT_PORT,
+    _http_client=None,
+) -> TeamSyncResult:
+    """Push everything dirty, then fetch from every changed peer.
+
+    Nothing is merged: fetched work stays parked for `merge`, as with
+    fetch_via_hub.
+    """
+    started = time.monotonic()
+    context = resolve_team_context(files_root, participant_hex, team_name)
+    session = get_team_session(team_name, hub_port=hub_port, _http_client=_http_client)
+    push_plan, pushed = _push_team(
+        files_root, participant_hex, context, session, workers, progress
+    )
+    fetch_plan, fetched = _fetch_team(
+        files_root, participant_hex, context, session, workers, progress, False
+    )
+    return TeamSyncResult(
+        outcomes=pushed + fetched,
+        push_plan=push_plan,
+        fetch_plan=fetch_plan,
+        seconds=time.monotonic() - started,
+    )
+
+
+def fast_forward_fetched(
+    files_root: str,
+    participant_hex: str,
+    context,
+    fetched: list[RepoSyncOutcome],
+    progress: Optional[Callable[[RepoSyncOutcome], None]] = None,
+) -> list[RepoSyncOutcome]:
+    """Fast-forward what a team fetch just parked, where no decision is needed.
+
+    The registry goes first so niches it introduces are listed. A niche
+    moves only if its checkout is clean and behind the parked ref; anything
+    else stays parked for an explicit merge.
+    """
+    outcomes = []
+    for outcome in sorted(fetched, key=lambda o: o.niche_name is not None):
+        if outcome.action != "fetch" or outcome.status != "fetched" or not outcome.sha:
+            continue
+        started = time.monotonic()
+        try:
+            if outcome.niche_name is None:
+                sha = files.fast_forward_registry(
+                    files_root, participant_hex, context, outcome.teammate_id
+                )
+            else:
+                sha = files.fast_forward_niche(
+                    files_root, participant_hex, context, outcome.niche_name,
+                    outcome.teammate_id,
+                )
+        except Exception as exc:
+            result = RepoSyncOutcome(
+                "fast-forward", outcome.niche_name, "failed", time.monotonic() - started,
+                teammate_id=outcome.teammate_id, error=exc,
+            )
+        else:
+            if sha is None:
+                continue
+            result = RepoSyncOutcome(
+                "fast-forward", outcome.niche_name, "fast-forwarded",
+                time.monotonic() - started, sha=sha, teammate_id=outcome.teammate_id,
+            )
+        outcomes.append(result)
+        if progress is not None:
+            progress(result)
+    return outcomes
+
+
+def auto_sync_team(
+    files_root: str,
+    participant_hex: str,
+    team_name: str,
+    session: SmallSeaSession,
+    *,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    progress: Optional[Callable[[RepoSyncOutcome], None]] = None,
+) -> TeamSyncResult:
+    """One unattended pass: fetch changed peers, then fast-forward clean checkouts.
+
+    Signal watermarks decide which peers are read, exactly as for
+    fetch_all_peers_via_hub. Divergent or dirty niches are fetched but not
+    merged.
+    """
+    started = time.monotonic()
+    context = resolve_team_context(files_root, participant_hex, team_name)
+    plan, fetched = _fetch_team(
+        files_root, participant_hex, context, session, workers, progress, False
+    )
+    moved = fast_forward_fetched(files_root, participant_hex, context, fetched, progress)
+    return TeamSyncResult(
+        outcomes=fetched + moved, fetch_plan=plan, seconds=time.monotonic() - started
     )
 
 
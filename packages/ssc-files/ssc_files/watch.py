@@ -0,0 +1,367 @@
+"""Incremental status for niche checkouts.
+
+A full `git status` walks the whole checkout, which on a tree of tens of
+thousands of files takes seconds, and the Files web UI asks often. Two things
+keep that cost down:
+
+- Every niche git dir is tuned for large work trees: the untracked cache lets
+  git skip directories whose mtime has not moved, and the split index keeps
+  index writes proportional to what changed.
+- While the Files server runs, a `CheckoutTracker` per checkout remembers the
+  last status and the paths a filesystem watcher has seen change since. A
+  status then asks git about those paths only. Anything that moves the git
+  dir's index or HEAD — a commit, a merge, a checkout from another process —
+  or a `.gitignore` edit falls back to one full scan.
+
+Watcher events arrive asynchronously, so a status first writes a cookie file
+into the checkout and waits for the watcher to report it. Events are
+delivered in order, so every write that finished before the status began has
+been noted by then. A cookie that never shows up costs one full scan.
+
+The watcher needs the optional `watchdog` package. Without it no tracker is
+registered and every status is a full scan, exactly as before.
+"""
+
+import itertools
+import os
+import pathlib
+import threading
+
+from cod_sync.git import gitCmd
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - depends on the environment
+    FileSystemEventHandler = object
+    Observer = None
+
+#: Past this many changed paths one full scan is cheaper than a long pathspec.
+MAX_TRACKED_PATHS = 256
+
+#: Files in the git dir whose change can alter every status entry.
+_GIT_STATE_FILES = ("index", "HEAD", "refs/heads/main", "MERGE_HEAD")
+
+_EVENTS_WITHOUT_WRITES = {"opened", "closed_no_write"}
+
+#: Name prefix of the barrier files a status writes into a watched checkout.
+COOKIE_PREFIX = ".ssc-files-cookie-"
+
+#: Seconds a status waits for the watcher to report its cookie.
+COOKIE_TIMEOUT = 2.0
+
+_cookie_ids = itertools.count()
+
+
+def watching_available() -> bool:
+    return Observer is not None
+
+
+def tune_git_dir(git_dir):
+    """Turn on git's own large-tree support for a niche git dir.
+
+    Also keeps status cookies out of git's view, so one a publish catches
+    mid-barrier is never staged. Idempotent, and safe on a git dir that
+    already has an index.
+    """
+    for key, value in (("core.untrackedCache", "true"), ("core.splitIndex", "true")):
+        gitCmd(["--git-dir", str(git_dir), "config", key, value])
+    exclude = pathlib.Path(git_dir) / "info" / "exclude"
+    pattern = f"/{COOKIE_PREFIX}*"
+    lines = exclude.read_text().splitlines() if exclude.exists() else []
+    if pattern not in lines:
+        exclude.parent.mkdir(parents=True, exist_ok=True)
+        exclude.write_text("".join(f"{line}\n" for line in [*lines, pattern]))
+
+
+def porcelain_status(git_dir, work_tree, pathspecs=None):
+    """Run `git status --porcelain -z` and return (status, paths) pairs.
+
+    paths is (path,) or, for a rename or copy, (new, old). pathspecs limits
+    the scan to those paths, taken literally. Untracked files are listed one
+    by one: git collapses an untracked directory differently depending on
+    the pathspec, and a partial scan has to agree with a full one.
+    """
+    args = [
+        "--literal-pathspecs",
+        "--git-dir", str(git_dir), "--work-tree", str(work_tree),
+        "status", "--porcelain", "-z", "--untracked-files=all",
+    ]
+    if pathspecs is not None:
+        args += ["--", *pathspecs]
+    result = gitCmd(args, raise_on_error=False)
+    if result.returncode != 0:
+        return None
+    fields = result.stdout.split("\0")
+    entries = []
+    i = 0
+    while i < len(fields):
+        field = fields[i]
+        i += 1
+        if not field:
+            continue
+        code, path = field[:2], field[3:]
+        if code[0] in "RC" and i < len(fields):
+            entries.append((code.strip(), (path, fields[i])))
+            i += 1
+        else:
+            entries.append((code.strip(), (path,)))
+    entries = [
+        entry for entry in entries
+        if not pathlib.PurePosixPath(entry[1][0]).name.startswith(COOKIE_PREFIX)
+    ]
+    return sorted(entries, key=_entry_order)
+
+
+def entry_dicts(entries):
+    """Render (status, paths) pairs as the {status, path} dicts Files returns."""
+    return [
+        {"status": code, "path": paths[0] if len(paths) == 1 else f"{paths[1]} -> {paths[0]}"}
+        for code, paths in entries
+    ]
+
+
+def _entry_order(entry):
+    code, paths = entry
+    # git lists changes to tracked paths before untracked ones.
+    return (code == "??", paths[0])
+
+
+def _covers(spec, path):
+    """True when a pathspec names path or a directory containing it."""
+    return path == spec or path.startswith(spec + "/")
+
+
+def _git_state(git_dir):
+    stamp = []
+    for name in _GIT_STATE_FILES:
+        try:
+            st = os.stat(pathlib.Path(git_dir) / name)
+        except OSError:
+            stamp.append(None)
+        else:
+            stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def on_any_event(self, event):
+        if event.event_type in _EVENTS_WITHOUT_WRITES:
+            return
+        self.tracker.note_change(event.src_path)
+        dest = getattr(event, "dest_path", "")
+        if dest:
+            self.tracker.note_change(dest)
+
+
+class CheckoutTracker:
+    """The status of one checkout, kept current from filesystem events.
+
+    note_change is the only input besides git itself: the watcher calls it,
+    and so can any code that writes into the checkout. The tracker never
+    trusts its cache across a change to the git dir's index or HEAD.
+    """
+
+    def __init__(self, git_dir, checkout):
+        self.git_dir = pathlib.Path(git_dir)
+        self.checkout = pathlib.Path(checkout).resolve()
+        self._lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self._cookies = {}
+        self._entries = None
+        self._touched = set()
+        self._overflowed = False
+        self._git_stamp = None
+        self._observer = None
+        self.full_scans = 0
+        self.partial_scans = 0
+
+    def start(self):
+        """Tune the git dir and start watching. Returns False without watchdog."""
+        tune_git_dir(self.git_dir)
+        if Observer is None:
+            return False
+        observer = Observer()
+        observer.schedule(_Handler(self), str(self.checkout), recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        return True
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def _relative(self, path):
+        path = pathlib.Path(path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.checkout)
+            except ValueError:
+                return None
+        return path.as_posix()
+
+    def note_change(self, path):
+        """Record that path (absolute, or relative to the checkout) changed."""
+        rel = self._relative(path)
+        if rel is None:
+            return
+        with self._lock:
+            if rel.startswith(COOKIE_PREFIX):
+                seen = self._cookies.get(rel)
+                if seen is not None:
+                    seen.set()
+            elif rel in ("", "."):
+                self._overflowed = True
+            elif len(self._touched) >= MAX_TRACKED_PATHS:
+                self._overflowed = True
+            else:
+                self._touched.add(rel)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+    def _barrier(self):
+        """Wait until the watcher has reported every write made before now.
+
+        Returns False when the cookie went unreported, so the caller cannot
+        trust the paths noted so far. A tracker without a watcher is fed
+        synchronously and needs no barrier.
+        """
+        if self._observer is None:
+            return True
+        name = f"{COOKIE_PREFIX}{os.getpid()}-{next(_cookie_ids)}"
+        seen = threading.Event()
+        with self._lock:
+            self._cookies[name] = seen
+        cookie = self.checkout / name
+        try:
+            cookie.write_bytes(b"")
+            return seen.wait(COOKIE_TIMEOUT)
+        except OSError:
+            return False
+        finally:
+            with self._lock:
+                self._cookies.pop(name, None)
+            try:
+                cookie.unlink()
+            except OSError:
+                pass
+
+    def status(self):
+        """Return the checkout's status as (status, paths) pairs, or None on error."""
+        with self._status_lock:
+            synced = self._barrier()
+            return self._status(synced)
+
+    def _status(self, synced):
+        with self._lock:
+            if not synced:
+                self._overflowed = True
+            touched, self._touched = self._touched, set()
+            needs_full = (
+                self._entries is None
+                or self._overflowed
+                or self._git_stamp != _git_state(self.git_dir)
+                or any(pathlib.PurePosixPath(p).name == ".gitignore" for p in touched)
+            )
+            self._overflowed = False
+            if needs_full:
+                return self._full_scan()
+            if touched:
+                self._partial_scan(touched)
+            return None if self._entries is None else list(self._entries)
+
+    def after_commit(self, paths):
+        """Accept the index a local commit of `paths` just wrote.
+
+        The committed paths are rescanned on the next status instead of
+        forcing a full scan, since nothing else in the index moved.
+        """
+        with self._lock:
+            if self._entries is None:
+                return
+            for path in paths:
+                rel = self._relative(path)
+                if rel in (None, "", "."):
+                    self._entries = None
+                    return
+                self._touched.add(rel.rstrip("/"))
+            self._git_stamp = _git_state(self.git_dir)
+
+    def _full_scan(self):
+        entries = porcelain_status(self.git_dir, self.checkout)
+        self.full_scans += 1
+        self._entries = entries
+        self._git_stamp = _git_state(self.git_dir) if entries is not None else None
+        return None if entries is None else list(entries)
+
+    def _partial_scan(self, touched):
+        specs = sorted(touched)
+        fresh = porcelain_status(self.git_dir, self.checkout, specs)
+        self.partial_scans += 1
+        if fresh is None:
+            self._entries = None
+            return
+        kept = [
+            (code, paths) for code, paths in self._entries
+            if not any(_covers(spec, path) for spec in specs for path in paths)
+        ]
+        self._entries = sorted(kept + fresh, key=_entry_order)
+        self._git_stamp = _git_state(self.git_dir)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def _key(git_dir, checkout):
+    return (str(pathlib.Path(git_dir).resolve()), str(pathlib.Path(checkout).resolve()))
+
+
+def track(git_dir, checkout):
+    """Start tracking a checkout; returns its tracker, or None without watchdog."""
+    if not watching_available() or not pathlib.Path(checkout).is_dir():
+        return None
+    key = _key(git_dir, checkout)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = CheckoutTracker(git_dir, checkout)
+            tracker.start()
+            _trackers[key] = tracker
+    return tracker
+
+
+def register(tracker):
+    """Register a tracker fed by the caller rather than by a watcher."""
+    with _trackers_lock:
+        _trackers[_key(tracker.git_dir, tracker.checkout)] = tracker
+
+
+def untrack(git_dir, checkout):
+    with _trackers_lock:
+        tracker = _trackers.pop(_key(git_dir, checkout), None)
+    if tracker is not None:
+        tracker.stop()
+
+
+def untrack_all():
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+        _trackers.clear()
+    for tracker in trackers:
+        tracker.stop()
+
+
+def tracker_for(git_dir, checkout):
+    if not _trackers:
+        return None
+    with _trackers_lock:
+        return _trackers.get(_key(git_dir, checkout))
@@ -1,16 +1,18 @@
 """FastAPI + Jinja2 + htmx web UI for Small Sea Files."""
 
 import pathlib
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from small_sea_client.client import SmallSeaClient
 
-from ssc_files import sync, files
+from ssc_files import agent, live_updates, sync, files, watch
 
 _template_dir = pathlib.Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=_template_dir)
+templates.env.globals["live_updates_script"] = live_updates.REFRESH_SCRIPT
 
 
 def create_app(
@@ -18,14 +20,53 @@ def create_app(
     participant_hex: str,
     hub_port: int = 11437,
     _http_client=None,
+    auto_sync: bool = False,
 ) -> FastAPI:
-    """Create a configured FastAPI application."""
-    app = FastAPI(title="Small Sea Files")
+    """Create a configured FastAPI application.
+
+    auto_sync runs a SyncAgent for every team with a cached session while the
+    app is up. A LiveUpdates watcher always runs, feeding the `/events`
+    stream that tells open pages which fragments to re-fetch.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        sync_agent = None
+        if auto_sync:
+            sync_agent = agent.SyncAgent(
+                files_root,
+                participant_hex,
+                agent.teams_with_sessions(),
+                hub_port=hub_port,
+                workers=int(sync.load_config().get("sync_workers", sync.DEFAULT_SYNC_WORKERS)),
+                _http_client=_http_client,
+            )
+            sync_agent.start()
+        app.state.sync_agent = sync_agent
+        live = live_updates.LiveUpdates(
+            files_root,
+            participant_hex,
+            app.state.events,
+            hub_port=hub_port,
+            _http_client=_http_client,
+        )
+        live.start()
+        app.state.live_updates = live
+        yield
+        live.stop(timeout=1)
+        app.state.live_updates = None
+        if sync_agent is not None:
+            sync_agent.stop(timeout=1)
+        watch.untrack_all()
+
+    app = FastAPI(title="Small Sea Files", lifespan=lifespan)
     app.state.files_root = files_root
     app.state.participant_hex = participant_hex
     app.state.hub_port = hub_port
     app.state.http_client = _http_client
     app.state.pending_sessions = {}
+    app.state.events = live_updates.EventBroker()
+    app.state.live_updates = None
 
     def _vr(request: Request) -> str:
         return request.app.state.files_root
@@ -84,21 +125,21 @@ def create_app(
         vr, ph = _vr(request), _ph(request)
         if _session_state(request, team_name) != "active":
             return []
+        live = request.app.state.live_updates
         try:
-            peers = sync.list_team_peers(
-                team_name,
-                hub_port=_hub_port(request),
-                _http_client=_http_client(request),
-            )
-            for peer in peers:
-                peer["update_status"] = sync.peer_update_status(
-                    vr,
-                    ph,
-                    _team_context(request, team_name),
-                    niche_name,
-                    peer["teammate_id"],
-                    current_signal_count=int(peer.get("signal_count", 0)),
+            # The live watcher's copy is current while it holds a Hub watch.
+            peers = live.peers(team_name) if live is not None else None
+            if peers is None:
+                peers = sync.list_team_peers(
+                    team_name,
+                    hub_port=_hub_port(request),
+                    _http_client=_http_client(request),
                 )
+            statuses = sync.peer_update_statuses(
+                vr, ph, _team_context(request, team_name), niche_name, peers
+            )
+            for peer, status in zip(peers, statuses):
+                peer["update_status"] = status
         except sync.FilesSyncError:
             peers = []
         return peers
@@ -165,6 +206,10 @@ def create_app(
         team_session_status = _session_state(request, team_name)
         peers = _build_peers(request, team_name, niche_name) if load_peers else None
         checkout = files.get_checkout(vr, ph, context, niche_name)
+        if checkout is not None:
+            # The server outlives any one request, so it keeps the checkout's
+            # status current from filesystem events instead of rescanning.
+            files.watch_checkout(vr, ph, context, niche_name)
         checkout_status = (
             files.status(vr, ph, context, niche_name, checkout)
             if checkout is not None
@@ -193,6 +238,14 @@ def create_app(
             },
         )
 
+    @app.get("/events")
+    async def events(request: Request):
+        return StreamingResponse(
+            live_updates.event_stream(request.app.state.events, request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     @app.get("/", response_class=HTMLResponse)
     async def index(request: Request):
         vr, ph = _vr(request), _ph(request)
@@ -545,9 +598,8 @@ def create_app(
 
 def _niches_with_info(files_root, participant_hex, context):
     """Return niches annotated with whether a checkout is attached."""
-    niches = files.list_niches(files_root, participant_hex, context)
-    result = []
-    for n in niches:
-        checkout = files.get_checkout(files_root, participant_hex, context, n["name"])
-        result.append({**n, "has_checkout": checkout is not None})
-    return result
+    team = files.team_status(files_root, participant_hex, context)
+    return [
+        {**n, "has_checkout": team.niches[n["name"]].checkout_path is not None}
+        for n in team.niche_records()
+    ]
@@ -0,0 +1,124 @@
+"""Unattended sync: fast-forwarding fetched work and the agent's wake-ups."""
+
+import pathlib
+import threading
+
+import pytest
+
+from cod_sync.store import LocalFolderStore
+from ssc_files import agent, sync
+from ssc_files.files import (
+    FilesMaterializationContext,
+    add_checkout,
+    create_niche,
+    fast_forward_niche,
+    fetch_niche,
+    init_files,
+    materialize_team,
+    merge_niche,
+    publish,
+    push_niche,
+)
+
+ALICE = "a1" * 16
+BOB = "b1" * 16
+TEAM_ID = "77" * 16
+
+
+def _team(participant_hex):
+    return FilesMaterializationContext(participant_hex, TEAM_ID, "AgentTeam")
+
+
+@pytest.fixture
+def two_devices(playground_dir):
+    playground = pathlib.Path(playground_dir)
+    (playground / "cloud").mkdir()
+    store = LocalFolderStore(str(playground / "cloud"))
+    alice_root, bob_root = str(playground / "alice"), str(playground / "bob")
+    alice_co, bob_co = playground / "alice-co", playground / "bob-co"
+
+    init_files(alice_root, ALICE)
+    create_niche(alice_root, ALICE, _team(ALICE), "docs")
+    add_checkout(alice_root, ALICE, _team(ALICE), "docs", str(alice_co))
+    (alice_co / "a.txt").write_text("one\n")
+    publish(alice_root, ALICE, _team(ALICE), "docs", str(alice_co), message="one")
+    push_niche(alice_root, ALICE, _team(ALICE), "docs", store)
+
+    init_files(bob_root, BOB)
+    fetch_niche(bob_root, BOB, _team(BOB), "docs", ALICE, store)
+    add_checkout(bob_root, BOB, _team(BOB), "docs", str(bob_co))
+    merge_niche(bob_root, BOB, _team(BOB), "docs", ALICE)
+
+    def alice_publishes(text):
+        (alice_co / "a.txt").write_text(text)
+        publish(alice_root, ALICE, _team(ALICE), "docs", str(alice_co), message=text)
+        push_niche(alice_root, ALICE, _team(ALICE), "docs", store)
+        return fetch_niche(bob_root, BOB, _team(BOB), "docs", ALICE, store)
+
+    return bob_root, bob_co, alice_publishes
+
+
+def test_fast_forward_moves_only_a_clean_checkout_that_is_behind(two_devices):
+    bob_root, bob_co, alice_publishes = two_devices
+    bob = _team(BOB)
+
+    parked = alice_publishes("two\n")
+    assert fast_forward_niche(bob_root, BOB, bob, "docs", ALICE) == parked
+    assert (bob_co / "a.txt").read_text() == "two\n"
+    assert fast_forward_niche(bob_root, BOB, bob, "docs", ALICE) is None
+
+    # A dirty checkout is left alone, and so is one that diverged.
+    alice_publishes("three\n")
+    (bob_co / "local.txt").write_text("mine\n")
+    assert fast_forward_niche(bob_root, BOB, bob, "docs", ALICE) is None
+    publish(bob_root, BOB, bob, "docs", str(bob_co), message="bob's own")
+    assert fast_forward_niche(bob_root, BOB, bob, "docs", ALICE) is None
+    assert (bob_co / "a.txt").read_text() == "two\n"
+
+
+class _WatchSession:
+    """Peers past their watermark on the first look, then one quiet long-poll."""
+
+    def __init__(self, stop):
+        self.counts = {"c1" * 16: 3, "c2" * 16: 0}
+        self.watches = []
+        self.stop = stop
+
+    def session_peers(self):
+        return [{"teammate_id": t, "signal_count": c} for t, c in self.counts.items()]
+
+    def watch_notifications(self, known, timeout=30):
+        self.watches.append(dict(known))
+        self.stop()
+        return {"updated": {}}
+
+
+def test_agent_syncs_at_once_when_behind_then_long_polls_with_watermarks(
+    playground_dir, monkeypatch
+):
+    root = str(pathlib.Path(playground_dir) / "files")
+    init_files(root, ALICE)
+    materialize_team(root, _team(ALICE))
+    monkeypatch.setenv("SMALL_SEA_FILES_CONFIG", str(pathlib.Path(playground_dir) / "f.toml"))
+
+    sync_agent = agent.SyncAgent(root, ALICE, ["AgentTeam"], watch_timeout=5)
+    session = _WatchSession(lambda: sync_agent._stopped.set())
+    monkeypatch.setattr(sync, "get_team_session", lambda *_a, **_k: session)
+    passes = []
+
+    def auto_sync(files_root, participant_hex, team_name, _session, **_kwargs):
+        context = sync.resolve_team_context(files_root, participant_hex, team_name)
+        for teammate_id, count in session.counts.items():
+            sync.set_signal_watermark(files_root, participant_hex, context, teammate_id, count)
+        passes.append(team_name)
+        return sync.TeamSyncResult()
+
+    monkeypatch.setattr(sync, "auto_sync_team", auto_sync)
+
+    thread = threading.Thread(target=sync_agent._team_loop, args=("AgentTeam",))
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert passes == ["AgentTeam"]
+    assert session.watches == [session.counts]
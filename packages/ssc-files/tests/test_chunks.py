@@ -0,0 +1,200 @@
+"""Large-file mode: chunking, manifests, and the git filter end to end."""
+
+import pathlib
+import random
+
+import pytest
+
+from cod_sync.git import gitCmd
+from cod_sync.store import LocalFolderStore
+from ssc_files import chunks
+from ssc_files.files import (
+    FilesMaterializationContext,
+    _niche_git_dir,
+    add_checkout,
+    create_niche,
+    fetch_niche,
+    init_files,
+    large_file_pointers,
+    materialize_large_files,
+    merge_niche,
+    publish,
+    push_niche,
+    set_large_file_threshold,
+    status,
+    upload_large_file_chunks,
+)
+
+ALICE = "aa" * 16
+BOB = "bb" * 16
+TEAM_ID = "55" * 16
+
+
+def _team(participant_hex):
+    return FilesMaterializationContext(participant_hex, TEAM_ID, "ChunkTeam")
+
+
+def _random_bytes(n, seed):
+    return random.Random(seed).randbytes(n)
+
+
+def test_chunks_rejoin_and_respect_size_bounds():
+    data = _random_bytes(9 * chunks.AVG_CHUNK, 1)
+    pieces = chunks.chunk_bytes(data)
+    assert b"".join(pieces) == data
+    assert all(len(p) <= chunks.MAX_CHUNK for p in pieces)
+    assert all(len(p) >= chunks.MIN_CHUNK for p in pieces[:-1])
+
+    # Feeding in odd-sized blocks cuts at the same places.
+    chunker = chunks.Chunker()
+    streamed = []
+    for i in range(0, len(data), 100_003):
+        streamed += chunker.feed(data[i:i + 100_003])
+    streamed += chunker.finish()
+    assert streamed == pieces
+
+
+def test_vectorized_cut_points_match_the_plain_loop(monkeypatch):
+    pytest.importorskip("numpy")
+    # Random bytes cut near the average; a repeating run hits the loose mask
+    # and the size cap.
+    data = bytes(range(256)) * 24_000 + _random_bytes(6 * chunks.AVG_CHUNK, 3)
+    vectorized = chunks.chunk_bytes(data)
+    monkeypatch.setattr(chunks, "numpy", None)
+    assert chunks.chunk_bytes(data) == vectorized
+
+
+def test_an_insertion_only_changes_nearby_chunks():
+    data = _random_bytes(9 * chunks.AVG_CHUNK, 2)
+    edited = data[:4_000_000] + b"inserted bytes" + data[4_000_000:]
+    before = set(chunks.chunk_bytes(data))
+    after = chunks.chunk_bytes(edited)
+    changed = [p for p in after if p not in before]
+    assert len(changed) <= 2
+    assert len(after) - len(changed) >= len(before) - 2
+
+
+def test_manifest_round_trip_and_rejection():
+    manifest = chunks.Manifest(3, "ab" * 32, (("cd" * 32, 1), ("ef" * 32, 2)))
+    encoded = chunks.encode_manifest(manifest)
+    assert chunks.decode_manifest(encoded) == manifest
+    assert chunks.decode_manifest(b"just a text file\n") is None
+    assert chunks.decode_manifest(encoded.replace(b" 2\n", b" 5\n")) is None
+    assert chunks.decode_manifest(encoded.replace(b"cd", b"zz")) is None
+
+
+def test_remote_chunk_paths_are_salted_per_niche():
+    digest = "ab" * 32
+    path = chunks.remote_chunk_path("niche-1", digest)
+    assert path.startswith("chunks/C-") and path.endswith(".chunk")
+    assert digest not in path
+    assert path != chunks.remote_chunk_path("niche-2", digest)
+
+
+def test_cache_refuses_mismatched_chunks(tmp_path):
+    cache = chunks.ChunkCache(tmp_path)
+    with pytest.raises(ValueError):
+        cache.put(b"data", "00" * 32)
+    digest = cache.put(b"data")
+    assert cache.get(digest) == b"data"
+    assert cache.pending_uploads() == [digest]
+    cache.mark_uploaded(digest)
+    assert cache.pending_uploads() == []
+
+
+@pytest.fixture
+def shared_large_file(playground_dir):
+    """Alice publishes a large file; Bob fetches and merges the niche."""
+    playground = pathlib.Path(playground_dir)
+    alice_root, bob_root = str(playground / "alice"), str(playground / "bob")
+    init_files(alice_root, ALICE)
+    niche_id = create_niche(alice_root, ALICE, _team(ALICE), "media")
+    set_large_file_threshold(alice_root, ALICE, _team(ALICE), "media", 1024 * 1024)
+    alice_co = playground / "alice-co"
+    add_checkout(alice_root, ALICE, _team(ALICE), "media", str(alice_co))
+    video = _random_bytes(3 * 1024 * 1024, 3)
+    (alice_co / "video.bin").write_bytes(video)
+    (alice_co / "notes.txt").write_text("small\n")
+    publish(alice_root, ALICE, _team(ALICE), "media", str(alice_co), message="add video")
+
+    cloud = {}
+    uploaded = upload_large_file_chunks(
+        alice_root, ALICE, _team(ALICE), "media", cloud.__setitem__
+    )
+    store = playground / "store"
+    store.mkdir()
+    push_niche(alice_root, ALICE, _team(ALICE), "media", LocalFolderStore(str(store)))
+
+    init_files(bob_root, BOB)
+    fetch_niche(bob_root, BOB, _team(BOB), "media", ALICE, LocalFolderStore(str(store)))
+    bob_co = playground / "bob-co"
+    add_checkout(bob_root, BOB, _team(BOB), "media", str(bob_co))
+    merge_niche(bob_root, BOB, _team(BOB), "media", ALICE)
+    return {
+        "alice_root": alice_root, "alice_co": alice_co, "bob_root": bob_root,
+        "bob_co": bob_co, "video": video, "cloud": cloud, "uploaded": uploaded,
+        "niche_id": niche_id,
+    }
+
+
+def test_large_files_are_committed_as_manifests(shared_large_file):
+    s = shared_large_file
+    git_dir = _niche_git_dir(s["alice_root"], _team(ALICE), "media")
+    blob = gitCmd(["--git-dir", str(git_dir), "cat-file", "blob", "HEAD:video.bin"]).stdout
+    manifest = chunks.decode_manifest(blob.encode())
+    assert manifest is not None and manifest.size == len(s["video"])
+    small = gitCmd(["--git-dir", str(git_dir), "cat-file", "blob", "HEAD:notes.txt"]).stdout
+    assert small == "small\n"
+
+    # The author's own checkout keeps the real file and stays clean.
+    assert (s["alice_co"] / "video.bin").read_bytes() == s["video"]
+    assert status(s["alice_root"], ALICE, _team(ALICE), "media", str(s["alice_co"])) == []
+
+    assert s["uploaded"] == len(manifest.chunks)
+    assert upload_large_file_chunks(
+        s["alice_root"], ALICE, _team(ALICE), "media", s["cloud"].__setitem__
+    ) == 0
+
+
+def test_teammates_get_pointers_until_they_materialize(shared_large_file):
+    s = shared_large_file
+    bob, video = _team(BOB), s["video"]
+    pointer = s["bob_co"] / "video.bin"
+    assert pointer.read_bytes().startswith(chunks.MANIFEST_HEADER)
+    assert list(large_file_pointers(s["bob_root"], BOB, bob, "media")) == ["video.bin"]
+    assert status(s["bob_root"], BOB, bob, "media", str(s["bob_co"])) == []
+
+    def fetch(digest):
+        return s["cloud"].get(chunks.remote_chunk_path(s["niche_id"], digest))
+
+    result = materialize_large_files(s["bob_root"], BOB, bob, "media", fetch)
+    assert result.materialized == ["video.bin"] and result.unavailable == []
+    assert pointer.read_bytes() == video
+    assert status(s["bob_root"], BOB, bob, "media", str(s["bob_co"])) == []
+    assert large_file_pointers(s["bob_root"], BOB, bob, "media") == {}
+
+    # Fetched chunks stay in Alice's storage; Bob's push does not copy them.
+    uploads = {}
+    assert upload_large_file_chunks(s["bob_root"], BOB, bob, "media", uploads.__setitem__) == 0
+
+
+def test_missing_chunks_leave_the_pointer_in_place(shared_large_file):
+    s = shared_large_file
+    result = materialize_large_files(s["bob_root"], BOB, _team(BOB), "media", lambda d: None)
+    assert result.materialized == [] and result.unavailable == ["video.bin"]
+    assert (s["bob_co"] / "video.bin").read_bytes().startswith(chunks.MANIFEST_HEADER)
+
+
+def test_an_edit_stores_only_new_chunks(shared_large_file):
+    s = shared_large_file
+    git_dir = _niche_git_dir(s["alice_root"], _team(ALICE), "media")
+    objects = git_dir / "ssc-chunks" / "objects"
+    before = sum(1 for _ in objects.glob("*/*"))
+    video = s["video"]
+    (s["alice_co"] / "video.bin").write_bytes(video[:1_500_000] + b"edit" + video[1_500_000:])
+    publish(s["alice_root"], ALICE, _team(ALICE), "media", str(s["alice_co"]), message="edit")
+    added = sum(1 for _ in objects.glob("*/*")) - before
+    assert 1 <= added <= 2
+    assert upload_large_file_chunks(
+        s["alice_root"], ALICE, _team(ALICE), "media", s["cloud"].__setitem__
+    ) == added
@@ -0,0 +1,74 @@
+"""UI events: what the Files live watcher announces, and the peer list it keeps."""
+
+import pathlib
+
+import small_sea_client.live_updates as shared_live_updates
+from ssc_files import live_updates, sync
+from ssc_files.files import FilesMaterializationContext, create_niche, init_files, materialize_team
+
+ALICE = "a3" * 16
+BOB = "b3" * 16
+TEAM_ID = "99" * 16
+
+
+class _RecordingBroker:
+    subscriber_count = 1
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, name):
+        self.published.append(name)
+
+
+def test_local_pass_announces_the_peer_panel_only_when_team_status_moves(
+    playground_dir, monkeypatch
+):
+    root = str(pathlib.Path(playground_dir) / "files")
+    team = FilesMaterializationContext(ALICE, TEAM_ID, "LiveTeam")
+    init_files(root, ALICE)
+    materialize_team(root, team)
+    monkeypatch.setattr(shared_live_updates, "RACY_STAMP_NS", 0)
+
+    broker = _RecordingBroker()
+    live = live_updates.LiveUpdates(root, ALICE, broker)
+    assert live.check_local(["LiveTeam", "NoSuchTeam"]) == []
+    assert live.check_local(["LiveTeam"]) == []
+
+    create_niche(root, ALICE, team, "docs")
+    assert live.check_local(["LiveTeam"]) == ["peers:LiveTeam"]
+    assert broker.published == ["peers:LiveTeam"]
+
+
+class _WatchSession:
+    def __init__(self, on_watch):
+        self.on_watch = on_watch
+        self.peer_reads = 0
+
+    def session_peers(self):
+        self.peer_reads += 1
+        return [{"teammate_id": BOB, "signal_count": self.peer_reads}]
+
+    def watch_notifications(self, known, timeout=30):
+        self.on_watch()
+        return {"updated": {BOB: known[BOB] + 1}}
+
+
+def test_hub_watch_keeps_the_peer_list_and_announces_publications(monkeypatch):
+    broker = _RecordingBroker()
+    live = live_updates.LiveUpdates("unused", ALICE, broker)
+    seen = []
+
+    def on_watch():
+        seen.append(live.peers("LiveTeam"))
+        live._stopped.set()
+
+    session = _WatchSession(on_watch)
+    monkeypatch.setattr(sync, "get_team_session", lambda *_a, **_k: session)
+    live._hub_loop("LiveTeam")
+
+    # While the watch was held the panel could render without a Hub call;
+    # once a teammate published, that copy was dropped and the panel told.
+    assert seen == [[{"teammate_id": BOB, "signal_count": 1}]]
+    assert live.peers("LiveTeam") is None
+    assert broker.published == ["peers:LiveTeam"]
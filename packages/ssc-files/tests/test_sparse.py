@@ -0,0 +1,89 @@
+"""Sparse checkouts: only some directories of a niche on disk."""
+
+import pathlib
+
+import pytest
+
+from ssc_files.files import (
+    DirtyCheckoutError,
+    FilesMaterializationContext,
+    add_checkout,
+    create_niche,
+    get_sparse_patterns,
+    init_files,
+    publish,
+    remove_checkout,
+    set_sparse_patterns,
+    status,
+)
+
+PARTICIPANT = "ee" * 16
+TEAM = FilesMaterializationContext(PARTICIPANT, "66" * 16, "SparseTeam")
+
+
+def _files(root):
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+@pytest.fixture
+def niche(playground_dir):
+    root = playground_dir
+    init_files(root, PARTICIPANT)
+    create_niche(root, PARTICIPANT, TEAM, "big")
+    full = pathlib.Path(root) / "full"
+    add_checkout(root, PARTICIPANT, TEAM, "big", str(full))
+    for rel in ("top.txt", "photos/2024/a.jpg", "photos/2025/b.jpg", "docs/c.txt"):
+        (full / rel).parent.mkdir(parents=True, exist_ok=True)
+        (full / rel).write_text(rel)
+    publish(root, PARTICIPANT, TEAM, "big", str(full), message="initial")
+    remove_checkout(root, PARTICIPANT, TEAM, "big", str(full))
+    return root, pathlib.Path(root) / "laptop"
+
+
+def test_sparse_checkout_writes_only_its_directories(niche):
+    root, laptop = niche
+    add_checkout(root, PARTICIPANT, TEAM, "big", str(laptop), sparse_patterns=["photos/2025/"])
+    assert get_sparse_patterns(root, PARTICIPANT, TEAM, "big") == ["photos/2025"]
+    assert _files(laptop) == ["photos/2025/b.jpg", "top.txt"]
+    assert status(root, PARTICIPANT, TEAM, "big", str(laptop)) == []
+
+    # Publishing from a sparse checkout leaves the unseen directories alone.
+    (laptop / "photos/2025/new.jpg").write_text("new")
+    publish(root, PARTICIPANT, TEAM, "big", str(laptop), message="add")
+    assert status(root, PARTICIPANT, TEAM, "big", str(laptop)) == []
+    remove_checkout(root, PARTICIPANT, TEAM, "big", str(laptop))
+    everything = pathlib.Path(root) / "everything"
+    add_checkout(root, PARTICIPANT, TEAM, "big", str(everything))
+    assert get_sparse_patterns(root, PARTICIPANT, TEAM, "big") is None
+    assert _files(everything) == [
+        "docs/c.txt", "photos/2024/a.jpg", "photos/2025/b.jpg", "photos/2025/new.jpg",
+        "top.txt",
+    ]
+
+
+def test_widening_is_incremental_and_narrowing_needs_a_clean_checkout(niche):
+    root, laptop = niche
+    add_checkout(root, PARTICIPANT, TEAM, "big", str(laptop), sparse_patterns=["docs"])
+    (laptop / "docs" / "draft.txt").write_text("unpublished")
+    before = (laptop / "docs" / "c.txt").stat().st_mtime_ns
+
+    set_sparse_patterns(root, PARTICIPANT, TEAM, "big", ["docs", "photos/2024"])
+    assert _files(laptop) == ["docs/c.txt", "docs/draft.txt", "photos/2024/a.jpg", "top.txt"]
+    assert (laptop / "docs" / "c.txt").stat().st_mtime_ns == before
+
+    with pytest.raises(DirtyCheckoutError):
+        set_sparse_patterns(root, PARTICIPANT, TEAM, "big", ["photos"])
+    (laptop / "docs" / "draft.txt").unlink()
+    assert set_sparse_patterns(root, PARTICIPANT, TEAM, "big", ["photos"]) == ["photos"]
+    assert _files(laptop) == ["photos/2024/a.jpg", "photos/2025/b.jpg", "top.txt"]
+
+    assert set_sparse_patterns(root, PARTICIPANT, TEAM, "big", None) is None
+    assert len(_files(laptop)) == 4
+    assert status(root, PARTICIPANT, TEAM, "big", str(laptop)) == []
+
+
+def test_sparse_patterns_are_plain_directories(niche):
+    root, laptop = niche
+    for bad in ("../up", "*.jpg", ""):
+        with pytest.raises(ValueError):
+            add_checkout(root, PARTICIPANT, TEAM, "big", str(laptop), sparse_patterns=[bad])
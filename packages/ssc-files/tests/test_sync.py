@@ -3,8 +3,13 @@ import shutil
 import subprocess
 
 import pytest
-from cod_sync.protocol import PublicationIntegrationRequiredError, parked_ref_name
-from cod_sync.store import LocalFolderStore
+from cod_sync.protocol import (
+    CodSync,
+    PublicationIntegrationRequiredError,
+    parked_ref_name,
+    read_head_manifest,
+)
+from cod_sync.store import LocalFolderStore, ObjectNotFoundError, StoreTransportError
 from ssc_files import sync
 from ssc_files.files import (
     NicheResidency,
@@ -66,6 +71,42 @@ def test_sync_niche_between_devices(playground_dir):
     assert beach_b.read_bytes() == b"fake-beach-data"
 
 
+def test_peer_head_manifest_skips_only_chains_already_parked(playground_dir):
+    from cod_sync.format import ChainHead
+
+    playground = pathlib.Path(playground_dir)
+    cloud_dir = playground / "cloud"
+    cloud_dir.mkdir()
+    root_a = str(playground / "device-a")
+    init_files(root_a, PARTICIPANT)
+    materialize_team(root_a, TEAM)
+    create_niche(root_a, PARTICIPANT, TEAM, "photos")
+    checkout_a = str(playground / "checkout-a" / "photos")
+    add_checkout(root_a, PARTICIPANT, TEAM, "photos", checkout_a)
+    (pathlib.Path(checkout_a) / "a.txt").write_text("a")
+    publish(root_a, PARTICIPANT, TEAM, "photos", checkout_a, message="a")
+    push_niche(root_a, PARTICIPANT, TEAM, "photos", LocalFolderStore(str(cloud_dir)))
+
+    root_b = str(playground / "device-b")
+    init_files(root_b, PARTICIPANT)
+    materialize_team(root_b, TEAM)
+    parked = fetch_niche(
+        root_b, PARTICIPANT, TEAM, "photos", PARTICIPANT, LocalFolderStore(str(cloud_dir))
+    )
+
+    def unchanged(manifest, niche_name="photos"):
+        return sync.peer_chain_unchanged(
+            root_b, PARTICIPANT, TEAM, manifest, PARTICIPANT, niche_name
+        )
+
+    prefix = sync.niche_path_prefix("photos")
+    assert unchanged({prefix: ChainHead("0123456789abcdef", parked)})
+    assert not unchanged({prefix: ChainHead("0123456789abcdef", "f" * 40)})
+    assert not unchanged({})  # a chain the manifest does not cover is probed
+    assert not unchanged(None)
+    assert not unchanged({sync.niche_path_prefix("docs"): ChainHead("0123456789abcdef", parked)}, "docs")
+
+
 # ---------------------------------------------------------------------------
 # sync-layer NoCheckoutError residency propagation
 # ---------------------------------------------------------------------------
@@ -501,3 +542,297 @@ def test_cli_merge_from_self_reports_nothing_parked(monkeypatch, tmp_path):
 
     assert result.exit_code == 0, result.output
     assert "No parked changes" in result.output
+
+
+# ---------------------------------------------------------------------------
+# Team-wide push / fetch planning
+# ---------------------------------------------------------------------------
+
+
+class _PeersSession:
+    def __init__(self, peers):
+        self.peers = peers
+        self.cloud_ready = 0
+
+    def session_peers(self):
+        return self.peers
+
+    def ensure_cloud_ready(self):
+        self.cloud_ready += 1
+
+
+def _team_with_niches(playground_dir, monkeypatch, names):
+    root = str(pathlib.Path(playground_dir) / "files")
+    init_files(root, PARTICIPANT)
+    materialize_team(root, TEAM)
+    monkeypatch.setattr(
+        sync.files, "list_niches", lambda *_a: [{"name": name} for name in names]
+    )
+    return root
+
+
+def test_push_all_publishes_only_dirty_niches_and_the_registry_once(
+    playground_dir, monkeypatch
+):
+    from cod_sync.format import ChainHead
+    from cod_sync.protocol import PublishResult
+
+    root = _team_with_niches(playground_dir, monkeypatch, ["clean", "dirty", "empty"])
+    heads = {"registry": "1" * 40, "clean": "2" * 40, "dirty": "3" * 40, "empty": None}
+    monkeypatch.setattr(
+        sync.files, "local_head",
+        lambda _root, _p, _c, repo_kind, niche_name=None: heads[niche_name or repo_kind],
+    )
+    monkeypatch.setattr(sync, "own_head_manifest", lambda _session: {
+        sync.registry_path_prefix(): ChainHead("0123456789abcdef", "0" * 40),
+        sync.niche_path_prefix("clean"): ChainHead("0123456789abcdef", "2" * 40),
+        sync.niche_path_prefix("dirty"): ChainHead("0123456789abcdef", "0" * 40),
+    })
+    session = _PeersSession([])
+    monkeypatch.setattr(sync, "get_team_session", lambda *_a, **_k: session)
+    monkeypatch.setattr(sync, "make_niche_remote", lambda *_a: None)
+    monkeypatch.setattr(sync, "make_registry_remote", lambda *_a: None)
+    pushed = []
+
+    def _push(kind):
+        def push(*args):
+            pushed.append(kind if kind == "registry" else args[3])
+            return PublishResult("published", "a" * 40, "a" * 40, "0123456789abcdef")
+        return push
+
+    monkeypatch.setattr(sync.files, "push_niche", _push("niche"))
+    monkeypatch.setattr(sync.files, "push_registry", _push("registry"))
+    seen = []
+
+    result = sync.push_all_via_hub(
+        root, PARTICIPANT, TEAM.team_name, workers=3, progress=seen.append
+    )
+
+    assert sorted(pushed) == ["dirty", "registry"]
+    assert result.push_plan.clean == ["clean", "empty"]
+    assert session.cloud_ready == 1
+    assert {o.repo_label for o in seen} == {"niche dirty", "registry"}
+    assert all(o.status == "published" and o.seconds >= 0 for o in result.outcomes)
+
+
+def test_push_all_publishes_the_registry_last_and_not_after_a_failed_niche(
+    playground_dir, monkeypatch
+):
+    from cod_sync.protocol import PublishResult
+
+    root = _team_with_niches(playground_dir, monkeypatch, ["docs", "photos"])
+    monkeypatch.setattr(sync.files, "local_head", lambda *_a, **_k: "3" * 40)
+    monkeypatch.setattr(sync, "own_head_manifest", lambda _session: None)
+    session = _PeersSession([])
+    monkeypatch.setattr(sync, "get_team_session", lambda *_a, **_k: session)
+    monkeypatch.setattr(sync, "make_niche_remote", lambda *_a: None)
+    monkeypatch.setattr(sync, "make_registry_remote", lambda *_a: None)
+    pushed, broken = [], set()
+
+    def _push_niche(_root, _p, _c, niche_name, _remote):
+        if niche_name in broken:
+            raise OSError("connection reset")
+        pushed.append(niche_name)
+        return PublishResult("published", "a" * 40, "a" * 40, "0123456789abcdef")
+
+    def _push_registry(*_args):
+        pushed.append(None)
+        return PublishResult("published", "a" * 40, "a" * 40, "0123456789abcdef")
+
+    monkeypatch.setattr(sync.files, "push_niche", _push_niche)
+    monkeypatch.setattr(sync.files, "push_registry", _push_registry)
+
+    sync.push_all_via_hub(root, PARTICIPANT, TEAM.team_name, workers=3)
+    assert sorted(pushed[:2]) == ["docs", "photos"] and pushed[2:] == [None]
+
+    # A teammate must not fetch a registry naming an unpublished niche.
+    pushed.clear()
+    broken.add("photos")
+    result = sync.push_all_via_hub(root, PARTICIPANT, TEAM.team_name, workers=3)
+    assert pushed == ["docs"]
+    assert {(o.repo_label, o.status) for o in result.outcomes} == {
+        ("niche docs", "published"),
+        ("niche photos", "failed"),
+        ("registry", "skipped"),
+    }
+
+
+def test_fetch_all_peers_skips_idle_peers_and_holds_back_failed_watermarks(
+    playground_dir, monkeypatch
+):
+    from cod_sync.format import ChainHead
+
+    root = _team_with_niches(playground_dir, monkeypatch, ["docs", "photos"])
+    idle, steady, flaky = "c1" * 16, "c2" * 16, "c3" * 16
+    sync.set_signal_watermark(root, PARTICIPANT, TEAM, idle, 4)
+    session = _PeersSession([
+        {"teammate_id": idle, "signal_count": 4},
+        {"teammate_id": steady, "signal_count": 2},
+        {"teammate_id": flaky, "signal_count": 9},
+    ])
+    monkeypatch.setattr(sync, "get_team_session", lambda *_a, **_k: session)
+    monkeypatch.setattr(sync, "make_peer_niche_remote", lambda *_a: None)
+    monkeypatch.setattr(sync, "make_peer_registry_remote", lambda *_a: None)
+    parked = "5" * 40
+    manifests = {
+        steady: {
+            sync.registry_path_prefix(): ChainHead("0123456789abcdef", parked),
+            sync.niche_path_prefix("docs"): ChainHead("0123456789abcdef", parked),
+            sync.niche_path_prefix("new-niche"): ChainHead("0123456789abcdef", "6" * 40),
+            "niches/../escape/": ChainHead("0123456789abcdef", "7" * 40),
+        },
+        flaky: None,
+    }
+    monkeypatch.setattr(sync, "peer_head_manifest", lambda teammate_id, _s: manifests[teammate_id])
+    monkeypatch.setattr(sync.files, "peer_parked_sha", lambda *_a: parked)
+    fetched = []
+
+    def _fetch_niche(_root, _p, _c, niche_name, teammate_id, _remote):
+        if teammate_id == flaky and niche_name == "photos":
+            raise OSError("connection reset")
+        fetched.append((niche_name, teammate_id))
+        return "8" * 40
+
+    def _fetch_registry(_root, _p, _c, teammate_id, _remote):
+        fetched.append((None, teammate_id))
+        return "8" * 40
+
+    monkeypatch.setattr(sync.files, "fetch_niche", _fetch_niche)
+    monkeypatch.setattr(sync.files, "fetch_registry", _fetch_registry)
+
+    result = sync.fetch_all_peers_via_hub(root, PARTICIPANT, TEAM.team_name, workers=2)
+
+    assert result.fetch_plan.idle_peers == [idle]
+    assert sorted(fetched, key=str) == sorted([
+        ("new-niche", steady),
+        ("photos", steady),
+        (None, flaky),
+        ("docs", flaky),
+    ], key=str)
+    assert fetched[0] == (None, flaky)
+    [failure] = result.failed
+    assert (failure.niche_name, failure.teammate_id) == ("photos", flaky)
+    assert sync.get_signal_watermark(root, PARTICIPANT, TEAM, steady) == 2
+    assert sync.get_signal_watermark(root, PARTICIPANT, TEAM, flaky) == 0
+
+
+def test_cli_push_requires_a_niche_or_all(monkeypatch, tmp_path):
+    from click.testing import CliRunner
+
+    from ssc_files.cli import cli
+
+    config_file = tmp_path / "files.toml"
+    monkeypatch.setenv("SMALL_SEA_FILES_CONFIG", str(config_file))
+    sync.save_config(
+        {"files_root": str(tmp_path / "files"), "participant_hex": PARTICIPANT, "sync_workers": 7}
+    )
+    captured = {}
+
+    def _push_all(files_root, participant_hex, team_name, *, workers, progress, hub_port):
+        captured["workers"] = workers
+        outcome = sync.RepoSyncOutcome("push", "docs", "published", 0.25, sha="ab" * 20)
+        progress(outcome)
+        return sync.TeamSyncResult(outcomes=[outcome], seconds=0.3)
+
+    monkeypatch.setattr(sync, "push_all_via_hub", _push_all)
+    runner = CliRunner()
+    neither = runner.invoke(cli, ["push", "ProjectX"])
+    both = runner.invoke(cli, ["push", "ProjectX", "docs", "--all"])
+    batch = runner.invoke(cli, ["push", "ProjectX", "--all"])
+
+    assert neither.exit_code != 0 and both.exit_code != 0
+    assert batch.exit_code == 0, batch.output
+    assert captured["workers"] == 7
+    assert "push niche docs: published abababab (0.25s)" in batch.output
+
+
+class _PeersOnlySession:
+    def __init__(self, peers):
+        self.peers = peers
+
+    def session_peers(self):
+        return self.peers
+
+
+def test_a_signal_no_manifest_entry_explains_probes_every_chain(playground_dir, monkeypatch):
+    root = str(pathlib.Path(playground_dir) / "files")
+    init_files(root, PARTICIPANT)
+    materialize_team(root, TEAM)
+    create_niche(root, PARTICIPANT, TEAM, "photos")
+    monkeypatch.setattr(sync, "peer_head_manifest", lambda teammate_id, session: {})
+    monkeypatch.setattr(sync, "peer_chain_unchanged", lambda *args: True)
+
+    # The count moved past the watermark, yet every entry reads as parked.
+    session = _PeersOnlySession([{"teammate_id": "aa" * 16, "signal_count": 3}])
+    plan = sync.plan_team_fetch(root, PARTICIPANT, TEAM, session)
+    assert plan.repos == {None: ["aa" * 16], "photos": ["aa" * 16]}
+    assert plan.unchanged_chains == 0
+
+    # A forced pass with no new signal still trusts the manifest.
+    session = _PeersOnlySession([{"teammate_id": "aa" * 16, "signal_count": 0}])
+    plan = sync.plan_team_fetch(root, PARTICIPANT, TEAM, session, all_peers=True)
+    assert plan.repos == {}
+    assert plan.unchanged_chains == 2
+
+
+class _PeerBucket:
+    """A peer's shared head manifest and signal counter."""
+
+    def __init__(self):
+        self.data = None
+        self.etag = None
+        self.signals = 0
+
+
+class _PeerChainStore:
+    """One of the peer's chains; its manifest write fails when told to."""
+
+    records_heads = True
+
+    def __init__(self, bucket, path_prefix, fail=False):
+        self.bucket = bucket
+        self.path_prefix = path_prefix
+        self.fail = fail
+
+    def get_head_manifest(self):
+        if self.bucket.data is None:
+            raise ObjectNotFoundError("head-manifest.yaml")
+        return self.bucket.data, self.bucket.etag
+
+    def put_head_manifest(self, data, expected_etag):
+        if self.fail:
+            raise StoreTransportError("head-manifest.yaml")
+        self.bucket.data, self.bucket.etag = data, f"m{self.bucket.signals}"
+        self.bucket.signals += 1
+        return self.bucket.etag
+
+    def notify_head_moved(self):
+        self.bucket.signals += 1
+
+
+def test_a_chain_whose_manifest_write_failed_is_fetched_beside_one_that_moved(
+    playground_dir, monkeypatch
+):
+    root = str(pathlib.Path(playground_dir) / "files")
+    init_files(root, PARTICIPANT)
+    materialize_team(root, TEAM)
+    create_niche(root, PARTICIPANT, TEAM, "photos")
+    bucket = _PeerBucket()
+    registry = _PeerChainStore(bucket, sync.registry_path_prefix())
+    photos = _PeerChainStore(bucket, sync.niche_path_prefix("photos"))
+    CodSync(None, registry)._record_head("link-r", "r1" * 20)
+    CodSync(None, photos)._record_head("link-p", "p1" * 20)
+    parked = {"registry": "r1" * 20, "niche": "p1" * 20}
+    monkeypatch.setattr(sync.files, "peer_parked_sha", lambda *a: parked[a[3]])
+    monkeypatch.setattr(sync, "peer_head_manifest", lambda *a: read_head_manifest(registry))
+    teammate = "aa" * 16
+    sync.set_signal_watermark(root, PARTICIPANT, TEAM, teammate, bucket.signals)
+
+    # Both heads move; only the registry's manifest entry lands.
+    photos.fail = True
+    CodSync(None, registry)._record_head("link-r", "r2" * 20)
+    CodSync(None, photos)._record_head("link-p", "p2" * 20)
+
+    session = _PeersOnlySession([{"teammate_id": teammate, "signal_count": bucket.signals}])
+    plan = sync.plan_team_fetch(root, PARTICIPANT, TEAM, session)
+    assert plan.repos == {None: [teammate], "photos": [teammate]}
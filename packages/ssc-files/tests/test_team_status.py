@@ -0,0 +1,111 @@
+"""The batched dashboard read: team_status and its cache."""
+
+import pathlib
+
+import pytest
+
+import small_sea_client.live_updates as shared_live_updates
+from cod_sync.store import LocalFolderStore
+from ssc_files import files, sync
+from ssc_files.files import (
+    FilesMaterializationContext,
+    NicheResidency,
+    add_checkout,
+    create_niche,
+    fetch_niche,
+    fetch_registry,
+    init_files,
+    merge_niche,
+    merge_registry,
+    peer_update_status,
+    publish,
+    push_niche,
+    push_registry,
+    set_peer_signal_watermark,
+    team_status,
+)
+
+ALICE = "a2" * 16
+BOB = "b2" * 16
+CAROL = "c2" * 16
+TEAM_ID = "88" * 16
+
+
+def _team(participant_hex):
+    return FilesMaterializationContext(participant_hex, TEAM_ID, "StatusTeam")
+
+
+@pytest.fixture
+def bob_with_parked_work(playground_dir):
+    """Alice shares two niches; Bob parks both and checks out one of them."""
+    playground = pathlib.Path(playground_dir)
+    stores = {}
+    for name in ("registry", "docs", "media"):
+        (playground / "cloud" / name).mkdir(parents=True)
+        stores[name] = LocalFolderStore(str(playground / "cloud" / name))
+    alice_root, bob_root = str(playground / "alice"), str(playground / "bob")
+
+    init_files(alice_root, ALICE)
+    for name in ("docs", "media"):
+        create_niche(alice_root, ALICE, _team(ALICE), name)
+        co = playground / f"alice-{name}"
+        add_checkout(alice_root, ALICE, _team(ALICE), name, str(co))
+        (co / "a.txt").write_text(f"{name}\n")
+        publish(alice_root, ALICE, _team(ALICE), name, str(co), message=name)
+        push_niche(alice_root, ALICE, _team(ALICE), name, stores[name])
+    push_registry(alice_root, ALICE, _team(ALICE), stores["registry"])
+
+    init_files(bob_root, BOB)
+    fetch_registry(bob_root, BOB, _team(BOB), ALICE, stores["registry"])
+    merge_registry(bob_root, BOB, _team(BOB), ALICE)
+    fetch_niche(bob_root, BOB, _team(BOB), "docs", ALICE, stores["docs"])
+    add_checkout(bob_root, BOB, _team(BOB), "docs", str(playground / "bob-docs"))
+    return bob_root
+
+
+def test_team_status_matches_the_per_peer_reads(bob_with_parked_work):
+    bob_root, bob = bob_with_parked_work, _team(BOB)
+    team = team_status(bob_root, BOB, bob)
+
+    assert team.niches["docs"].residency is NicheResidency.CHECKED_OUT
+    assert team.niches["media"].residency is NicheResidency.REMOTE_ONLY
+    assert [n["residency"] for n in team.niche_records()] == ["checked_out", "remote_only"]
+
+    for repo_kind, niche_name, repo in [
+        ("registry", None, team.registry),
+        ("niche", "docs", team.niches["docs"].repo),
+        ("niche", "media", team.niches["media"].repo),
+    ]:
+        for teammate_id in (ALICE, CAROL):
+            expected = peer_update_status(bob_root, BOB, bob, repo_kind, niche_name, teammate_id)
+            peer = repo.peer(teammate_id)
+            assert peer.parked_sha == expected["parked_sha"]
+            assert peer.ready_to_merge == expected["ready_to_merge"]
+            assert peer.already_merged == expected["already_merged"]
+            assert peer.last_fetched_sha == expected["last_fetched_sha"]
+
+
+def test_team_status_is_cached_until_refs_or_checkouts_change(
+    bob_with_parked_work, monkeypatch
+):
+    bob_root, bob = bob_with_parked_work, _team(BOB)
+    # The fixture just wrote everything; without this nothing is settled
+    # enough to cache.
+    monkeypatch.setattr(shared_live_updates, "RACY_STAMP_NS", 0)
+    first = team_status(bob_root, BOB, bob)
+    assert team_status(bob_root, BOB, bob) is first
+    assert first.niches["docs"].repo.peer(ALICE).ready_to_merge
+
+    merge_niche(bob_root, BOB, bob, "docs", ALICE)
+    merged = team_status(bob_root, BOB, bob)
+    assert merged is not first
+    assert merged.niches["docs"].repo.peer(ALICE).already_merged
+
+    # A write inside the racy window is never hidden behind the cache.
+    monkeypatch.setattr(shared_live_updates, "RACY_STAMP_NS", 60_000_000_000)
+    set_peer_signal_watermark(bob_root, BOB, bob, ALICE, 4)
+    assert team_status(bob_root, BOB, bob) is not team_status(bob_root, BOB, bob)
+    statuses = sync.peer_update_statuses(
+        bob_root, BOB, bob, "docs", [{"teammate_id": ALICE, "signal_count": 5}]
+    )
+    assert statuses[0].has_unfetched_hint and statuses[0].already_merged
@@ -0,0 +1,210 @@
+"""Incremental checkout status.
+
+The tracker is fed by hand here, standing in for the filesystem watcher, so
+the tests pin down what matters regardless of watchdog: an incremental status
+is always the status a full scan would give, and it only falls back to a full
+scan when the git dir itself moved.
+"""
+
+import pathlib
+import threading
+
+import pytest
+
+from ssc_files import watch
+from ssc_files.files import (
+    FilesMaterializationContext,
+    _is_checkout_clean,
+    _niche_git_dir,
+    add_checkout,
+    create_niche,
+    init_files,
+    publish,
+    status,
+)
+
+PARTICIPANT = "dd" * 16
+TEAM = FilesMaterializationContext(PARTICIPANT, "44" * 16, "WatchTeam")
+
+
+@pytest.fixture
+def tracked(playground_dir):
+    root = playground_dir
+    init_files(root, PARTICIPANT)
+    create_niche(root, PARTICIPANT, TEAM, "docs")
+    checkout = pathlib.Path(root) / "checkout" / "docs"
+    add_checkout(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    (checkout / "a.txt").write_text("a\n")
+    (checkout / "sub").mkdir()
+    (checkout / "sub" / "b.txt").write_text("b\n")
+    publish(root, PARTICIPANT, TEAM, "docs", str(checkout), message="initial")
+
+    git_dir = _niche_git_dir(root, TEAM, "docs")
+    tracker = watch.CheckoutTracker(git_dir, checkout)
+    watch.register(tracker)
+    yield root, checkout, git_dir, tracker
+    watch.untrack_all()
+
+
+def _full(git_dir, checkout):
+    """A full scan that leaves the index alone, so the tracker's cache survives it."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GIT_OPTIONAL_LOCKS", "0")
+        return watch.entry_dicts(watch.porcelain_status(git_dir, checkout))
+
+
+def _change(tracker, checkout, rel, text=None):
+    path = checkout / rel
+    if text is None:
+        path.unlink()
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    tracker.note_change(path)
+
+
+def test_new_git_dirs_are_tuned_for_large_trees(tracked):
+    _root, _checkout, git_dir, _tracker = tracked
+    config = (git_dir / "config").read_text()
+    assert "untrackedCache = true" in config
+    assert "splitIndex = true" in config
+
+
+def test_a_cookie_caught_mid_barrier_is_invisible_to_git(tracked):
+    root, checkout, git_dir, _tracker = tracked
+    watch.tune_git_dir(git_dir)
+    exclude = (git_dir / "info" / "exclude").read_text().splitlines()
+    assert exclude.count(f"/{watch.COOKIE_PREFIX}*") == 1
+
+    watch.untrack_all()
+    (checkout / f"{watch.COOKIE_PREFIX}1-0").write_text("")
+    assert _full(git_dir, checkout) == []
+    assert _is_checkout_clean(checkout, git_dir)
+
+
+def test_incremental_status_matches_a_full_scan(tracked):
+    root, checkout, git_dir, tracker = tracked
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == []
+    assert tracker.full_scans == 1
+
+    _change(tracker, checkout, "a.txt", "changed\n")
+    _change(tracker, checkout, "new/x.txt", "x\n")
+    _change(tracker, checkout, "new/y.txt", "y\n")
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == _full(git_dir, checkout)
+
+    # Removing one file from an untracked directory keeps its sibling.
+    _change(tracker, checkout, "new/x.txt")
+    _change(tracker, checkout, "sub/b.txt")
+    entries = status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    assert entries == _full(git_dir, checkout)
+    assert {"status": "??", "path": "new/y.txt"} in entries
+    assert {"status": "D", "path": "sub/b.txt"} in entries
+    assert not _is_checkout_clean(checkout, git_dir)
+
+    assert tracker.full_scans == 1
+    assert tracker.partial_scans == 2
+
+
+def test_publish_stages_only_tracked_changes_and_keeps_the_cache(tracked):
+    root, checkout, git_dir, tracker = tracked
+    status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    _change(tracker, checkout, "a.txt", "changed\n")
+    _change(tracker, checkout, "sub/b.txt")
+    _change(tracker, checkout, "c.txt", "c\n")
+
+    publish(root, PARTICIPANT, TEAM, "docs", str(checkout), message="incremental")
+
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == []
+    assert _full(git_dir, checkout) == []
+    assert tracker.full_scans == 1
+
+
+def test_publish_stages_everything_when_the_tracker_status_fails(tracked, monkeypatch):
+    root, checkout, git_dir, tracker = tracked
+    status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    _change(tracker, checkout, "a.txt", "changed\n")
+    (checkout / "unseen.txt").write_text("unseen\n")
+    monkeypatch.setattr(tracker, "status", lambda: None)
+
+    publish(root, PARTICIPANT, TEAM, "docs", str(checkout), message="fallback")
+
+    assert _full(git_dir, checkout) == []
+    monkeypatch.undo()
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == []
+    assert tracker.full_scans == 2
+
+
+def test_git_dir_changes_and_ignore_rules_force_a_full_scan(tracked):
+    root, checkout, git_dir, tracker = tracked
+    status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+
+    # A commit from another process moves the index behind the tracker's back.
+    (checkout / "late.txt").write_text("late\n")
+    watch.untrack_all()
+    publish(root, PARTICIPANT, TEAM, "docs", str(checkout), message="elsewhere")
+    watch.register(tracker)
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == []
+    assert tracker.full_scans == 2
+
+    (checkout / "build.log").write_text("noise\n")
+    _change(tracker, checkout, ".gitignore", "*.log\n")
+    assert status(root, PARTICIPANT, TEAM, "docs", str(checkout)) == _full(git_dir, checkout)
+    assert tracker.full_scans == 3
+
+
+class _LaggingWatcher:
+    """Stands in for an observer whose events arrive after the write returns.
+
+    Queued paths are delivered only once a cookie appears, ahead of it, the
+    order a real watcher keeps.
+    """
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.queued = []
+        self.cookies = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(0.005):
+            for cookie in self.tracker.checkout.glob(watch.COOKIE_PREFIX + "*"):
+                for path in self.queued:
+                    self.tracker.note_change(path)
+                self.queued = []
+                self.cookies += 1
+                self.tracker.note_change(cookie)
+
+    def stop(self):
+        self._stopped.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+
+def test_status_waits_for_writes_the_watcher_has_not_reported(tracked):
+    root, checkout, git_dir, tracker = tracked
+    status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    watcher = tracker._observer = _LaggingWatcher(tracker)
+
+    (checkout / "a.txt").write_text("changed\n")
+    watcher.queued.append(checkout / "a.txt")
+
+    entries = status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    assert entries == [{"status": "M", "path": "a.txt"}]
+    assert watcher.cookies == 1
+    assert tracker.full_scans == 1
+    assert not list(checkout.glob(watch.COOKIE_PREFIX + "*"))
+
+
+def test_an_unreported_cookie_falls_back_to_a_full_scan(tracked, monkeypatch):
+    root, checkout, git_dir, tracker = tracked
+    status(root, PARTICIPANT, TEAM, "docs", str(checkout))
+    monkeypatch.setattr(watch, "COOKIE_TIMEOUT", 0.05)
+    tracker._observer = _LaggingWatcher(tracker)
+    tracker._observer.stop()
+
+    (checkout / "a.txt").write_text("changed\n")
+    assert not _is_checkout_clean(checkout, git_dir)
+    assert tracker.full_scans == 2
@@ -0,0 +1,23 @@
+import pathlib
+
+from Experiments import sqlite_storage_stability_comparison as exp
+
+
+def test_tracked_policy_ships_smaller_bundles_than_stock(tmp_path: pathlib.Path):
+    results = exp.run_policy_comparison(tmp_path, 10, 7, purge_every=5)
+    stock = results["stock"]
+    policy = results["tracked-policy"]
+
+    assert policy["relayouts"] >= 1
+    assert policy["db_size"] < stock["db_size"]
+    assert policy["total_bundle_bytes"] < stock["total_bundle_bytes"]
+
+
+def test_small_edits_do_not_trigger_a_relayout(tmp_path: pathlib.Path):
+    stats = exp.run_policy_condition(
+        tmp_path / "policy", "tracked-policy", 6, 7, purge_every=0
+    )
+
+    assert stats["relayouts"] == 0
+    # A few changed rows ship as a few changed pages, not the whole file.
+    assert max(stats["bundle_bytes"]) < stats["db_size"] // 20
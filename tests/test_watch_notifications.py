@@ -1,4 +1,4 @@
-"""Tests for POST /notifications/watch notification behavior.
+"""Tests for POST /notifications/watch and GET /notifications/stream behavior.
 
 Uses httpx.AsyncClient with ASGITransport (in-process, no subprocess) and a
 stub backend to exercise all notification edge cases without MinIO or real
@@ -41,6 +41,9 @@ class _StubBackend:
             raise Exception(f"Unknown stub session: {session_hex}")
         return self._sessions[session_hex]
 
+    def transfer_route(self, session_hex):
+        return self._lookup_session(session_hex).berth_id.hex(), None
+
     def upload_to_cloud(self, session_hex, path, data, expected_etag=None):
         return True, "fake-etag", "ok"
 
@@ -66,10 +69,11 @@ def stub_app():
     for attr in (
         "backend", "watched_sessions",
         "watched_peers", "peer_counts", "peer_signal_events", "logger",
+        "notification_streams",
     ):
         try:
             delattr(app.state, attr)
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
 
@@ -334,3 +338,85 @@ def test_count_at_known_value_does_not_trigger(stub_app):
         assert resp.json()["updated"] == {}
 
     asyncio.run(_run())
+
+
+# ---------------------------------------------------------------------------
+# Streaming subscription
+# ---------------------------------------------------------------------------
+
+def _stream_events(resp):
+    import json
+
+    return [
+        json.loads(line[5:])
+        for line in resp.text.splitlines()
+        if line.startswith("data:")
+    ]
+
+
+def test_stream_sends_a_snapshot_then_deltas(stub_app):
+    application, stub = stub_app
+    stub.register(SESSION_1, BERTH_A)
+    application.state.peer_counts[(BERTH_A, PEER_BOB)] = 2
+    application.state.peer_counts[(BERTH_B, PEER_EVE)] = 9  # another berth
+
+    async def _run():
+        async def bump():
+            await asyncio.sleep(0.1)
+            application.state.peer_counts[(BERTH_A, PEER_BOB)] = 3
+            _pulse_berth_event(application, BERTH_A)
+
+        async with _client(application) as c:
+            bumper = asyncio.create_task(bump())
+            resp = await c.get(
+                "/notifications/stream",
+                params={"max_duration": 0.5},
+                headers=_auth(SESSION_1),
+            )
+            await bumper
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        snapshot, delta = _stream_events(resp)
+        assert snapshot["snapshot"] is True
+        assert snapshot["peers"] == {PEER_BOB: 2}
+        assert (delta["snapshot"], delta["peers"]) == (False, {PEER_BOB: 3})
+        assert f"id: {delta['cursor']}" in resp.text
+
+    asyncio.run(_run())
+
+
+def test_stream_resumes_from_a_cursor(stub_app):
+    application, stub = stub_app
+    stub.register(SESSION_1, BERTH_A)
+    stub.register(SESSION_2, BERTH_A)
+    application.state.peer_counts[(BERTH_A, PEER_BOB)] = 1
+
+    async def _run():
+        async with _client(application) as c:
+            first = await c.get(
+                "/notifications/stream",
+                params={"max_duration": 0.1},
+                headers=_auth(SESSION_1),
+            )
+            cursor = _stream_events(first)[-1]["cursor"]
+
+            # Changes made while disconnected arrive as deltas on resume.
+            application.state.peer_counts[(BERTH_A, PEER_EVE)] = 4
+            resumed = await c.get(
+                "/notifications/stream",
+                params={"max_duration": 0.1},
+                headers={**_auth(SESSION_1), "Last-Event-ID": cursor},
+            )
+            # Another session cannot resume this subscription.
+            other = await c.get(
+                "/notifications/stream",
+                params={"max_duration": 0.1, "cursor": cursor},
+                headers=_auth(SESSION_2),
+            )
+        (delta,) = _stream_events(resumed)
+        assert (delta["snapshot"], delta["peers"]) == (False, {PEER_EVE: 4})
+        (snapshot,) = _stream_events(other)
+        assert snapshot["snapshot"] is True
+        assert snapshot["peers"] == {PEER_BOB: 1, PEER_EVE: 4}
+
+    asyncio.run(_run())